@@ -0,0 +1,79 @@
+"""
+Measure MessageFormat.format() throughput when several threads share one
+MessageFormat object.
+
+Run on a free-threaded build to see formatting scale with thread count:
+
+    python3.14t benchmarks/messageformat_threads.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import sysconfig
+import threading
+import time
+from datetime import date
+
+from icu4py.messageformat import MessageFormat
+
+PATTERN = (
+    "{name} has {count, plural, one {# new message} other {# new messages}}"
+    " since {when, date, long}."
+)
+
+
+def run(fmt: MessageFormat, threads: int, calls: int) -> float:
+    """
+    Format from `threads` threads at once, returning total calls per second.
+    """
+    params = ("Alice", 42, date(2024, 1, 16))
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        for _ in range(calls):
+            fmt.format(params)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * calls / elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20_000, help="calls per thread")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="thread counts to measure",
+    )
+    args = parser.parse_args(argv)
+
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"Python {sys.version.split()[0]}, free-threaded: {free_threaded}")
+
+    fmt = MessageFormat(PATTERN, "en_GB")
+    # Warm up, so ICU data loading isn't measured.
+    run(fmt, 1, 1_000)
+
+    baseline = None
+    for threads in args.threads:
+        rate = run(fmt, threads, args.calls)
+        if baseline is None:
+            baseline = rate
+        print(f"{threads:>3} threads: {rate:>12,.0f} calls/s  ({rate / baseline:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -42,6 +42,18 @@ ext = partial(
 
 setup(
     ext_modules=[
+        ext(
+            "icu4py.casemap",
+            sources=["src/icu4py/casemap.cpp"],
+        ),
+        ext(
+            "icu4py.collator",
+            sources=["src/icu4py/collator.cpp"],
+        ),
+        ext(
+            "icu4py.datetime",
+            sources=["src/icu4py/datetime.cpp"],
+        ),
         ext(
             "icu4py.locale",
             sources=["src/icu4py/locale.cpp"],
@@ -50,6 +62,26 @@ setup(
             "icu4py.messageformat",
             sources=["src/icu4py/messageformat.cpp"],
         ),
+        ext(
+            "icu4py.messageformat2",
+            sources=["src/icu4py/messageformat2.cpp"],
+        ),
+        ext(
+            "icu4py.normalizer",
+            sources=["src/icu4py/normalizer.cpp"],
+        ),
+        ext(
+            "icu4py.number",
+            sources=["src/icu4py/number.cpp"],
+        ),
+        ext(
+            "icu4py.plurals",
+            sources=["src/icu4py/plurals.cpp"],
+        ),
+        ext(
+            "icu4py.transliterate",
+            sources=["src/icu4py/transliterate.cpp"],
+        ),
         ext(
             "icu4py.breakers",
             sources=["src/icu4py/breakers.cpp"],
@@ -16,10 +16,12 @@ using icu::BreakIterator;
 using icu::Locale;
 using icu::UnicodeString;
 using icu::StringPiece;
-using icu4py::LocaleObject;
+using icu4py::resolve_locale;
 
 struct ModuleState {
     PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
     PyObject* segment_iterator_type;
     PyObject* string_iterator_type;
 };
@@ -91,28 +93,8 @@ int Breaker_init_impl(BreakerObject* self, PyObject* args, PyObject* kwds,
     ModuleState* mod_state = get_module_state(module);
 
     Locale locale;
-    if (PyUnicode_Check(locale_obj)) {
-        const char* locale_str = PyUnicode_AsUTF8(locale_obj);
-        if (locale_str == nullptr) {
-            return -1;
-        }
-        locale = Locale(locale_str);
-    } else {
-        int is_locale = PyObject_IsInstance(locale_obj, mod_state->locale_type);
-        if (is_locale == -1) {
-            return -1;
-        }
-        if (is_locale == 0) {
-            PyErr_SetString(PyExc_TypeError, "locale must be a string or Locale object");
-            return -1;
-        }
-
-        LocaleObject* locale_pyobj = reinterpret_cast<LocaleObject*>(locale_obj);
-        if (locale_pyobj->locale == nullptr) {
-            PyErr_SetString(PyExc_ValueError, "Locale object has null internal locale");
-            return -1;
-        }
-        locale = *locale_pyobj->locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return -1;
     }
 
     UErrorCode status = U_ZERO_ERROR;
@@ -598,12 +580,18 @@ int icu4py_breakers_exec(PyObject* m) {
         return -1;
     }
 
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
     return 0;
 }
 
 int icu4py_breakers_traverse(PyObject* m, visitproc visit, void* arg) {
     ModuleState* state = get_module_state(m);
     Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
     Py_VISIT(state->segment_iterator_type);
     return 0;
 }
@@ -611,6 +599,7 @@ int icu4py_breakers_traverse(PyObject* m, visitproc visit, void* arg) {
 int icu4py_breakers_clear(PyObject* m) {
     ModuleState* state = get_module_state(m);
     Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
     Py_CLEAR(state->segment_iterator_type);
     return 0;
 }
@@ -0,0 +1,435 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/brkiter.h>
+#include <unicode/casemap.h>
+#include <unicode/locid.h>
+#include <unicode/uchar.h>
+#include <unicode/utypes.h>
+
+#include <cstring>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "locale_types.h"
+#include "lru_cache.h"
+#include "string_conversion.h"
+
+namespace {
+
+using icu::BreakIterator;
+using icu::CaseMap;
+using icu::Locale;
+using icu4py::resolve_locale;
+using icu4py::StrData;
+using icu4py::get_str_data;
+using icu4py::to_utf16;
+using icu4py::utf16_to_str;
+
+enum class Mapping { kLower, kUpper, kFold, kTitle };
+
+// Recently created word break iterators, keyed by locale name, so title
+// casing skips loading the locale's break rules. Cached iterators are
+// never used directly, only cloned, since iterating modifies them.
+using IteratorCache = icu4py::LruCache<const BreakIterator>;
+
+constexpr size_t kMaxCachedIterators = 16;
+
+struct ModuleState {
+    PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+    IteratorCache* iterator_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_casemap_exec(PyObject* m);
+int icu4py_casemap_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_casemap_clear(PyObject* m);
+void icu4py_casemap_free(void* m);
+
+// Create a word break iterator for title casing in locale, cloned from
+// the cached one.
+std::unique_ptr<BreakIterator> create_word_iterator(ModuleState* mod_state,
+                                                    const Locale& locale) {
+    std::string cache_key(locale.getName());
+    std::shared_ptr<const BreakIterator> iterator =
+        mod_state->iterator_cache->lookup(cache_key);
+    if (iterator == nullptr) {
+        UErrorCode status = U_ZERO_ERROR;
+        std::shared_ptr<const BreakIterator> new_iterator(
+            BreakIterator::createWordInstance(locale, status));
+        if (U_FAILURE(status) || new_iterator == nullptr) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to create BreakIterator: %s",
+                         u_errorName(status));
+            return nullptr;
+        }
+        iterator = std::move(new_iterator);
+        mod_state->iterator_cache->store(std::move(cache_key), iterator);
+    }
+    std::unique_ptr<BreakIterator> clone(iterator->clone());
+    if (clone == nullptr) {
+        PyErr_NoMemory();
+    }
+    return clone;
+}
+
+// The locale and break iterator to map case with, which are used without
+// the GIL.
+struct CaseContext {
+    Mapping mapping;
+    Locale locale;
+    // Turkish and Azerbaijani map the ASCII letters I and i to dotless
+    // and dotted forms, so ASCII text can't be mapped on its own.
+    bool turkic;
+    // Lithuanian keeps the dot of i when lowercasing accented Latin-1
+    // letters like Í, so Latin-1 text can't be lowercased on its own.
+    bool lithuanian;
+    // Only for title casing.
+    std::unique_ptr<BreakIterator> word_iterator;
+};
+
+bool make_context(ModuleState* mod_state, Mapping mapping, PyObject* locale_obj,
+                  CaseContext& context) {
+    context.mapping = mapping;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj,
+                        context.locale)) {
+        return false;
+    }
+    const char* language = context.locale.getLanguage();
+    context.turkic = std::strcmp(language, "tr") == 0 || std::strcmp(language, "az") == 0;
+    context.lithuanian = std::strcmp(language, "lt") == 0;
+    if (mapping == Mapping::kTitle) {
+        context.word_iterator = create_word_iterator(mod_state, context.locale);
+        if (context.word_iterator == nullptr) {
+            return false;
+        }
+    }
+    return true;
+}
+
+// Whether c is an uppercase letter whose lowercase is c + 0x20, as for
+// all uppercase Latin-1 letters.
+bool is_simple_upper(Py_UCS1 c) {
+    return (c >= 'A' && c <= 'Z') || (c >= 0xC0 && c <= 0xDE && c != 0xD7);
+}
+
+bool is_simple_lower(Py_UCS1 c) {
+    return c >= 'a' && c <= 'z';
+}
+
+// Map one byte text whose letters each map to one letter independently of
+// their context, as checked by map_text(). Returns true if nothing changed.
+bool map_simple(bool to_upper, const StrData& str, std::u16string& result) {
+    const auto* chars = static_cast<const Py_UCS1*>(str.data);
+    bool (*is_mapped)(Py_UCS1) = to_upper ? is_simple_lower : is_simple_upper;
+    int32_t i = 0;
+    while (i < str.length && !is_mapped(chars[i])) {
+        ++i;
+    }
+    if (i == str.length) {
+        return true;
+    }
+    result.assign(chars, chars + str.length);
+    for (; i < str.length; ++i) {
+        if (is_mapped(chars[i])) {
+            result[i] = static_cast<char16_t>(chars[i] ^ 0x20);
+        }
+    }
+    return false;
+}
+
+int32_t call_case_map(CaseContext& context, const UChar* text, int32_t length, UChar* dest,
+                      int32_t capacity, UErrorCode& status) {
+    const char* locale_id = context.locale.getName();
+    switch (context.mapping) {
+        case Mapping::kLower:
+            return CaseMap::toLower(locale_id, 0, text, length, dest, capacity, nullptr,
+                                    status);
+        case Mapping::kUpper:
+            return CaseMap::toUpper(locale_id, 0, text, length, dest, capacity, nullptr,
+                                    status);
+        case Mapping::kFold:
+            return CaseMap::fold(context.turkic ? U_FOLD_CASE_EXCLUDE_SPECIAL_I : 0, text, length,
+                                 dest, capacity, nullptr, status);
+        case Mapping::kTitle:
+            return CaseMap::toTitle(locale_id, 0, context.word_iterator.get(), text, length,
+                                    dest, capacity, nullptr, status);
+    }
+    return 0;
+}
+
+// Map the case of str into result. Returns true without setting result if
+// the mapping leaves str unchanged.
+bool map_text(CaseContext& context, const StrData& str, std::u16string& buffer,
+              std::u16string& result, UErrorCode& status) {
+    // Case folding and uppercasing have multi-letter mappings in Latin-1,
+    // like ß to "ss", so only ASCII text skips ICU for them.
+    if (!context.turkic) {
+        if (context.mapping == Mapping::kLower && str.kind == PyUnicode_1BYTE_KIND &&
+            !context.lithuanian) {
+            return map_simple(false, str, result);
+        }
+        if ((context.mapping == Mapping::kFold || context.mapping == Mapping::kUpper) &&
+            str.is_ascii) {
+            return map_simple(context.mapping == Mapping::kUpper, str, result);
+        }
+    }
+    int32_t length;
+    const UChar* text = to_utf16(str, buffer, length);
+    // Mapping rarely changes the length much, so this usually fits.
+    result.resize(static_cast<size_t>(length) + 16);
+    int32_t result_length =
+        call_case_map(context, text, length, reinterpret_cast<UChar*>(&result[0]),
+                      static_cast<int32_t>(result.size()), status);
+    if (status == U_BUFFER_OVERFLOW_ERROR) {
+        status = U_ZERO_ERROR;
+        result.resize(result_length);
+        result_length = call_case_map(context, text, length, reinterpret_cast<UChar*>(&result[0]),
+                                      static_cast<int32_t>(result.size()), status);
+    }
+    if (U_FAILURE(status)) {
+        return true;
+    }
+    result.resize(result_length);
+    return result_length == length &&
+           std::memcmp(result.data(), text, static_cast<size_t>(length) * sizeof(UChar)) == 0;
+}
+
+void set_case_map_error(UErrorCode status) {
+    PyErr_Format(PyExc_RuntimeError, "Failed to map case: %s", u_errorName(status));
+}
+
+PyObject* map_case(PyObject* module, PyObject* const* args, Py_ssize_t nargs, Mapping mapping,
+                   const char* name) {
+    if (nargs != 2) {
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly 2 arguments", name);
+        return nullptr;
+    }
+    StrData str;
+    if (!get_str_data(args[0], str)) {
+        return nullptr;
+    }
+    CaseContext context;
+    if (!make_context(get_module_state(module), mapping, args[1], context)) {
+        return nullptr;
+    }
+
+    std::u16string buffer;
+    std::u16string result;
+    UErrorCode status = U_ZERO_ERROR;
+    bool unchanged = map_text(context, str, buffer, result, status);
+    if (U_FAILURE(status)) {
+        set_case_map_error(status);
+        return nullptr;
+    }
+    if (unchanged) {
+        return Py_NewRef(args[0]);
+    }
+    return utf16_to_str(reinterpret_cast<const UChar*>(result.data()),
+                        static_cast<int32_t>(result.size()));
+}
+
+PyObject* map_case_many(PyObject* module, PyObject* const* args, Py_ssize_t nargs,
+                        Mapping mapping, const char* name) {
+    if (nargs != 2) {
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly 2 arguments", name);
+        return nullptr;
+    }
+    PyObject* arg = args[0];
+    if (PyUnicode_Check(arg) || PyBytes_Check(arg) || PyByteArray_Check(arg)) {
+        PyErr_Format(PyExc_TypeError, "strings must be an iterable of strings, not %.200s",
+                     Py_TYPE(arg)->tp_name);
+        return nullptr;
+    }
+    PyObject* strings = PySequence_Tuple(arg);
+    if (strings == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t count = PyTuple_GET_SIZE(strings);
+    std::vector<StrData> str_data(count);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        if (!get_str_data(PyTuple_GET_ITEM(strings, i), str_data[i])) {
+            Py_DECREF(strings);
+            return nullptr;
+        }
+    }
+    // One context, and so one word break iterator, serves the whole batch.
+    CaseContext context;
+    if (!make_context(get_module_state(module), mapping, args[1], context)) {
+        Py_DECREF(strings);
+        return nullptr;
+    }
+
+    // Mapped copies, by index, of only the strings that changed.
+    std::vector<std::pair<Py_ssize_t, std::u16string>> changed;
+    UErrorCode status = U_ZERO_ERROR;
+
+    Py_BEGIN_ALLOW_THREADS
+    std::u16string buffer;
+    std::u16string result;
+    for (Py_ssize_t i = 0; i < count && U_SUCCESS(status); ++i) {
+        if (!map_text(context, str_data[i], buffer, result, status)) {
+            changed.emplace_back(i, std::move(result));
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    if (U_FAILURE(status)) {
+        Py_DECREF(strings);
+        set_case_map_error(status);
+        return nullptr;
+    }
+
+    PyObject* list = PyList_New(count);
+    if (list == nullptr) {
+        Py_DECREF(strings);
+        return nullptr;
+    }
+    auto next_changed = changed.begin();
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* str_obj;
+        if (next_changed != changed.end() && next_changed->first == i) {
+            const std::u16string& mapped = next_changed->second;
+            str_obj = utf16_to_str(reinterpret_cast<const UChar*>(mapped.data()),
+                                   static_cast<int32_t>(mapped.size()));
+            if (str_obj == nullptr) {
+                Py_DECREF(list);
+                Py_DECREF(strings);
+                return nullptr;
+            }
+            ++next_changed;
+        } else {
+            str_obj = Py_NewRef(PyTuple_GET_ITEM(strings, i));
+        }
+        PyList_SET_ITEM(list, i, str_obj);
+    }
+    Py_DECREF(strings);
+    return list;
+}
+
+PyObject* lower(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case(module, args, nargs, Mapping::kLower, "lower");
+}
+
+PyObject* upper(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case(module, args, nargs, Mapping::kUpper, "upper");
+}
+
+PyObject* fold(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case(module, args, nargs, Mapping::kFold, "fold");
+}
+
+PyObject* title(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case(module, args, nargs, Mapping::kTitle, "title");
+}
+
+PyObject* lower_many(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case_many(module, args, nargs, Mapping::kLower, "lower_many");
+}
+
+PyObject* upper_many(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case_many(module, args, nargs, Mapping::kUpper, "upper_many");
+}
+
+PyObject* fold_many(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case_many(module, args, nargs, Mapping::kFold, "fold_many");
+}
+
+PyObject* title_many(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    return map_case_many(module, args, nargs, Mapping::kTitle, "title_many");
+}
+
+PyMethodDef icu4py_casemap_module_methods[] = {
+    {"lower", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(lower)),
+     METH_FASTCALL, "Lowercase a string by the rules of a locale"},
+    {"upper", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(upper)),
+     METH_FASTCALL, "Uppercase a string by the rules of a locale"},
+    {"fold", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(fold)),
+     METH_FASTCALL, "Case fold a string for caseless matching"},
+    {"title", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(title)),
+     METH_FASTCALL, "Title case each word of a string by the rules of a locale"},
+    {"lower_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(lower_many)),
+     METH_FASTCALL, "Lowercase each string in an iterable"},
+    {"upper_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(upper_many)),
+     METH_FASTCALL, "Uppercase each string in an iterable"},
+    {"fold_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(fold_many)),
+     METH_FASTCALL, "Case fold each string in an iterable"},
+    {"title_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(title_many)),
+     METH_FASTCALL, "Title case each string in an iterable"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_casemap_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_casemap_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef casemapmodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.casemap",
+    "",
+    sizeof(ModuleState),
+    icu4py_casemap_module_methods,
+    icu4py_casemap_slots,
+    icu4py_casemap_traverse,
+    icu4py_casemap_clear,
+    icu4py_casemap_free,
+};
+
+int icu4py_casemap_exec(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    state->iterator_cache = new IteratorCache(kMaxCachedIterators);
+
+    PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
+    if (locale_module == nullptr) {
+        return -1;
+    }
+    state->locale_type = PyObject_GetAttrString(locale_module, "Locale");
+    Py_DECREF(locale_module);
+    if (state->locale_type == nullptr) {
+        return -1;
+    }
+
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_casemap_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    return 0;
+}
+
+int icu4py_casemap_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    return 0;
+}
+
+void icu4py_casemap_free(void* m) {
+    icu4py_casemap_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->iterator_cache;
+    state->iterator_cache = nullptr;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_casemap() {
+    return PyModuleDef_Init(&casemapmodule);
+}
@@ -0,0 +1,12 @@
+from collections.abc import Iterable
+
+from icu4py.locale import Locale
+
+def lower(text: str, locale: str | Locale, /) -> str: ...
+def upper(text: str, locale: str | Locale, /) -> str: ...
+def fold(text: str, locale: str | Locale, /) -> str: ...
+def title(text: str, locale: str | Locale, /) -> str: ...
+def lower_many(strings: Iterable[str], locale: str | Locale, /) -> list[str]: ...
+def upper_many(strings: Iterable[str], locale: str | Locale, /) -> list[str]: ...
+def fold_many(strings: Iterable[str], locale: str | Locale, /) -> list[str]: ...
+def title_many(strings: Iterable[str], locale: str | Locale, /) -> list[str]: ...
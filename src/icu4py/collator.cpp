@@ -0,0 +1,597 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/coll.h>
+#include <unicode/locid.h>
+#include <unicode/ucol.h>
+#include <unicode/utypes.h>
+
+#include <algorithm>
+#include <cstdint>
+#include <memory>
+#include <numeric>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "locale_types.h"
+#include "lru_cache.h"
+#include "string_conversion.h"
+
+namespace {
+
+using icu::Collator;
+using icu::Locale;
+using icu4py::LocaleObject;
+using icu4py::resolve_locale;
+using icu4py::StrData;
+using icu4py::get_str_data;
+using icu4py::to_utf16;
+
+// Recently created collators, keyed by locale name and options, so
+// creating the same Collator again skips loading its rules. Collators are
+// shared between Collator objects and never modified once cached, which
+// makes them safe to use from several threads at once.
+using CollatorCache = icu4py::LruCache<const Collator>;
+
+constexpr size_t kMaxCachedCollators = 64;
+
+struct StrengthName {
+    const char* name;
+    Collator::ECollationStrength strength;
+};
+
+constexpr StrengthName kStrengthNames[] = {
+    {"primary", Collator::PRIMARY},
+    {"secondary", Collator::SECONDARY},
+    {"tertiary", Collator::TERTIARY},
+    {"quaternary", Collator::QUATERNARY},
+    {"identical", Collator::IDENTICAL},
+};
+
+struct ModuleState {
+    PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+    CollatorCache* collator_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_collator_exec(PyObject* m);
+int icu4py_collator_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_collator_clear(PyObject* m);
+void icu4py_collator_free(void* m);
+
+extern PyModuleDef collatormodule;
+
+struct CollatorObject {
+    PyObject_HEAD
+    std::shared_ptr<const Collator>* collator;
+    Locale* locale;
+    const StrengthName* strength;
+    bool numeric;
+};
+
+void Collator_dealloc(CollatorObject* self) {
+    delete self->collator;
+    delete self->locale;
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* Collator_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<CollatorObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->collator = nullptr;
+        self->locale = nullptr;
+        self->strength = nullptr;
+        self->numeric = false;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+const StrengthName* lookup_strength(PyObject* strength_obj) {
+    if (PyUnicode_Check(strength_obj)) {
+        for (const StrengthName& entry : kStrengthNames) {
+            if (PyUnicode_CompareWithASCIIString(strength_obj, entry.name) == 0) {
+                return &entry;
+            }
+        }
+    }
+    PyErr_Format(PyExc_ValueError,
+                 "strength must be 'primary', 'secondary', 'tertiary', 'quaternary', or "
+                 "'identical', not %R",
+                 strength_obj);
+    return nullptr;
+}
+
+int Collator_init(CollatorObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* locale_obj;
+    PyObject* strength_obj = nullptr;
+    int numeric = 0;
+
+    static const char* kwlist[] = {"locale", "strength", "numeric", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|Op", const_cast<char**>(kwlist),
+                                     &locale_obj, &strength_obj, &numeric)) {
+        return -1;
+    }
+
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &collatormodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &collatormodule);
+#endif
+    if (module == nullptr) {
+        return -1;
+    }
+    ModuleState* mod_state = get_module_state(module);
+
+    const StrengthName* strength = &kStrengthNames[2];
+    if (strength_obj != nullptr) {
+        strength = lookup_strength(strength_obj);
+        if (strength == nullptr) {
+            return -1;
+        }
+    }
+    Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return -1;
+    }
+
+    std::string cache_key(locale.getName());
+    cache_key.push_back('\0');
+    cache_key.append(strength->name);
+    cache_key.push_back(numeric ? 'n' : '\0');
+
+    std::shared_ptr<const Collator> collator = mod_state->collator_cache->lookup(cache_key);
+    if (collator == nullptr) {
+        UErrorCode status = U_ZERO_ERROR;
+        std::unique_ptr<Collator> new_collator(Collator::createInstance(locale, status));
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to create collator: %s",
+                         u_errorName(status));
+            return -1;
+        }
+        new_collator->setStrength(strength->strength);
+        new_collator->setAttribute(UCOL_NUMERIC_COLLATION, numeric ? UCOL_ON : UCOL_OFF, status);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to configure collator: %s",
+                         u_errorName(status));
+            return -1;
+        }
+        collator = std::shared_ptr<const Collator>(new_collator.release());
+        mod_state->collator_cache->store(std::move(cache_key), collator);
+    }
+
+    delete self->collator;
+    self->collator = new std::shared_ptr<const Collator>(std::move(collator));
+    delete self->locale;
+    self->locale = new Locale(locale);
+    self->strength = strength;
+    self->numeric = numeric;
+    return 0;
+}
+
+bool check_initialized(CollatorObject* self) {
+    if (self->collator == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "Collator is not initialized");
+        return false;
+    }
+    return true;
+}
+
+// Reused between strings, so their allocations are too.
+struct SortKeyBuffers {
+    std::u16string text;
+    std::vector<uint8_t> key;
+};
+
+// Write the sort key of str to key, without its terminating zero byte.
+void compute_sort_key(const Collator& collator, const StrData& str, SortKeyBuffers& buffers,
+                      std::string& key) {
+    int32_t text_length;
+    const UChar* text = to_utf16(str, buffers.text, text_length);
+    if (buffers.key.empty()) {
+        buffers.key.resize(256);
+    }
+    int32_t length = collator.getSortKey(text, text_length, buffers.key.data(),
+                                         static_cast<int32_t>(buffers.key.size()));
+    if (length > static_cast<int32_t>(buffers.key.size())) {
+        buffers.key.resize(length);
+        length = collator.getSortKey(text, text_length, buffers.key.data(), length);
+    }
+    key.assign(reinterpret_cast<const char*>(buffers.key.data()), length > 0 ? length - 1 : 0);
+}
+
+PyObject* Collator_sort_key(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<CollatorObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    StrData str;
+    if (!get_str_data(arg, str)) {
+        return nullptr;
+    }
+    SortKeyBuffers buffers;
+    std::string key;
+    compute_sort_key(**self_obj->collator, str, buffers, key);
+    return PyBytes_FromStringAndSize(key.data(), key.size());
+}
+
+PyObject* Collator_compare(PyObject* self, PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "compare() takes exactly 2 arguments");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<CollatorObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    StrData first;
+    StrData second;
+    if (!get_str_data(args[0], first) || !get_str_data(args[1], second)) {
+        return nullptr;
+    }
+    std::u16string first_buffer;
+    std::u16string second_buffer;
+    int32_t first_length;
+    int32_t second_length;
+    const UChar* first_text = to_utf16(first, first_buffer, first_length);
+    const UChar* second_text = to_utf16(second, second_buffer, second_length);
+    UErrorCode status = U_ZERO_ERROR;
+    UCollationResult result = (*self_obj->collator)
+                                  ->compare(first_text, first_length, second_text,
+                                            second_length, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to compare strings: %s", u_errorName(status));
+        return nullptr;
+    }
+    return PyLong_FromLong(result);
+}
+
+// Read the strs in a tuple, which keeps them alive.
+bool collect_str_data(PyObject* strings, std::vector<StrData>& result) {
+    Py_ssize_t count = PyTuple_GET_SIZE(strings);
+    result.resize(count);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        if (!get_str_data(PyTuple_GET_ITEM(strings, i), result[i])) {
+            return false;
+        }
+    }
+    return true;
+}
+
+void compute_sort_keys(const Collator& collator, const std::vector<StrData>& strings,
+                       std::vector<std::string>& keys) {
+    keys.resize(strings.size());
+    SortKeyBuffers buffers;
+    for (size_t i = 0; i < keys.size(); ++i) {
+        compute_sort_key(collator, strings[i], buffers, keys[i]);
+    }
+}
+
+PyObject* as_tuple(PyObject* values, const char* name) {
+    if (PyUnicode_Check(values) || PyBytes_Check(values) || PyByteArray_Check(values)) {
+        PyErr_Format(PyExc_TypeError, "%s must be an iterable of strings, not %.200s", name,
+                     Py_TYPE(values)->tp_name);
+        return nullptr;
+    }
+    return PySequence_Tuple(values);
+}
+
+PyObject* Collator_sort_keys(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<CollatorObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    PyObject* strings = as_tuple(arg, "strings");
+    if (strings == nullptr) {
+        return nullptr;
+    }
+    std::vector<StrData> str_data;
+    if (!collect_str_data(strings, str_data)) {
+        Py_DECREF(strings);
+        return nullptr;
+    }
+
+    std::vector<std::string> keys;
+    // A reference, so the collator outlives a concurrent __init__() while
+    // the GIL is released.
+    std::shared_ptr<const Collator> collator = *self_obj->collator;
+    Py_BEGIN_ALLOW_THREADS
+    compute_sort_keys(*collator, str_data, keys);
+    Py_END_ALLOW_THREADS
+    Py_DECREF(strings);
+
+    PyObject* results = PyList_New(keys.size());
+    if (results == nullptr) {
+        return nullptr;
+    }
+    for (size_t i = 0; i < keys.size(); ++i) {
+        PyObject* key = PyBytes_FromStringAndSize(keys[i].data(), keys[i].size());
+        if (key == nullptr) {
+            Py_DECREF(results);
+            return nullptr;
+        }
+        PyList_SET_ITEM(results, i, key);
+    }
+    return results;
+}
+
+PyObject* Collator_sorted(PyObject* self, PyObject* const* args, Py_ssize_t nargs,
+                          PyObject* kwnames) {
+    static const char* const kwlist[] = {"key", "reverse"};
+    PyObject* key_func = Py_None;
+    PyObject* reverse_obj = Py_False;
+
+    if (nargs != 1) {
+        PyErr_SetString(PyExc_TypeError, "sorted() takes exactly 1 positional argument");
+        return nullptr;
+    }
+    Py_ssize_t nkwargs = kwnames != nullptr ? PyTuple_GET_SIZE(kwnames) : 0;
+    for (Py_ssize_t i = 0; i < nkwargs; ++i) {
+        PyObject* name = PyTuple_GET_ITEM(kwnames, i);
+        if (PyUnicode_CompareWithASCIIString(name, kwlist[0]) == 0) {
+            key_func = args[nargs + i];
+        } else if (PyUnicode_CompareWithASCIIString(name, kwlist[1]) == 0) {
+            reverse_obj = args[nargs + i];
+        } else {
+            PyErr_Format(PyExc_TypeError, "sorted() got an unexpected keyword argument %R", name);
+            return nullptr;
+        }
+    }
+    int reverse = PyObject_IsTrue(reverse_obj);
+    if (reverse == -1) {
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<CollatorObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+
+    PyObject* items = as_tuple(args[0], "values");
+    if (items == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t count = PyTuple_GET_SIZE(items);
+
+    // The strings to sort by: the items themselves, or their keys.
+    PyObject* strings;
+    if (key_func == Py_None) {
+        strings = Py_NewRef(items);
+    } else {
+        strings = PyTuple_New(count);
+        if (strings == nullptr) {
+            Py_DECREF(items);
+            return nullptr;
+        }
+        for (Py_ssize_t i = 0; i < count; ++i) {
+            PyObject* key = PyObject_CallOneArg(key_func, PyTuple_GET_ITEM(items, i));
+            if (key == nullptr) {
+                Py_DECREF(strings);
+                Py_DECREF(items);
+                return nullptr;
+            }
+            PyTuple_SET_ITEM(strings, i, key);
+        }
+    }
+
+    std::vector<StrData> str_data;
+    if (!collect_str_data(strings, str_data)) {
+        Py_DECREF(strings);
+        Py_DECREF(items);
+        return nullptr;
+    }
+
+    std::vector<std::string> keys;
+    std::vector<Py_ssize_t> order(count);
+    // A reference, so the collator outlives a concurrent __init__() while
+    // the GIL is released.
+    std::shared_ptr<const Collator> collator = *self_obj->collator;
+    Py_BEGIN_ALLOW_THREADS
+    compute_sort_keys(*collator, str_data, keys);
+    std::iota(order.begin(), order.end(), 0);
+    // A stable sort keeps equal items in their original order, in either
+    // direction, as with the builtin sorted().
+    if (reverse) {
+        std::stable_sort(order.begin(), order.end(),
+                         [&keys](Py_ssize_t a, Py_ssize_t b) { return keys[b] < keys[a]; });
+    } else {
+        std::stable_sort(order.begin(), order.end(),
+                         [&keys](Py_ssize_t a, Py_ssize_t b) { return keys[a] < keys[b]; });
+    }
+    Py_END_ALLOW_THREADS
+    Py_DECREF(strings);
+
+    PyObject* results = PyList_New(count);
+    if (results == nullptr) {
+        Py_DECREF(items);
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyList_SET_ITEM(results, i, Py_NewRef(PyTuple_GET_ITEM(items, order[i])));
+    }
+    Py_DECREF(items);
+    return results;
+}
+
+PyObject* Collator_get_locale(CollatorObject* self, void* closure) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &collatormodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &collatormodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+
+    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+    icu4py::set_locale(locale_obj, *self->locale);
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* Collator_get_strength(CollatorObject* self, void* closure) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return PyUnicode_FromString(self->strength->name);
+}
+
+PyObject* Collator_get_numeric(CollatorObject* self, void* closure) {
+    return PyBool_FromLong(self->numeric);
+}
+
+PyObject* Collator_repr(CollatorObject* self) {
+    if (self->collator == nullptr) {
+        return PyUnicode_FromFormat("<%s uninitialized>", Py_TYPE(self)->tp_name);
+    }
+    return PyUnicode_FromFormat("Collator(Locale('%s'), strength='%s', numeric=%s)",
+                                self->locale->getName(), self->strength->name,
+                                self->numeric ? "True" : "False");
+}
+
+PyObject* Collator_reduce(CollatorObject* self, PyObject* Py_UNUSED(ignored)) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return Py_BuildValue("(O(ssO))", Py_TYPE(self), self->locale->getName(),
+                         self->strength->name, self->numeric ? Py_True : Py_False);
+}
+
+PyMethodDef Collator_methods[] = {
+    {"compare", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(Collator_compare)),
+     METH_FASTCALL,
+     "Compare two strings"},
+    {"sort_key", reinterpret_cast<PyCFunction>(Collator_sort_key), METH_O,
+     "Return the sort key of a string"},
+    {"sort_keys", reinterpret_cast<PyCFunction>(Collator_sort_keys), METH_O,
+     "Return the sort key of each string in an iterable"},
+    {"sorted", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(Collator_sorted)),
+     METH_FASTCALL | METH_KEYWORDS,
+     "Return a new list of the values in collation order"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(Collator_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef Collator_getsetters[] = {
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(Collator_get_locale), nullptr,
+     const_cast<char*>("The locale whose collation rules are used"), nullptr},
+    {const_cast<char*>("strength"), reinterpret_cast<getter>(Collator_get_strength), nullptr,
+     const_cast<char*>("The comparison strength"), nullptr},
+    {const_cast<char*>("numeric"), reinterpret_cast<getter>(Collator_get_numeric), nullptr,
+     const_cast<char*>("Whether digits are compared by numeric value"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot Collator_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU Collator")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(Collator_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(Collator_init)},
+    {Py_tp_new, reinterpret_cast<void*>(Collator_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(Collator_repr)},
+    {Py_tp_methods, Collator_methods},
+    {Py_tp_getset, Collator_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec Collator_spec = {
+    "icu4py.collator.Collator",
+    sizeof(CollatorObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    Collator_slots
+};
+
+PyMethodDef icu4py_collator_module_methods[] = {
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_collator_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_collator_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef collatormodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.collator",
+    "",
+    sizeof(ModuleState),
+    icu4py_collator_module_methods,
+    icu4py_collator_slots,
+    icu4py_collator_traverse,
+    icu4py_collator_clear,
+    icu4py_collator_free,
+};
+
+int icu4py_collator_exec(PyObject* m) {
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &Collator_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "Collator", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+
+    ModuleState* state = get_module_state(m);
+    state->collator_cache = new CollatorCache(kMaxCachedCollators);
+
+    PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
+    if (locale_module == nullptr) {
+        return -1;
+    }
+    state->locale_type = PyObject_GetAttrString(locale_module, "Locale");
+    Py_DECREF(locale_module);
+    if (state->locale_type == nullptr) {
+        return -1;
+    }
+
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_collator_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    return 0;
+}
+
+int icu4py_collator_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    return 0;
+}
+
+void icu4py_collator_free(void* m) {
+    icu4py_collator_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->collator_cache;
+    state->collator_cache = nullptr;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_collator() {
+    return PyModuleDef_Init(&collatormodule);
+}
@@ -0,0 +1,42 @@
+from collections.abc import Callable, Iterable
+from typing import Literal, TypeAlias, TypeVar, overload
+
+from typing_extensions import disjoint_base
+
+from icu4py.locale import Locale
+
+_T = TypeVar("_T")
+_Strength: TypeAlias = Literal[
+    "primary", "secondary", "tertiary", "quaternary", "identical"
+]
+
+@disjoint_base
+class Collator:
+    def __init__(
+        self,
+        locale: str | Locale,
+        strength: _Strength = "tertiary",
+        numeric: bool = False,
+    ) -> None: ...
+    @property
+    def locale(self) -> Locale: ...
+    @property
+    def strength(self) -> _Strength: ...
+    @property
+    def numeric(self) -> bool: ...
+    def compare(self, a: str, b: str, /) -> Literal[-1, 0, 1]: ...
+    def sort_key(self, string: str, /) -> bytes: ...
+    def sort_keys(self, strings: Iterable[str], /) -> list[bytes]: ...
+    @overload
+    def sorted(
+        self, values: Iterable[str], /, *, key: None = None, reverse: bool = False
+    ) -> list[str]: ...
+    @overload
+    def sorted(
+        self,
+        values: Iterable[_T],
+        /,
+        *,
+        key: Callable[[_T], str],
+        reverse: bool = False,
+    ) -> list[_T]: ...
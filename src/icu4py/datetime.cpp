@@ -0,0 +1,928 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <datetime.h>
+#include <unicode/basictz.h>
+#include <unicode/calendar.h>
+#include <unicode/dtptngen.h>
+#include <unicode/fieldpos.h>
+#include <unicode/locid.h>
+#include <unicode/smpdtfmt.h>
+#include <unicode/timezone.h>
+#include <unicode/unistr.h>
+#include <unicode/utypes.h>
+
+#include <cstring>
+#include <list>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include "datetime_conversion.h"
+#include "locale_types.h"
+#include "lru_cache.h"
+#include "number_conversion.h"
+
+namespace {
+
+using icu::BasicTimeZone;
+using icu::Calendar;
+using icu::DateTimePatternGenerator;
+using icu::FieldPosition;
+using icu::Locale;
+using icu::SimpleDateFormat;
+using icu::StringPiece;
+using icu::TimeZone;
+using icu::UnicodeString;
+using icu4py::LocaleObject;
+using icu4py::resolve_locale;
+using icu4py::TimeZoneRegistry;
+using icu4py::date_to_udate;
+using icu4py::datetime64_scale;
+using icu4py::datetime_to_udate;
+using icu4py::is_native_byte_order;
+using icu4py::kDatetime64NaT;
+using icu4py::numeric_buffer_kind;
+using icu4py::read_buffer_int;
+using icu4py::time_to_udate;
+
+// Recently compiled formats, keyed by locale name, skeleton or pattern,
+// and time zone, so creating the same DateFormatter again skips resolving
+// the skeleton and parsing the pattern. Formats are shared between
+// DateFormatter objects and never modified once cached.
+using FormatCache = icu4py::LruCache<const SimpleDateFormat>;
+
+constexpr size_t kMaxCachedFormats = 256;
+
+// Pattern generators by locale name, which are slow to create and used to
+// resolve skeletons to patterns. Generators aren't thread-safe, so the
+// mutex is held while using them.
+struct GeneratorCache {
+    std::mutex mutex;
+    // Most recently used first.
+    std::list<std::pair<std::string, std::unique_ptr<DateTimePatternGenerator>>> entries;
+    std::unordered_map<std::string, decltype(entries)::iterator> index;
+};
+
+constexpr size_t kMaxCachedGenerators = 16;
+
+struct ModuleState {
+    PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+    PyObject* str_utcoffset;
+    PyObject* str_key;
+    PyObject* str_from_pattern;
+    PyObject* zoneinfo_type;
+    // Naive datetimes are interpreted, and all values formatted, in ICU's
+    // default time zone unless a formatter has its own.
+    BasicTimeZone* default_time_zone;
+    TimeZoneRegistry* time_zones;
+    FormatCache* format_cache;
+    GeneratorCache* generator_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_datetime_exec(PyObject* m);
+int icu4py_datetime_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_datetime_clear(PyObject* m);
+void icu4py_datetime_free(void* m);
+
+extern PyModuleDef datetimemodule;
+
+struct DateFormatterObject {
+    PyObject_HEAD
+    std::shared_ptr<const SimpleDateFormat>* format;
+    // The skeleton, or nullptr for formatters created from a pattern.
+    PyObject* skeleton;
+    PyObject* pattern;
+    Locale* locale;
+    // Borrowed from the module's TimeZoneRegistry, or nullptr for ICU's
+    // default time zone.
+    const BasicTimeZone* time_zone;
+};
+
+void DateFormatter_dealloc(DateFormatterObject* self) {
+    delete self->format;
+    delete self->locale;
+    Py_XDECREF(self->skeleton);
+    Py_XDECREF(self->pattern);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* DateFormatter_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<DateFormatterObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->format = nullptr;
+        self->skeleton = nullptr;
+        self->pattern = nullptr;
+        self->locale = nullptr;
+        self->time_zone = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+ModuleState* type_module_state(PyTypeObject* type) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(type, &datetimemodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(type, &datetimemodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    return get_module_state(module);
+}
+
+// Resolve a skeleton to the locale's best matching pattern, with a cached
+// pattern generator.
+bool resolve_skeleton(GeneratorCache* cache, const Locale& locale, const UnicodeString& skeleton,
+                      UnicodeString& pattern) {
+    std::lock_guard<std::mutex> lock(cache->mutex);
+    UErrorCode status = U_ZERO_ERROR;
+    std::string key(locale.getName());
+    DateTimePatternGenerator* generator;
+    auto found = cache->index.find(key);
+    if (found != cache->index.end()) {
+        cache->entries.splice(cache->entries.begin(), cache->entries, found->second);
+        generator = found->second->second.get();
+    } else {
+        std::unique_ptr<DateTimePatternGenerator> new_generator(
+            DateTimePatternGenerator::createInstance(locale, status));
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to create date pattern generator: %s",
+                         u_errorName(status));
+            return false;
+        }
+        generator = new_generator.get();
+        cache->entries.emplace_front(std::move(key), std::move(new_generator));
+        cache->index.emplace(cache->entries.front().first, cache->entries.begin());
+        if (cache->entries.size() > kMaxCachedGenerators) {
+            cache->index.erase(cache->entries.back().first);
+            cache->entries.pop_back();
+        }
+    }
+
+    pattern = generator->getBestPattern(skeleton, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to resolve date skeleton: %s",
+                     u_errorName(status));
+        return false;
+    }
+    return true;
+}
+
+std::string time_zone_id(const TimeZone* time_zone) {
+    std::string id;
+    if (time_zone != nullptr) {
+        UnicodeString uid;
+        time_zone->getID(uid);
+        uid.toUTF8String(id);
+    }
+    return id;
+}
+
+// Set up a DateFormatter from a skeleton or, if is_pattern, a pattern.
+bool init_formatter(DateFormatterObject* self, ModuleState* mod_state, PyObject* text_obj,
+                    bool is_pattern, PyObject* locale_obj, PyObject* time_zone_obj) {
+    Py_ssize_t text_len;
+    const char* text = PyUnicode_AsUTF8AndSize(text_obj, &text_len);
+    if (text == nullptr) {
+        return false;
+    }
+    Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return false;
+    }
+    const BasicTimeZone* time_zone;
+    if (!icu4py::lookup_time_zone(mod_state->time_zones, mod_state->zoneinfo_type,
+                                  mod_state->str_key, time_zone_obj, &time_zone)) {
+        return false;
+    }
+
+    std::string cache_key(locale.getName());
+    cache_key.push_back('\0');
+    cache_key.push_back(is_pattern ? 'p' : 's');
+    cache_key.append(text, text_len);
+    cache_key.push_back('\0');
+    cache_key.append(time_zone_id(time_zone));
+
+    std::shared_ptr<const SimpleDateFormat> format =
+        mod_state->format_cache->lookup(cache_key);
+    if (format == nullptr) {
+        UnicodeString utext = UnicodeString::fromUTF8(StringPiece(text, text_len));
+        UnicodeString pattern;
+        if (is_pattern) {
+            pattern = utext;
+        } else if (!resolve_skeleton(mod_state->generator_cache, locale, utext, pattern)) {
+            return false;
+        }
+
+        UErrorCode status = U_ZERO_ERROR;
+        auto new_format = std::make_shared<SimpleDateFormat>(pattern, locale, status);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError, "Failed to parse date pattern %R: %s", text_obj,
+                         u_errorName(status));
+            return false;
+        }
+        new_format->setTimeZone(time_zone != nullptr ? *time_zone : *mod_state->default_time_zone);
+        format = std::move(new_format);
+        mod_state->format_cache->store(std::move(cache_key), format);
+    }
+
+    UnicodeString upattern;
+    format->toPattern(upattern);
+    std::string pattern_utf8;
+    upattern.toUTF8String(pattern_utf8);
+    PyObject* pattern_obj = PyUnicode_FromStringAndSize(pattern_utf8.data(), pattern_utf8.size());
+    if (pattern_obj == nullptr) {
+        return false;
+    }
+
+    delete self->format;
+    self->format = new std::shared_ptr<const SimpleDateFormat>(std::move(format));
+    delete self->locale;
+    self->locale = new Locale(locale);
+    Py_XSETREF(self->pattern, pattern_obj);
+    Py_XSETREF(self->skeleton, is_pattern ? nullptr : Py_NewRef(text_obj));
+    self->time_zone = time_zone;
+    return true;
+}
+
+int DateFormatter_init(DateFormatterObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* skeleton_obj;
+    PyObject* locale_obj;
+    PyObject* time_zone_obj = Py_None;
+
+    static const char* kwlist[] = {"skeleton", "locale", "time_zone", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "UO|O", const_cast<char**>(kwlist),
+                                     &skeleton_obj, &locale_obj, &time_zone_obj)) {
+        return -1;
+    }
+
+    ModuleState* mod_state = type_module_state(Py_TYPE(self));
+    if (mod_state == nullptr) {
+        return -1;
+    }
+    if (!init_formatter(self, mod_state, skeleton_obj, false, locale_obj, time_zone_obj)) {
+        return -1;
+    }
+    return 0;
+}
+
+PyObject* DateFormatter_from_pattern(PyObject* cls,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    static const char* const kwlist[] = {"pattern", "locale", "time_zone"};
+    PyObject* values[3] = {nullptr, nullptr, Py_None};
+
+    if (nargs > 3) {
+        PyErr_Format(PyExc_TypeError, "from_pattern() takes at most 3 arguments (%zd given)",
+                     nargs);
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < nargs; ++i) {
+        values[i] = args[i];
+    }
+    Py_ssize_t nkwargs = kwnames != nullptr ? PyTuple_GET_SIZE(kwnames) : 0;
+    for (Py_ssize_t i = 0; i < nkwargs; ++i) {
+        PyObject* name = PyTuple_GET_ITEM(kwnames, i);
+        Py_ssize_t position = -1;
+        for (Py_ssize_t j = 0; j < 3; ++j) {
+            if (PyUnicode_CompareWithASCIIString(name, kwlist[j]) == 0) {
+                position = j;
+                break;
+            }
+        }
+        if (position == -1) {
+            PyErr_Format(PyExc_TypeError,
+                         "from_pattern() got an unexpected keyword argument %R", name);
+            return nullptr;
+        }
+        if (position < nargs) {
+            PyErr_Format(PyExc_TypeError,
+                         "from_pattern() got multiple values for argument %R", name);
+            return nullptr;
+        }
+        values[position] = args[nargs + i];
+    }
+    if (values[0] == nullptr || values[1] == nullptr) {
+        PyErr_SetString(PyExc_TypeError,
+                        "from_pattern() missing required argument 'pattern' or 'locale'");
+        return nullptr;
+    }
+    if (!PyUnicode_Check(values[0])) {
+        PyErr_Format(PyExc_TypeError, "pattern must be a string, not %.200s",
+                     Py_TYPE(values[0])->tp_name);
+        return nullptr;
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    // Subclasses are created without calling their __init__(), as it
+    // takes a skeleton.
+    auto* type = reinterpret_cast<PyTypeObject*>(cls);
+    PyObject* self = type->tp_alloc(type, 0);
+    if (self == nullptr) {
+        return nullptr;
+    }
+    if (!init_formatter(reinterpret_cast<DateFormatterObject*>(self), mod_state, values[0], true,
+                        values[1], values[2])) {
+        Py_DECREF(self);
+        return nullptr;
+    }
+    return self;
+}
+
+bool check_initialized(DateFormatterObject* self) {
+    if (self->format == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "DateFormatter is not initialized");
+        return false;
+    }
+    return true;
+}
+
+// The time zone a formatter formats in, and interprets naive values in.
+const BasicTimeZone* formatter_time_zone(DateFormatterObject* self, ModuleState* mod_state) {
+    return self->time_zone != nullptr ? self->time_zone : mod_state->default_time_zone;
+}
+
+// Convert a datetime, date, or time to a UDate. Naive values are
+// interpreted in time_zone.
+bool value_to_udate(ModuleState* mod_state, const BasicTimeZone* time_zone, PyObject* obj,
+                    UDate& udate) {
+    if (PyDateTime_Check(obj)) {
+        return datetime_to_udate(obj, mod_state->str_utcoffset, time_zone, udate);
+    }
+    if (PyDate_Check(obj)) {
+        return date_to_udate(obj, time_zone, udate);
+    }
+    if (PyTime_Check(obj)) {
+        return time_to_udate(obj, mod_state->str_utcoffset, time_zone, udate);
+    }
+    PyErr_Format(PyExc_TypeError, "Values must be datetime, date, or time, got %R", obj);
+    return false;
+}
+
+// Format udate with calendar, a clone of the format's calendar, so the
+// shared format isn't modified.
+bool format_udate(const SimpleDateFormat& format, Calendar& calendar, UDate udate,
+                  UnicodeString& result, std::string& utf8) {
+    UErrorCode status = U_ZERO_ERROR;
+    calendar.setTime(udate, status);
+    if (U_FAILURE(status)) {
+        return false;
+    }
+    FieldPosition position(FieldPosition::DONT_CARE);
+    result.remove();
+    format.format(calendar, result, position);
+    utf8.clear();
+    result.toUTF8String(utf8);
+    return true;
+}
+
+std::unique_ptr<Calendar> clone_calendar(const SimpleDateFormat& format) {
+    std::unique_ptr<Calendar> calendar(format.getCalendar()->clone());
+    if (calendar == nullptr) {
+        PyErr_NoMemory();
+    }
+    return calendar;
+}
+
+PyObject* DateFormatter_format(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "format() takes exactly 1 argument");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<DateFormatterObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    UDate udate;
+    if (!value_to_udate(mod_state, formatter_time_zone(self_obj, mod_state), args[0], udate)) {
+        return nullptr;
+    }
+    const SimpleDateFormat& format = **self_obj->format;
+    std::unique_ptr<Calendar> calendar = clone_calendar(format);
+    if (calendar == nullptr) {
+        return nullptr;
+    }
+    UnicodeString result;
+    std::string utf8;
+    if (!format_udate(format, *calendar, udate, result, utf8)) {
+        PyErr_Format(PyExc_ValueError, "Date out of range: %R", args[0]);
+        return nullptr;
+    }
+    return PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+}
+
+// Read a NumPy datetime64 array's int64 view. Returns 1 with view filled
+// and scale set to milliseconds per unit, 0 if obj isn't a datetime64
+// array, or -1 on error.
+int open_datetime64_array(PyObject* obj, Py_buffer* view, double& scale) {
+    PyObject* dtype = PyObject_GetAttrString(obj, "dtype");
+    if (dtype == nullptr) {
+        if (PyErr_ExceptionMatches(PyExc_AttributeError)) {
+            PyErr_Clear();
+            return 0;
+        }
+        return -1;
+    }
+    PyObject* dtype_kind = PyObject_GetAttrString(dtype, "kind");
+    if (dtype_kind == nullptr) {
+        Py_DECREF(dtype);
+        return -1;
+    }
+    int is_datetime = PyUnicode_Check(dtype_kind) &&
+                      PyUnicode_CompareWithASCIIString(dtype_kind, "M") == 0;
+    Py_DECREF(dtype_kind);
+    if (!is_datetime) {
+        Py_DECREF(dtype);
+        return 0;
+    }
+
+    PyObject* dtype_str = PyObject_GetAttrString(dtype, "str");
+    Py_DECREF(dtype);
+    if (dtype_str == nullptr) {
+        return -1;
+    }
+    const char* dtype_chars = PyUnicode_AsUTF8(dtype_str);
+    if (dtype_chars == nullptr) {
+        Py_DECREF(dtype_str);
+        return -1;
+    }
+    scale = datetime64_scale(dtype_chars);
+    if (scale == 0.0) {
+        PyErr_Format(PyExc_ValueError, "Unsupported datetime64 unit in dtype '%s'", dtype_chars);
+        Py_DECREF(dtype_str);
+        return -1;
+    }
+    Py_DECREF(dtype_str);
+
+    PyObject* int_view = PyObject_CallMethod(obj, "view", "s", "i8");
+    if (int_view == nullptr) {
+        return -1;
+    }
+    int result = PyObject_GetBuffer(int_view, view, PyBUF_STRIDED_RO | PyBUF_FORMAT);
+    Py_DECREF(int_view);
+    if (result < 0) {
+        return -1;
+    }
+
+    const char* format = view->format != nullptr ? view->format : "B";
+    if (*format != '\0' && std::strchr("@=<>!", *format) != nullptr) {
+        if (!is_native_byte_order(*format)) {
+            format = "";
+        } else {
+            ++format;
+        }
+    }
+    if (view->ndim != 1 || numeric_buffer_kind(format, view->itemsize) != 'i' ||
+        view->itemsize != 8) {
+        PyErr_SetString(PyExc_ValueError,
+                        "datetime64 array must be 1-dimensional and view as native int64");
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 1;
+}
+
+// Format a datetime64 array, releasing the GIL while ICU formats it.
+PyObject* format_datetime64(DateFormatterObject* self, Py_buffer* view, double scale) {
+    Py_ssize_t count = view->shape[0];
+    std::vector<std::string> formatted(count);
+    // A reference, so the format outlives a concurrent __init__() while the
+    // GIL is released.
+    std::shared_ptr<const SimpleDateFormat> shared_format = *self->format;
+    const SimpleDateFormat& format = *shared_format;
+    std::unique_ptr<Calendar> calendar = clone_calendar(format);
+    if (calendar == nullptr) {
+        PyBuffer_Release(view);
+        return nullptr;
+    }
+
+    // The index of the first item that couldn't be formatted, and whether
+    // it was NaT rather than out of range.
+    Py_ssize_t failed_index = -1;
+    bool failed_nat = false;
+
+    Py_BEGIN_ALLOW_THREADS
+    UnicodeString result;
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        const char* ptr = static_cast<const char*>(view->buf) + i * view->strides[0];
+        int64_t value = read_buffer_int(ptr, 8);
+        if (value == kDatetime64NaT) {
+            failed_index = i;
+            failed_nat = true;
+            break;
+        }
+        UDate udate = static_cast<double>(value) * scale;
+        if (!format_udate(format, *calendar, udate, result, formatted[i])) {
+            failed_index = i;
+            break;
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(view);
+    if (failed_index != -1) {
+        PyErr_Format(PyExc_ValueError, failed_nat ? "Cannot format NaT at index %zd"
+                                                  : "Date out of range at index %zd",
+                     failed_index);
+        return nullptr;
+    }
+
+    PyObject* results = PyList_New(count);
+    if (results == nullptr) {
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* str_obj = PyUnicode_FromStringAndSize(formatted[i].data(), formatted[i].size());
+        if (str_obj == nullptr) {
+            Py_DECREF(results);
+            return nullptr;
+        }
+        PyList_SET_ITEM(results, i, str_obj);
+    }
+    return results;
+}
+
+PyObject* DateFormatter_format_many(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "format_many() takes exactly 1 argument");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<DateFormatterObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* values = args[0];
+    if (PyUnicode_Check(values) || PyBytes_Check(values) || PyByteArray_Check(values)) {
+        PyErr_Format(PyExc_TypeError,
+                     "values must be an iterable or datetime64 array, not %.200s",
+                     Py_TYPE(values)->tp_name);
+        return nullptr;
+    }
+    if (PyObject_CheckBuffer(values)) {
+        Py_buffer view;
+        double scale;
+        int is_datetime64 = open_datetime64_array(values, &view, scale);
+        if (is_datetime64 < 0) {
+            return nullptr;
+        }
+        if (is_datetime64 == 1) {
+            return format_datetime64(self_obj, &view, scale);
+        }
+    }
+
+    PyObject* iterator = PyObject_GetIter(values);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+    PyObject* results = PyList_New(0);
+    if (results == nullptr) {
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    // The iterator can run Python code that reinitializes the object.
+    std::shared_ptr<const SimpleDateFormat> shared_format = *self_obj->format;
+    const SimpleDateFormat& format = *shared_format;
+    const BasicTimeZone* time_zone = formatter_time_zone(self_obj, mod_state);
+    std::unique_ptr<Calendar> calendar = clone_calendar(format);
+    if (calendar == nullptr) {
+        Py_DECREF(iterator);
+        Py_DECREF(results);
+        return nullptr;
+    }
+    // Shared across iterations, so their allocations get reused.
+    UnicodeString result;
+    std::string utf8;
+
+    PyObject* value;
+    while ((value = PyIter_Next(iterator)) != nullptr) {
+        UDate udate;
+        bool ok = value_to_udate(mod_state, time_zone, value, udate);
+        if (ok && !format_udate(format, *calendar, udate, result, utf8)) {
+            PyErr_Format(PyExc_ValueError, "Date out of range: %R", value);
+            ok = false;
+        }
+        Py_DECREF(value);
+        if (!ok) {
+            break;
+        }
+        PyObject* str_obj = PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+        if (str_obj == nullptr) {
+            break;
+        }
+        int append_result = PyList_Append(results, str_obj);
+        Py_DECREF(str_obj);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+PyObject* DateFormatter_get_skeleton(DateFormatterObject* self, void* closure) {
+    if (self->skeleton == nullptr) {
+        Py_RETURN_NONE;
+    }
+    return Py_NewRef(self->skeleton);
+}
+
+PyObject* DateFormatter_get_pattern(DateFormatterObject* self, void* closure) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return Py_NewRef(self->pattern);
+}
+
+PyObject* DateFormatter_get_locale(DateFormatterObject* self, void* closure) {
+    ModuleState* mod_state = type_module_state(Py_TYPE(self));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+
+    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+    icu4py::set_locale(locale_obj, *self->locale);
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* DateFormatter_get_time_zone(DateFormatterObject* self, void* closure) {
+    if (self->time_zone == nullptr) {
+        Py_RETURN_NONE;
+    }
+    std::string id = time_zone_id(self->time_zone);
+    return PyUnicode_FromStringAndSize(id.data(), id.size());
+}
+
+PyObject* DateFormatter_repr(DateFormatterObject* self) {
+    if (self->format == nullptr) {
+        return PyUnicode_FromFormat("<%s uninitialized>", Py_TYPE(self)->tp_name);
+    }
+    std::string time_zone_arg;
+    if (self->time_zone != nullptr) {
+        time_zone_arg = ", time_zone='" + time_zone_id(self->time_zone) + "'";
+    }
+    if (self->skeleton == nullptr) {
+        return PyUnicode_FromFormat("DateFormatter.from_pattern(%R, Locale('%s')%s)",
+                                    self->pattern, self->locale->getName(),
+                                    time_zone_arg.c_str());
+    }
+    return PyUnicode_FromFormat("DateFormatter(%R, Locale('%s')%s)", self->skeleton,
+                                self->locale->getName(), time_zone_arg.c_str());
+}
+
+PyObject* DateFormatter_reduce(DateFormatterObject* self, PyObject* Py_UNUSED(ignored)) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    PyObject* time_zone = DateFormatter_get_time_zone(self, nullptr);
+    if (time_zone == nullptr) {
+        return nullptr;
+    }
+    PyObject* result;
+    if (self->skeleton == nullptr) {
+        ModuleState* mod_state = type_module_state(Py_TYPE(self));
+        if (mod_state == nullptr) {
+            Py_DECREF(time_zone);
+            return nullptr;
+        }
+        PyObject* from_pattern =
+            PyObject_GetAttr(reinterpret_cast<PyObject*>(Py_TYPE(self)), mod_state->str_from_pattern);
+        if (from_pattern == nullptr) {
+            Py_DECREF(time_zone);
+            return nullptr;
+        }
+        result = Py_BuildValue("(N(OsO))", from_pattern, self->pattern, self->locale->getName(),
+                               time_zone);
+    } else {
+        result = Py_BuildValue("(O(OsO))", Py_TYPE(self), self->skeleton, self->locale->getName(),
+                               time_zone);
+    }
+    Py_DECREF(time_zone);
+    return result;
+}
+
+PyMethodDef DateFormatter_methods[] = {
+    {"from_pattern", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(DateFormatter_from_pattern)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS | METH_CLASS,
+     "Create a DateFormatter from a date pattern"},
+    {"format", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(DateFormatter_format)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format a datetime, date, or time"},
+    {"format_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(DateFormatter_format_many)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format each value in an iterable or datetime64 array"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(DateFormatter_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef DateFormatter_getsetters[] = {
+    {const_cast<char*>("skeleton"), reinterpret_cast<getter>(DateFormatter_get_skeleton), nullptr,
+     const_cast<char*>("The date skeleton, or None for formatters created from a pattern"),
+     nullptr},
+    {const_cast<char*>("pattern"), reinterpret_cast<getter>(DateFormatter_get_pattern), nullptr,
+     const_cast<char*>("The date pattern"), nullptr},
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(DateFormatter_get_locale), nullptr,
+     const_cast<char*>("The locale dates are formatted for"), nullptr},
+    {const_cast<char*>("time_zone"), reinterpret_cast<getter>(DateFormatter_get_time_zone),
+     nullptr, const_cast<char*>("The time zone ID, or None for ICU's default time zone"),
+     nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot DateFormatter_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU SimpleDateFormat")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(DateFormatter_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(DateFormatter_init)},
+    {Py_tp_new, reinterpret_cast<void*>(DateFormatter_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(DateFormatter_repr)},
+    {Py_tp_methods, DateFormatter_methods},
+    {Py_tp_getset, DateFormatter_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec DateFormatter_spec = {
+    "icu4py.datetime.DateFormatter",
+    sizeof(DateFormatterObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    DateFormatter_slots
+};
+
+PyMethodDef icu4py_datetime_module_methods[] = {
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_datetime_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_datetime_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef datetimemodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.datetime",
+    "",
+    sizeof(ModuleState),
+    icu4py_datetime_module_methods,
+    icu4py_datetime_slots,
+    icu4py_datetime_traverse,
+    icu4py_datetime_clear,
+    icu4py_datetime_free,
+};
+
+int icu4py_datetime_exec(PyObject* m) {
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &DateFormatter_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "DateFormatter", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+
+    PyDateTime_IMPORT;
+    if (PyDateTimeAPI == nullptr) {
+        return -1;
+    }
+
+    ModuleState* state = get_module_state(m);
+    state->time_zones = new TimeZoneRegistry();
+    state->format_cache = new FormatCache(kMaxCachedFormats);
+    state->generator_cache = new GeneratorCache();
+
+    state->str_utcoffset = PyUnicode_InternFromString("utcoffset");
+    if (state->str_utcoffset == nullptr) {
+        return -1;
+    }
+    state->str_key = PyUnicode_InternFromString("key");
+    if (state->str_key == nullptr) {
+        return -1;
+    }
+    state->str_from_pattern = PyUnicode_InternFromString("from_pattern");
+    if (state->str_from_pattern == nullptr) {
+        return -1;
+    }
+
+    PyObject* zoneinfo_module = PyImport_ImportModule("zoneinfo");
+    if (zoneinfo_module == nullptr) {
+        return -1;
+    }
+    state->zoneinfo_type = PyObject_GetAttrString(zoneinfo_module, "ZoneInfo");
+    Py_DECREF(zoneinfo_module);
+    if (state->zoneinfo_type == nullptr) {
+        return -1;
+    }
+
+    TimeZone* default_time_zone = TimeZone::createDefault();
+    state->default_time_zone = dynamic_cast<BasicTimeZone*>(default_time_zone);
+    if (state->default_time_zone == nullptr) {
+        delete default_time_zone;
+        PyErr_SetString(PyExc_RuntimeError, "Failed to load ICU's default time zone");
+        return -1;
+    }
+
+    PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
+    if (locale_module == nullptr) {
+        return -1;
+    }
+    state->locale_type = PyObject_GetAttrString(locale_module, "Locale");
+    Py_DECREF(locale_module);
+    if (state->locale_type == nullptr) {
+        return -1;
+    }
+
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_datetime_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    Py_VISIT(state->zoneinfo_type);
+    return 0;
+}
+
+int icu4py_datetime_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    Py_CLEAR(state->str_utcoffset);
+    Py_CLEAR(state->str_key);
+    Py_CLEAR(state->str_from_pattern);
+    Py_CLEAR(state->zoneinfo_type);
+    return 0;
+}
+
+void icu4py_datetime_free(void* m) {
+    icu4py_datetime_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->default_time_zone;
+    state->default_time_zone = nullptr;
+    delete state->format_cache;
+    state->format_cache = nullptr;
+    delete state->generator_cache;
+    state->generator_cache = nullptr;
+    delete state->time_zones;
+    state->time_zones = nullptr;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_datetime() {
+    return PyModuleDef_Init(&datetimemodule);
+}
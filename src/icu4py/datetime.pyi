@@ -0,0 +1,35 @@
+from collections.abc import Iterable
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from typing_extensions import Buffer, Self, disjoint_base
+
+from icu4py.locale import Locale
+
+@disjoint_base
+class DateFormatter:
+    def __init__(
+        self,
+        skeleton: str,
+        locale: str | Locale,
+        time_zone: str | ZoneInfo | None = None,
+    ) -> None: ...
+    @classmethod
+    def from_pattern(
+        cls,
+        pattern: str,
+        locale: str | Locale,
+        time_zone: str | ZoneInfo | None = None,
+    ) -> Self: ...
+    @property
+    def skeleton(self) -> str | None: ...
+    @property
+    def pattern(self) -> str: ...
+    @property
+    def locale(self) -> Locale: ...
+    @property
+    def time_zone(self) -> str | None: ...
+    def format(self, value: datetime | date | time, /) -> str: ...
+    def format_many(
+        self, values: Iterable[datetime | date | time] | Buffer, /
+    ) -> list[str]: ...
@@ -0,0 +1,274 @@
+#ifndef ICU4PY_DATETIME_CONVERSION_H
+#define ICU4PY_DATETIME_CONVERSION_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <datetime.h>
+#include <unicode/basictz.h>
+#include <unicode/stringpiece.h>
+#include <unicode/timezone.h>
+#include <unicode/unistr.h>
+#include <unicode/utypes.h>
+
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+
+// Conversion of Python dates and times to ICU UDates, and resolution of
+// time zone arguments, shared by the modules that format dates. Modules
+// including this must call PyDateTime_IMPORT in their exec function.
+
+namespace icu4py {
+
+constexpr double kMillisPerDay = 86400000.0;
+
+// ICU time zones by ID, created on first use and kept for the module's
+// lifetime, so objects and calls can borrow them.
+struct TimeZoneRegistry {
+    std::mutex mutex;
+    std::unordered_map<std::string, std::unique_ptr<icu::BasicTimeZone>> zones;
+};
+
+// Resolve a time zone argument, an IANA time zone name or a ZoneInfo
+// object, to a zone from the registry. None resolves to nullptr, for the
+// caller's default time zone. zoneinfo_type is zoneinfo.ZoneInfo, and
+// str_key the interned string "key".
+inline bool lookup_time_zone(TimeZoneRegistry* registry, PyObject* zoneinfo_type,
+                             PyObject* str_key, PyObject* obj,
+                             const icu::BasicTimeZone** time_zone) {
+    *time_zone = nullptr;
+    if (obj == Py_None) {
+        return true;
+    }
+
+    PyObject* name_obj;
+    if (PyUnicode_Check(obj)) {
+        name_obj = Py_NewRef(obj);
+    } else {
+        int is_zoneinfo = PyObject_IsInstance(obj, zoneinfo_type);
+        if (is_zoneinfo == -1) {
+            return false;
+        }
+        if (is_zoneinfo == 0) {
+            PyErr_Format(PyExc_TypeError, "time_zone must be a string or ZoneInfo object, not %.200s",
+                         Py_TYPE(obj)->tp_name);
+            return false;
+        }
+        name_obj = PyObject_GetAttr(obj, str_key);
+        if (name_obj == nullptr) {
+            return false;
+        }
+        if (!PyUnicode_Check(name_obj)) {
+            PyErr_Format(PyExc_ValueError, "ZoneInfo object %R has no key", obj);
+            Py_DECREF(name_obj);
+            return false;
+        }
+    }
+
+    Py_ssize_t name_len;
+    const char* name = PyUnicode_AsUTF8AndSize(name_obj, &name_len);
+    if (name == nullptr) {
+        Py_DECREF(name_obj);
+        return false;
+    }
+    std::string id(name, name_len);
+
+    {
+        std::lock_guard<std::mutex> lock(registry->mutex);
+        auto it = registry->zones.find(id);
+        if (it != registry->zones.end()) {
+            *time_zone = it->second.get();
+        }
+    }
+    if (*time_zone != nullptr) {
+        Py_DECREF(name_obj);
+        return true;
+    }
+
+    // ICU returns the "Etc/Unknown" zone for IDs it doesn't know.
+    std::unique_ptr<icu::TimeZone> zone(
+        icu::TimeZone::createTimeZone(icu::UnicodeString::fromUTF8(icu::StringPiece(name, name_len))));
+    if (zone == nullptr || *zone == icu::TimeZone::getUnknown()) {
+        PyErr_Format(PyExc_ValueError, "Unknown time zone: %R", name_obj);
+        Py_DECREF(name_obj);
+        return false;
+    }
+    Py_DECREF(name_obj);
+    auto* basic_zone = dynamic_cast<icu::BasicTimeZone*>(zone.get());
+    if (basic_zone == nullptr) {
+        PyErr_Format(PyExc_ValueError, "Unsupported time zone: %s", id.c_str());
+        return false;
+    }
+    zone.release();
+
+    std::lock_guard<std::mutex> lock(registry->mutex);
+    auto inserted =
+        registry->zones.emplace(std::move(id), std::unique_ptr<icu::BasicTimeZone>(basic_zone));
+    *time_zone = inserted.first->second.get();
+    return true;
+}
+
+// Days since 1970-01-01 in the proleptic Gregorian calendar, per Howard
+// Hinnant's days_from_civil algorithm.
+inline int64_t days_from_civil(int64_t year, int64_t month, int64_t day) {
+    year -= month <= 2;
+    const int64_t era = (year >= 0 ? year : year - 399) / 400;
+    const int64_t year_of_era = year - era * 400;
+    const int64_t day_of_year = (153 * (month > 2 ? month - 3 : month + 9) + 2) / 5 + day - 1;
+    const int64_t day_of_era = year_of_era * 365 + year_of_era / 4 - year_of_era / 100 + day_of_year;
+    return era * 146097 + day_of_era - 719468;
+}
+
+inline double timedelta_to_millis(PyObject* delta) {
+    return PyDateTime_DELTA_GET_DAYS(delta) * kMillisPerDay +
+           PyDateTime_DELTA_GET_SECONDS(delta) * 1000.0 +
+           PyDateTime_DELTA_GET_MICROSECONDS(delta) / 1000.0;
+}
+
+// Convert a naive wall time, in milliseconds since the epoch as if it were
+// UTC, to a UDate in the given time zone. As with Python, fold selects the
+// later of two ambiguous times.
+inline bool local_wall_time_to_udate(double wall_ms, int fold, const icu::BasicTimeZone* time_zone,
+                                     UDate& udate) {
+    UErrorCode status = U_ZERO_ERROR;
+    int32_t raw_offset = 0;
+    int32_t dst_offset = 0;
+    UTimeZoneLocalOption option = fold ? UCAL_TZ_LOCAL_LATTER : UCAL_TZ_LOCAL_FORMER;
+    time_zone->getOffsetFromLocal(wall_ms, option, option, raw_offset, dst_offset, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to resolve local time: %s", u_errorName(status));
+        return false;
+    }
+    udate = wall_ms - raw_offset - dst_offset;
+    return true;
+}
+
+// Resolve the wall time of an aware datetime or time to a UDate, using its
+// utcoffset(). Sets is_aware to false for naive values. str_utcoffset is
+// the interned string "utcoffset".
+inline bool aware_wall_time_to_udate(PyObject* obj, PyObject* tzinfo, double wall_ms,
+                                     PyObject* str_utcoffset, UDate& udate, bool& is_aware) {
+    is_aware = false;
+    if (tzinfo == Py_None) {
+        return true;
+    }
+    if (tzinfo == PyDateTime_TimeZone_UTC) {
+        is_aware = true;
+        udate = wall_ms;
+        return true;
+    }
+
+    PyObject* offset = PyObject_CallMethodNoArgs(obj, str_utcoffset);
+    if (offset == nullptr) {
+        return false;
+    }
+    if (offset == Py_None) {
+        Py_DECREF(offset);
+        return true;
+    }
+    if (!PyDelta_Check(offset)) {
+        PyErr_Format(PyExc_TypeError, "utcoffset() must return a timedelta, not %.200s",
+                     Py_TYPE(offset)->tp_name);
+        Py_DECREF(offset);
+        return false;
+    }
+    is_aware = true;
+    udate = wall_ms - timedelta_to_millis(offset);
+    Py_DECREF(offset);
+    return true;
+}
+
+// Naive datetimes are interpreted in time_zone.
+inline bool datetime_to_udate(PyObject* obj, PyObject* str_utcoffset,
+                              const icu::BasicTimeZone* time_zone, UDate& udate) {
+    double wall_ms =
+        days_from_civil(PyDateTime_GET_YEAR(obj), PyDateTime_GET_MONTH(obj),
+                        PyDateTime_GET_DAY(obj)) * kMillisPerDay +
+        PyDateTime_DATE_GET_HOUR(obj) * 3600000.0 + PyDateTime_DATE_GET_MINUTE(obj) * 60000.0 +
+        PyDateTime_DATE_GET_SECOND(obj) * 1000.0 + PyDateTime_DATE_GET_MICROSECOND(obj) / 1000.0;
+
+    bool is_aware;
+    if (!aware_wall_time_to_udate(obj, PyDateTime_DATE_GET_TZINFO(obj), wall_ms, str_utcoffset,
+                                  udate, is_aware)) {
+        return false;
+    }
+    return is_aware ||
+           local_wall_time_to_udate(wall_ms, PyDateTime_DATE_GET_FOLD(obj), time_zone, udate);
+}
+
+// Times are converted as that time on 1970-01-01.
+inline bool time_to_udate(PyObject* obj, PyObject* str_utcoffset,
+                          const icu::BasicTimeZone* time_zone, UDate& udate) {
+    double wall_ms =
+        PyDateTime_TIME_GET_HOUR(obj) * 3600000.0 + PyDateTime_TIME_GET_MINUTE(obj) * 60000.0 +
+        PyDateTime_TIME_GET_SECOND(obj) * 1000.0 + PyDateTime_TIME_GET_MICROSECOND(obj) / 1000.0;
+
+    bool is_aware;
+    if (!aware_wall_time_to_udate(obj, PyDateTime_TIME_GET_TZINFO(obj), wall_ms, str_utcoffset,
+                                  udate, is_aware)) {
+        return false;
+    }
+    return is_aware ||
+           local_wall_time_to_udate(wall_ms, PyDateTime_TIME_GET_FOLD(obj), time_zone, udate);
+}
+
+// Dates are converted as midnight in time_zone.
+inline bool date_to_udate(PyObject* obj, const icu::BasicTimeZone* time_zone, UDate& udate) {
+    double wall_ms = days_from_civil(PyDateTime_GET_YEAR(obj), PyDateTime_GET_MONTH(obj),
+                                     PyDateTime_GET_DAY(obj)) * kMillisPerDay;
+    return local_wall_time_to_udate(wall_ms, 0, time_zone, udate);
+}
+
+// Parse a NumPy datetime64 dtype string like "<M8[ms]" into milliseconds
+// per unit. Returns 0 for unsupported units.
+inline double datetime64_scale(const char* dtype_str) {
+    const char* open = std::strchr(dtype_str, '[');
+    if (open == nullptr) {
+        return 0.0;
+    }
+    const char* pos = open + 1;
+    long long multiplier = 0;
+    while (*pos >= '0' && *pos <= '9') {
+        multiplier = multiplier * 10 + (*pos - '0');
+        ++pos;
+    }
+    if (multiplier == 0) {
+        multiplier = 1;
+    }
+    const char* close = std::strchr(pos, ']');
+    if (close == nullptr) {
+        return 0.0;
+    }
+    std::string unit(pos, close - pos);
+    double scale;
+    if (unit == "W") {
+        scale = 7 * kMillisPerDay;
+    } else if (unit == "D") {
+        scale = kMillisPerDay;
+    } else if (unit == "h") {
+        scale = 3600000.0;
+    } else if (unit == "m") {
+        scale = 60000.0;
+    } else if (unit == "s") {
+        scale = 1000.0;
+    } else if (unit == "ms") {
+        scale = 1.0;
+    } else if (unit == "us") {
+        scale = 1e-3;
+    } else if (unit == "ns") {
+        scale = 1e-6;
+    } else {
+        return 0.0;
+    }
+    return scale * static_cast<double>(multiplier);
+}
+
+// The NaT ("not a time") value of NumPy datetime64 arrays.
+constexpr int64_t kDatetime64NaT = INT64_MIN;
+
+}  // namespace icu4py
+
+#endif  // ICU4PY_DATETIME_CONVERSION_H
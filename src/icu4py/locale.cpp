@@ -1,6 +1,8 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <string>
+#include <memory>
+#include <unicode/localematcher.h>
 #include <unicode/locid.h>
 #include <unicode/strenum.h>
 #include "locale_types.h"
@@ -8,10 +10,32 @@
 namespace {
 
 using icu::Locale;
+using icu::StringPiece;
 using icu4py::LocaleObject;
 
+struct ModuleState {
+    PyObject* locale_type;
+    // Locales created by Locale.get(), keyed by the string they were
+    // created from, oldest first.
+    PyObject* locale_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+constexpr Py_ssize_t kMaxCachedLocales = 256;
+
+int icu4py_locale_exec(PyObject* m);
+int icu4py_locale_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_locale_clear(PyObject* m);
+
+extern PyModuleDef localemodule;
+
 void Locale_dealloc(LocaleObject* self) {
     delete self->locale;
+    delete self->canonical_name;
     Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
 }
 
@@ -19,11 +43,20 @@ PyObject* Locale_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
     auto* self = reinterpret_cast<LocaleObject*>(type->tp_alloc(type, 0));
     if (self != nullptr) {
         self->locale = nullptr;
+        self->canonical_name = nullptr;
+        self->hash = 0;
     }
     return reinterpret_cast<PyObject*>(self);
 }
 
 int Locale_init(LocaleObject* self, PyObject* args, PyObject* kwds) {
+    // Locales are hashable and shared through Locale.get(), so they
+    // must not change once created.
+    if (self->locale != nullptr) {
+        PyErr_SetString(PyExc_TypeError, "Locale objects cannot be reinitialized");
+        return -1;
+    }
+
     const char* language = nullptr;
     const char* country = nullptr;
     const char* variant = nullptr;
@@ -99,7 +132,7 @@ int Locale_init(LocaleObject* self, PyObject* args, PyObject* kwds) {
         }
     }
 
-    self->locale = new Locale(language, country, variant, keywords_and_values);
+    icu4py::set_locale(self, Locale(language, country, variant, keywords_and_values));
 
     return 0;
 }
@@ -196,6 +229,243 @@ PyObject* Locale_repr(LocaleObject* self) {
     return PyUnicode_FromFormat("Locale('%s')", name);
 }
 
+// Locales are equal when their canonical names are, so equivalent
+// locales created in different ways, such as Locale("en_GB") and
+// Locale("en", "GB"), or Locale("iw") and Locale("he"), compare and
+// hash alike.
+PyObject* Locale_richcompare(PyObject* self, PyObject* other, int op) {
+    if (op != Py_EQ && op != Py_NE) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &localemodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &localemodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+    int is_locale = PyObject_IsInstance(other, mod_state->locale_type);
+    if (is_locale == -1) {
+        return nullptr;
+    }
+    if (is_locale == 0) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    const auto* locale_obj = reinterpret_cast<LocaleObject*>(self);
+    const auto* other_locale_obj = reinterpret_cast<LocaleObject*>(other);
+    bool equal;
+    if (locale_obj->canonical_name == nullptr || other_locale_obj->canonical_name == nullptr) {
+        equal = self == other;
+    } else {
+        equal = locale_obj->hash == other_locale_obj->hash
+            && *locale_obj->canonical_name == *other_locale_obj->canonical_name;
+    }
+    return PyBool_FromLong(equal == (op == Py_EQ));
+}
+
+Py_hash_t Locale_hash(LocaleObject* self) {
+    if (self->canonical_name == nullptr) {
+        return 0;
+    }
+    return self->hash;
+}
+
+// PyDict_GetItemRef() for Python versions before 3.13.
+int dict_get_item_ref(PyObject* dict, PyObject* key, PyObject** result) {
+#if PY_VERSION_HEX >= 0x030D0000
+    return PyDict_GetItemRef(dict, key, result);
+#else
+    PyObject* item = PyDict_GetItemWithError(dict, key);
+    if (item == nullptr) {
+        *result = nullptr;
+        return PyErr_Occurred() ? -1 : 0;
+    }
+    Py_INCREF(item);
+    *result = item;
+    return 1;
+#endif
+}
+
+// Store value in a bounded cache dict, evicting the oldest entry when
+// full, like the re module's cache. Returns a new reference to the cached
+// value, which is another thread's if it stored one first.
+PyObject* store_in_cache(PyObject* cache, PyObject* key, PyObject* value, Py_ssize_t max_size) {
+    PyObject* result = nullptr;
+    int status = 0;
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(cache);
+#endif
+    if (PyDict_GET_SIZE(cache) >= max_size) {
+        Py_ssize_t pos = 0;
+        PyObject* oldest;
+        if (PyDict_Next(cache, &pos, &oldest, nullptr)) {
+            Py_INCREF(oldest);
+            status = PyDict_DelItem(cache, oldest);
+            Py_DECREF(oldest);
+        }
+    }
+    if (status == 0) {
+        result = PyDict_SetDefault(cache, key, value);
+        Py_XINCREF(result);
+    }
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+    return result;
+}
+
+// Return a shared Locale for a locale string, creating and caching it if
+// needed.
+PyObject* get_cached_locale(ModuleState* mod_state, PyObject* name) {
+    PyObject* locale_obj;
+    int found = dict_get_item_ref(mod_state->locale_cache, name, &locale_obj);
+    if (found != 0) {
+        return found < 0 ? nullptr : locale_obj;
+    }
+
+    PyObject* new_locale = PyObject_CallOneArg(mod_state->locale_type, name);
+    if (new_locale == nullptr) {
+        return nullptr;
+    }
+    locale_obj = store_in_cache(mod_state->locale_cache, name, new_locale, kMaxCachedLocales);
+    Py_DECREF(new_locale);
+    return locale_obj;
+}
+
+// Return a shared Locale for a locale string, so repeated lookups skip
+// parsing it. Subclasses get a new, uncached object each time.
+PyObject* Locale_get(PyObject* cls,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "get() takes exactly 1 argument");
+        return nullptr;
+    }
+    PyObject* name = args[0];
+    if (!PyUnicode_Check(name)) {
+        PyErr_Format(PyExc_TypeError, "name must be a string, not %.200s",
+                     Py_TYPE(name)->tp_name);
+        return nullptr;
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+    if (cls != mod_state->locale_type) {
+        return PyObject_CallOneArg(cls, name);
+    }
+    return get_cached_locale(mod_state, name);
+}
+
+// Create a locale object of the given type for an ICU locale, without
+// calling __init__().
+PyObject* new_locale_object(PyTypeObject* type, const Locale& locale) {
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(type->tp_alloc(type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+    icu4py::set_locale(locale_obj, locale);
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* Locale_from_bcp47(PyObject* cls,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "from_bcp47() takes exactly 1 argument");
+        return nullptr;
+    }
+    PyObject* tag_obj = args[0];
+    if (!PyUnicode_Check(tag_obj)) {
+        PyErr_Format(PyExc_TypeError, "tag must be a string, not %.200s",
+                     Py_TYPE(tag_obj)->tp_name);
+        return nullptr;
+    }
+    Py_ssize_t tag_len;
+    const char* tag = PyUnicode_AsUTF8AndSize(tag_obj, &tag_len);
+    if (tag == nullptr) {
+        return nullptr;
+    }
+
+    UErrorCode status = U_ZERO_ERROR;
+    Locale locale = Locale::forLanguageTag(StringPiece(tag, tag_len), status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse language tag %R: %s", tag_obj,
+                     u_errorName(status));
+        return nullptr;
+    }
+    return new_locale_object(reinterpret_cast<PyTypeObject*>(cls), locale);
+}
+
+PyObject* Locale_to_bcp47(LocaleObject* self, PyObject* Py_UNUSED(ignored)) {
+    UErrorCode status = U_ZERO_ERROR;
+    std::string tag = self->locale->toLanguageTag<std::string>(status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to convert locale to language tag: %s",
+                     u_errorName(status));
+        return nullptr;
+    }
+    return PyUnicode_FromStringAndSize(tag.data(), tag.size());
+}
+
+// Return a transformed copy of self, of the same type.
+PyObject* transformed_locale(LocaleObject* self, void (Locale::*transform)(UErrorCode&),
+                             const char* action) {
+    Locale locale(*self->locale);
+    UErrorCode status = U_ZERO_ERROR;
+    (locale.*transform)(status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to %s locale: %s", action, u_errorName(status));
+        return nullptr;
+    }
+    return new_locale_object(Py_TYPE(self), locale);
+}
+
+PyObject* Locale_canonicalize(LocaleObject* self, PyObject* Py_UNUSED(ignored)) {
+    return transformed_locale(self, &Locale::canonicalize, "canonicalize");
+}
+
+PyObject* Locale_add_likely_subtags(LocaleObject* self, PyObject* Py_UNUSED(ignored)) {
+    return transformed_locale(self, &Locale::addLikelySubtags, "add likely subtags to");
+}
+
+PyObject* Locale_minimize_subtags(LocaleObject* self, PyObject* Py_UNUSED(ignored)) {
+    return transformed_locale(self, &Locale::minimizeSubtags, "minimize subtags of");
+}
+
+PyObject* Locale_reduce(LocaleObject* self, PyObject* Py_UNUSED(ignored)) {
+    return Py_BuildValue("(O(s))", Py_TYPE(self), self->locale->getName());
+}
+
+PyMethodDef Locale_methods[] = {
+    {"get", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(Locale_get)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS | METH_CLASS,
+     "Return a shared Locale for a locale string, from a cache of recently used ones"},
+    {"from_bcp47", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(Locale_from_bcp47)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS | METH_CLASS,
+     "Create a Locale from a BCP 47 language tag"},
+    {"to_bcp47", reinterpret_cast<PyCFunction>(Locale_to_bcp47), METH_NOARGS,
+     "Return the locale as a BCP 47 language tag"},
+    {"canonicalize", reinterpret_cast<PyCFunction>(Locale_canonicalize), METH_NOARGS,
+     "Return a copy of the locale canonicalized per CLDR, replacing deprecated codes"},
+    {"add_likely_subtags", reinterpret_cast<PyCFunction>(Locale_add_likely_subtags), METH_NOARGS,
+     "Return a copy of the locale with its likely script and region filled in"},
+    {"minimize_subtags", reinterpret_cast<PyCFunction>(Locale_minimize_subtags), METH_NOARGS,
+     "Return a copy of the locale without script and region subtags implied by the rest"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(Locale_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
 PyGetSetDef Locale_getsetters[] = {
     {const_cast<char*>("bogus"), reinterpret_cast<getter>(Locale_get_bogus), nullptr,
      const_cast<char*>("Whether the locale is bogus"), nullptr},
@@ -216,6 +486,9 @@ PyType_Slot Locale_slots[] = {
     {Py_tp_init, reinterpret_cast<void*>(Locale_init)},
     {Py_tp_new, reinterpret_cast<void*>(Locale_new)},
     {Py_tp_repr, reinterpret_cast<void*>(Locale_repr)},
+    {Py_tp_richcompare, reinterpret_cast<void*>(Locale_richcompare)},
+    {Py_tp_hash, reinterpret_cast<void*>(Locale_hash)},
+    {Py_tp_methods, Locale_methods},
     {Py_tp_getset, Locale_getsetters},
     {0, nullptr}
 };
@@ -228,7 +501,341 @@ PyType_Spec Locale_spec = {
     Locale_slots
 };
 
+struct LocaleMatcherObject {
+    PyObject_HEAD
+    icu::LocaleMatcher* matcher;
+    // The supported Locale objects, in the order given.
+    PyObject* supported;
+    // Results for recent Accept-Language strings, oldest first.
+    PyObject* cache;
+};
+
+constexpr Py_ssize_t kMaxCachedMatches = 256;
+
+void LocaleMatcher_dealloc(LocaleMatcherObject* self) {
+    delete self->matcher;
+    Py_XDECREF(self->supported);
+    Py_XDECREF(self->cache);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* LocaleMatcher_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<LocaleMatcherObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->matcher = nullptr;
+        self->supported = nullptr;
+        self->cache = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+// Convert a locale argument, a string or Locale object, to a Locale
+// object, sharing cached ones for strings.
+PyObject* as_locale_object(ModuleState* mod_state, PyObject* obj, const char* what) {
+    if (PyUnicode_Check(obj)) {
+        return get_cached_locale(mod_state, obj);
+    }
+    int is_locale = PyObject_IsInstance(obj, mod_state->locale_type);
+    if (is_locale == -1) {
+        return nullptr;
+    }
+    if (is_locale == 0 || reinterpret_cast<LocaleObject*>(obj)->locale == nullptr) {
+        PyErr_Format(PyExc_TypeError, "%s must be strings or Locale objects, not %.200s", what,
+                     Py_TYPE(obj)->tp_name);
+        return nullptr;
+    }
+    return Py_NewRef(obj);
+}
+
+// Convert an iterable of strings and Locale objects to a tuple of Locale
+// objects.
+PyObject* as_locale_tuple(ModuleState* mod_state, PyObject* iterable, const char* what) {
+    if (PyUnicode_Check(iterable)) {
+        PyErr_Format(PyExc_TypeError, "%s must be an iterable of locales, not a string", what);
+        return nullptr;
+    }
+    PyObject* items = PySequence_Tuple(iterable);
+    if (items == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t count = PyTuple_GET_SIZE(items);
+    PyObject* locales = PyTuple_New(count);
+    if (locales == nullptr) {
+        Py_DECREF(items);
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* locale_obj = as_locale_object(mod_state, PyTuple_GET_ITEM(items, i), what);
+        if (locale_obj == nullptr) {
+            Py_DECREF(items);
+            Py_DECREF(locales);
+            return nullptr;
+        }
+        PyTuple_SET_ITEM(locales, i, locale_obj);
+    }
+    Py_DECREF(items);
+    return locales;
+}
+
+// Iterate over the icu::Locale of each Locale object in a tuple.
+struct LocaleTupleIterator : public Locale::Iterator {
+    explicit LocaleTupleIterator(PyObject* locales) : locales(locales) {}
+
+    UBool hasNext() const override { return index < PyTuple_GET_SIZE(locales); }
+
+    const Locale& next() override {
+        return *reinterpret_cast<LocaleObject*>(PyTuple_GET_ITEM(locales, index++))->locale;
+    }
+
+    PyObject* locales;
+    Py_ssize_t index = 0;
+};
+
+int LocaleMatcher_init(LocaleMatcherObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* supported_obj;
+
+    static const char* kwlist[] = {"supported_locales", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", const_cast<char**>(kwlist),
+                                     &supported_obj)) {
+        return -1;
+    }
+
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &localemodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &localemodule);
+#endif
+    if (module == nullptr) {
+        return -1;
+    }
+    ModuleState* mod_state = get_module_state(module);
+
+    PyObject* supported = as_locale_tuple(mod_state, supported_obj, "supported_locales");
+    if (supported == nullptr) {
+        return -1;
+    }
+    if (PyTuple_GET_SIZE(supported) == 0) {
+        PyErr_SetString(PyExc_ValueError, "supported_locales must not be empty");
+        Py_DECREF(supported);
+        return -1;
+    }
+
+    UErrorCode status = U_ZERO_ERROR;
+    LocaleTupleIterator iterator(supported);
+    auto matcher = std::make_unique<icu::LocaleMatcher>(
+        icu::LocaleMatcher::Builder().setSupportedLocales(iterator).build(status));
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to create LocaleMatcher: %s",
+                     u_errorName(status));
+        Py_DECREF(supported);
+        return -1;
+    }
+
+    PyObject* cache = PyDict_New();
+    if (cache == nullptr) {
+        Py_DECREF(supported);
+        return -1;
+    }
+
+    delete self->matcher;
+    self->matcher = matcher.release();
+    Py_XSETREF(self->supported, supported);
+    Py_XSETREF(self->cache, cache);
+    return 0;
+}
+
+// Return a new reference to the supported Locale object equal to the
+// matcher's result, which is a copy of it.
+PyObject* supported_locale_object(LocaleMatcherObject* self, const Locale* match) {
+    Py_ssize_t count = PyTuple_GET_SIZE(self->supported);
+    if (match != nullptr) {
+        for (Py_ssize_t i = 0; i < count; ++i) {
+            PyObject* locale_obj = PyTuple_GET_ITEM(self->supported, i);
+            if (*reinterpret_cast<LocaleObject*>(locale_obj)->locale == *match) {
+                return Py_NewRef(locale_obj);
+            }
+        }
+    }
+    // The default locale, used when nothing matches, is the first supported
+    // locale.
+    return Py_NewRef(PyTuple_GET_ITEM(self->supported, 0));
+}
+
+PyObject* LocaleMatcher_best_match(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "best_match() takes exactly 1 argument");
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<LocaleMatcherObject*>(self);
+    if (self_obj->matcher == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "LocaleMatcher is not initialized");
+        return nullptr;
+    }
+    PyObject* desired = args[0];
+    UErrorCode status = U_ZERO_ERROR;
+
+    if (!PyUnicode_Check(desired)) {
+        ModuleState* mod_state =
+            reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+        if (mod_state == nullptr) {
+            return nullptr;
+        }
+        PyObject* locales = as_locale_tuple(mod_state, desired, "desired locales");
+        if (locales == nullptr) {
+            return nullptr;
+        }
+        LocaleTupleIterator iterator(locales);
+        icu::LocaleMatcher::Result result = self_obj->matcher->getBestMatchResult(iterator, status);
+        Py_DECREF(locales);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to match locales: %s", u_errorName(status));
+            return nullptr;
+        }
+        return supported_locale_object(self_obj, result.getSupportedLocale());
+    }
+
+    PyObject* cached;
+    int found = dict_get_item_ref(self_obj->cache, desired, &cached);
+    if (found != 0) {
+        return found < 0 ? nullptr : cached;
+    }
+
+    Py_ssize_t header_len;
+    const char* header = PyUnicode_AsUTF8AndSize(desired, &header_len);
+    if (header == nullptr) {
+        return nullptr;
+    }
+    const Locale* match =
+        self_obj->matcher->getBestMatchForListString(StringPiece(header, header_len), status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse Accept-Language header %R: %s", desired,
+                     u_errorName(status));
+        return nullptr;
+    }
+
+    PyObject* locale_obj = supported_locale_object(self_obj, match);
+    PyObject* result = store_in_cache(self_obj->cache, desired, locale_obj, kMaxCachedMatches);
+    Py_DECREF(locale_obj);
+    return result;
+}
+
+PyObject* LocaleMatcher_get_supported_locales(LocaleMatcherObject* self, void* closure) {
+    if (self->supported == nullptr) {
+        return PyTuple_New(0);
+    }
+    return Py_NewRef(self->supported);
+}
+
+PyMethodDef LocaleMatcher_methods[] = {
+    {"best_match", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(LocaleMatcher_best_match)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Return the supported locale best matching an Accept-Language header or locales"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef LocaleMatcher_getsetters[] = {
+    {const_cast<char*>("supported_locales"),
+     reinterpret_cast<getter>(LocaleMatcher_get_supported_locales), nullptr,
+     const_cast<char*>("The supported locales, in the order given"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot LocaleMatcher_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU LocaleMatcher")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(LocaleMatcher_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(LocaleMatcher_init)},
+    {Py_tp_new, reinterpret_cast<void*>(LocaleMatcher_new)},
+    {Py_tp_methods, LocaleMatcher_methods},
+    {Py_tp_getset, LocaleMatcher_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec LocaleMatcher_spec = {
+    "icu4py.locale.LocaleMatcher",
+    sizeof(LocaleMatcherObject),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    LocaleMatcher_slots
+};
+
+// Canonicalize each locale string in an iterable to a BCP 47 language tag,
+// converting each distinct string once.
+PyObject* canonicalize_many(PyObject* module, PyObject* tags) {
+    PyObject* iterator = PyObject_GetIter(tags);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+    PyObject* results = PyList_New(0);
+    PyObject* seen = PyDict_New();
+    if (results == nullptr || seen == nullptr) {
+        Py_XDECREF(results);
+        Py_XDECREF(seen);
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    std::string canonical;
+    PyObject* tag_obj;
+    while ((tag_obj = PyIter_Next(iterator)) != nullptr) {
+        PyObject* result = nullptr;
+        int found = dict_get_item_ref(seen, tag_obj, &result);
+        if (found == 0) {
+            const char* tag = nullptr;
+            if (!PyUnicode_Check(tag_obj)) {
+                PyErr_Format(PyExc_TypeError, "tags must be strings, not %.200s",
+                             Py_TYPE(tag_obj)->tp_name);
+            } else {
+                tag = PyUnicode_AsUTF8(tag_obj);
+            }
+            if (tag != nullptr) {
+                // Locale() accepts both ICU locale IDs and BCP 47 tags.
+                Locale locale(tag);
+                UErrorCode status = U_ZERO_ERROR;
+                locale.canonicalize(status);
+                if (U_SUCCESS(status)) {
+                    canonical = locale.toLanguageTag<std::string>(status);
+                }
+                // Like ICU does for empty locales, use "und" (undetermined)
+                // for strings that aren't locales, rather than failing the
+                // whole batch.
+                if (U_FAILURE(status)) {
+                    canonical = "und";
+                }
+                result = PyUnicode_FromStringAndSize(canonical.data(), canonical.size());
+                if (result != nullptr && PyDict_SetItem(seen, tag_obj, result) < 0) {
+                    Py_CLEAR(result);
+                }
+            }
+        }
+        Py_DECREF(tag_obj);
+        if (found < 0 || result == nullptr) {
+            break;
+        }
+        int append_result = PyList_Append(results, result);
+        Py_DECREF(result);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+    Py_DECREF(seen);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
 PyMethodDef locale_module_methods[] = {
+    {"canonicalize_many", canonicalize_many, METH_O,
+     "Canonicalize locale strings to BCP 47 language tags, converting each distinct one once"},
     {nullptr, nullptr, 0, nullptr}
 };
 
@@ -238,11 +845,42 @@ int icu4py_locale_exec(PyObject* m) {
         return -1;
     }
 
-    if (PyModule_AddObject(m, "Locale", type_obj) < 0) {
+    if (PyModule_AddObjectRef(m, "Locale", type_obj) < 0) {
         Py_DECREF(type_obj);
         return -1;
     }
 
+    ModuleState* state = get_module_state(m);
+    state->locale_type = type_obj;
+
+    state->locale_cache = PyDict_New();
+    if (state->locale_cache == nullptr) {
+        return -1;
+    }
+
+    PyObject* matcher_type = PyType_FromModuleAndSpec(m, &LocaleMatcher_spec, nullptr);
+    if (matcher_type == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "LocaleMatcher", matcher_type) < 0) {
+        Py_DECREF(matcher_type);
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_locale_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_cache);
+    return 0;
+}
+
+int icu4py_locale_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_cache);
     return 0;
 }
 
@@ -254,15 +892,15 @@ PyModuleDef_Slot locale_slots[] = {
     {0, nullptr}
 };
 
-static PyModuleDef localemodule = {
+PyModuleDef localemodule = {
     PyModuleDef_HEAD_INIT,
     "icu4py.locale",
     "",
-    0,
+    sizeof(ModuleState),
     locale_module_methods,
     locale_slots,
-    nullptr,
-    nullptr,
+    icu4py_locale_traverse,
+    icu4py_locale_clear,
     nullptr,
 };
 
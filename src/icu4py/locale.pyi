@@ -1,6 +1,7 @@
-from typing import overload
+from collections.abc import Iterable
+from typing import final, overload
 
-from typing_extensions import disjoint_base
+from typing_extensions import Self, disjoint_base
 
 @disjoint_base
 class Locale:
@@ -24,3 +25,22 @@ class Locale:
     def variant(self) -> str: ...
     @property
     def extensions(self) -> dict[str, str]: ...
+    @classmethod
+    def get(cls, name: str, /) -> Self: ...
+    @classmethod
+    def from_bcp47(cls, tag: str, /) -> Self: ...
+    def to_bcp47(self) -> str: ...
+    def canonicalize(self) -> Self: ...
+    def add_likely_subtags(self) -> Self: ...
+    def minimize_subtags(self) -> Self: ...
+    def __eq__(self, other: object, /) -> bool: ...
+    def __hash__(self) -> int: ...
+
+def canonicalize_many(tags: Iterable[str], /) -> list[str]: ...
+
+@final
+class LocaleMatcher:
+    def __init__(self, supported_locales: Iterable[str | Locale]) -> None: ...
+    @property
+    def supported_locales(self) -> tuple[Locale, ...]: ...
+    def best_match(self, desired: str | Iterable[str | Locale], /) -> Locale: ...
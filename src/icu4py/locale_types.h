@@ -5,12 +5,74 @@
 #include <Python.h>
 #include <unicode/locid.h>
 
+#include <functional>
+#include <string>
+
 namespace icu4py {
 
 struct LocaleObject {
     PyObject_HEAD icu::Locale *locale;
+    // The locale's canonical name and its hash, computed on creation so
+    // comparing and hashing locales doesn't canonicalize them each time.
+    std::string* canonical_name;
+    Py_hash_t hash;
 };
 
+// Return the name of the locale after CLDR canonicalization, or its
+// plain name if canonicalization fails.
+inline std::string canonical_locale_name(const icu::Locale& locale) {
+    icu::Locale canonical(locale);
+    UErrorCode status = U_ZERO_ERROR;
+    canonical.canonicalize(status);
+    if (U_FAILURE(status) || canonical.isBogus()) {
+        return locale.getName();
+    }
+    return canonical.getName();
+}
+
+// Fill in a newly allocated locale object with a copy of an ICU locale.
+// Objects created with tp_alloc() rather than through __init__() must be
+// set up with this.
+inline void set_locale(LocaleObject* self, const icu::Locale& locale) {
+    self->locale = new icu::Locale(locale);
+    self->canonical_name = new std::string(canonical_locale_name(locale));
+    auto hash = static_cast<Py_hash_t>(std::hash<std::string>{}(*self->canonical_name));
+    self->hash = hash == -1 ? -2 : hash;
+}
+
+// Convert a locale argument, a string or Locale object, to an ICU Locale.
+// Strings are looked up with locale_get, the Locale.get() method, which
+// shares parsed locales between calls.
+inline bool resolve_locale(PyObject* locale_type, PyObject* locale_get, PyObject* locale_obj,
+                           icu::Locale& locale) {
+    if (PyUnicode_Check(locale_obj)) {
+        PyObject* shared_locale = PyObject_CallOneArg(locale_get, locale_obj);
+        if (shared_locale == nullptr) {
+            return false;
+        }
+        locale = *reinterpret_cast<LocaleObject*>(shared_locale)->locale;
+        Py_DECREF(shared_locale);
+        return true;
+    }
+
+    int is_locale = PyObject_IsInstance(locale_obj, locale_type);
+    if (is_locale == -1) {
+        return false;
+    }
+    if (is_locale == 0) {
+        PyErr_SetString(PyExc_TypeError, "locale must be a string or Locale object");
+        return false;
+    }
+
+    auto* locale_pyobj = reinterpret_cast<LocaleObject*>(locale_obj);
+    if (locale_pyobj->locale == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "Locale object has null internal locale");
+        return false;
+    }
+    locale = *locale_pyobj->locale;
+    return true;
+}
+
 }  // namespace icu4py
 
 #endif  // ICU4PY_LOCALE_TYPES_H
@@ -0,0 +1,61 @@
+#ifndef ICU4PY_LRU_CACHE_H
+#define ICU4PY_LRU_CACHE_H
+
+#include <cstddef>
+#include <list>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <utility>
+
+namespace icu4py {
+
+// A thread-safe cache of shared values by string key, which evicts the
+// least recently used values beyond a maximum size. The modules use it to
+// keep compiled ICU objects, so creating the same object again is cheap.
+template <typename T>
+class LruCache {
+public:
+    explicit LruCache(size_t max_size) : max_size_(max_size) {}
+
+    // Return the value cached for key, or nullptr if there is none.
+    std::shared_ptr<T> lookup(const std::string& key) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto found = index_.find(key);
+        if (found == index_.end()) {
+            return nullptr;
+        }
+        entries_.splice(entries_.begin(), entries_, found->second);
+        return found->second->second;
+    }
+
+    // Cache value for key, unless another thread cached one first.
+    void store(std::string key, std::shared_ptr<T> value) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto found = index_.find(key);
+        if (found != index_.end()) {
+            entries_.splice(entries_.begin(), entries_, found->second);
+            return;
+        }
+        entries_.emplace_front(std::move(key), std::move(value));
+        index_.emplace(entries_.front().first, entries_.begin());
+        if (entries_.size() > max_size_) {
+            index_.erase(entries_.back().first);
+            entries_.pop_back();
+        }
+    }
+
+private:
+    using Entries = std::list<std::pair<std::string, std::shared_ptr<T>>>;
+
+    std::mutex mutex_;
+    // Most recently used first.
+    Entries entries_;
+    std::unordered_map<std::string, typename Entries::iterator> index_;
+    size_t max_size_;
+};
+
+}  // namespace icu4py
+
+#endif  // ICU4PY_LRU_CACHE_H
@@ -1,34 +1,136 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <datetime.h>
+#include <unicode/messagepattern.h>
 #include <unicode/msgfmt.h>
 #include <unicode/unistr.h>
 #include <unicode/fmtable.h>
 #include <unicode/locid.h>
 #include <unicode/parsepos.h>
+#include <unicode/basictz.h>
+#include <unicode/datefmt.h>
+#include <unicode/timezone.h>
 #include <unicode/ustring.h>
 #include <unicode/utypes.h>
 
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
 #include <cstring>
 #include <memory>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
 
+#include "datetime_conversion.h"
 #include "locale_types.h"
+#include "lru_cache.h"
+#include "number_conversion.h"
 
 namespace {
 
+using icu::BasicTimeZone;
+using icu::DateFormat;
+using icu::Format;
 using icu::MessageFormat;
+using icu::MessagePattern;
 using icu::UnicodeString;
 using icu::Formattable;
 using icu::Locale;
 using icu::FieldPosition;
+using icu::ParsePosition;
 using icu::StringPiece;
+using icu::TimeZone;
 using icu4py::LocaleObject;
+using icu4py::resolve_locale;
+using icu4py::TimeZoneRegistry;
+using icu4py::date_to_udate;
+using icu4py::datetime64_scale;
+using icu4py::datetime_to_udate;
+using icu4py::kDatetime64NaT;
+using icu4py::time_to_udate;
+using icu4py::buffer_item_to_formattable;
+using icu4py::digits_to_formattable;
+using icu4py::float_to_formattable;
+using icu4py::is_native_byte_order;
+using icu4py::long_to_formattable;
+using icu4py::numeric_buffer_kind;
+using icu4py::read_buffer_int;
+
+// A formatter, with the time zone its date and time arguments are set to,
+// or nullptr for ICU's default time zone they're compiled with.
+struct PooledFormatter {
+    MessageFormat* formatter;
+    const TimeZone* time_zone;
+};
+
+// A compiled pattern, shared between MessageFormat objects created with
+// the same pattern and locale, plus its formatters not currently in use. A
+// MessageFormat can't format on several threads at once, so concurrent
+// calls each take one, cloning the original when none are idle, rather
+// than serializing on the object.
+struct FormatterPool {
+    FormatterPool(MessageFormat* formatter, const TimeZone* default_time_zone,
+                  bool has_nested_dates)
+        : formatter(formatter), default_time_zone(default_time_zone),
+          has_nested_dates(has_nested_dates), idle{{formatter, nullptr}} {}
+
+    ~FormatterPool() {
+        for (const PooledFormatter& pooled : idle) {
+            if (pooled.formatter != formatter) {
+                delete pooled.formatter;
+            }
+        }
+        delete formatter;
+    }
+
+    FormatterPool(const FormatterPool&) = delete;
+    FormatterPool& operator=(const FormatterPool&) = delete;
+
+    // The original formatter, kept in the pool and used for cloning. Its
+    // time zone is never changed, so clones start in the default one.
+    MessageFormat* const formatter;
+    const TimeZone* const default_time_zone;
+    // Whether the pattern has date or time arguments nested in plural,
+    // select, or choice arguments, which can't be set to a time zone.
+    const bool has_nested_dates;
+    std::mutex mutex;
+    std::vector<PooledFormatter> idle;
+    // A copy with numbered arguments for parse(), created on first use.
+    std::unique_ptr<MessageFormat> parser;
+};
+
+// Clones beyond this many are deleted when released.
+constexpr size_t kMaxIdleFormatters = 8;
+
+// Recently compiled patterns, keyed by locale name and pattern, so
+// creating the same MessageFormat again, such as when unpickling, skips
+// compiling the pattern.
+using FormatCache = icu4py::LruCache<FormatterPool>;
+
+constexpr size_t kMaxCachedFormats = 256;
 
 struct ModuleState {
-    PyObject* datetime_datetime_type;
-    PyObject* datetime_date_type;
-    PyObject* datetime_time_type;
     PyObject* decimal_decimal_type;
+    PyObject* enum_enum_type;
     PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+    PyObject* str_utcoffset;
+    PyObject* str_value;
+    // Naive datetimes are interpreted in ICU's default time zone, which
+    // ICU also formats them in.
+    BasicTimeZone* default_time_zone;
+    FormatCache* format_cache;
+    PyObject* cache_info_type;
+    PyObject* str_key;
+    PyObject* str_time_zone;
+    PyObject* zoneinfo_type;
+    TimeZoneRegistry* time_zones;
+    PyObject* message_format_type;
 };
 
 static inline ModuleState* get_module_state(PyObject* module) {
@@ -39,8 +141,12 @@ static inline ModuleState* get_module_state(PyObject* module) {
 int icu4py_messageformat_exec(PyObject* m);
 int icu4py_messageformat_traverse(PyObject* m, visitproc visit, void* arg);
 int icu4py_messageformat_clear(PyObject* m);
+void icu4py_messageformat_free(void* m);
+PyObject* compile_catalog(PyObject* module, PyObject* const* args, Py_ssize_t nargs);
 
 PyMethodDef icu4py_messageformat_module_methods[] = {
+    {"compile_catalog", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(compile_catalog)),
+     METH_FASTCALL, "Compile messages into a catalog file's contents"},
     {nullptr, nullptr, 0, nullptr}
 };
 
@@ -63,16 +169,88 @@ static PyModuleDef icu4pymodule = {
     icu4py_messageformat_slots,
     icu4py_messageformat_traverse,
     icu4py_messageformat_clear,
-    nullptr,
+    icu4py_messageformat_free,
+};
+
+// Literal text from the top level of a pattern, followed by the argument
+// after it, compiled on its own so its output can be located. The final
+// segment has only literal text.
+struct MessageSegment {
+    // Quoting already resolved, with its length in code points.
+    UnicodeString literal;
+    int32_t literal_length;
+    std::unique_ptr<MessageFormat> formatter;
+    // Borrowed from arg_names.
+    PyObject* name;
+    // Owned reference to an interned str.
+    PyObject* type;
 };
 
 struct MessageFormatObject {
     PyObject_HEAD
+    // Borrowed from pool, for reading the pattern and locale.
     MessageFormat* formatter;
+    std::shared_ptr<FormatterPool>* pool;
+    // Argument names in order of first appearance in the pattern, as a
+    // tuple of interned str, with parallel tuple of argument types.
+    PyObject* arg_names;
+    PyObject* arg_types;
+    // The same names, pre-built for passing to ICU. Shared so a call that
+    // passes them to ICU keeps them alive if __init__() replaces them.
+    std::shared_ptr<const UnicodeString[]>* arg_name_ustrings;
+    // Top-level pattern segments for format_to_parts(), built on first use.
+    std::vector<MessageSegment>* segments;
+    // Opt-in results of format(), keyed by a tuple of the argument values
+    // in arg_names order, oldest first. nullptr when disabled.
+    PyObject* result_cache;
+    Py_ssize_t result_cache_size;
+    Py_ssize_t result_cache_hits;
+    Py_ssize_t result_cache_misses;
+    // Borrowed from the module's TimeZoneRegistry, or nullptr for ICU's
+    // default time zone.
+    const BasicTimeZone* time_zone;
+};
+
+
+// Parallel argument arrays for one format() call. Kept separate from the
+// conversion so the buffers can be reused between calls.
+struct FormatArguments {
+    // Only used when the params don't line up with the precomputed names.
+    std::vector<UnicodeString> names;
+    std::vector<Formattable> values;
+    const UnicodeString* names_ptr = nullptr;
+    // Holds the object's precomputed names while names_ptr points to them.
+    std::shared_ptr<const UnicodeString[]> shared_names;
+    int32_t count = 0;
+    // The time zone to format in, and interpret naive values in, or
+    // nullptr for ICU's default.
+    const BasicTimeZone* time_zone = nullptr;
 };
 
+void free_segments(MessageFormatObject* self) {
+    if (self->segments == nullptr) {
+        return;
+    }
+    for (MessageSegment& segment : *self->segments) {
+        Py_XDECREF(segment.type);
+    }
+    delete self->segments;
+    self->segments = nullptr;
+}
+
+void free_formatters(MessageFormatObject* self) {
+    delete self->pool;
+    self->pool = nullptr;
+    self->formatter = nullptr;
+}
+
 void MessageFormat_dealloc(MessageFormatObject* self) {
-    delete self->formatter;
+    free_segments(self);
+    free_formatters(self);
+    delete self->arg_name_ustrings;
+    Py_XDECREF(self->result_cache);
+    Py_XDECREF(self->arg_names);
+    Py_XDECREF(self->arg_types);
     Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
 }
 
@@ -80,20 +258,321 @@ PyObject* MessageFormat_new(PyTypeObject* type, PyObject* args, PyObject* kwds)
     auto* self = reinterpret_cast<MessageFormatObject*>(type->tp_alloc(type, 0));
     if (self != nullptr) {
         self->formatter = nullptr;
+        self->pool = nullptr;
+        self->arg_names = nullptr;
+        self->arg_types = nullptr;
+        self->arg_name_ustrings = nullptr;
+        self->segments = nullptr;
+        self->result_cache = nullptr;
+        self->result_cache_size = 0;
+        self->result_cache_hits = 0;
+        self->result_cache_misses = 0;
+        self->time_zone = nullptr;
     }
     return reinterpret_cast<PyObject*>(self);
 }
 
+PyObject* ustring_to_interned_pyunicode(const UnicodeString& ustr) {
+    std::string utf8;
+    ustr.toUTF8String(utf8);
+    PyObject* str_obj = PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+    if (str_obj != nullptr) {
+        PyUnicode_InternInPlace(&str_obj);
+    }
+    return str_obj;
+}
+
+UnicodeString argument_type_name(const MessagePattern& msg_pattern, int32_t arg_start) {
+    switch (msg_pattern.getPart(arg_start).getArgType()) {
+        case UMSGPAT_ARG_TYPE_SIMPLE: {
+            // ARG_START, ARG_NAME/ARG_NUMBER, then ARG_TYPE, e.g. "number".
+            UnicodeString type_name = msg_pattern.getSubstring(msg_pattern.getPart(arg_start + 2));
+            return type_name.toLower(Locale::getRoot());
+        }
+        case UMSGPAT_ARG_TYPE_CHOICE:
+            return UNICODE_STRING_SIMPLE("choice");
+        case UMSGPAT_ARG_TYPE_PLURAL:
+            return UNICODE_STRING_SIMPLE("plural");
+        case UMSGPAT_ARG_TYPE_SELECT:
+            return UNICODE_STRING_SIMPLE("select");
+        case UMSGPAT_ARG_TYPE_SELECTORDINAL:
+            return UNICODE_STRING_SIMPLE("selectordinal");
+        default:
+            return UNICODE_STRING_SIMPLE("none");
+    }
+}
+
+// Collect the pattern's argument names and types, in order of first
+// appearance.
+bool parse_arguments(const UnicodeString& pattern, std::vector<UnicodeString>& names,
+                     std::vector<UnicodeString>& types) {
+    UErrorCode status = U_ZERO_ERROR;
+    MessagePattern msg_pattern(pattern, nullptr, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse MessageFormat pattern: %s",
+                     u_errorName(status));
+        return false;
+    }
+
+    int32_t part_count = msg_pattern.countParts();
+    for (int32_t i = 0; i < part_count; ++i) {
+        if (msg_pattern.getPartType(i) != UMSGPAT_PART_TYPE_ARG_START) {
+            continue;
+        }
+        UnicodeString name = msg_pattern.getSubstring(msg_pattern.getPart(i + 1));
+        bool seen = false;
+        for (const UnicodeString& existing : names) {
+            if (existing == name) {
+                seen = true;
+                break;
+            }
+        }
+        if (!seen) {
+            names.push_back(name);
+            types.push_back(argument_type_name(msg_pattern, i));
+        }
+    }
+    return true;
+}
+
+// Store argument names and types, so format() can pass pre-built names to
+// ICU rather than converting keys on every call.
+bool set_arguments(MessageFormatObject* self, const std::vector<UnicodeString>& names,
+                   const std::vector<UnicodeString>& types) {
+    Py_ssize_t count = static_cast<Py_ssize_t>(names.size());
+    PyObject* arg_names = PyTuple_New(count);
+    if (arg_names == nullptr) {
+        return false;
+    }
+    PyObject* arg_types = PyTuple_New(count);
+    if (arg_types == nullptr) {
+        Py_DECREF(arg_names);
+        return false;
+    }
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* name_obj = ustring_to_interned_pyunicode(names[i]);
+        PyObject* type_obj = ustring_to_interned_pyunicode(types[i]);
+        if (name_obj == nullptr || type_obj == nullptr) {
+            Py_XDECREF(name_obj);
+            Py_XDECREF(type_obj);
+            Py_DECREF(arg_names);
+            Py_DECREF(arg_types);
+            return false;
+        }
+        PyTuple_SET_ITEM(arg_names, i, name_obj);
+        PyTuple_SET_ITEM(arg_types, i, type_obj);
+    }
+
+    std::shared_ptr<UnicodeString[]> name_ustrings(new UnicodeString[count]);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        name_ustrings[i] = names[i];
+    }
+
+    Py_XSETREF(self->arg_names, arg_names);
+    Py_XSETREF(self->arg_types, arg_types);
+    delete self->arg_name_ustrings;
+    self->arg_name_ustrings =
+        new std::shared_ptr<const UnicodeString[]>(std::move(name_ustrings));
+    return true;
+}
+
+bool extract_arguments(MessageFormatObject* self, const UnicodeString& pattern) {
+    std::vector<UnicodeString> names;
+    std::vector<UnicodeString> types;
+    return parse_arguments(pattern, names, types) && set_arguments(self, names, types);
+}
+
+// Set the time zone of a formatter's date and time arguments. ICU only
+// exposes the sub-formats of top-level arguments, so time zones are
+// rejected for patterns with nested ones, per has_nested_date_arguments().
+void set_time_zone(MessageFormat* formatter, const TimeZone& time_zone) {
+    int32_t count = 0;
+    const Format** formats = formatter->getFormats(count);
+    if (formats == nullptr) {
+        return;
+    }
+    for (int32_t i = 0; i < count; ++i) {
+        auto* date_format = dynamic_cast<const DateFormat*>(formats[i]);
+        if (date_format != nullptr) {
+            const_cast<DateFormat*>(date_format)->setTimeZone(time_zone);
+        }
+    }
+}
+
+// Split the top-level pattern into literal text and arguments, mirroring
+// how MessageFormat::format() walks it. ICU4C doesn't report where each
+// argument lands in its output, so each argument gets its own formatter.
+bool build_segments(MessageFormatObject* self) {
+    UErrorCode status = U_ZERO_ERROR;
+    UnicodeString pattern;
+    self->formatter->toPattern(pattern);
+    MessagePattern msg_pattern(pattern, nullptr, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse MessageFormat pattern: %s",
+                     u_errorName(status));
+        return false;
+    }
+
+    const Locale& locale = self->formatter->getLocale();
+    auto segments = std::make_unique<std::vector<MessageSegment>>();
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+    UnicodeString literal;
+    int32_t prev_index = msg_pattern.getPart(0).getLimit();
+
+    for (int32_t i = 1;; ++i) {
+        const MessagePattern::Part& part = msg_pattern.getPart(i);
+        UMessagePatternPartType part_type = part.getType();
+        literal.append(pattern, prev_index, part.getIndex() - prev_index);
+        if (part_type == UMSGPAT_PART_TYPE_MSG_LIMIT) {
+            break;
+        }
+        prev_index = part.getLimit();
+        if (part_type == UMSGPAT_PART_TYPE_INSERT_CHAR) {
+            literal.append(static_cast<UChar32>(part.getValue()));
+        } else if (part_type == UMSGPAT_PART_TYPE_ARG_START) {
+            int32_t limit_index = msg_pattern.getLimitPartIndex(i);
+            int32_t arg_limit = msg_pattern.getPart(limit_index).getLimit();
+            UnicodeString sub_pattern(pattern, part.getIndex(), arg_limit - part.getIndex());
+
+            auto formatter = std::make_unique<MessageFormat>(sub_pattern, locale, status);
+            if (U_FAILURE(status)) {
+                PyErr_Format(PyExc_ValueError, "Failed to create MessageFormat: %s",
+                             u_errorName(status));
+                for (MessageSegment& segment : *segments) {
+                    Py_DECREF(segment.type);
+                }
+                return false;
+            }
+            if (self->time_zone != nullptr) {
+                set_time_zone(formatter.get(), *self->time_zone);
+            }
+
+            UnicodeString name = msg_pattern.getSubstring(msg_pattern.getPart(i + 1));
+            PyObject* name_obj = nullptr;
+            for (Py_ssize_t j = 0; j < arg_count; ++j) {
+                if ((*self->arg_name_ustrings)[j] == name) {
+                    name_obj = PyTuple_GET_ITEM(self->arg_names, j);
+                    break;
+                }
+            }
+            PyObject* type_obj = ustring_to_interned_pyunicode(argument_type_name(msg_pattern, i));
+            if (type_obj == nullptr) {
+                for (MessageSegment& segment : *segments) {
+                    Py_DECREF(segment.type);
+                }
+                return false;
+            }
+
+            segments->push_back(MessageSegment{
+                literal, literal.countChar32(), std::move(formatter), name_obj, type_obj});
+            literal.remove();
+            prev_index = arg_limit;
+            i = limit_index;
+        }
+    }
+    segments->push_back(MessageSegment{literal, literal.countChar32(), nullptr, nullptr, nullptr});
+
+    self->segments = segments.release();
+    return true;
+}
+
+// Whether a pattern has date or time arguments inside the sub-messages of
+// plural, select, or choice arguments.
+bool has_nested_date_arguments(const UnicodeString& pattern) {
+    UErrorCode status = U_ZERO_ERROR;
+    MessagePattern msg_pattern(pattern, nullptr, status);
+    if (U_FAILURE(status)) {
+        return false;
+    }
+    int32_t depth = 0;
+    int32_t part_count = msg_pattern.countParts();
+    for (int32_t i = 0; i < part_count; ++i) {
+        const MessagePattern::Part& part = msg_pattern.getPart(i);
+        switch (part.getType()) {
+            case UMSGPAT_PART_TYPE_MSG_START:
+                ++depth;
+                break;
+            case UMSGPAT_PART_TYPE_MSG_LIMIT:
+                --depth;
+                break;
+            case UMSGPAT_PART_TYPE_ARG_START:
+                if (depth > 1 && part.getArgType() == UMSGPAT_ARG_TYPE_SIMPLE) {
+                    UnicodeString type_name = argument_type_name(msg_pattern, i);
+                    if (type_name == UNICODE_STRING_SIMPLE("date") ||
+                        type_name == UNICODE_STRING_SIMPLE("time")) {
+                        return true;
+                    }
+                }
+                break;
+            default:
+                break;
+        }
+    }
+    return false;
+}
+
+// Raise ValueError if a time zone is given for a pattern whose date or time
+// arguments can't all be set to it.
+bool check_time_zone(const FormatterPool& pool, const BasicTimeZone* time_zone) {
+    if (time_zone != nullptr && pool.has_nested_dates) {
+        PyErr_SetString(PyExc_ValueError,
+                        "time_zone is not supported for date or time arguments nested in "
+                        "plural, select, or choice arguments");
+        return false;
+    }
+    return true;
+}
+
+// Return the compiled pattern for a pattern and locale, from the cache or
+// newly compiled. Returns nullptr with an exception set on error.
+std::shared_ptr<FormatterPool> get_formatter_pool(ModuleState* mod_state, const Locale& locale,
+                                                  const char* pattern, Py_ssize_t pattern_len,
+                                                  const UnicodeString& upattern) {
+    std::string cache_key(locale.getName());
+    cache_key.push_back('\0');
+    cache_key.append(pattern, pattern_len);
+
+    std::shared_ptr<FormatterPool> pool = mod_state->format_cache->lookup(cache_key);
+    if (pool == nullptr) {
+        UErrorCode status = U_ZERO_ERROR;
+        auto formatter = std::make_unique<MessageFormat>(upattern, locale, status);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError, "Failed to create MessageFormat: %s",
+                         u_errorName(status));
+            return nullptr;
+        }
+        pool = std::make_shared<FormatterPool>(formatter.release(), mod_state->default_time_zone,
+                                               has_nested_date_arguments(upattern));
+        mod_state->format_cache->store(std::move(cache_key), pool);
+    }
+    return pool;
+}
+
+// Resolve a time zone argument, an IANA time zone name or a ZoneInfo
+// object, to a zone from the module's registry. None resolves to nullptr,
+// for ICU's default time zone.
+bool lookup_time_zone(ModuleState* mod_state, PyObject* obj, const BasicTimeZone** time_zone) {
+    return icu4py::lookup_time_zone(mod_state->time_zones, mod_state->zoneinfo_type,
+                                    mod_state->str_key, obj, time_zone);
+}
+
 int MessageFormat_init(MessageFormatObject* self, PyObject* args, PyObject* kwds) {
     const char* pattern;
     PyObject* locale_obj;
     Py_ssize_t pattern_len;
+    Py_ssize_t cache_size = 0;
+    PyObject* time_zone_obj = Py_None;
 
-    static const char* kwlist[] = {"pattern", "locale", nullptr};
+    static const char* kwlist[] = {"pattern", "locale", "cache_size", "time_zone", nullptr};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s#O",
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s#O|nO",
                                      const_cast<char**>(kwlist),
-                                     &pattern, &pattern_len, &locale_obj)) {
+                                     &pattern, &pattern_len, &locale_obj, &cache_size,
+                                     &time_zone_obj)) {
+        return -1;
+    }
+    if (cache_size < 0) {
+        PyErr_SetString(PyExc_ValueError, "cache_size must be non-negative");
         return -1;
     }
 
@@ -107,211 +586,359 @@ int MessageFormat_init(MessageFormatObject* self, PyObject* args, PyObject* kwds
     }
     ModuleState* mod_state = get_module_state(module);
 
-    UErrorCode status = U_ZERO_ERROR;
+    const BasicTimeZone* time_zone;
+    if (!lookup_time_zone(mod_state, time_zone_obj, &time_zone)) {
+        return -1;
+    }
+
     UnicodeString upattern = UnicodeString::fromUTF8(StringPiece(pattern, pattern_len));
     Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return -1;
+    }
+
+    std::shared_ptr<FormatterPool> pool =
+        get_formatter_pool(mod_state, locale, pattern, pattern_len, upattern);
+    if (pool == nullptr || !check_time_zone(*pool, time_zone)) {
+        return -1;
+    }
+
+    free_segments(self);
+    free_formatters(self);
+    self->formatter = pool->formatter;
+    self->pool = new std::shared_ptr<FormatterPool>(std::move(pool));
+
+    if (!extract_arguments(self, upattern)) {
+        return -1;
+    }
 
-    if (PyUnicode_Check(locale_obj)) {
-        const char* locale_str = PyUnicode_AsUTF8(locale_obj);
-        if (locale_str == nullptr) {
+    Py_CLEAR(self->result_cache);
+    if (cache_size > 0) {
+        self->result_cache = PyDict_New();
+        if (self->result_cache == nullptr) {
             return -1;
         }
-        locale = Locale(locale_str);
+    }
+    self->result_cache_size = cache_size;
+    self->result_cache_hits = 0;
+    self->result_cache_misses = 0;
+    self->time_zone = time_zone;
+
+    return 0;
+}
+
+bool datetime_to_formattable(PyObject* obj, Formattable& formattable, ModuleState* state,
+                              const BasicTimeZone* time_zone) {
+    UDate udate;
+    if (!datetime_to_udate(obj, state->str_utcoffset, time_zone, udate)) {
+        return false;
+    }
+    formattable = Formattable(udate, Formattable::kIsDate);
+    return true;
+}
+
+// Times are formatted as that time on 1970-01-01.
+bool time_to_formattable(PyObject* obj, Formattable& formattable, ModuleState* state,
+                          const BasicTimeZone* time_zone) {
+    UDate udate;
+    if (!time_to_udate(obj, state->str_utcoffset, time_zone, udate)) {
+        return false;
+    }
+    formattable = Formattable(udate, Formattable::kIsDate);
+    return true;
+}
+
+// Timedeltas are formatted as a number of seconds, as used by the
+// "duration" argument type.
+void timedelta_to_formattable(PyObject* obj, Formattable& formattable) {
+    int64_t seconds = static_cast<int64_t>(PyDateTime_DELTA_GET_DAYS(obj)) * 86400 +
+                      PyDateTime_DELTA_GET_SECONDS(obj);
+    int microseconds = PyDateTime_DELTA_GET_MICROSECONDS(obj);
+    if (microseconds == 0) {
+        formattable = Formattable(seconds);
     } else {
-        int is_locale = PyObject_IsInstance(locale_obj, mod_state->locale_type);
-        if (is_locale == -1) {
-            return -1;
+        formattable = Formattable(static_cast<double>(seconds) + microseconds / 1e6);
+    }
+}
+
+bool str_to_formattable(PyObject* obj, Formattable& formattable) {
+    Py_ssize_t size;
+    const char* str_val = PyUnicode_AsUTF8AndSize(obj, &size);
+    if (str_val == nullptr) {
+        return false;
+    }
+    formattable = Formattable(UnicodeString::fromUTF8(StringPiece(str_val, size)));
+    return true;
+}
+
+bool date_to_formattable(PyObject* obj, Formattable& formattable, ModuleState* state,
+                          const BasicTimeZone* time_zone) {
+    UDate udate;
+    if (!date_to_udate(obj, time_zone, udate)) {
+        return false;
+    }
+    formattable = Formattable(udate, Formattable::kIsDate);
+    return true;
+}
+
+void set_unsupported_value_error(PyObject* obj) {
+    PyObject* repr = PyObject_Repr(obj);
+    if (repr != nullptr) {
+        const char* repr_str = PyUnicode_AsUTF8(repr);
+        if (repr_str != nullptr) {
+            PyErr_Format(PyExc_TypeError,
+                        "Parameter values must be int, float, str, Decimal, datetime, date, time, or timedelta, got %s",
+                        repr_str);
+        } else {
+            PyErr_SetString(PyExc_TypeError, "Parameter values must be int, float, str, Decimal, datetime, date, time, or timedelta");
         }
-        if (is_locale == 0) {
-            PyErr_SetString(PyExc_TypeError, "locale must be a string or Locale object");
-            return -1;
+        Py_DECREF(repr);
+    } else {
+        PyErr_SetString(PyExc_TypeError, "Parameter values must be int, float, str, Decimal, datetime, date, time, or timedelta");
+    }
+}
+
+// Naive datetimes, dates, and times are interpreted in time_zone.
+bool pyobject_to_formattable(PyObject* obj, Formattable& formattable, ModuleState* state,
+                             const BasicTimeZone* time_zone) {
+    // Exact types are matched by pointer first, so common values skip the
+    // subclass checks below.
+    PyTypeObject* type = Py_TYPE(obj);
+    if (type == &PyUnicode_Type) {
+        return str_to_formattable(obj, formattable);
+    }
+    if (type == &PyLong_Type) {
+        return long_to_formattable(obj, formattable);
+    }
+    if (type == &PyFloat_Type) {
+        return float_to_formattable(obj, formattable);
+    }
+    if (type == &PyBool_Type) {
+        formattable = Formattable(static_cast<int64_t>(obj == Py_True));
+        return true;
+    }
+    if (reinterpret_cast<PyObject*>(type) == state->decimal_decimal_type) {
+        return digits_to_formattable(obj, formattable, "Decimal");
+    }
+    if (type == PyDateTimeAPI->DateTimeType) {
+        return datetime_to_formattable(obj, formattable, state, time_zone);
+    }
+    if (type == PyDateTimeAPI->DateType) {
+        return date_to_formattable(obj, formattable, state, time_zone);
+    }
+    if (type == PyDateTimeAPI->TimeType) {
+        return time_to_formattable(obj, formattable, state, time_zone);
+    }
+    if (type == PyDateTimeAPI->DeltaType) {
+        timedelta_to_formattable(obj, formattable);
+        return true;
+    }
+    if (obj == Py_None) {
+        set_unsupported_value_error(obj);
+        return false;
+    }
+
+    // Enum members format as their value, checked before the subclass
+    // checks so IntEnum and StrEnum members don't format as their name.
+    int is_enum = PyObject_IsInstance(obj, state->enum_enum_type);
+    if (is_enum == -1) {
+        return false;
+    } else if (is_enum == 1) {
+        PyObject* value = PyObject_GetAttr(obj, state->str_value);
+        if (value == nullptr) {
+            return false;
         }
+        bool result = false;
+        if (Py_EnterRecursiveCall(" while converting an Enum value") == 0) {
+            result = pyobject_to_formattable(value, formattable, state, time_zone);
+            Py_LeaveRecursiveCall();
+        }
+        Py_DECREF(value);
+        return result;
+    }
 
-        LocaleObject* locale_pyobj = reinterpret_cast<LocaleObject*>(locale_obj);
-        if (locale_pyobj->locale == nullptr) {
-            PyErr_SetString(PyExc_ValueError, "Locale object has null internal locale");
-            return -1;
+    if (PyLong_Check(obj)) {
+        return long_to_formattable(obj, formattable);
+    }
+    if (PyUnicode_Check(obj)) {
+        return str_to_formattable(obj, formattable);
+    }
+    if (PyFloat_Check(obj)) {
+        return float_to_formattable(obj, formattable);
+    }
+
+    int is_decimal = PyObject_IsInstance(obj, state->decimal_decimal_type);
+    if (is_decimal == -1) {
+        return false;
+    } else if (is_decimal == 1) {
+        return digits_to_formattable(obj, formattable, "Decimal");
+    }
+
+    if (PyDateTime_Check(obj)) {
+        return datetime_to_formattable(obj, formattable, state, time_zone);
+    }
+    if (PyDate_Check(obj)) {
+        return date_to_formattable(obj, formattable, state, time_zone);
+    }
+    if (PyTime_Check(obj)) {
+        return time_to_formattable(obj, formattable, state, time_zone);
+    }
+    if (PyDelta_Check(obj)) {
+        timedelta_to_formattable(obj, formattable);
+        return true;
+    }
+
+    set_unsupported_value_error(obj);
+    return false;
+}
+
+void add_key_to_error(PyObject* key) {
+    if (PyErr_Occurred()) {
+        PyObject *exc_type, *exc_value, *exc_tb;
+        PyErr_Fetch(&exc_type, &exc_value, &exc_tb);
+
+        PyObject* key_repr = PyObject_Repr(key);
+
+        if (key_repr != nullptr) {
+            const char* key_repr_str = PyUnicode_AsUTF8(key_repr);
+
+            if (key_repr_str != nullptr && exc_value != nullptr) {
+                PyObject* orig_msg = PyObject_Str(exc_value);
+                if (orig_msg != nullptr) {
+                    const char* orig_msg_str = PyUnicode_AsUTF8(orig_msg);
+                    if (orig_msg_str != nullptr) {
+                        PyErr_Format(exc_type != nullptr ? (PyObject*)exc_type : PyExc_TypeError,
+                                   "%s for key %s",
+                                   orig_msg_str, key_repr_str);
+                    }
+                    Py_DECREF(orig_msg);
+                }
+            }
+        }
+
+        Py_XDECREF(key_repr);
+        Py_XDECREF(exc_type);
+        Py_XDECREF(exc_value);
+        Py_XDECREF(exc_tb);
+
+        if (!PyErr_Occurred()) {
+            PyErr_SetString(PyExc_TypeError, "Failed to convert dictionary value to Formattable");
         }
-        locale = *locale_pyobj->locale;
+    } else {
+        PyErr_SetString(PyExc_TypeError, "Failed to convert dictionary value to Formattable");
     }
+}
 
-    self->formatter = new MessageFormat(upattern, locale, status);
+bool convert_value(PyObject* key, PyObject* value, Formattable& formattable,
+                   ModuleState* mod_state, const BasicTimeZone* time_zone) {
+    if (time_zone == nullptr) {
+        time_zone = mod_state->default_time_zone;
+    }
+    if (!pyobject_to_formattable(value, formattable, mod_state, time_zone)) {
+        add_key_to_error(key);
+        return false;
+    }
+    return true;
+}
 
-    if (U_FAILURE(status)) {
-        delete self->formatter;
-        self->formatter = nullptr;
-        PyErr_Format(PyExc_ValueError, "Failed to create MessageFormat: %s",
-                     u_errorName(status));
-        return -1;
+bool convert_key(PyObject* key, UnicodeString& name) {
+    Py_ssize_t key_size;
+    const char* key_str = PyUnicode_AsUTF8AndSize(key, &key_size);
+    if (key_str == nullptr) {
+        PyErr_Clear();
+        PyObject* key_repr = PyObject_Repr(key);
+        if (key_repr != nullptr) {
+            const char* key_repr_str = PyUnicode_AsUTF8(key_repr);
+            if (key_repr_str != nullptr) {
+                PyErr_Format(PyExc_TypeError, "Dictionary keys must be strings, got %s", key_repr_str);
+            } else {
+                PyErr_SetString(PyExc_TypeError, "Dictionary keys must be strings");
+            }
+            Py_DECREF(key_repr);
+        } else {
+            PyErr_SetString(PyExc_TypeError, "Dictionary keys must be strings");
+        }
+        return false;
     }
+    name = UnicodeString::fromUTF8(StringPiece(key_str, key_size));
+    return true;
+}
 
-    return 0;
+int dict_get_item_ref(PyObject* dict, PyObject* key, PyObject** result) {
+#if PY_VERSION_HEX >= 0x030D0000
+    return PyDict_GetItemRef(dict, key, result);
+#else
+    PyObject* item = PyDict_GetItemWithError(dict, key);
+    if (item == nullptr) {
+        *result = nullptr;
+        return PyErr_Occurred() ? -1 : 0;
+    }
+    Py_INCREF(item);
+    *result = item;
+    return 1;
+#endif
 }
 
-bool pyobject_to_formattable(PyObject* obj, Formattable& formattable, ModuleState* state) {
-    if (PyLong_Check(obj)) {
-        int overflow;
-        long long long_val = PyLong_AsLongLongAndOverflow(obj, &overflow);
-        if (overflow != 0) {
-            PyObject* str_obj = PyObject_Str(obj);
-            if (str_obj == nullptr) {
+// Index of key in the precomputed argument names, or -1 if absent.
+Py_ssize_t find_argument_index(MessageFormatObject* self, PyObject* key) {
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+    // Keyword names from call sites are interned, as are ours.
+    for (Py_ssize_t i = 0; i < arg_count; ++i) {
+        if (PyTuple_GET_ITEM(self->arg_names, i) == key) {
+            return i;
+        }
+    }
+    for (Py_ssize_t i = 0; i < arg_count; ++i) {
+        if (PyUnicode_Compare(PyTuple_GET_ITEM(self->arg_names, i), key) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+// Pass the object's precomputed names to ICU, holding a reference to them.
+void use_argument_names(MessageFormatObject* self, FormatArguments& arguments) {
+    arguments.shared_names = *self->arg_name_ustrings;
+    arguments.names_ptr = arguments.shared_names.get();
+}
+
+bool collect_dict_arguments(MessageFormatObject* self, PyObject* dict, ModuleState* mod_state,
+                            FormatArguments& arguments) {
+    Py_ssize_t size = PyDict_Size(dict);
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+
+    // Fast path: the dict holds exactly the pattern's arguments, so the
+    // precomputed names can be used without converting any keys.
+    if (size == arg_count && size > 0) {
+        arguments.values.resize(size);
+        Py_ssize_t i = 0;
+        for (; i < arg_count; ++i) {
+            PyObject* key = PyTuple_GET_ITEM(self->arg_names, i);
+            PyObject* value;
+            int found = dict_get_item_ref(dict, key, &value);
+            if (found < 0) {
                 return false;
             }
-            Py_ssize_t size;
-            const char* str_val = PyUnicode_AsUTF8AndSize(str_obj, &size);
-            if (str_val == nullptr) {
-                Py_DECREF(str_obj);
-                return false;
+            if (found == 0) {
+                break;
             }
-            UErrorCode status = U_ZERO_ERROR;
-            formattable = Formattable(StringPiece(str_val, size), status);
-            Py_DECREF(str_obj);
-            if (U_FAILURE(status)) {
-                PyErr_Format(PyExc_ValueError, "Failed to create Formattable from overflowed int: %s",
-                              u_errorName(status));
+            bool ok = convert_value(key, value, arguments.values[i], mod_state,
+                                    arguments.time_zone);
+            Py_DECREF(value);
+            if (!ok) {
                 return false;
             }
-            return true;
         }
-        if (long_val == -1 && PyErr_Occurred()) {
-            return false;
+        if (i == arg_count) {
+            use_argument_names(self, arguments);
+            arguments.count = static_cast<int32_t>(arg_count);
+            return true;
         }
-        formattable = Formattable(static_cast<int64_t>(long_val));
-        return true;
-    }
-
-      if (PyUnicode_Check(obj)) {
-          Py_ssize_t size;
-          const char* str_val = PyUnicode_AsUTF8AndSize(obj, &size);
-          if (str_val == nullptr) {
-              return false;
-          }
-          formattable = Formattable(UnicodeString::fromUTF8(StringPiece(str_val, size)));
-          return true;
-      }
-
-      if (PyFloat_Check(obj)) {
-          double dbl_val = PyFloat_AsDouble(obj);
-          if (dbl_val == -1.0 && PyErr_Occurred()) {
-              return false;
-          }
-          formattable = Formattable(dbl_val);
-          return true;
-      }
-
-      int is_decimal = PyObject_IsInstance(obj, state->decimal_decimal_type);
-      if (is_decimal == -1) {
-          return false;
-      } else if (is_decimal == 1) {
-          PyObject* str_obj = PyObject_Str(obj);
-          if (str_obj == nullptr) {
-              return false;
-          }
-          Py_ssize_t size;
-          const char* str_val = PyUnicode_AsUTF8AndSize(str_obj, &size);
-          if (str_val == nullptr) {
-              Py_DECREF(str_obj);
-              return false;
-          }
-          UErrorCode status = U_ZERO_ERROR;
-          formattable = Formattable(StringPiece(str_val, size), status);
-          Py_DECREF(str_obj);
-          if (U_FAILURE(status)) {
-              PyErr_Format(PyExc_ValueError, "Failed to create Formattable from Decimal: %s",
-                            u_errorName(status));
-              return false;
-          }
-          return true;
-      }
-
-      int is_datetime = PyObject_IsInstance(obj, state->datetime_datetime_type);
-      if (is_datetime == -1) {
-          return false;
-      } else if (is_datetime == 1) {
-          PyObject* timestamp = PyObject_CallMethod(obj, "timestamp", nullptr);
-          if (timestamp == nullptr) {
-              return false;
-          }
-          double timestamp_seconds = PyFloat_AsDouble(timestamp);
-          Py_DECREF(timestamp);
-          if (timestamp_seconds == -1.0 && PyErr_Occurred()) {
-              return false;
-          }
-          UDate udate = timestamp_seconds * 1000.0;
-          formattable = Formattable(udate, Formattable::kIsDate);
-          return true;
-      }
-
-      int is_date = PyObject_IsInstance(obj, state->datetime_date_type);
-      if (is_date == -1) {
-          return false;
-      } else if (is_date == 1) {
-          PyObject* combine = PyObject_GetAttrString(state->datetime_datetime_type, "combine");
-          if (combine == nullptr) {
-              return false;
-          }
-
-          PyObject* min_time = PyObject_GetAttrString(state->datetime_time_type, "min");
-          if (min_time == nullptr) {
-              Py_DECREF(combine);
-              return false;
-          }
-
-          PyObject* dt = PyObject_CallFunctionObjArgs(combine, obj, min_time, nullptr);
-          Py_DECREF(combine);
-          Py_DECREF(min_time);
-          if (dt == nullptr) {
-              return false;
-          }
-
-          PyObject* timestamp = PyObject_CallMethod(dt, "timestamp", nullptr);
-          Py_DECREF(dt);
-          if (timestamp == nullptr) {
-              return false;
-          }
-          double timestamp_seconds = PyFloat_AsDouble(timestamp);
-          Py_DECREF(timestamp);
-          if (timestamp_seconds == -1.0 && PyErr_Occurred()) {
-              return false;
-          }
-          UDate udate = timestamp_seconds * 1000.0;
-          formattable = Formattable(udate, Formattable::kIsDate);
-          return true;
-      }
-
-      PyObject* repr = PyObject_Repr(obj);
-      if (repr != nullptr) {
-          const char* repr_str = PyUnicode_AsUTF8(repr);
-          if (repr_str != nullptr) {
-              PyErr_Format(PyExc_TypeError,
-                          "Parameter values must be int, float, str, Decimal, datetime, or date, got %s",
-                          repr_str);
-          } else {
-              PyErr_SetString(PyExc_TypeError, "Parameter values must be int, float, str, Decimal, datetime, or date");
-          }
-          Py_DECREF(repr);
-      } else {
-          PyErr_SetString(PyExc_TypeError, "Parameter values must be int, float, str, Decimal, datetime, or date");
-      }
-      return false;
-}
-
-bool dict_to_parallel_arrays(PyObject* dict, ModuleState* mod_state, UnicodeString*& names,
-                             Formattable*& values, int32_t& count) {
-    if (!PyDict_Check(dict)) {
-        PyErr_SetString(PyExc_TypeError, "Argument must be a dictionary");
-        return false;
-    }
-
-    count = static_cast<int32_t>(PyDict_Size(dict));
-    if (count == 0) {
-        names = nullptr;
-        values = nullptr;
-        return true;
     }
 
-    auto names_ptr = std::make_unique<UnicodeString[]>(count);
-    auto values_ptr = std::make_unique<Formattable[]>(count);
+    int32_t count = static_cast<int32_t>(size);
+    arguments.names.resize(count);
+    arguments.values.resize(count);
 
     Py_ssize_t pos = 0;
     PyObject* key;
@@ -341,152 +968,2058 @@ bool dict_to_parallel_arrays(PyObject* dict, ModuleState* mod_state, UnicodeStri
             break;
         }
 
-        Py_ssize_t key_size;
-        const char* key_str = PyUnicode_AsUTF8AndSize(key, &key_size);
-        if (key_str == nullptr) {
-            PyErr_Clear();
-            PyObject* key_repr = PyObject_Repr(key);
-            if (key_repr != nullptr) {
-                const char* key_repr_str = PyUnicode_AsUTF8(key_repr);
-                if (key_repr_str != nullptr) {
-                    PyErr_Format(PyExc_TypeError, "Dictionary keys must be strings, got %s", key_repr_str);
-                } else {
-                    PyErr_SetString(PyExc_TypeError, "Dictionary keys must be strings");
-                }
-                Py_DECREF(key_repr);
-            } else {
-                PyErr_SetString(PyExc_TypeError, "Dictionary keys must be strings");
-            }
+        if (!convert_key(key, arguments.names[i])) {
             err = true;
             break;
         }
-        names_ptr[i] = UnicodeString::fromUTF8(StringPiece(key_str, key_size));
 
-        if (!pyobject_to_formattable(value, values_ptr[i], mod_state)) {
-            if (PyErr_Occurred()) {
-                PyObject *exc_type, *exc_value, *exc_tb;
-                PyErr_Fetch(&exc_type, &exc_value, &exc_tb);
-
-                PyObject* key_repr = PyObject_Repr(key);
-
-                if (key_repr != nullptr) {
-                    const char* key_repr_str = PyUnicode_AsUTF8(key_repr);
-
-                    if (key_repr_str != nullptr && exc_value != nullptr) {
-                        PyObject* orig_msg = PyObject_Str(exc_value);
-                        if (orig_msg != nullptr) {
-                            const char* orig_msg_str = PyUnicode_AsUTF8(orig_msg);
-                            if (orig_msg_str != nullptr) {
-                                PyErr_Format(exc_type != nullptr ? (PyObject*)exc_type : PyExc_TypeError,
-                                           "%s for key %s",
-                                           orig_msg_str, key_repr_str);
-                            }
-                            Py_DECREF(orig_msg);
-                        }
-                    }
-                }
+        if (!convert_value(key, value, arguments.values[i], mod_state, arguments.time_zone)) {
+            err = true;
+            break;
+        }
+        ++i;
+    }
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+    if (err) {
+        return false;
+    }
+
+    arguments.names_ptr = arguments.names.data();
+    arguments.count = i;
+    return true;
+}
+
+bool collect_tuple_arguments(MessageFormatObject* self, PyObject* tuple, ModuleState* mod_state,
+                             FormatArguments& arguments) {
+    Py_ssize_t size = PyTuple_GET_SIZE(tuple);
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+    if (size != arg_count) {
+        PyErr_Format(PyExc_TypeError,
+                     "params tuple must have one item per argument (%zd), got %zd",
+                     arg_count, size);
+        return false;
+    }
+
+    arguments.values.resize(size);
+    for (Py_ssize_t i = 0; i < size; ++i) {
+        if (!convert_value(PyTuple_GET_ITEM(self->arg_names, i), PyTuple_GET_ITEM(tuple, i),
+                           arguments.values[i], mod_state, arguments.time_zone)) {
+            return false;
+        }
+    }
+
+    use_argument_names(self, arguments);
+    arguments.count = static_cast<int32_t>(size);
+    return true;
+}
+
+bool collect_keyword_arguments(MessageFormatObject* self, PyObject* const* values,
+                               PyObject* kwnames, ModuleState* mod_state,
+                               FormatArguments& arguments) {
+    Py_ssize_t nkwargs = PyTuple_GET_SIZE(kwnames);
+    arguments.values.resize(nkwargs);
+
+    if (nkwargs == PyTuple_GET_SIZE(self->arg_names)) {
+        Py_ssize_t j = 0;
+        for (; j < nkwargs; ++j) {
+            PyObject* key = PyTuple_GET_ITEM(kwnames, j);
+            Py_ssize_t i = find_argument_index(self, key);
+            if (i == -1) {
+                break;
+            }
+            if (!convert_value(key, values[j], arguments.values[i], mod_state,
+                               arguments.time_zone)) {
+                return false;
+            }
+        }
+        if (j == nkwargs) {
+            use_argument_names(self, arguments);
+            arguments.count = static_cast<int32_t>(nkwargs);
+            return true;
+        }
+    }
+
+    arguments.names.resize(nkwargs);
+    for (Py_ssize_t j = 0; j < nkwargs; ++j) {
+        PyObject* key = PyTuple_GET_ITEM(kwnames, j);
+        if (!convert_key(key, arguments.names[j]) ||
+            !convert_value(key, values[j], arguments.values[j], mod_state,
+                           arguments.time_zone)) {
+            return false;
+        }
+    }
+
+    arguments.names_ptr = arguments.names.data();
+    arguments.count = static_cast<int32_t>(nkwargs);
+    return true;
+}
+
+bool collect_params(MessageFormatObject* self, PyObject* params, ModuleState* mod_state,
+                    FormatArguments& arguments) {
+    if (PyDict_Check(params)) {
+        return collect_dict_arguments(self, params, mod_state, arguments);
+    }
+    if (PyTuple_Check(params)) {
+        return collect_tuple_arguments(self, params, mod_state, arguments);
+    }
+    PyErr_Format(PyExc_TypeError, "params must be a dict or tuple, not %.200s",
+                 Py_TYPE(params)->tp_name);
+    return false;
+}
+
+// Convert a formatted result to str, using buffer for the UTF-8 bytes.
+PyObject* ustring_to_pyunicode(const UnicodeString& ustr, std::string& buffer) {
+    buffer.clear();
+    ustr.toUTF8String(buffer);
+    return PyUnicode_FromStringAndSize(buffer.data(), buffer.size());
+}
+
+// Take a formatter set to time_zone, or nullptr for the default time zone.
+// Formatters already in that time zone are preferred, as setting it
+// clones the zone for each date and time argument.
+PooledFormatter acquire_formatter(FormatterPool& pool, const TimeZone* time_zone) {
+    PooledFormatter pooled{nullptr, nullptr};
+    {
+        std::lock_guard<std::mutex> lock(pool.mutex);
+        size_t chosen = pool.idle.size();
+        for (size_t i = pool.idle.size(); i-- > 0;) {
+            if (pool.idle[i].time_zone == time_zone) {
+                chosen = i;
+                break;
+            }
+            if (chosen == pool.idle.size() && pool.idle[i].formatter != pool.formatter) {
+                chosen = i;
+            }
+        }
+        if (chosen < pool.idle.size()) {
+            pooled = pool.idle[chosen];
+            pool.idle.erase(pool.idle.begin() + static_cast<std::ptrdiff_t>(chosen));
+        }
+    }
+
+    if (pooled.formatter == nullptr) {
+        // Cloning only reads the original's parsed pattern and sub-formats,
+        // so it's safe while another thread formats with the original. May
+        // be called without the GIL, so a failure is left to the caller to
+        // raise.
+        pooled.formatter = pool.formatter->clone();
+        if (pooled.formatter == nullptr) {
+            return pooled;
+        }
+    }
+    if (pooled.time_zone != time_zone) {
+        set_time_zone(pooled.formatter, time_zone != nullptr ? *time_zone : *pool.default_time_zone);
+        pooled.time_zone = time_zone;
+    }
+    return pooled;
+}
+
+void release_formatter(FormatterPool& pool, const PooledFormatter& pooled) {
+    {
+        std::lock_guard<std::mutex> lock(pool.mutex);
+        if (pooled.formatter == pool.formatter || pool.idle.size() < kMaxIdleFormatters) {
+            pool.idle.push_back(pooled);
+            return;
+        }
+    }
+    delete pooled.formatter;
+}
+
+// Format to UTF-8 in buffer, using result as scratch space. Once the
+// arguments are converted no Python objects are touched, so the GIL is
+// released while ICU formats and the result is encoded to UTF-8.
+bool format_to_utf8(MessageFormatObject* self, const FormatArguments& arguments,
+                    UnicodeString& result, std::string& buffer) {
+    UErrorCode status = U_ZERO_ERROR;
+    bool acquired;
+
+    // A reference, so the pool outlives a concurrent __init__() while the
+    // GIL is released.
+    std::shared_ptr<FormatterPool> shared_pool = *self->pool;
+    FormatterPool& pool = *shared_pool;
+
+    Py_BEGIN_ALLOW_THREADS
+    PooledFormatter pooled = acquire_formatter(pool, arguments.time_zone);
+    MessageFormat* formatter = pooled.formatter;
+    acquired = formatter != nullptr;
+    if (acquired) {
+        result.remove();
+        if (arguments.count == 0) {
+            FieldPosition field_pos;
+            formatter->format(nullptr, 0, result, field_pos, status);
+        } else {
+            formatter->format(arguments.names_ptr, arguments.values.data(), arguments.count,
+                              result, status);
+        }
+        release_formatter(pool, pooled);
+
+        if (U_SUCCESS(status)) {
+            buffer.clear();
+            result.toUTF8String(buffer);
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    if (!acquired) {
+        PyErr_NoMemory();
+        return false;
+    }
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to format message: %s",
+                     u_errorName(status));
+        return false;
+    }
+    return true;
+}
+
+// What format_params() returns the formatted message as.
+enum class FormatOutput { kStr, kBytes };
+
+PyObject* format_arguments(MessageFormatObject* self, const FormatArguments& arguments,
+                           UnicodeString& result, std::string& buffer,
+                           FormatOutput output = FormatOutput::kStr) {
+    if (!format_to_utf8(self, arguments, result, buffer)) {
+        return nullptr;
+    }
+    if (output == FormatOutput::kBytes) {
+        return PyBytes_FromStringAndSize(buffer.data(), buffer.size());
+    }
+    return PyUnicode_FromStringAndSize(buffer.data(), buffer.size());
+}
+
+// Whether a value can be part of a result cache key. Only types whose
+// equal values always format the same are accepted, which rules out
+// float (0.0 and -0.0), Decimal (1 and 1.0 select different plural
+// forms), and datetimes (fold is ignored when comparing).
+int is_cacheable_value(PyObject* value, ModuleState* mod_state) {
+    if (PyUnicode_CheckExact(value) || PyLong_CheckExact(value) || PyBool_Check(value)) {
+        return 1;
+    }
+    return PyObject_IsInstance(value, mod_state->enum_enum_type);
+}
+
+// Fill key with the values in arg_names order, from either a params dict
+// or keyword arguments, where names[i] maps to values[i]. Returns 0 when
+// the names don't match the pattern's arguments exactly.
+int fill_cache_key(MessageFormatObject* self, PyObject* key, PyObject* names,
+                   PyObject* const* values, PyObject* dict, ModuleState* mod_state) {
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+    for (Py_ssize_t i = 0; i < arg_count; ++i) {
+        PyObject* value;
+        if (dict != nullptr) {
+            int found = dict_get_item_ref(dict, PyTuple_GET_ITEM(self->arg_names, i), &value);
+            if (found <= 0) {
+                return found;
+            }
+            PyTuple_SET_ITEM(key, i, value);
+        } else {
+            Py_ssize_t index = find_argument_index(self, PyTuple_GET_ITEM(names, i));
+            if (index == -1 || PyTuple_GET_ITEM(key, index) != nullptr) {
+                return 0;
+            }
+            value = Py_NewRef(values[i]);
+            PyTuple_SET_ITEM(key, index, value);
+        }
+        int cacheable = is_cacheable_value(value, mod_state);
+        if (cacheable <= 0) {
+            return cacheable;
+        }
+    }
+    return 1;
+}
+
+// Build the result cache key for one format() call's params or keyword
+// arguments, or set *key to nullptr if the call can't be cached. Returns
+// false with an exception set on error.
+bool make_cache_key(MessageFormatObject* self, PyObject* params, PyObject* const* kwvalues,
+                    PyObject* kwnames, ModuleState* mod_state, PyObject** key) {
+    *key = nullptr;
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+
+    if (params != nullptr && PyTuple_Check(params)) {
+        if (PyTuple_GET_SIZE(params) != arg_count) {
+            return true;
+        }
+        for (Py_ssize_t i = 0; i < arg_count; ++i) {
+            int cacheable = is_cacheable_value(PyTuple_GET_ITEM(params, i), mod_state);
+            if (cacheable <= 0) {
+                return cacheable == 0;
+            }
+        }
+        *key = Py_NewRef(params);
+        return true;
+    }
+
+    Py_ssize_t size;
+    if (params != nullptr) {
+        if (!PyDict_Check(params)) {
+            return true;
+        }
+        size = PyDict_Size(params);
+    } else {
+        size = kwnames == nullptr ? 0 : PyTuple_GET_SIZE(kwnames);
+    }
+    if (size != arg_count) {
+        return true;
+    }
+
+    PyObject* new_key = PyTuple_New(arg_count);
+    if (new_key == nullptr) {
+        return false;
+    }
+    int filled = fill_cache_key(self, new_key, kwnames, kwvalues, params, mod_state);
+    if (filled <= 0) {
+        Py_DECREF(new_key);
+        return filled == 0;
+    }
+    *key = new_key;
+    return true;
+}
+
+// Return a new reference to the cached result for key, marking it most
+// recently used, or nullptr if there is none or on error.
+PyObject* lookup_cached_result(MessageFormatObject* self, PyObject* key) {
+    PyObject* result = nullptr;
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+    PyObject* cached = PyDict_GetItemWithError(self->result_cache, key);
+    if (cached != nullptr) {
+        result = Py_NewRef(cached);
+        // Move to the end, as dicts keep insertion order.
+        if (PyDict_DelItem(self->result_cache, key) < 0 ||
+            PyDict_SetItem(self->result_cache, key, result) < 0) {
+            Py_CLEAR(result);
+        } else {
+            ++self->result_cache_hits;
+        }
+    } else if (!PyErr_Occurred()) {
+        ++self->result_cache_misses;
+    }
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+    return result;
+}
+
+bool store_cached_result(MessageFormatObject* self, PyObject* key, PyObject* result) {
+    bool ok = true;
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+    if (PyDict_SetItem(self->result_cache, key, result) < 0) {
+        ok = false;
+    } else if (PyDict_GET_SIZE(self->result_cache) > self->result_cache_size) {
+        Py_ssize_t pos = 0;
+        PyObject* oldest;
+        PyObject* value;
+        PyDict_Next(self->result_cache, &pos, &oldest, &value);
+        Py_INCREF(oldest);
+        ok = PyDict_DelItem(self->result_cache, oldest) == 0;
+        Py_DECREF(oldest);
+    }
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+    return ok;
+}
+
+// Format one call's params or keyword arguments in the given time zone,
+// going through the result cache when it's enabled. The cache only holds
+// str results.
+PyObject* format_params(MessageFormatObject* self, PyObject* params, PyObject* const* kwvalues,
+                        PyObject* kwnames, const BasicTimeZone* time_zone,
+                        ModuleState* mod_state, FormatArguments& arguments,
+                        UnicodeString& result, std::string& buffer,
+                        FormatOutput output = FormatOutput::kStr) {
+    arguments.time_zone = time_zone;
+
+    PyObject* key = nullptr;
+    if (self->result_cache != nullptr && output == FormatOutput::kStr) {
+        if (!make_cache_key(self, params, kwvalues, kwnames, mod_state, &key)) {
+            return nullptr;
+        }
+        if (key != nullptr && time_zone != self->time_zone) {
+            // Registry zones live as long as the module, so their address
+            // identifies them.
+            PyObject* zone_key = PyLong_FromVoidPtr(const_cast<BasicTimeZone*>(time_zone));
+            PyObject* zoned_key = nullptr;
+            if (zone_key != nullptr) {
+                zoned_key = PyTuple_Pack(2, key, zone_key);
+                Py_DECREF(zone_key);
+            }
+            Py_SETREF(key, zoned_key);
+            if (key == nullptr) {
+                return nullptr;
+            }
+        }
+        if (key != nullptr) {
+            PyObject* cached = lookup_cached_result(self, key);
+            if (cached != nullptr || PyErr_Occurred()) {
+                Py_DECREF(key);
+                return cached;
+            }
+        } else {
+#ifdef Py_GIL_DISABLED
+            Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+            ++self->result_cache_misses;
+#ifdef Py_GIL_DISABLED
+            Py_END_CRITICAL_SECTION();
+#endif
+        }
+    }
+
+    bool ok;
+    if (params != nullptr) {
+        ok = collect_params(self, params, mod_state, arguments);
+    } else if (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0) {
+        ok = collect_keyword_arguments(self, kwvalues, kwnames, mod_state, arguments);
+    } else {
+        arguments.count = 0;
+        ok = true;
+    }
+
+    PyObject* str_obj = ok ? format_arguments(self, arguments, result, buffer, output) : nullptr;
+    if (key != nullptr) {
+        if (str_obj != nullptr && !store_cached_result(self, key, str_obj)) {
+            Py_CLEAR(str_obj);
+        }
+        Py_DECREF(key);
+    }
+    return str_obj;
+}
+
+// Resolve a call's time_zone argument, defaulting to the object's time
+// zone, and check the pattern supports it.
+bool resolve_call_time_zone(MessageFormatObject* self, ModuleState* mod_state,
+                            PyObject* time_zone_obj, const BasicTimeZone** time_zone) {
+    if (!lookup_time_zone(mod_state, time_zone_obj, time_zone)) {
+        return false;
+    }
+    if (*time_zone == nullptr) {
+        *time_zone = self->time_zone;
+    }
+    return check_time_zone(**self->pool, *time_zone);
+}
+
+// Get the time_zone argument of a method that takes no other keyword
+// arguments, or None when it isn't given.
+bool get_time_zone_argument(ModuleState* mod_state, PyObject* const* kwvalues,
+                            PyObject* kwnames, const char* method_name,
+                            PyObject** time_zone_obj) {
+    *time_zone_obj = Py_None;
+    Py_ssize_t nkwargs = kwnames == nullptr ? 0 : PyTuple_GET_SIZE(kwnames);
+    for (Py_ssize_t j = 0; j < nkwargs; ++j) {
+        PyObject* name = PyTuple_GET_ITEM(kwnames, j);
+        if (name != mod_state->str_time_zone &&
+            PyUnicode_Compare(name, mod_state->str_time_zone) != 0) {
+            PyErr_Format(PyExc_TypeError, "%s() got an unexpected keyword argument %R",
+                         method_name, name);
+            return false;
+        }
+        *time_zone_obj = kwvalues[j];
+    }
+    return true;
+}
+
+// The arguments of a format() style call, which takes either a params
+// argument or keyword arguments, with the time_zone keyword argument
+// resolved and taken out of the message arguments.
+struct CallArguments {
+    PyObject* params = nullptr;
+    PyObject* const* kwvalues = nullptr;
+    PyObject* kwnames = nullptr;
+    const BasicTimeZone* time_zone = nullptr;
+    // The other keyword arguments, when time_zone is given with some.
+    std::vector<PyObject*> other_kwvalues;
+    PyObject* other_kwnames = nullptr;
+
+    ~CallArguments() { Py_XDECREF(other_kwnames); }
+};
+
+bool parse_call_arguments(MessageFormatObject* self, ModuleState* mod_state,
+                          PyObject* const* args, Py_ssize_t nargs, PyObject* kwnames,
+                          const char* method_name, CallArguments& call) {
+    // The time_zone keyword argument isn't a message argument, so count
+    // only the others.
+    Py_ssize_t nkwargs = kwnames == nullptr ? 0 : PyTuple_GET_SIZE(kwnames);
+    Py_ssize_t time_zone_index = -1;
+    for (Py_ssize_t j = 0; j < nkwargs; ++j) {
+        PyObject* name = PyTuple_GET_ITEM(kwnames, j);
+        if (name == mod_state->str_time_zone ||
+            PyUnicode_Compare(name, mod_state->str_time_zone) == 0) {
+            time_zone_index = j;
+            --nkwargs;
+            break;
+        }
+    }
+    if (nargs > 1) {
+        PyErr_Format(PyExc_TypeError, "%s() takes at most 1 positional argument (%zd given)",
+                     method_name, nargs);
+        return false;
+    }
+    if (nargs == 1 && nkwargs > 0) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s() takes either a params argument or keyword arguments, not both",
+                     method_name);
+        return false;
+    }
+
+    PyObject* time_zone_obj = time_zone_index == -1 ? Py_None : args[nargs + time_zone_index];
+    if (!resolve_call_time_zone(self, mod_state, time_zone_obj, &call.time_zone)) {
+        return false;
+    }
+
+    call.params = nargs == 1 ? args[0] : nullptr;
+    if (time_zone_index == -1) {
+        call.kwvalues = args + nargs;
+        call.kwnames = kwnames;
+        return true;
+    }
+    if (nkwargs == 0) {
+        return true;
+    }
+
+    // Pass on the other keyword arguments without time_zone.
+    call.other_kwnames = PyTuple_New(nkwargs);
+    if (call.other_kwnames == nullptr) {
+        return false;
+    }
+    call.other_kwvalues.reserve(nkwargs);
+    for (Py_ssize_t j = 0, k = 0; j <= nkwargs; ++j) {
+        if (j == time_zone_index) {
+            continue;
+        }
+        PyTuple_SET_ITEM(call.other_kwnames, k++, Py_NewRef(PyTuple_GET_ITEM(kwnames, j)));
+        call.other_kwvalues.push_back(args[nargs + j]);
+    }
+    call.kwvalues = call.other_kwvalues.data();
+    call.kwnames = call.other_kwnames;
+    return true;
+}
+
+// Shared by format() and format_bytes(), which take the same arguments.
+PyObject* format_call(PyObject* self, PyTypeObject* defining_class, PyObject* const* args,
+                      Py_ssize_t nargs, PyObject* kwnames, const char* method_name,
+                      FormatOutput output) {
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+
+    CallArguments call;
+    if (!parse_call_arguments(self_obj, mod_state, args, nargs, kwnames, method_name, call)) {
+        return nullptr;
+    }
+
+    FormatArguments arguments;
+    UnicodeString result;
+    std::string utf8;
+    return format_params(self_obj, call.params, call.kwvalues, call.kwnames, call.time_zone,
+                         mod_state, arguments, result, utf8, output);
+}
+
+PyObject* MessageFormat_format(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    return format_call(self, defining_class, args, nargs, kwnames, "format", FormatOutput::kStr);
+}
+
+PyObject* MessageFormat_format_bytes(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    return format_call(self, defining_class, args, nargs, kwnames, "format_bytes",
+                       FormatOutput::kBytes);
+}
+
+PyObject* MessageFormat_format_into(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs < 2 || nargs > 3) {
+        PyErr_Format(PyExc_TypeError,
+                     "format_into() takes 2 or 3 positional arguments (%zd given)", nargs);
+        return nullptr;
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* time_zone_obj;
+    if (!get_time_zone_argument(mod_state, args + nargs, kwnames, "format_into",
+                                &time_zone_obj)) {
+        return nullptr;
+    }
+
+    Py_ssize_t offset = 0;
+    if (nargs == 3) {
+        offset = PyNumber_AsSsize_t(args[2], PyExc_OverflowError);
+        if (offset == -1 && PyErr_Occurred()) {
+            return nullptr;
+        }
+        if (offset < 0) {
+            PyErr_SetString(PyExc_ValueError, "offset must be non-negative");
+            return nullptr;
+        }
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+
+    FormatArguments arguments;
+    if (!resolve_call_time_zone(self_obj, mod_state, time_zone_obj, &arguments.time_zone)) {
+        return nullptr;
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(args[1], &view, PyBUF_WRITABLE) < 0) {
+        return nullptr;
+    }
+
+    UnicodeString result;
+    std::string utf8;
+    bool ok = collect_params(self_obj, args[0], mod_state, arguments) &&
+              format_to_utf8(self_obj, arguments, result, utf8);
+    Py_ssize_t size = static_cast<Py_ssize_t>(utf8.size());
+    if (ok && (offset > view.len || size > view.len - offset)) {
+        PyErr_Format(PyExc_ValueError,
+                     "Buffer too small: the message needs %zd bytes at offset %zd, "
+                     "but the buffer has %zd bytes",
+                     size, offset, view.len);
+        ok = false;
+    }
+    if (ok) {
+        std::memcpy(static_cast<char*>(view.buf) + offset, utf8.data(), size);
+    }
+    PyBuffer_Release(&view);
+
+    if (!ok) {
+        return nullptr;
+    }
+    return PyLong_FromSsize_t(size);
+}
+
+PyObject* MessageFormat_format_to_parts(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+
+    CallArguments call;
+    if (!parse_call_arguments(self_obj, mod_state, args, nargs, kwnames, "format_to_parts",
+                              call)) {
+        return nullptr;
+    }
+
+    FormatArguments arguments;
+    arguments.time_zone = call.time_zone;
+    bool ok;
+    if (call.params != nullptr) {
+        ok = collect_params(self_obj, call.params, mod_state, arguments);
+    } else if (call.kwnames != nullptr && PyTuple_GET_SIZE(call.kwnames) > 0) {
+        ok = collect_keyword_arguments(self_obj, call.kwvalues, call.kwnames, mod_state,
+                                       arguments);
+    } else {
+        ok = true;
+    }
+    if (!ok) {
+        return nullptr;
+    }
+
+    PyObject* parts = PyList_New(0);
+    if (parts == nullptr) {
+        return nullptr;
+    }
+
+    UnicodeString result;
+    UnicodeString piece;
+    UErrorCode status = U_ZERO_ERROR;
+    Py_ssize_t position = 0;
+    // The segments are set to the object's time zone, so a different one
+    // is set for each argument and then reset.
+    const TimeZone* call_time_zone = call.time_zone != self_obj->time_zone ? call.time_zone
+                                                                           : nullptr;
+    const TimeZone& object_time_zone = self_obj->time_zone != nullptr
+                                           ? *self_obj->time_zone
+                                           : *mod_state->default_time_zone;
+
+    // ICU objects need external synchronization
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+
+    ok = self_obj->segments != nullptr || build_segments(self_obj);
+    if (ok) {
+        for (const MessageSegment& segment : *self_obj->segments) {
+            result.append(segment.literal);
+            position += segment.literal_length;
+            if (segment.formatter == nullptr) {
+                break;
+            }
+
+            piece.remove();
+            if (call_time_zone != nullptr) {
+                set_time_zone(segment.formatter.get(), *call_time_zone);
+            }
+            if (arguments.count == 0) {
+                FieldPosition field_pos;
+                segment.formatter->format(nullptr, 0, piece, field_pos, status);
+            } else {
+                segment.formatter->format(arguments.names_ptr, arguments.values.data(),
+                                          arguments.count, piece, status);
+            }
+            if (call_time_zone != nullptr) {
+                set_time_zone(segment.formatter.get(), object_time_zone);
+            }
+            if (U_FAILURE(status)) {
+                PyErr_Format(PyExc_RuntimeError, "Failed to format message: %s",
+                             u_errorName(status));
+                ok = false;
+                break;
+            }
+
+            Py_ssize_t start = position;
+            position += piece.countChar32();
+            result.append(piece);
+
+            PyObject* part = Py_BuildValue("(OOnn)", segment.name, segment.type, start, position);
+            if (part == nullptr || PyList_Append(parts, part) < 0) {
+                Py_XDECREF(part);
+                ok = false;
+                break;
+            }
+            Py_DECREF(part);
+        }
+    }
+
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+
+    if (!ok) {
+        Py_DECREF(parts);
+        return nullptr;
+    }
+
+    std::string utf8;
+    PyObject* result_obj = ustring_to_pyunicode(result, utf8);
+    if (result_obj == nullptr) {
+        Py_DECREF(parts);
+        return nullptr;
+    }
+    return Py_BuildValue("(NN)", result_obj, parts);
+}
+
+PyObject* MessageFormat_format_many(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1) {
+        PyErr_SetString(PyExc_TypeError, "format_many() takes exactly 1 argument");
+        return nullptr;
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+
+    PyObject* time_zone_obj;
+    const BasicTimeZone* time_zone;
+    if (!get_time_zone_argument(mod_state, args + nargs, kwnames, "format_many",
+                                &time_zone_obj) ||
+        !resolve_call_time_zone(self_obj, mod_state, time_zone_obj, &time_zone)) {
+        return nullptr;
+    }
+
+    PyObject* iterator = PyObject_GetIter(args[0]);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* results = PyList_New(0);
+    if (results == nullptr) {
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    // Shared across iterations, so their allocations get reused.
+    FormatArguments arguments;
+    UnicodeString result;
+    std::string utf8;
+
+    PyObject* params;
+    while ((params = PyIter_Next(iterator)) != nullptr) {
+        PyObject* str_obj = format_params(self_obj, params, nullptr, nullptr, time_zone,
+                                          mod_state, arguments, result, utf8);
+        Py_DECREF(params);
+        if (str_obj == nullptr) {
+            break;
+        }
+        int append_result = PyList_Append(results, str_obj);
+        Py_DECREF(str_obj);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+// Create the formatter parse() uses. ICU's MessageFormat::parse() only
+// supports numbered arguments, so each argument is renumbered by its
+// position in arg_names, and the results are mapped back to names.
+MessageFormat* create_parser(MessageFormatObject* self) {
+    UErrorCode status = U_ZERO_ERROR;
+    UnicodeString pattern;
+    self->formatter->toPattern(pattern);
+    MessagePattern msg_pattern(pattern, nullptr, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse MessageFormat pattern: %s",
+                     u_errorName(status));
+        return nullptr;
+    }
+
+    Py_ssize_t arg_count = PyTuple_GET_SIZE(self->arg_names);
+    UnicodeString numbered;
+    int32_t copied = 0;
+    int32_t part_count = msg_pattern.countParts();
+    for (int32_t i = 0; i < part_count; ++i) {
+        const MessagePattern::Part& part = msg_pattern.getPart(i);
+        UMessagePatternPartType part_type = part.getType();
+        if (part_type != UMSGPAT_PART_TYPE_ARG_NAME && part_type != UMSGPAT_PART_TYPE_ARG_NUMBER) {
+            continue;
+        }
+        UnicodeString name = msg_pattern.getSubstring(part);
+        Py_ssize_t index = 0;
+        while (index < arg_count && (*self->arg_name_ustrings)[index] != name) {
+            ++index;
+        }
+        numbered.append(pattern, copied, part.getIndex() - copied);
+        numbered.append(UnicodeString::fromUTF8(std::to_string(index)));
+        copied = part.getLimit();
+    }
+    numbered.append(pattern, copied, pattern.length() - copied);
+
+    auto parser = std::make_unique<MessageFormat>(numbered, self->formatter->getLocale(), status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to create parser: %s", u_errorName(status));
+        return nullptr;
+    }
+    return parser.release();
+}
+
+// Return the pool's parser, creating it if needed.
+const MessageFormat* get_parser(MessageFormatObject* self, FormatterPool& pool) {
+    std::lock_guard<std::mutex> lock(pool.mutex);
+    if (pool.parser == nullptr) {
+        pool.parser.reset(create_parser(self));
+    }
+    return pool.parser.get();
+}
+
+// Inverse of Hinnant's days_from_civil algorithm.
+void civil_from_days(int64_t days, int* year, int* month, int* day) {
+    days += 719468;
+    const int64_t era = (days >= 0 ? days : days - 146096) / 146097;
+    const int64_t doe = days - era * 146097;
+    const int64_t yoe = (doe - doe / 1460 + doe / 36524 - doe / 146096) / 365;
+    const int64_t doy = doe - (365 * yoe + yoe / 4 - yoe / 100);
+    const int64_t mp = (5 * doy + 2) / 153;
+    *day = static_cast<int>(doy - (153 * mp + 2) / 5 + 1);
+    *month = static_cast<int>(mp < 10 ? mp + 3 : mp - 9);
+    *year = static_cast<int>(yoe + era * 400 + (*month <= 2));
+}
+
+// Convert an ICU date, milliseconds since the epoch, to an aware UTC
+// datetime.
+PyObject* udate_to_datetime(UDate udate) {
+    int64_t micros = static_cast<int64_t>(std::llround(udate * 1000.0));
+    constexpr int64_t kMicrosPerDay = 86400000000LL;
+    int64_t days = micros / kMicrosPerDay;
+    int64_t day_micros = micros % kMicrosPerDay;
+    if (day_micros < 0) {
+        day_micros += kMicrosPerDay;
+        --days;
+    }
+    int year, month, day;
+    civil_from_days(days, &year, &month, &day);
+    if (year < 1 || year > 9999) {
+        PyErr_Format(PyExc_OverflowError, "Parsed date is out of range for datetime");
+        return nullptr;
+    }
+    int64_t seconds = day_micros / 1000000;
+    return PyDateTimeAPI->DateTime_FromDateAndTime(
+        year, month, day, static_cast<int>(seconds / 3600), static_cast<int>(seconds / 60 % 60),
+        static_cast<int>(seconds % 60), static_cast<int>(day_micros % 1000000),
+        PyDateTime_TimeZone_UTC, PyDateTimeAPI->DateTimeType);
+}
+
+PyObject* formattable_to_python(const Formattable& value) {
+    switch (value.getType()) {
+        case Formattable::kString: {
+            UnicodeString ustr;
+            value.getString(ustr);
+            std::string utf8;
+            ustr.toUTF8String(utf8);
+            return PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+        }
+        case Formattable::kLong:
+            return PyLong_FromLong(value.getLong());
+        case Formattable::kInt64:
+            return PyLong_FromLongLong(value.getInt64());
+        case Formattable::kDouble:
+            return PyFloat_FromDouble(value.getDouble());
+        case Formattable::kDate:
+            return udate_to_datetime(value.getDate());
+        default:
+            PyErr_SetString(PyExc_RuntimeError, "Unsupported parsed value type");
+            return nullptr;
+    }
+}
+
+// Parse text with parser into a dict of argument values, keyed by
+// arg_names. Returns nullptr with no exception set if the text doesn't
+// match the pattern.
+PyObject* parse_text(const MessageFormat& parser, PyObject* arg_names, PyObject* text) {
+    if (!PyUnicode_Check(text)) {
+        PyErr_Format(PyExc_TypeError, "text must be a string, not %.200s",
+                     Py_TYPE(text)->tp_name);
+        return nullptr;
+    }
+    Py_ssize_t text_len;
+    const char* text_utf8 = PyUnicode_AsUTF8AndSize(text, &text_len);
+    if (text_utf8 == nullptr) {
+        return nullptr;
+    }
+
+    int32_t count = 0;
+    std::unique_ptr<Formattable[]> values;
+    Py_BEGIN_ALLOW_THREADS
+    UnicodeString utext = UnicodeString::fromUTF8(StringPiece(text_utf8, text_len));
+    ParsePosition pos(0);
+    values.reset(parser.parse(utext, pos, count));
+    // Partial matches don't count.
+    if (values != nullptr && pos.getIndex() != utext.length()) {
+        values.reset();
+    }
+    Py_END_ALLOW_THREADS
+
+    if (values == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* result = PyDict_New();
+    if (result == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t arg_count = std::min(static_cast<Py_ssize_t>(count),
+                                    PyTuple_GET_SIZE(arg_names));
+    for (Py_ssize_t i = 0; i < arg_count; ++i) {
+        PyObject* value = formattable_to_python(values[i]);
+        if (value == nullptr ||
+            PyDict_SetItem(result, PyTuple_GET_ITEM(arg_names, i), value) < 0) {
+            Py_XDECREF(value);
+            Py_DECREF(result);
+            return nullptr;
+        }
+        Py_DECREF(value);
+    }
+    return result;
+}
+
+// Like get_parser(), but with the object's time zone applied, in a copy
+// owned by zoned if it has one. pool is set to a reference to the object's
+// pool, which owns the parser, so it outlives a concurrent __init__().
+const MessageFormat* get_zoned_parser(MessageFormatObject* self,
+                                      std::shared_ptr<FormatterPool>& pool,
+                                      std::unique_ptr<MessageFormat>& zoned) {
+    pool = *self->pool;
+    const MessageFormat* parser = get_parser(self, *pool);
+    if (parser == nullptr || self->time_zone == nullptr) {
+        return parser;
+    }
+    zoned.reset(parser->clone());
+    if (zoned == nullptr) {
+        PyErr_NoMemory();
+        return nullptr;
+    }
+    set_time_zone(zoned.get(), *self->time_zone);
+    return zoned.get();
+}
+
+PyObject* MessageFormat_parse(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "parse() takes exactly 1 argument");
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+    std::shared_ptr<FormatterPool> pool;
+    std::unique_ptr<MessageFormat> zoned;
+    const MessageFormat* parser = get_zoned_parser(self_obj, pool, zoned);
+    if (parser == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* result = parse_text(*parser, self_obj->arg_names, args[0]);
+    if (result == nullptr && !PyErr_Occurred()) {
+        PyErr_Format(PyExc_ValueError, "Text does not match the pattern: %R", args[0]);
+    }
+    return result;
+}
+
+PyObject* MessageFormat_parse_many(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "parse_many() takes exactly 1 argument");
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+    std::shared_ptr<FormatterPool> pool;
+    std::unique_ptr<MessageFormat> zoned;
+    const MessageFormat* parser = get_zoned_parser(self_obj, pool, zoned);
+    if (parser == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* iterator = PyObject_GetIter(args[0]);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* results = PyList_New(0);
+    if (results == nullptr) {
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    // The iterator can run Python code that reinitializes the object, so
+    // keep the names matching the parser.
+    PyObject* arg_names = Py_NewRef(self_obj->arg_names);
+    PyObject* text;
+    while ((text = PyIter_Next(iterator)) != nullptr) {
+        PyObject* values = parse_text(*parser, arg_names, text);
+        Py_DECREF(text);
+        if (values == nullptr) {
+            if (PyErr_Occurred()) {
+                break;
+            }
+            values = Py_NewRef(Py_None);
+        }
+        int append_result = PyList_Append(results, values);
+        Py_DECREF(values);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(arg_names);
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+// One column of values for format_columns(), either a tuple of objects or a
+// 1-dimensional numeric buffer read directly.
+struct Column {
+    PyObject* key = nullptr;
+    PyObject* items = nullptr;
+    Py_buffer view = {};
+    bool has_view = false;
+    char kind = 0;  // 'i', 'u', or 'f' for buffers
+    // For datetime64 buffers, milliseconds per stored unit, else 0.
+    double datetime_scale = 0.0;
+    Py_ssize_t length = 0;
+
+    ~Column() {
+        if (has_view) {
+            PyBuffer_Release(&view);
+        }
+        Py_XDECREF(items);
+    }
+};
+
+bool open_buffer_column(Column& column, PyObject* obj) {
+    if (PyObject_GetBuffer(obj, &column.view, PyBUF_STRIDED_RO | PyBUF_FORMAT) < 0) {
+        return false;
+    }
+    column.has_view = true;
+
+    if (column.view.ndim != 1) {
+        PyErr_Format(PyExc_ValueError,
+                     "Buffer column must be 1-dimensional, got %d dimensions for key %R",
+                     column.view.ndim, column.key);
+        return false;
+    }
+
+    const char* format = column.view.format != nullptr ? column.view.format : "B";
+    if (*format != '\0' && std::strchr("@=<>!", *format) != nullptr) {
+        if (!is_native_byte_order(*format)) {
+            PyErr_Format(PyExc_ValueError,
+                         "Buffer column must use native byte order, got format '%s' for key %R",
+                         format, column.key);
+            return false;
+        }
+        ++format;
+    }
+
+    column.kind = numeric_buffer_kind(format, column.view.itemsize);
+    if (column.kind == 0) {
+        PyErr_Format(PyExc_ValueError,
+                     "Unsupported buffer format '%s' for key %R, expected an integer or float format",
+                     column.view.format != nullptr ? column.view.format : "B", column.key);
+        return false;
+    }
+
+    column.length = column.view.shape[0];
+    return true;
+}
+
+// NumPy datetime64 arrays can't be exported through the buffer protocol, so
+// detect them by dtype and read their int64 view instead.
+int open_datetime64_column(Column& column, PyObject* obj) {
+    PyObject* dtype = PyObject_GetAttrString(obj, "dtype");
+    if (dtype == nullptr) {
+        if (PyErr_ExceptionMatches(PyExc_AttributeError)) {
+            PyErr_Clear();
+            return 0;
+        }
+        return -1;
+    }
+    PyObject* dtype_kind = PyObject_GetAttrString(dtype, "kind");
+    if (dtype_kind == nullptr) {
+        Py_DECREF(dtype);
+        return -1;
+    }
+    int is_datetime = PyUnicode_Check(dtype_kind) &&
+                      PyUnicode_CompareWithASCIIString(dtype_kind, "M") == 0;
+    Py_DECREF(dtype_kind);
+    if (!is_datetime) {
+        Py_DECREF(dtype);
+        return 0;
+    }
+
+    PyObject* dtype_str = PyObject_GetAttrString(dtype, "str");
+    Py_DECREF(dtype);
+    if (dtype_str == nullptr) {
+        return -1;
+    }
+    const char* dtype_chars = PyUnicode_AsUTF8(dtype_str);
+    if (dtype_chars == nullptr) {
+        Py_DECREF(dtype_str);
+        return -1;
+    }
+    column.datetime_scale = datetime64_scale(dtype_chars);
+    if (column.datetime_scale == 0.0) {
+        PyErr_Format(PyExc_ValueError, "Unsupported datetime64 unit in dtype '%s' for key %R",
+                     dtype_chars, column.key);
+        Py_DECREF(dtype_str);
+        return -1;
+    }
+    Py_DECREF(dtype_str);
+
+    PyObject* int_view = PyObject_CallMethod(obj, "view", "s", "i8");
+    if (int_view == nullptr) {
+        return -1;
+    }
+    bool ok = open_buffer_column(column, int_view);
+    Py_DECREF(int_view);
+    if (!ok) {
+        return -1;
+    }
+    if (column.kind != 'i' || column.view.itemsize != 8) {
+        PyErr_Format(PyExc_ValueError, "datetime64 column for key %R must view as int64",
+                     column.key);
+        return -1;
+    }
+    return 1;
+}
+
+bool open_column(Column& column, PyObject* key, PyObject* obj) {
+    column.key = key;
+
+    if (PyUnicode_Check(obj) || PyBytes_Check(obj) || PyByteArray_Check(obj)) {
+        PyErr_Format(PyExc_TypeError,
+                     "Column must be a sequence or numeric buffer, not %.200s for key %R",
+                     Py_TYPE(obj)->tp_name, key);
+        return false;
+    }
+
+    if (PyObject_CheckBuffer(obj)) {
+        int is_datetime64 = open_datetime64_column(column, obj);
+        if (is_datetime64 < 0) {
+            return false;
+        }
+        if (is_datetime64 == 1) {
+            return true;
+        }
+        return open_buffer_column(column, obj);
+    }
+
+    column.items = PySequence_Tuple(obj);
+    if (column.items == nullptr) {
+        if (PyErr_ExceptionMatches(PyExc_TypeError)) {
+            PyErr_Clear();
+            PyErr_Format(PyExc_TypeError,
+                         "Column must be a sequence or numeric buffer, not %.200s for key %R",
+                         Py_TYPE(obj)->tp_name, key);
+        }
+        return false;
+    }
+    column.length = PyTuple_GET_SIZE(column.items);
+    return true;
+}
+
+bool column_value(const Column& column, Py_ssize_t index, Formattable& formattable,
+                  ModuleState* mod_state, const BasicTimeZone* time_zone) {
+    if (column.items != nullptr) {
+        return convert_value(column.key, PyTuple_GET_ITEM(column.items, index), formattable,
+                             mod_state, time_zone);
+    }
+
+    const char* ptr = static_cast<const char*>(column.view.buf) + index * column.view.strides[0];
+
+    if (column.datetime_scale != 0.0) {
+        int64_t value = read_buffer_int(ptr, column.view.itemsize);
+        if (value == kDatetime64NaT) {
+            PyErr_Format(PyExc_ValueError, "Cannot format NaT for key %R", column.key);
+            return false;
+        }
+        UDate udate = static_cast<double>(value) * column.datetime_scale;
+        formattable = Formattable(udate, Formattable::kIsDate);
+        return true;
+    }
+
+    if (!buffer_item_to_formattable(ptr, column.kind, column.view.itemsize, formattable)) {
+        add_key_to_error(column.key);
+        return false;
+    }
+    return true;
+}
+
+PyObject* MessageFormat_format_columns(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "format_columns() takes exactly 1 argument");
+        return nullptr;
+    }
+
+    PyObject* columns_dict = args[0];
+    if (!PyDict_Check(columns_dict)) {
+        PyErr_Format(PyExc_TypeError, "columns must be a dict, not %.200s",
+                     Py_TYPE(columns_dict)->tp_name);
+        return nullptr;
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+
+    // Snapshot the items, so the keys stay alive and the dict can't change
+    // size underneath us.
+    PyObject* items = PyDict_Items(columns_dict);
+    if (items == nullptr) {
+        return nullptr;
+    }
+
+    Py_ssize_t column_count = PyList_GET_SIZE(items);
+    auto columns = std::make_unique<Column[]>(column_count);
+    FormatArguments arguments;
+    arguments.time_zone = self_obj->time_zone;
+    arguments.names.resize(column_count);
+    arguments.values.resize(column_count);
+
+    Py_ssize_t row_count = 0;
+    for (Py_ssize_t c = 0; c < column_count; ++c) {
+        PyObject* item = PyList_GET_ITEM(items, c);
+        PyObject* key = PyTuple_GET_ITEM(item, 0);
+        if (!convert_key(key, arguments.names[c]) ||
+            !open_column(columns[c], key, PyTuple_GET_ITEM(item, 1))) {
+            columns.reset();
+            Py_DECREF(items);
+            return nullptr;
+        }
+        if (c == 0) {
+            row_count = columns[c].length;
+        } else if (columns[c].length != row_count) {
+            PyErr_Format(PyExc_ValueError,
+                         "All columns must have the same length, got %zd for key %R and %zd for key %R",
+                         row_count, PyTuple_GET_ITEM(PyList_GET_ITEM(items, 0), 0),
+                         columns[c].length, key);
+            columns.reset();
+            Py_DECREF(items);
+            return nullptr;
+        }
+    }
+    arguments.names_ptr = arguments.names.data();
+    arguments.count = static_cast<int32_t>(column_count);
+
+    PyObject* results = PyList_New(row_count);
+    if (results == nullptr) {
+        columns.reset();
+        Py_DECREF(items);
+        return nullptr;
+    }
+
+    UnicodeString result;
+    std::string utf8;
+    bool err = false;
+    for (Py_ssize_t row = 0; row < row_count; ++row) {
+        for (Py_ssize_t c = 0; c < column_count; ++c) {
+            if (!column_value(columns[c], row, arguments.values[c], mod_state,
+                              arguments.time_zone)) {
+                err = true;
+                break;
+            }
+        }
+        if (err) {
+            break;
+        }
+
+        PyObject* str_obj = format_arguments(self_obj, arguments, result, utf8);
+        if (str_obj == nullptr) {
+            err = true;
+            break;
+        }
+        PyList_SET_ITEM(results, row, str_obj);
+    }
+
+    columns.reset();
+    Py_DECREF(items);
+    if (err) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+PyObject* MessageFormat_get_arg_names(MessageFormatObject* self, void* closure) {
+    return Py_NewRef(self->arg_names);
+}
+
+PyObject* MessageFormat_get_arg_types(MessageFormatObject* self, void* closure) {
+    return Py_NewRef(self->arg_types);
+}
+
+PyObject* MessageFormat_get_pattern(MessageFormatObject* self, void* closure) {
+    UnicodeString pattern_ustr;
+    self->formatter->toPattern(pattern_ustr);
+    std::string pattern_utf8;
+    pattern_ustr.toUTF8String(pattern_utf8);
+    return PyUnicode_FromString(pattern_utf8.c_str());
+}
+
+PyObject* new_locale_object(ModuleState* mod_state, const Locale& locale);
+
+PyObject* MessageFormat_get_locale(MessageFormatObject* self, void* closure) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &icu4pymodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &icu4pymodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+
+    return new_locale_object(mod_state, self->formatter->getLocale());
+}
+
+PyObject* new_locale_object(ModuleState* mod_state, const Locale& locale) {
+    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+
+    icu4py::set_locale(locale_obj, locale);
+
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* MessageFormat_get_time_zone(MessageFormatObject* self, void* closure) {
+    if (self->time_zone == nullptr) {
+        Py_RETURN_NONE;
+    }
+    UnicodeString id;
+    std::string id_utf8;
+    self->time_zone->getID(id).toUTF8String(id_utf8);
+    return PyUnicode_FromStringAndSize(id_utf8.data(), id_utf8.size());
+}
+
+PyObject* MessageFormat_repr(MessageFormatObject* self) {
+    UnicodeString pattern_ustr;
+    self->formatter->toPattern(pattern_ustr);
+    std::string pattern_utf8;
+    pattern_ustr.toUTF8String(pattern_utf8);
+
+    const Locale& locale = self->formatter->getLocale();
+    const char* locale_name = locale.getName();
+
+    return PyUnicode_FromFormat("MessageFormat('%s', Locale('%s'))",
+                                 pattern_utf8.c_str(), locale_name);
+}
+
+
+
+PyObject* MessageFormat_reduce(MessageFormatObject* self, PyObject* Py_UNUSED(ignored)) {
+    UnicodeString pattern_ustr;
+    self->formatter->toPattern(pattern_ustr);
+    std::string pattern_utf8;
+    pattern_ustr.toUTF8String(pattern_utf8);
+
+    const char* locale_name = self->formatter->getLocale().getName();
+
+    if (self->time_zone != nullptr) {
+        UnicodeString id;
+        std::string id_utf8;
+        self->time_zone->getID(id).toUTF8String(id_utf8);
+        return Py_BuildValue("(O(s#sns))", Py_TYPE(self), pattern_utf8.data(),
+                             static_cast<Py_ssize_t>(pattern_utf8.size()), locale_name,
+                             self->result_cache_size, id_utf8.c_str());
+    }
+    if (self->result_cache_size > 0) {
+        return Py_BuildValue("(O(s#sn))", Py_TYPE(self), pattern_utf8.data(),
+                             static_cast<Py_ssize_t>(pattern_utf8.size()), locale_name,
+                             self->result_cache_size);
+    }
+    return Py_BuildValue("(O(s#s))", Py_TYPE(self), pattern_utf8.data(),
+                         static_cast<Py_ssize_t>(pattern_utf8.size()), locale_name);
+}
+
+PyObject* MessageFormat_cache_info(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 0 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "cache_info() takes no arguments");
+        return nullptr;
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+    PyObject* info = PyStructSequence_New(reinterpret_cast<PyTypeObject*>(mod_state->cache_info_type));
+    if (info == nullptr) {
+        return nullptr;
+    }
+
+    Py_ssize_t hits, misses, currsize;
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+    hits = self_obj->result_cache_hits;
+    misses = self_obj->result_cache_misses;
+    currsize = self_obj->result_cache == nullptr ? 0 : PyDict_GET_SIZE(self_obj->result_cache);
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+
+    Py_ssize_t fields[] = {hits, misses, self_obj->result_cache_size, currsize};
+    for (Py_ssize_t i = 0; i < 4; ++i) {
+        PyObject* field = PyLong_FromSsize_t(fields[i]);
+        if (field == nullptr) {
+            Py_DECREF(info);
+            return nullptr;
+        }
+        PyStructSequence_SetItem(info, i, field);
+    }
+    return info;
+}
+
+PyObject* MessageFormat_cache_clear(MessageFormatObject* self, PyObject* Py_UNUSED(ignored)) {
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+    if (self->result_cache != nullptr) {
+        PyDict_Clear(self->result_cache);
+    }
+    self->result_cache_hits = 0;
+    self->result_cache_misses = 0;
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+    Py_RETURN_NONE;
+}
+
+PyMethodDef MessageFormat_methods[] = {
+    {"format", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message with given parameters"},
+    {"format_bytes", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format_bytes)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message with given parameters to UTF-8 bytes"},
+    {"format_into", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format_into)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message as UTF-8 into a writable buffer at an offset"},
+    {"format_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format_many)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message once for each parameters dict or tuple in an iterable"},
+    {"parse", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_parse)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Parse text formatted with the message back into its argument values"},
+    {"parse_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_parse_many)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Parse each text in an iterable, returning None for those that don't match"},
+    {"format_to_parts", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format_to_parts)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message, also returning where each top-level argument landed"},
+    {"format_columns", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format_columns)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message once per row of a dict of equal-length columns"},
+    {"cache_info", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_cache_info)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Return statistics for the result cache"},
+    {"cache_clear", reinterpret_cast<PyCFunction>(MessageFormat_cache_clear), METH_NOARGS,
+     "Clear the result cache and its statistics"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(MessageFormat_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef MessageFormat_getsetters[] = {
+    {const_cast<char*>("pattern"), reinterpret_cast<getter>(MessageFormat_get_pattern), nullptr,
+     const_cast<char*>("The message pattern string"), nullptr},
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(MessageFormat_get_locale), nullptr,
+     const_cast<char*>("The locale used for formatting"), nullptr},
+    {const_cast<char*>("time_zone"), reinterpret_cast<getter>(MessageFormat_get_time_zone), nullptr,
+     const_cast<char*>("The time zone used for formatting, or None for ICU's default"), nullptr},
+    {const_cast<char*>("arg_names"), reinterpret_cast<getter>(MessageFormat_get_arg_names), nullptr,
+     const_cast<char*>("The pattern's argument names, in order of first appearance"), nullptr},
+    {const_cast<char*>("arg_types"), reinterpret_cast<getter>(MessageFormat_get_arg_types), nullptr,
+     const_cast<char*>("The type of each argument in arg_names"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot MessageFormat_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU MessageFormat")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(MessageFormat_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(MessageFormat_init)},
+    {Py_tp_new, reinterpret_cast<void*>(MessageFormat_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(MessageFormat_repr)},
+    {Py_tp_methods, MessageFormat_methods},
+    {Py_tp_getset, MessageFormat_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec MessageFormat_spec = {
+    "icu4py.messageformat.MessageFormat",
+    sizeof(MessageFormatObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    MessageFormat_slots
+};
+
+// Compiled catalogs hold a catalog's messages with their patterns already
+// validated and their argument names and types already parsed, so they can
+// be memory-mapped and looked up without reading the whole file. All
+// integers are little-endian uint32, and offsets are from the file start:
+//
+//   Header:  magic "ICU4PYMC", version, message count, locale string
+//            offset and length, entries offset, arguments offset.
+//   Entries: per message, sorted by UTF-8 ID: ID offset and length,
+//            pattern offset and length, first argument index, argument
+//            count.
+//   Arguments: per argument: name offset and length, type offset and
+//            length.
+//   Strings: UTF-8 text referenced by the above.
+constexpr char kCatalogMagic[8] = {'I', 'C', 'U', '4', 'P', 'Y', 'M', 'C'};
+constexpr uint32_t kCatalogVersion = 1;
+constexpr size_t kCatalogHeaderSize = 32;
+constexpr size_t kCatalogEntrySize = 24;
+constexpr size_t kCatalogArgumentSize = 16;
+
+uint32_t read_u32(const unsigned char* data) {
+    return static_cast<uint32_t>(data[0]) | static_cast<uint32_t>(data[1]) << 8 |
+           static_cast<uint32_t>(data[2]) << 16 | static_cast<uint32_t>(data[3]) << 24;
+}
+
+void append_u32(std::string& out, uint32_t value) {
+    out.push_back(static_cast<char>(value & 0xFF));
+    out.push_back(static_cast<char>((value >> 8) & 0xFF));
+    out.push_back(static_cast<char>((value >> 16) & 0xFF));
+    out.push_back(static_cast<char>((value >> 24) & 0xFF));
+}
+
+struct CatalogMessage {
+    std::string id;
+    std::string pattern;
+    std::vector<UnicodeString> names;
+    std::vector<UnicodeString> types;
+};
+
+PyObject* compile_catalog(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "compile_catalog() takes exactly 2 arguments");
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+
+    Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, args[1], locale)) {
+        return nullptr;
+    }
+
+    PyObject* items = PyMapping_Items(args[0]);
+    if (items == nullptr) {
+        return nullptr;
+    }
+
+    Py_ssize_t count = PyList_GET_SIZE(items);
+    std::vector<CatalogMessage> messages(count);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* item = PyList_GET_ITEM(items, i);
+        PyObject* id_obj = PyTuple_GET_ITEM(item, 0);
+        PyObject* pattern_obj = PyTuple_GET_ITEM(item, 1);
+        if (!PyUnicode_Check(id_obj) || !PyUnicode_Check(pattern_obj)) {
+            PyErr_Format(PyExc_TypeError,
+                         "Message IDs and patterns must be strings, got %R: %R",
+                         id_obj, pattern_obj);
+            Py_DECREF(items);
+            return nullptr;
+        }
+
+        Py_ssize_t id_len;
+        const char* id = PyUnicode_AsUTF8AndSize(id_obj, &id_len);
+        Py_ssize_t pattern_len;
+        const char* pattern = id == nullptr ? nullptr :
+                              PyUnicode_AsUTF8AndSize(pattern_obj, &pattern_len);
+        if (pattern == nullptr) {
+            Py_DECREF(items);
+            return nullptr;
+        }
 
-                Py_XDECREF(key_repr);
-                Py_XDECREF(exc_type);
-                Py_XDECREF(exc_value);
-                Py_XDECREF(exc_tb);
+        // Compile each pattern now, so loading needn't handle invalid ones.
+        CatalogMessage& message = messages[i];
+        message.id.assign(id, id_len);
+        message.pattern.assign(pattern, pattern_len);
+        UnicodeString upattern = UnicodeString::fromUTF8(StringPiece(pattern, pattern_len));
+        UErrorCode status = U_ZERO_ERROR;
+        MessageFormat formatter(upattern, locale, status);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError, "Failed to compile message %R: %s", id_obj,
+                         u_errorName(status));
+            Py_DECREF(items);
+            return nullptr;
+        }
+        if (!parse_arguments(upattern, message.names, message.types)) {
+            Py_DECREF(items);
+            return nullptr;
+        }
+    }
+    Py_DECREF(items);
 
-                if (!PyErr_Occurred()) {
-                    PyErr_SetString(PyExc_TypeError, "Failed to convert dictionary value to Formattable");
-                }
-            } else {
-                PyErr_SetString(PyExc_TypeError, "Failed to convert dictionary value to Formattable");
-            }
-            err = true;
-            break;
+    std::sort(messages.begin(), messages.end(),
+              [](const CatalogMessage& a, const CatalogMessage& b) { return a.id < b.id; });
+
+    size_t arg_count = 0;
+    for (const CatalogMessage& message : messages) {
+        arg_count += message.names.size();
+    }
+
+    // Lay out the tables first, then the strings they point to.
+    std::string strings;
+    const size_t entries_offset = kCatalogHeaderSize;
+    const size_t args_offset = entries_offset + messages.size() * kCatalogEntrySize;
+    const size_t strings_offset = args_offset + arg_count * kCatalogArgumentSize;
+    std::string entries;
+    std::string arguments;
+    std::string utf8;
+    auto add_string = [&](std::string& table, const char* data, size_t size) {
+        append_u32(table, static_cast<uint32_t>(strings_offset + strings.size()));
+        append_u32(table, static_cast<uint32_t>(size));
+        strings.append(data, size);
+    };
+
+    const char* locale_name = locale.getName();
+    std::string header(kCatalogMagic, sizeof(kCatalogMagic));
+    append_u32(header, kCatalogVersion);
+    append_u32(header, static_cast<uint32_t>(messages.size()));
+    add_string(header, locale_name, std::strlen(locale_name));
+    append_u32(header, static_cast<uint32_t>(entries_offset));
+    append_u32(header, static_cast<uint32_t>(args_offset));
+
+    uint32_t first_arg = 0;
+    for (const CatalogMessage& message : messages) {
+        add_string(entries, message.id.data(), message.id.size());
+        add_string(entries, message.pattern.data(), message.pattern.size());
+        append_u32(entries, first_arg);
+        append_u32(entries, static_cast<uint32_t>(message.names.size()));
+        for (size_t i = 0; i < message.names.size(); ++i) {
+            utf8.clear();
+            message.names[i].toUTF8String(utf8);
+            add_string(arguments, utf8.data(), utf8.size());
+            utf8.clear();
+            message.types[i].toUTF8String(utf8);
+            add_string(arguments, utf8.data(), utf8.size());
         }
-        ++i;
+        first_arg += static_cast<uint32_t>(message.names.size());
     }
-#ifdef Py_GIL_DISABLED
-    Py_END_CRITICAL_SECTION();
-#endif
-    if (err) {
-        return false;
+
+    if (strings_offset + strings.size() > UINT32_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "Catalog is too large");
+        return nullptr;
+    }
+
+    PyObject* result = PyBytes_FromStringAndSize(nullptr, strings_offset + strings.size());
+    if (result == nullptr) {
+        return nullptr;
+    }
+    char* out = PyBytes_AS_STRING(result);
+    std::memcpy(out, header.data(), header.size());
+    std::memcpy(out + entries_offset, entries.data(), entries.size());
+    std::memcpy(out + args_offset, arguments.data(), arguments.size());
+    std::memcpy(out + strings_offset, strings.data(), strings.size());
+    return result;
+}
+
+struct CatalogObject {
+    PyObject_HEAD
+    // The mmap object, kept open while its buffer is in use.
+    PyObject* mmap;
+    Py_buffer view;
+    const unsigned char* data;
+    size_t size;
+    uint32_t count;
+    uint32_t entries_offset;
+    uint32_t args_offset;
+    Locale* locale;
+    // MessageFormat objects built so far, by message ID.
+    PyObject* formats;
+};
+
+PyObject* Catalog_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<CatalogObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->mmap = nullptr;
+        self->data = nullptr;
+        self->size = 0;
+        self->count = 0;
+        self->locale = nullptr;
+        self->formats = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+void Catalog_release(CatalogObject* self) {
+    if (self->mmap != nullptr) {
+        PyBuffer_Release(&self->view);
+        Py_CLEAR(self->mmap);
     }
+    self->data = nullptr;
+    self->size = 0;
+    self->count = 0;
+    delete self->locale;
+    self->locale = nullptr;
+    Py_CLEAR(self->formats);
+}
+
+void Catalog_dealloc(CatalogObject* self) {
+    Catalog_release(self);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+void set_corrupt_catalog_error() {
+    PyErr_SetString(PyExc_ValueError, "Catalog file is corrupt");
+}
 
-    names = names_ptr.release();
-    values = values_ptr.release();
+// Find a string from a table entry, checking it lies within the file.
+bool catalog_string(const CatalogObject* self, const unsigned char* field, const char** data,
+                    size_t* size) {
+    uint32_t offset = read_u32(field);
+    uint32_t length = read_u32(field + 4);
+    if (offset > self->size || length > self->size - offset) {
+        set_corrupt_catalog_error();
+        return false;
+    }
+    *data = reinterpret_cast<const char*>(self->data) + offset;
+    *size = length;
     return true;
 }
 
-PyObject* MessageFormat_format(PyObject* self,
-        PyTypeObject* defining_class,
-        PyObject* const* args,
-        Py_ssize_t nargs,
-        PyObject* kwnames) {
-    if (nargs != 1) {
-        PyErr_SetString(PyExc_TypeError, "format() takes exactly 1 argument");
+// Memory-map the file, opened through Python so any path works on any
+// platform.
+PyObject* map_file(PyObject* path) {
+    PyObject* io_module = PyImport_ImportModule("io");
+    if (io_module == nullptr) {
         return nullptr;
     }
-
-    PyObject* params_dict = args[0];
-    if (!PyDict_Check(params_dict)) {
-        PyErr_SetString(PyExc_TypeError, "argument must be a dict");
+    PyObject* file = PyObject_CallMethod(io_module, "open", "Os", path, "rb");
+    Py_DECREF(io_module);
+    if (file == nullptr) {
         return nullptr;
     }
 
-    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
-    if (mod_state == nullptr) {
+    PyObject* mmap_obj = nullptr;
+    PyObject* fileno = PyObject_CallMethod(file, "fileno", nullptr);
+    if (fileno != nullptr) {
+        PyObject* mmap_module = PyImport_ImportModule("mmap");
+        if (mmap_module != nullptr) {
+            PyObject* access = PyObject_GetAttrString(mmap_module, "ACCESS_READ");
+            PyObject* mmap_type = PyObject_GetAttrString(mmap_module, "mmap");
+            if (access != nullptr && mmap_type != nullptr) {
+                PyObject* call_args = Py_BuildValue("(Oi)", fileno, 0);
+                PyObject* call_kwargs = Py_BuildValue("{sO}", "access", access);
+                if (call_args != nullptr && call_kwargs != nullptr) {
+                    mmap_obj = PyObject_Call(mmap_type, call_args, call_kwargs);
+                }
+                Py_XDECREF(call_args);
+                Py_XDECREF(call_kwargs);
+            }
+            Py_XDECREF(access);
+            Py_XDECREF(mmap_type);
+            Py_DECREF(mmap_module);
+        }
+        Py_DECREF(fileno);
+    }
+
+    // The mapping stays valid after the file is closed.
+    PyObject* close_result = PyObject_CallMethod(file, "close", nullptr);
+    Py_DECREF(file);
+    if (close_result == nullptr) {
+        Py_XDECREF(mmap_obj);
         return nullptr;
     }
+    Py_DECREF(close_result);
+    return mmap_obj;
+}
 
-    auto* self_obj = reinterpret_cast<MessageFormatObject*>(self);
+int Catalog_init(CatalogObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* path;
 
-    UnicodeString* argumentNames = nullptr;
-    Formattable* arguments = nullptr;
-    int32_t count = 0;
+    static const char* kwlist[] = {"path", nullptr};
 
-    if (!dict_to_parallel_arrays(params_dict, mod_state, argumentNames, arguments, count)) {
-        return nullptr;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", const_cast<char**>(kwlist), &path)) {
+        return -1;
     }
 
-    auto names_guard = std::unique_ptr<UnicodeString[]>(argumentNames);
-    auto values_guard = std::unique_ptr<Formattable[]>(arguments);
+    Catalog_release(self);
 
-    UErrorCode status = U_ZERO_ERROR;
-    UnicodeString result;
+    PyObject* mmap_obj = map_file(path);
+    if (mmap_obj == nullptr) {
+        return -1;
+    }
+    if (PyObject_GetBuffer(mmap_obj, &self->view, PyBUF_SIMPLE) < 0) {
+        Py_DECREF(mmap_obj);
+        return -1;
+    }
+    self->mmap = mmap_obj;
+    self->data = static_cast<const unsigned char*>(self->view.buf);
+    self->size = static_cast<size_t>(self->view.len);
+
+    // Only the header is checked up front, so opening is independent of
+    // the catalog's size. Entries are checked as they're read.
+    if (self->size < kCatalogHeaderSize ||
+        std::memcmp(self->data, kCatalogMagic, sizeof(kCatalogMagic)) != 0) {
+        PyErr_SetString(PyExc_ValueError, "File is not a compiled catalog");
+        Catalog_release(self);
+        return -1;
+    }
+    uint32_t version = read_u32(self->data + 8);
+    if (version != kCatalogVersion) {
+        PyErr_Format(PyExc_ValueError, "Unsupported catalog version %u", version);
+        Catalog_release(self);
+        return -1;
+    }
+    self->count = read_u32(self->data + 12);
+    self->entries_offset = read_u32(self->data + 24);
+    self->args_offset = read_u32(self->data + 28);
+    const char* locale_name;
+    size_t locale_len;
+    if (self->entries_offset > self->size ||
+        self->count > (self->size - self->entries_offset) / kCatalogEntrySize ||
+        self->args_offset > self->size ||
+        !catalog_string(self, self->data + 16, &locale_name, &locale_len)) {
+        set_corrupt_catalog_error();
+        Catalog_release(self);
+        return -1;
+    }
 
-    // ICU objects need external synchronization
-#ifdef Py_GIL_DISABLED
-    Py_BEGIN_CRITICAL_SECTION(self_obj);
-#endif
+    self->locale = new Locale(std::string(locale_name, locale_len).c_str());
+    self->formats = PyDict_New();
+    if (self->formats == nullptr) {
+        Catalog_release(self);
+        return -1;
+    }
+    return 0;
+}
 
-    if (count == 0) {
-        FieldPosition field_pos;
-        result = self_obj->formatter->format(nullptr, 0, result, field_pos, status);
-    } else {
-        result = self_obj->formatter->format(argumentNames, arguments, count, result, status);
+const unsigned char* catalog_entry(const CatalogObject* self, uint32_t index) {
+    return self->data + self->entries_offset + static_cast<size_t>(index) * kCatalogEntrySize;
+}
+
+// Binary search for a message ID. Returns 1 and sets index if found, 0 if
+// not, or -1 on error.
+int find_catalog_entry(const CatalogObject* self, const char* id, size_t id_len,
+                       uint32_t* index) {
+    uint32_t low = 0;
+    uint32_t high = self->count;
+    while (low < high) {
+        uint32_t mid = low + (high - low) / 2;
+        const char* entry_id;
+        size_t entry_id_len;
+        if (!catalog_string(self, catalog_entry(self, mid), &entry_id, &entry_id_len)) {
+            return -1;
+        }
+        int cmp = std::memcmp(entry_id, id, std::min(entry_id_len, id_len));
+        if (cmp == 0) {
+            cmp = entry_id_len < id_len ? -1 : (entry_id_len > id_len ? 1 : 0);
+        }
+        if (cmp == 0) {
+            *index = mid;
+            return 1;
+        }
+        if (cmp < 0) {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
     }
+    return 0;
+}
 
-#ifdef Py_GIL_DISABLED
-    Py_END_CRITICAL_SECTION();
-#endif
+// Build a MessageFormat for a catalog entry, using its stored argument
+// names and types rather than parsing the pattern for them again.
+PyObject* build_catalog_format(CatalogObject* self, ModuleState* mod_state, uint32_t index) {
+    const unsigned char* entry = catalog_entry(self, index);
+    const char* pattern;
+    size_t pattern_len;
+    if (!catalog_string(self, entry + 8, &pattern, &pattern_len)) {
+        return nullptr;
+    }
+    uint32_t first_arg = read_u32(entry + 16);
+    uint32_t arg_count = read_u32(entry + 20);
+    size_t max_args = (self->size - self->args_offset) / kCatalogArgumentSize;
+    if (first_arg > max_args || arg_count > max_args - first_arg) {
+        set_corrupt_catalog_error();
+        return nullptr;
+    }
 
-    if (U_FAILURE(status)) {
-        PyErr_Format(PyExc_RuntimeError, "Failed to format message: %s",
-                     u_errorName(status));
+    std::vector<UnicodeString> names(arg_count);
+    std::vector<UnicodeString> types(arg_count);
+    for (uint32_t i = 0; i < arg_count; ++i) {
+        const unsigned char* arg = self->data + self->args_offset +
+                                   static_cast<size_t>(first_arg + i) * kCatalogArgumentSize;
+        const char* name;
+        size_t name_len;
+        const char* type;
+        size_t type_len;
+        if (!catalog_string(self, arg, &name, &name_len) ||
+            !catalog_string(self, arg + 8, &type, &type_len)) {
+            return nullptr;
+        }
+        names[i] = UnicodeString::fromUTF8(StringPiece(name, static_cast<int32_t>(name_len)));
+        types[i] = UnicodeString::fromUTF8(StringPiece(type, static_cast<int32_t>(type_len)));
+    }
+
+    UnicodeString upattern =
+        UnicodeString::fromUTF8(StringPiece(pattern, static_cast<int32_t>(pattern_len)));
+    std::shared_ptr<FormatterPool> pool = get_formatter_pool(
+        mod_state, *self->locale, pattern, static_cast<Py_ssize_t>(pattern_len), upattern);
+    if (pool == nullptr) {
         return nullptr;
     }
 
-    std::string utf8;
-    result.toUTF8String(utf8);
-    return PyUnicode_FromStringAndSize(utf8.c_str(), utf8.size());
+    PyTypeObject* type = reinterpret_cast<PyTypeObject*>(mod_state->message_format_type);
+    auto* format = reinterpret_cast<MessageFormatObject*>(MessageFormat_new(type, nullptr, nullptr));
+    if (format == nullptr) {
+        return nullptr;
+    }
+    format->formatter = pool->formatter;
+    format->pool = new std::shared_ptr<FormatterPool>(std::move(pool));
+    if (!set_arguments(format, names, types)) {
+        Py_DECREF(format);
+        return nullptr;
+    }
+    return reinterpret_cast<PyObject*>(format);
 }
 
-PyObject* MessageFormat_get_pattern(MessageFormatObject* self, void* closure) {
-    UnicodeString pattern_ustr;
-    self->formatter->toPattern(pattern_ustr);
-    std::string pattern_utf8;
-    pattern_ustr.toUTF8String(pattern_utf8);
-    return PyUnicode_FromString(pattern_utf8.c_str());
+// Return a new reference to the message's MessageFormat, building it on
+// first use, or nullptr with KeyError set if there's no such message.
+PyObject* catalog_lookup(CatalogObject* self, ModuleState* mod_state, PyObject* id_obj) {
+    if (!PyUnicode_Check(id_obj)) {
+        PyErr_SetObject(PyExc_KeyError, id_obj);
+        return nullptr;
+    }
+
+    PyObject* format;
+    int found = dict_get_item_ref(self->formats, id_obj, &format);
+    if (found != 0) {
+        return found < 0 ? nullptr : format;
+    }
+
+    Py_ssize_t id_len;
+    const char* id = PyUnicode_AsUTF8AndSize(id_obj, &id_len);
+    if (id == nullptr) {
+        return nullptr;
+    }
+    uint32_t index;
+    found = find_catalog_entry(self, id, static_cast<size_t>(id_len), &index);
+    if (found <= 0) {
+        if (found == 0) {
+            PyErr_SetObject(PyExc_KeyError, id_obj);
+        }
+        return nullptr;
+    }
+
+    PyObject* new_format = build_catalog_format(self, mod_state, index);
+    if (new_format == nullptr) {
+        return nullptr;
+    }
+    // Another thread may have built it first, in which case use theirs.
+    format = PyDict_SetDefault(self->formats, id_obj, new_format);
+    Py_DECREF(new_format);
+    return Py_XNewRef(format);
 }
 
-PyObject* MessageFormat_get_locale(MessageFormatObject* self, void* closure) {
+ModuleState* catalog_module_state(PyObject* self) {
 #if PY_VERSION_HEX < 0x030B0000
     PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &icu4pymodule);
 #else
@@ -495,68 +3028,179 @@ PyObject* MessageFormat_get_locale(MessageFormatObject* self, void* closure) {
     if (module == nullptr) {
         return nullptr;
     }
-    ModuleState* mod_state = get_module_state(module);
+    return get_module_state(module);
+}
 
-    const Locale& locale = self->formatter->getLocale();
+bool check_catalog_open(CatalogObject* self) {
+    if (self->data == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "Catalog is not open");
+        return false;
+    }
+    return true;
+}
 
-    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
-    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
-    if (locale_obj == nullptr) {
+PyObject* Catalog_getitem(PyObject* self, PyObject* key) {
+    auto* self_obj = reinterpret_cast<CatalogObject*>(self);
+    if (!check_catalog_open(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = catalog_module_state(self);
+    if (mod_state == nullptr) {
         return nullptr;
     }
+    return catalog_lookup(self_obj, mod_state, key);
+}
 
-    locale_obj->locale = new Locale(locale);
+int Catalog_contains(PyObject* self, PyObject* key) {
+    auto* self_obj = reinterpret_cast<CatalogObject*>(self);
+    if (!check_catalog_open(self_obj)) {
+        return -1;
+    }
+    if (!PyUnicode_Check(key)) {
+        return 0;
+    }
+    Py_ssize_t id_len;
+    const char* id = PyUnicode_AsUTF8AndSize(key, &id_len);
+    if (id == nullptr) {
+        return -1;
+    }
+    uint32_t index;
+    return find_catalog_entry(self_obj, id, static_cast<size_t>(id_len), &index);
+}
 
-    return reinterpret_cast<PyObject*>(locale_obj);
+Py_ssize_t Catalog_length(PyObject* self) {
+    return reinterpret_cast<CatalogObject*>(self)->count;
 }
 
-PyObject* MessageFormat_repr(MessageFormatObject* self) {
-    UnicodeString pattern_ustr;
-    self->formatter->toPattern(pattern_ustr);
-    std::string pattern_utf8;
-    pattern_ustr.toUTF8String(pattern_utf8);
+// Iterate over a list of the message IDs, in sorted order.
+PyObject* Catalog_iter(PyObject* self) {
+    auto* self_obj = reinterpret_cast<CatalogObject*>(self);
+    PyObject* ids = PyList_New(self_obj->count);
+    if (ids == nullptr) {
+        return nullptr;
+    }
+    for (uint32_t i = 0; i < self_obj->count; ++i) {
+        const char* id;
+        size_t id_len;
+        if (!catalog_string(self_obj, catalog_entry(self_obj, i), &id, &id_len)) {
+            Py_DECREF(ids);
+            return nullptr;
+        }
+        PyObject* id_obj = PyUnicode_DecodeUTF8(id, static_cast<Py_ssize_t>(id_len), nullptr);
+        if (id_obj == nullptr) {
+            Py_DECREF(ids);
+            return nullptr;
+        }
+        PyList_SET_ITEM(ids, i, id_obj);
+    }
+    PyObject* iterator = PyObject_GetIter(ids);
+    Py_DECREF(ids);
+    return iterator;
+}
 
-    const Locale& locale = self->formatter->getLocale();
-    const char* locale_name = locale.getName();
+PyObject* Catalog_get(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs < 1 || nargs > 2 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "get() takes 1 or 2 arguments");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<CatalogObject*>(self);
+    if (!check_catalog_open(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
 
-    return PyUnicode_FromFormat("MessageFormat('%s', Locale('%s'))",
-                                 pattern_utf8.c_str(), locale_name);
+    PyObject* format = catalog_lookup(self_obj, mod_state, args[0]);
+    if (format == nullptr && PyErr_ExceptionMatches(PyExc_KeyError)) {
+        PyErr_Clear();
+        return Py_NewRef(nargs == 2 ? args[1] : Py_None);
+    }
+    return format;
 }
 
+PyObject* Catalog_close(CatalogObject* self, PyObject* Py_UNUSED(ignored)) {
+    Catalog_release(self);
+    Py_RETURN_NONE;
+}
 
+PyObject* Catalog_enter(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    return Py_NewRef(self);
+}
 
-PyMethodDef MessageFormat_methods[] = {
-    {"format", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormat_format)),
+PyObject* Catalog_exit(CatalogObject* self, PyObject* args) {
+    Catalog_release(self);
+    Py_RETURN_NONE;
+}
+
+PyObject* Catalog_get_locale(CatalogObject* self, void* closure) {
+    if (!check_catalog_open(self)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = catalog_module_state(reinterpret_cast<PyObject*>(self));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+    return new_locale_object(mod_state, *self->locale);
+}
+
+PyMethodDef Catalog_methods[] = {
+    {"get", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(Catalog_get)),
      METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
-     "Format the message with given parameters"},
+     "Return the MessageFormat for a message ID, or a default if there's no such message"},
+    {"close", reinterpret_cast<PyCFunction>(Catalog_close), METH_NOARGS,
+     "Unmap the catalog file"},
+    {"__enter__", reinterpret_cast<PyCFunction>(Catalog_enter), METH_NOARGS, nullptr},
+    {"__exit__", reinterpret_cast<PyCFunction>(Catalog_exit), METH_VARARGS, nullptr},
     {nullptr, nullptr, 0, nullptr}
 };
 
-PyGetSetDef MessageFormat_getsetters[] = {
-    {const_cast<char*>("pattern"), reinterpret_cast<getter>(MessageFormat_get_pattern), nullptr,
-     const_cast<char*>("The message pattern string"), nullptr},
-    {const_cast<char*>("locale"), reinterpret_cast<getter>(MessageFormat_get_locale), nullptr,
-     const_cast<char*>("The locale used for formatting"), nullptr},
+PyGetSetDef Catalog_getsetters[] = {
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(Catalog_get_locale), nullptr,
+     const_cast<char*>("The locale the catalog's messages were compiled for"), nullptr},
     {nullptr, nullptr, nullptr, nullptr, nullptr}
 };
 
-PyType_Slot MessageFormat_slots[] = {
-    {Py_tp_doc, const_cast<char*>("ICU MessageFormat")},
-    {Py_tp_dealloc, reinterpret_cast<void*>(MessageFormat_dealloc)},
-    {Py_tp_init, reinterpret_cast<void*>(MessageFormat_init)},
-    {Py_tp_new, reinterpret_cast<void*>(MessageFormat_new)},
-    {Py_tp_repr, reinterpret_cast<void*>(MessageFormat_repr)},
-    {Py_tp_methods, MessageFormat_methods},
-    {Py_tp_getset, MessageFormat_getsetters},
+PyType_Slot Catalog_slots[] = {
+    {Py_tp_doc, const_cast<char*>("A memory-mapped compiled message catalog")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(Catalog_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(Catalog_init)},
+    {Py_tp_new, reinterpret_cast<void*>(Catalog_new)},
+    {Py_tp_iter, reinterpret_cast<void*>(Catalog_iter)},
+    {Py_mp_subscript, reinterpret_cast<void*>(Catalog_getitem)},
+    {Py_mp_length, reinterpret_cast<void*>(Catalog_length)},
+    {Py_sq_contains, reinterpret_cast<void*>(Catalog_contains)},
+    {Py_tp_methods, Catalog_methods},
+    {Py_tp_getset, Catalog_getsetters},
     {0, nullptr}
 };
 
-PyType_Spec MessageFormat_spec = {
-    "icu4py.messageformat.MessageFormat",
-    sizeof(MessageFormatObject),
+PyType_Spec Catalog_spec = {
+    "icu4py.messageformat.Catalog",
+    sizeof(CatalogObject),
     0,
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
-    MessageFormat_slots
+    Py_TPFLAGS_DEFAULT,
+    Catalog_slots
+};
+
+PyStructSequence_Field CacheInfo_fields[] = {
+    {"hits", "Calls answered from the cache"},
+    {"misses", "Calls that were formatted"},
+    {"maxsize", "The cache size limit, 0 when caching is disabled"},
+    {"currsize", "The number of cached results"},
+    {nullptr, nullptr}
+};
+
+PyStructSequence_Desc CacheInfo_desc = {
+    "icu4py.messageformat.CacheInfo",
+    "Result cache statistics for a MessageFormat",
+    CacheInfo_fields,
+    4,
 };
 
 int icu4py_messageformat_exec(PyObject* m) {
@@ -565,26 +3209,69 @@ int icu4py_messageformat_exec(PyObject* m) {
         return -1;
     }
 
-    if (PyModule_AddObject(m, "MessageFormat", type_obj) < 0) {
+    if (PyModule_AddObjectRef(m, "MessageFormat", type_obj) < 0) {
         Py_DECREF(type_obj);
         return -1;
     }
 
     ModuleState* state = get_module_state(m);
+    state->message_format_type = type_obj;
+
+    PyObject* catalog_type = PyType_FromModuleAndSpec(m, &Catalog_spec, nullptr);
+    if (catalog_type == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "Catalog", catalog_type) < 0) {
+        Py_DECREF(catalog_type);
+        return -1;
+    }
+
+    PyDateTime_IMPORT;
+    if (PyDateTimeAPI == nullptr) {
+        return -1;
+    }
+
+    state->str_utcoffset = PyUnicode_InternFromString("utcoffset");
+    if (state->str_utcoffset == nullptr) {
+        return -1;
+    }
+
+    state->format_cache = new FormatCache(kMaxCachedFormats);
+    state->time_zones = new TimeZoneRegistry();
+
+    state->str_key = PyUnicode_InternFromString("key");
+    if (state->str_key == nullptr) {
+        return -1;
+    }
 
-    PyObject* datetime_module = PyImport_ImportModule("datetime");
-    if (datetime_module == nullptr) {
+    state->str_time_zone = PyUnicode_InternFromString("time_zone");
+    if (state->str_time_zone == nullptr) {
         return -1;
     }
 
-    state->datetime_datetime_type = PyObject_GetAttrString(datetime_module, "datetime");
-    state->datetime_date_type = PyObject_GetAttrString(datetime_module, "date");
-    state->datetime_time_type = PyObject_GetAttrString(datetime_module, "time");
-    Py_DECREF(datetime_module);
+    PyObject* zoneinfo_module = PyImport_ImportModule("zoneinfo");
+    if (zoneinfo_module == nullptr) {
+        return -1;
+    }
+    state->zoneinfo_type = PyObject_GetAttrString(zoneinfo_module, "ZoneInfo");
+    Py_DECREF(zoneinfo_module);
+    if (state->zoneinfo_type == nullptr) {
+        return -1;
+    }
+
+    state->cache_info_type = reinterpret_cast<PyObject*>(PyStructSequence_NewType(&CacheInfo_desc));
+    if (state->cache_info_type == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObjectRef(m, "CacheInfo", state->cache_info_type) < 0) {
+        return -1;
+    }
 
-    if (state->datetime_datetime_type == nullptr ||
-        state->datetime_date_type == nullptr ||
-        state->datetime_time_type == nullptr) {
+    TimeZone* default_time_zone = TimeZone::createDefault();
+    state->default_time_zone = dynamic_cast<BasicTimeZone*>(default_time_zone);
+    if (state->default_time_zone == nullptr) {
+        delete default_time_zone;
+        PyErr_SetString(PyExc_RuntimeError, "Failed to load ICU's default time zone");
         return -1;
     }
 
@@ -600,6 +3287,23 @@ int icu4py_messageformat_exec(PyObject* m) {
         return -1;
     }
 
+    state->str_value = PyUnicode_InternFromString("value");
+    if (state->str_value == nullptr) {
+        return -1;
+    }
+
+    PyObject* enum_module = PyImport_ImportModule("enum");
+    if (enum_module == nullptr) {
+        return -1;
+    }
+
+    state->enum_enum_type = PyObject_GetAttrString(enum_module, "Enum");
+    Py_DECREF(enum_module);
+
+    if (state->enum_enum_type == nullptr) {
+        return -1;
+    }
+
     PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
     if (locale_module == nullptr) {
         return -1;
@@ -612,29 +3316,57 @@ int icu4py_messageformat_exec(PyObject* m) {
         return -1;
     }
 
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
     return 0;
 }
 
 int icu4py_messageformat_traverse(PyObject* m, visitproc visit, void* arg) {
     ModuleState* state = get_module_state(m);
-    Py_VISIT(state->datetime_datetime_type);
-    Py_VISIT(state->datetime_date_type);
-    Py_VISIT(state->datetime_time_type);
     Py_VISIT(state->decimal_decimal_type);
     Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    Py_VISIT(state->str_utcoffset);
+    Py_VISIT(state->enum_enum_type);
+    Py_VISIT(state->str_value);
+    Py_VISIT(state->cache_info_type);
+    Py_VISIT(state->str_key);
+    Py_VISIT(state->str_time_zone);
+    Py_VISIT(state->zoneinfo_type);
+    Py_VISIT(state->message_format_type);
     return 0;
 }
 
 int icu4py_messageformat_clear(PyObject* m) {
     ModuleState* state = get_module_state(m);
-    Py_CLEAR(state->datetime_datetime_type);
-    Py_CLEAR(state->datetime_date_type);
-    Py_CLEAR(state->datetime_time_type);
     Py_CLEAR(state->decimal_decimal_type);
     Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    Py_CLEAR(state->str_utcoffset);
+    Py_CLEAR(state->enum_enum_type);
+    Py_CLEAR(state->str_value);
+    Py_CLEAR(state->cache_info_type);
+    Py_CLEAR(state->str_key);
+    Py_CLEAR(state->str_time_zone);
+    Py_CLEAR(state->zoneinfo_type);
+    Py_CLEAR(state->message_format_type);
     return 0;
 }
 
+void icu4py_messageformat_free(void* m) {
+    icu4py_messageformat_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->default_time_zone;
+    state->default_time_zone = nullptr;
+    delete state->format_cache;
+    state->format_cache = nullptr;
+    delete state->time_zones;
+    state->time_zones = nullptr;
+}
+
 }  // anonymous namespace
 
 PyMODINIT_FUNC PyInit_messageformat() {
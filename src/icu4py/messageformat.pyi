@@ -1,17 +1,124 @@
-from datetime import date, datetime
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
+from enum import Enum
+from types import TracebackType
+from typing import Final, TypeAlias, TypeVar, final, overload
+from zoneinfo import ZoneInfo
 
-from typing_extensions import disjoint_base
+from _typeshed import StrOrBytesPath, structseq
+from typing_extensions import Buffer, disjoint_base
 
 from icu4py.locale import Locale
 
+_Value: TypeAlias = (
+    int | float | str | Decimal | date | datetime | time | timedelta | Enum
+)
+
+@final
+class CacheInfo(structseq[int], tuple[int, int, int, int]):
+    __match_args__: Final = ("hits", "misses", "maxsize", "currsize")
+    @property
+    def hits(self) -> int: ...
+    @property
+    def misses(self) -> int: ...
+    @property
+    def maxsize(self) -> int: ...
+    @property
+    def currsize(self) -> int: ...
+
 @disjoint_base
 class MessageFormat:
-    def __init__(self, pattern: str, locale: str | Locale) -> None: ...
+    def __init__(
+        self,
+        pattern: str,
+        locale: str | Locale,
+        cache_size: int = 0,
+        time_zone: str | ZoneInfo | None = None,
+    ) -> None: ...
     @property
     def pattern(self) -> str: ...
     @property
     def locale(self) -> Locale: ...
+    @property
+    def time_zone(self) -> str | None: ...
+    @property
+    def arg_names(self) -> tuple[str, ...]: ...
+    @property
+    def arg_types(self) -> tuple[str, ...]: ...
     def format(
-        self, params: dict[str, int | float | str | Decimal | date | datetime]
+        self,
+        params: dict[str, _Value] | tuple[_Value, ...] = ...,
+        /,
+        *,
+        time_zone: str | ZoneInfo | None = None,
+        **kwargs: _Value,
     ) -> str: ...
+    def format_bytes(
+        self,
+        params: dict[str, _Value] | tuple[_Value, ...] = ...,
+        /,
+        *,
+        time_zone: str | ZoneInfo | None = None,
+        **kwargs: _Value,
+    ) -> bytes: ...
+    def format_into(
+        self,
+        params: dict[str, _Value] | tuple[_Value, ...],
+        buffer: Buffer,
+        offset: int = 0,
+        /,
+        *,
+        time_zone: str | ZoneInfo | None = None,
+    ) -> int: ...
+    def parse(self, text: str, /) -> dict[str, int | float | str | datetime]: ...
+    def parse_many(
+        self, texts: Iterable[str], /
+    ) -> list[dict[str, int | float | str | datetime] | None]: ...
+    def format_to_parts(
+        self,
+        params: dict[str, _Value] | tuple[_Value, ...] = ...,
+        /,
+        *,
+        time_zone: str | ZoneInfo | None = None,
+        **kwargs: _Value,
+    ) -> tuple[str, list[tuple[str, str, int, int]]]: ...
+    def format_many(
+        self,
+        params: Iterable[dict[str, _Value] | tuple[_Value, ...]],
+        /,
+        *,
+        time_zone: str | ZoneInfo | None = None,
+    ) -> list[str]: ...
+    def format_columns(
+        self, columns: dict[str, Sequence[_Value] | Buffer], /
+    ) -> list[str]: ...
+    def cache_info(self) -> CacheInfo: ...
+    def cache_clear(self) -> None: ...
+
+_T = TypeVar("_T")
+
+def compile_catalog(messages: Mapping[str, str], locale: str | Locale) -> bytes: ...
+
+@final
+class Catalog:
+    def __init__(self, path: StrOrBytesPath) -> None: ...
+    @property
+    def locale(self) -> Locale: ...
+    def __getitem__(self, id: str, /) -> MessageFormat: ...
+    def __contains__(self, id: object, /) -> bool: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[str]: ...
+    @overload
+    def get(self, id: str, /) -> MessageFormat | None: ...
+    @overload
+    def get(self, id: str, default: _T, /) -> MessageFormat | _T: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> Catalog: ...
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+        /,
+    ) -> None: ...
@@ -0,0 +1,771 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/uconfig.h>
+#include <unicode/uversion.h>
+
+// MessageFormat 2 is only complete enough to wrap from ICU 78. Against older
+// ICU versions the module still builds, but raises ImportError on import.
+#if U_ICU_VERSION_MAJOR_NUM >= 78 && !UCONFIG_NO_MF2
+#define ICU4PY_HAVE_MESSAGEFORMAT2 1
+#else
+#define ICU4PY_HAVE_MESSAGEFORMAT2 0
+#endif
+
+#if ICU4PY_HAVE_MESSAGEFORMAT2
+
+#include <unicode/locid.h>
+#include <unicode/messageformat2.h>
+#include <unicode/messageformat2_arguments.h>
+#include <unicode/messageformat2_data_model.h>
+#include <unicode/messageformat2_formattable.h>
+#include <unicode/parseerr.h>
+#include <unicode/unistr.h>
+#include <unicode/utypes.h>
+
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <string_view>
+
+#include "locale_types.h"
+
+#endif
+
+namespace {
+
+#if ICU4PY_HAVE_MESSAGEFORMAT2
+
+using icu::Locale;
+using icu::StringPiece;
+using icu::UnicodeString;
+using icu::message2::MessageArguments;
+using icu::message2::MessageFormatter;
+using icu::message2::MFDataModel;
+using icu4py::LocaleObject;
+using icu4py::resolve_locale;
+namespace message2 = icu::message2;
+
+struct ModuleState {
+    PyObject* data_model_type;
+    PyObject* decimal_decimal_type;
+    PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_messageformat2_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_messageformat2_clear(PyObject* m);
+
+#endif
+
+int icu4py_messageformat2_exec(PyObject* m);
+
+PyMethodDef icu4py_messageformat2_module_methods[] = {
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_messageformat2_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_messageformat2_exec)},
+// On Python 3.13+, declare free-threaded support.
+// https://py-free-threading.github.io/porting-extensions/#declaring-free-threaded-support
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+#if ICU4PY_HAVE_MESSAGEFORMAT2
+
+static PyModuleDef icu4pymodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.messageformat2",
+    "",
+    sizeof(ModuleState),
+    icu4py_messageformat2_module_methods,
+    icu4py_messageformat2_slots,
+    icu4py_messageformat2_traverse,
+    icu4py_messageformat2_clear,
+    nullptr,
+};
+
+// A parsed message, which can build any number of MessageFormatter objects
+// without parsing the source again.
+struct DataModelObject {
+    PyObject_HEAD
+    MFDataModel* data_model;
+    PyObject* source;
+};
+
+struct MessageFormatterObject {
+    PyObject_HEAD
+    MessageFormatter* formatter;
+    // ICU's MessageFormatter can't format on several threads at once.
+    std::mutex* mutex;
+    PyObject* source;
+    // The DataModel used to build the formatter, created on first access
+    // when built from a source string.
+    PyObject* data_model;
+};
+
+ModuleState* get_state_for_type(PyTypeObject* type) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(type, &icu4pymodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(type, &icu4pymodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    return get_module_state(module);
+}
+
+bool pyunicode_to_ustring(PyObject* obj, UnicodeString& ustr) {
+    Py_ssize_t size;
+    const char* str_val = PyUnicode_AsUTF8AndSize(obj, &size);
+    if (str_val == nullptr) {
+        return false;
+    }
+    ustr = UnicodeString::fromUTF8(StringPiece(str_val, size));
+    return true;
+}
+
+// DataModel
+
+void DataModel_dealloc(DataModelObject* self) {
+    delete self->data_model;
+    Py_XDECREF(self->source);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* DataModel_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<DataModelObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->data_model = nullptr;
+        self->source = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+int DataModel_init(DataModelObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* source;
+
+    static const char* kwlist[] = {"source", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U", const_cast<char**>(kwlist), &source)) {
+        return -1;
+    }
+
+    UnicodeString usource;
+    if (!pyunicode_to_ustring(source, usource)) {
+        return -1;
+    }
+
+    // ICU only exposes parsing through the formatter builder.
+    UErrorCode status = U_ZERO_ERROR;
+    UParseError parse_error;
+    MessageFormatter::Builder builder(status);
+    builder.setPattern(usource, parse_error, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse message: %s at line %d, offset %d",
+                     u_errorName(status), parse_error.line, parse_error.offset);
+        return -1;
+    }
+    MessageFormatter formatter = builder.build(status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to parse message: %s", u_errorName(status));
+        return -1;
+    }
+
+    delete self->data_model;
+    self->data_model = new MFDataModel(formatter.getDataModel());
+    Py_XSETREF(self->source, Py_NewRef(source));
+    return 0;
+}
+
+PyObject* DataModel_get_source(DataModelObject* self, void* closure) {
+    return Py_NewRef(self->source);
+}
+
+PyObject* DataModel_repr(DataModelObject* self) {
+    return PyUnicode_FromFormat("DataModel(%R)", self->source);
+}
+
+PyGetSetDef DataModel_getsetters[] = {
+    {const_cast<char*>("source"), reinterpret_cast<getter>(DataModel_get_source), nullptr,
+     const_cast<char*>("The message source string"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot DataModel_slots[] = {
+    {Py_tp_doc, const_cast<char*>("A parsed MessageFormat 2 message")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(DataModel_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(DataModel_init)},
+    {Py_tp_new, reinterpret_cast<void*>(DataModel_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(DataModel_repr)},
+    {Py_tp_getset, DataModel_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec DataModel_spec = {
+    "icu4py.messageformat2.DataModel",
+    sizeof(DataModelObject),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    DataModel_slots
+};
+
+// MessageFormatter
+
+void MessageFormatter_dealloc(MessageFormatterObject* self) {
+    delete self->formatter;
+    delete self->mutex;
+    Py_XDECREF(self->source);
+    Py_XDECREF(self->data_model);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* MessageFormatter_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<MessageFormatterObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->formatter = nullptr;
+        self->mutex = nullptr;
+        self->source = nullptr;
+        self->data_model = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+int MessageFormatter_init(MessageFormatterObject* self, PyObject* args, PyObject* kwds) {
+    // format() uses the formatter with the GIL released, so it must not be
+    // replaced once created.
+    if (self->formatter != nullptr) {
+        PyErr_SetString(PyExc_TypeError, "MessageFormatter objects cannot be reinitialized");
+        return -1;
+    }
+
+    PyObject* source_obj;
+    PyObject* locale_obj;
+
+    static const char* kwlist[] = {"source", "locale", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", const_cast<char**>(kwlist),
+                                     &source_obj, &locale_obj)) {
+        return -1;
+    }
+
+    ModuleState* mod_state = get_state_for_type(Py_TYPE(self));
+    if (mod_state == nullptr) {
+        return -1;
+    }
+
+    Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return -1;
+    }
+
+    UErrorCode status = U_ZERO_ERROR;
+    MessageFormatter::Builder builder(status);
+    builder.setLocale(locale);
+
+    PyObject* source;
+    PyObject* data_model = nullptr;
+    if (PyUnicode_Check(source_obj)) {
+        UnicodeString usource;
+        if (!pyunicode_to_ustring(source_obj, usource)) {
+            return -1;
+        }
+        UParseError parse_error;
+        builder.setPattern(usource, parse_error, status);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError, "Failed to parse message: %s at line %d, offset %d",
+                         u_errorName(status), parse_error.line, parse_error.offset);
+            return -1;
+        }
+        source = source_obj;
+    } else {
+        int is_data_model = PyObject_IsInstance(source_obj, mod_state->data_model_type);
+        if (is_data_model == -1) {
+            return -1;
+        }
+        if (is_data_model == 0) {
+            PyErr_SetString(PyExc_TypeError, "source must be a string or DataModel object");
+            return -1;
+        }
+        auto* data_model_obj = reinterpret_cast<DataModelObject*>(source_obj);
+        if (data_model_obj->data_model == nullptr) {
+            PyErr_SetString(PyExc_ValueError, "DataModel object is not initialized");
+            return -1;
+        }
+        // Building from a data model skips parsing.
+        builder.setDataModel(MFDataModel(*data_model_obj->data_model));
+        source = data_model_obj->source;
+        data_model = source_obj;
+    }
+
+    // MessageFormatter can't be moved, so build() has to initialize it in place.
+    std::unique_ptr<MessageFormatter> formatter(new MessageFormatter(builder.build(status)));
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to create MessageFormatter: %s",
+                     u_errorName(status));
+        return -1;
+    }
+
+    self->formatter = formatter.release();
+    self->mutex = new std::mutex();
+    self->source = Py_NewRef(source);
+    self->data_model = Py_XNewRef(data_model);
+    return 0;
+}
+
+void add_key_to_error(PyObject* key) {
+    PyObject *exc_type, *exc_value, *exc_tb;
+    PyErr_Fetch(&exc_type, &exc_value, &exc_tb);
+    PyErr_NormalizeException(&exc_type, &exc_value, &exc_tb);
+
+    PyObject* orig_msg = exc_value != nullptr ? PyObject_Str(exc_value) : nullptr;
+    if (orig_msg != nullptr) {
+        PyErr_Format(exc_type, "%U for key %R", orig_msg, key);
+        Py_DECREF(orig_msg);
+        Py_XDECREF(exc_type);
+        Py_XDECREF(exc_value);
+        Py_XDECREF(exc_tb);
+    } else {
+        PyErr_Restore(exc_type, exc_value, exc_tb);
+    }
+}
+
+bool digits_to_formattable(PyObject* obj, message2::Formattable& formattable) {
+    PyObject* str_obj = PyObject_Str(obj);
+    if (str_obj == nullptr) {
+        return false;
+    }
+    Py_ssize_t size;
+    const char* str_val = PyUnicode_AsUTF8AndSize(str_obj, &size);
+    if (str_val == nullptr) {
+        Py_DECREF(str_obj);
+        return false;
+    }
+    UErrorCode status = U_ZERO_ERROR;
+    formattable = message2::Formattable::forDecimal(std::string_view(str_val, size), status);
+    Py_DECREF(str_obj);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to create Formattable from number: %s",
+                     u_errorName(status));
+        return false;
+    }
+    return true;
+}
+
+bool pyobject_to_formattable(PyObject* obj, message2::Formattable& formattable,
+                             ModuleState* state) {
+    if (PyUnicode_Check(obj)) {
+        UnicodeString ustr;
+        if (!pyunicode_to_ustring(obj, ustr)) {
+            return false;
+        }
+        formattable = message2::Formattable(ustr);
+        return true;
+    }
+
+    if (PyLong_Check(obj)) {
+        int overflow;
+        long long long_val = PyLong_AsLongLongAndOverflow(obj, &overflow);
+        if (overflow != 0) {
+            return digits_to_formattable(obj, formattable);
+        }
+        if (long_val == -1 && PyErr_Occurred()) {
+            return false;
+        }
+        formattable = message2::Formattable(static_cast<int64_t>(long_val));
+        return true;
+    }
+
+    if (PyFloat_Check(obj)) {
+        formattable = message2::Formattable(PyFloat_AS_DOUBLE(obj));
+        return true;
+    }
+
+    int is_decimal = PyObject_IsInstance(obj, state->decimal_decimal_type);
+    if (is_decimal == -1) {
+        return false;
+    } else if (is_decimal == 1) {
+        return digits_to_formattable(obj, formattable);
+    }
+
+    PyErr_Format(PyExc_TypeError, "Parameter values must be int, float, str, or Decimal, got %R",
+                 obj);
+    return false;
+}
+
+bool add_argument(std::map<UnicodeString, message2::Formattable>& arguments, PyObject* key,
+                  PyObject* value, ModuleState* state) {
+    if (!PyUnicode_Check(key)) {
+        PyErr_Format(PyExc_TypeError, "Dictionary keys must be strings, got %R", key);
+        return false;
+    }
+    UnicodeString name;
+    if (!pyunicode_to_ustring(key, name)) {
+        return false;
+    }
+    message2::Formattable formattable;
+    if (!pyobject_to_formattable(value, formattable, state)) {
+        add_key_to_error(key);
+        return false;
+    }
+    arguments[name] = formattable;
+    return true;
+}
+
+bool collect_dict_arguments(PyObject* dict, ModuleState* state,
+                            std::map<UnicodeString, message2::Formattable>& arguments) {
+    bool ok = true;
+    Py_ssize_t pos = 0;
+    PyObject* key;
+    PyObject* value;
+
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(dict);
+#endif
+
+    while (PyDict_Next(dict, &pos, &key, &value)) {
+        if (!add_argument(arguments, key, value, state)) {
+            ok = false;
+            break;
+        }
+    }
+
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+
+    return ok;
+}
+
+PyObject* format_arguments(MessageFormatterObject* self,
+                           const std::map<UnicodeString, message2::Formattable>& argument_map) {
+    UErrorCode status = U_ZERO_ERROR;
+    MessageArguments arguments(argument_map, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to create message arguments: %s",
+                     u_errorName(status));
+        return nullptr;
+    }
+
+    UnicodeString result;
+    std::string utf8;
+
+    Py_BEGIN_ALLOW_THREADS
+    {
+        std::lock_guard<std::mutex> lock(*self->mutex);
+        result = self->formatter->formatToString(arguments, status);
+    }
+    if (U_SUCCESS(status)) {
+        result.toUTF8String(utf8);
+    }
+    Py_END_ALLOW_THREADS
+
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to format message: %s", u_errorName(status));
+        return nullptr;
+    }
+    return PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+}
+
+PyObject* MessageFormatter_format(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    Py_ssize_t nkwargs = kwnames == nullptr ? 0 : PyTuple_GET_SIZE(kwnames);
+    if (nargs > 1) {
+        PyErr_Format(PyExc_TypeError, "format() takes at most 1 positional argument (%zd given)",
+                     nargs);
+        return nullptr;
+    }
+    if (nargs == 1 && nkwargs > 0) {
+        PyErr_SetString(PyExc_TypeError,
+                        "format() takes either a params argument or keyword arguments, not both");
+        return nullptr;
+    }
+
+    ModuleState* mod_state = static_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    std::map<UnicodeString, message2::Formattable> arguments;
+    if (nargs == 1) {
+        if (!PyDict_Check(args[0])) {
+            PyErr_Format(PyExc_TypeError, "params must be a dict, not %.200s",
+                         Py_TYPE(args[0])->tp_name);
+            return nullptr;
+        }
+        if (!collect_dict_arguments(args[0], mod_state, arguments)) {
+            return nullptr;
+        }
+    }
+    for (Py_ssize_t i = 0; i < nkwargs; ++i) {
+        if (!add_argument(arguments, PyTuple_GET_ITEM(kwnames, i), args[nargs + i], mod_state)) {
+            return nullptr;
+        }
+    }
+
+    return format_arguments(reinterpret_cast<MessageFormatterObject*>(self), arguments);
+}
+
+PyObject* MessageFormatter_format_many(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "format_many() takes exactly 1 argument");
+        return nullptr;
+    }
+
+    ModuleState* mod_state = static_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* iterator = PyObject_GetIter(args[0]);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* results = PyList_New(0);
+    if (results == nullptr) {
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    std::map<UnicodeString, message2::Formattable> arguments;
+    PyObject* params;
+    while ((params = PyIter_Next(iterator)) != nullptr) {
+        arguments.clear();
+        bool ok;
+        if (PyDict_Check(params)) {
+            ok = collect_dict_arguments(params, mod_state, arguments);
+        } else {
+            PyErr_Format(PyExc_TypeError, "params must be a dict, not %.200s",
+                         Py_TYPE(params)->tp_name);
+            ok = false;
+        }
+        Py_DECREF(params);
+        if (!ok) {
+            break;
+        }
+
+        PyObject* str_obj =
+            format_arguments(reinterpret_cast<MessageFormatterObject*>(self), arguments);
+        if (str_obj == nullptr) {
+            break;
+        }
+        int append_result = PyList_Append(results, str_obj);
+        Py_DECREF(str_obj);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+PyObject* MessageFormatter_get_source(MessageFormatterObject* self, void* closure) {
+    return Py_NewRef(self->source);
+}
+
+PyObject* MessageFormatter_get_data_model(MessageFormatterObject* self, void* closure) {
+    PyObject* data_model = nullptr;
+
+#ifdef Py_GIL_DISABLED
+    Py_BEGIN_CRITICAL_SECTION(self);
+#endif
+
+    if (self->data_model == nullptr) {
+        ModuleState* mod_state = get_state_for_type(Py_TYPE(self));
+        if (mod_state != nullptr) {
+            auto* type = reinterpret_cast<PyTypeObject*>(mod_state->data_model_type);
+            auto* obj = reinterpret_cast<DataModelObject*>(type->tp_alloc(type, 0));
+            if (obj != nullptr) {
+                obj->data_model = new MFDataModel(self->formatter->getDataModel());
+                obj->source = Py_NewRef(self->source);
+                self->data_model = reinterpret_cast<PyObject*>(obj);
+            }
+        }
+    }
+    data_model = Py_XNewRef(self->data_model);
+
+#ifdef Py_GIL_DISABLED
+    Py_END_CRITICAL_SECTION();
+#endif
+
+    return data_model;
+}
+
+PyObject* MessageFormatter_get_locale(MessageFormatterObject* self, void* closure) {
+    ModuleState* mod_state = get_state_for_type(Py_TYPE(self));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+
+    icu4py::set_locale(locale_obj, self->formatter->getLocale());
+
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* MessageFormatter_repr(MessageFormatterObject* self) {
+    return PyUnicode_FromFormat("MessageFormatter(%R, Locale('%s'))", self->source,
+                                self->formatter->getLocale().getName());
+}
+
+PyMethodDef MessageFormatter_methods[] = {
+    {"format", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormatter_format)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message with given parameters"},
+    {"format_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(MessageFormatter_format_many)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format the message once for each parameters dict in an iterable"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef MessageFormatter_getsetters[] = {
+    {const_cast<char*>("source"), reinterpret_cast<getter>(MessageFormatter_get_source), nullptr,
+     const_cast<char*>("The message source string"), nullptr},
+    {const_cast<char*>("data_model"), reinterpret_cast<getter>(MessageFormatter_get_data_model), nullptr,
+     const_cast<char*>("The parsed message"), nullptr},
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(MessageFormatter_get_locale), nullptr,
+     const_cast<char*>("The locale used for formatting"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot MessageFormatter_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU MessageFormat 2 MessageFormatter")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(MessageFormatter_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(MessageFormatter_init)},
+    {Py_tp_new, reinterpret_cast<void*>(MessageFormatter_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(MessageFormatter_repr)},
+    {Py_tp_methods, MessageFormatter_methods},
+    {Py_tp_getset, MessageFormatter_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec MessageFormatter_spec = {
+    "icu4py.messageformat2.MessageFormatter",
+    sizeof(MessageFormatterObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    MessageFormatter_slots
+};
+
+int icu4py_messageformat2_exec(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+
+    state->data_model_type = PyType_FromModuleAndSpec(m, &DataModel_spec, nullptr);
+    if (state->data_model_type == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObjectRef(m, "DataModel", state->data_model_type) < 0) {
+        return -1;
+    }
+
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &MessageFormatter_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "MessageFormatter", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+
+    PyObject* decimal_module = PyImport_ImportModule("decimal");
+    if (decimal_module == nullptr) {
+        return -1;
+    }
+    state->decimal_decimal_type = PyObject_GetAttrString(decimal_module, "Decimal");
+    Py_DECREF(decimal_module);
+    if (state->decimal_decimal_type == nullptr) {
+        return -1;
+    }
+
+    PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
+    if (locale_module == nullptr) {
+        return -1;
+    }
+    state->locale_type = PyObject_GetAttrString(locale_module, "Locale");
+    Py_DECREF(locale_module);
+    if (state->locale_type == nullptr) {
+        return -1;
+    }
+
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_messageformat2_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->data_model_type);
+    Py_VISIT(state->decimal_decimal_type);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    return 0;
+}
+
+int icu4py_messageformat2_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->data_model_type);
+    Py_CLEAR(state->decimal_decimal_type);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    return 0;
+}
+
+#else  // !ICU4PY_HAVE_MESSAGEFORMAT2
+
+static PyModuleDef icu4pymodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.messageformat2",
+    "",
+    0,
+    icu4py_messageformat2_module_methods,
+    icu4py_messageformat2_slots,
+    nullptr,
+    nullptr,
+    nullptr,
+};
+
+int icu4py_messageformat2_exec(PyObject* m) {
+    PyErr_Format(PyExc_ImportError,
+                 "icu4py.messageformat2 requires ICU 78 or later, but was built with ICU %s",
+                 U_ICU_VERSION);
+    return -1;
+}
+
+#endif  // ICU4PY_HAVE_MESSAGEFORMAT2
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_messageformat2() {
+    return PyModuleDef_Init(&icu4pymodule);
+}
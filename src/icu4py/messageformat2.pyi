@@ -0,0 +1,32 @@
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import TypeAlias
+
+from typing_extensions import disjoint_base
+
+from icu4py.locale import Locale
+
+_Value: TypeAlias = int | float | str | Decimal
+
+@disjoint_base
+class DataModel:
+    def __init__(self, source: str) -> None: ...
+    @property
+    def source(self) -> str: ...
+
+@disjoint_base
+class MessageFormatter:
+    def __init__(self, source: str | DataModel, locale: str | Locale) -> None: ...
+    @property
+    def source(self) -> str: ...
+    @property
+    def data_model(self) -> DataModel: ...
+    @property
+    def locale(self) -> Locale: ...
+    def format(
+        self,
+        params: dict[str, _Value] = ...,
+        /,
+        **kwargs: _Value,
+    ) -> str: ...
+    def format_many(self, params: Iterable[dict[str, _Value]], /) -> list[str]: ...
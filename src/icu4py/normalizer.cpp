@@ -0,0 +1,406 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/normalizer2.h>
+#include <unicode/unistr.h>
+#include <unicode/utypes.h>
+
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "string_conversion.h"
+
+namespace {
+
+using icu::Normalizer2;
+using icu::UnicodeString;
+using icu4py::StrData;
+using icu4py::get_str_data;
+using icu4py::to_utf16;
+using icu4py::utf16_to_str;
+
+struct FormInfo {
+    const char* name;
+    const Normalizer2* (*get_instance)(UErrorCode&);
+    // Whether ASCII text is only normalized without uppercase letters,
+    // rather than always.
+    bool folds_case;
+    // Whether all Latin-1 text is normalized, as it is for NFC, which
+    // has no combining marks or compositions in that range.
+    bool latin1_normalized;
+};
+
+constexpr FormInfo kForms[] = {
+    {"NFC", Normalizer2::getNFCInstance, false, true},
+    {"NFD", Normalizer2::getNFDInstance, false, false},
+    {"NFKC", Normalizer2::getNFKCInstance, false, false},
+    {"NFKD", Normalizer2::getNFKDInstance, false, false},
+    {"NFKC_Casefold", Normalizer2::getNFKCCasefoldInstance, true, false},
+};
+
+int icu4py_normalizer_exec(PyObject* m);
+
+extern PyModuleDef normalizermodule;
+
+struct NormalizerObject {
+    PyObject_HEAD
+    // One of ICU's shared instances, which it owns and caches.
+    const Normalizer2* normalizer;
+    const FormInfo* form;
+};
+
+void Normalizer_dealloc(NormalizerObject* self) {
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* Normalizer_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<NormalizerObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->normalizer = nullptr;
+        self->form = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+int Normalizer_init(NormalizerObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* form_obj;
+
+    static const char* kwlist[] = {"form", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U", const_cast<char**>(kwlist), &form_obj)) {
+        return -1;
+    }
+
+    const FormInfo* form = nullptr;
+    for (const FormInfo& entry : kForms) {
+        if (PyUnicode_CompareWithASCIIString(form_obj, entry.name) == 0) {
+            form = &entry;
+            break;
+        }
+    }
+    if (form == nullptr) {
+        PyErr_Format(PyExc_ValueError,
+                     "form must be 'NFC', 'NFD', 'NFKC', 'NFKD', or 'NFKC_Casefold', not %R",
+                     form_obj);
+        return -1;
+    }
+
+    UErrorCode status = U_ZERO_ERROR;
+    const Normalizer2* normalizer = form->get_instance(status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to load %s normalizer: %s", form->name,
+                     u_errorName(status));
+        return -1;
+    }
+    self->normalizer = normalizer;
+    self->form = form;
+    return 0;
+}
+
+bool check_initialized(NormalizerObject* self) {
+    if (self->normalizer == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "Normalizer is not initialized");
+        return false;
+    }
+    return true;
+}
+
+// Check whether text is known to be normalized from its str kind alone,
+// without converting it to UTF-16. ASCII text always is, apart from
+// uppercase letters when folding case.
+bool known_normalized(const FormInfo& form, const StrData& str) {
+    if (str.kind == PyUnicode_1BYTE_KIND && form.latin1_normalized) {
+        return true;
+    }
+    if (!str.is_ascii) {
+        return false;
+    }
+    if (!form.folds_case) {
+        return true;
+    }
+    const auto* chars = static_cast<const Py_UCS1*>(str.data);
+    for (int32_t i = 0; i < str.length; ++i) {
+        if (chars[i] >= 'A' && chars[i] <= 'Z') {
+            return false;
+        }
+    }
+    return true;
+}
+
+// Normalize str into result, unless it's already normalized, which returns
+// true without copying it. Only the text after the longest normalized
+// prefix found by a quick check is normalized.
+bool normalize_text(const Normalizer2& normalizer, const FormInfo& form, const StrData& str,
+                    std::u16string& buffer, UnicodeString& result, UErrorCode& status) {
+    if (known_normalized(form, str)) {
+        return true;
+    }
+    int32_t length;
+    const UChar* text = to_utf16(str, buffer, length);
+    // A read-only alias, which doesn't copy the text.
+    UnicodeString alias(false, text, length);
+    int32_t span = normalizer.spanQuickCheckYes(alias, status);
+    if (U_FAILURE(status) || span == length) {
+        return true;
+    }
+    result.setTo(alias, 0, span);
+    normalizer.normalizeSecondAndAppend(result, alias.tempSubString(span), status);
+    return false;
+}
+
+PyObject* Normalizer_normalize(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<NormalizerObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    StrData str;
+    if (!get_str_data(arg, str)) {
+        return nullptr;
+    }
+    std::u16string buffer;
+    UnicodeString result;
+    UErrorCode status = U_ZERO_ERROR;
+    bool unchanged =
+        normalize_text(*self_obj->normalizer, *self_obj->form, str, buffer, result, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to normalize string: %s", u_errorName(status));
+        return nullptr;
+    }
+    if (unchanged) {
+        return Py_NewRef(arg);
+    }
+    return utf16_to_str(result.getBuffer(), result.length());
+}
+
+PyObject* Normalizer_is_normalized(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<NormalizerObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    StrData str;
+    if (!get_str_data(arg, str)) {
+        return nullptr;
+    }
+    if (known_normalized(*self_obj->form, str)) {
+        Py_RETURN_TRUE;
+    }
+    std::u16string buffer;
+    int32_t length;
+    const UChar* text = to_utf16(str, buffer, length);
+    UErrorCode status = U_ZERO_ERROR;
+    UBool result = self_obj->normalizer->isNormalized(UnicodeString(false, text, length), status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to check normalization: %s",
+                     u_errorName(status));
+        return nullptr;
+    }
+    return PyBool_FromLong(result);
+}
+
+PyObject* Normalizer_quick_check(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<NormalizerObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    StrData str;
+    if (!get_str_data(arg, str)) {
+        return nullptr;
+    }
+    UNormalizationCheckResult result;
+    if (known_normalized(*self_obj->form, str)) {
+        result = UNORM_YES;
+    } else {
+        std::u16string buffer;
+        int32_t length;
+        const UChar* text = to_utf16(str, buffer, length);
+        UErrorCode status = U_ZERO_ERROR;
+        result = self_obj->normalizer->quickCheck(UnicodeString(false, text, length), status);
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to check normalization: %s",
+                         u_errorName(status));
+            return nullptr;
+        }
+    }
+    switch (result) {
+        case UNORM_YES:
+            return PyUnicode_FromString("yes");
+        case UNORM_NO:
+            return PyUnicode_FromString("no");
+        default:
+            return PyUnicode_FromString("maybe");
+    }
+}
+
+PyObject* Normalizer_normalize_many(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<NormalizerObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    if (PyUnicode_Check(arg) || PyBytes_Check(arg) || PyByteArray_Check(arg)) {
+        PyErr_Format(PyExc_TypeError, "strings must be an iterable of strings, not %.200s",
+                     Py_TYPE(arg)->tp_name);
+        return nullptr;
+    }
+    PyObject* strings = PySequence_Tuple(arg);
+    if (strings == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t count = PyTuple_GET_SIZE(strings);
+    std::vector<StrData> str_data(count);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        if (!get_str_data(PyTuple_GET_ITEM(strings, i), str_data[i])) {
+            Py_DECREF(strings);
+            return nullptr;
+        }
+    }
+
+    // Normalized copies, by index, of only the strings that weren't
+    // already normalized.
+    std::vector<std::pair<Py_ssize_t, UnicodeString>> changed;
+    const Normalizer2& normalizer = *self_obj->normalizer;
+    const FormInfo& form = *self_obj->form;
+    UErrorCode status = U_ZERO_ERROR;
+
+    Py_BEGIN_ALLOW_THREADS
+    std::u16string buffer;
+    UnicodeString result;
+    for (Py_ssize_t i = 0; i < count && U_SUCCESS(status); ++i) {
+        if (!normalize_text(normalizer, form, str_data[i], buffer, result, status)) {
+            changed.emplace_back(i, std::move(result));
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    if (U_FAILURE(status)) {
+        Py_DECREF(strings);
+        PyErr_Format(PyExc_RuntimeError, "Failed to normalize string: %s", u_errorName(status));
+        return nullptr;
+    }
+
+    PyObject* list = PyList_New(count);
+    if (list == nullptr) {
+        Py_DECREF(strings);
+        return nullptr;
+    }
+    auto next_changed = changed.begin();
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* str_obj;
+        if (next_changed != changed.end() && next_changed->first == i) {
+            const UnicodeString& normalized = next_changed->second;
+            str_obj = utf16_to_str(normalized.getBuffer(), normalized.length());
+            if (str_obj == nullptr) {
+                Py_DECREF(list);
+                Py_DECREF(strings);
+                return nullptr;
+            }
+            ++next_changed;
+        } else {
+            str_obj = Py_NewRef(PyTuple_GET_ITEM(strings, i));
+        }
+        PyList_SET_ITEM(list, i, str_obj);
+    }
+    Py_DECREF(strings);
+    return list;
+}
+
+PyObject* Normalizer_get_form(NormalizerObject* self, void* closure) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return PyUnicode_FromString(self->form->name);
+}
+
+PyObject* Normalizer_repr(NormalizerObject* self) {
+    if (self->form == nullptr) {
+        return PyUnicode_FromFormat("<%s uninitialized>", Py_TYPE(self)->tp_name);
+    }
+    return PyUnicode_FromFormat("Normalizer('%s')", self->form->name);
+}
+
+PyObject* Normalizer_reduce(NormalizerObject* self, PyObject* Py_UNUSED(ignored)) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return Py_BuildValue("(O(s))", Py_TYPE(self), self->form->name);
+}
+
+PyMethodDef Normalizer_methods[] = {
+    {"normalize", reinterpret_cast<PyCFunction>(Normalizer_normalize), METH_O,
+     "Return the normalized form of a string"},
+    {"is_normalized", reinterpret_cast<PyCFunction>(Normalizer_is_normalized), METH_O,
+     "Check whether a string is normalized"},
+    {"quick_check", reinterpret_cast<PyCFunction>(Normalizer_quick_check), METH_O,
+     "Quickly check whether a string is normalized"},
+    {"normalize_many", reinterpret_cast<PyCFunction>(Normalizer_normalize_many), METH_O,
+     "Return the normalized form of each string in an iterable"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(Normalizer_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef Normalizer_getsetters[] = {
+    {const_cast<char*>("form"), reinterpret_cast<getter>(Normalizer_get_form), nullptr,
+     const_cast<char*>("The normalization form"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot Normalizer_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU Normalizer2")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(Normalizer_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(Normalizer_init)},
+    {Py_tp_new, reinterpret_cast<void*>(Normalizer_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(Normalizer_repr)},
+    {Py_tp_methods, Normalizer_methods},
+    {Py_tp_getset, Normalizer_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec Normalizer_spec = {
+    "icu4py.normalizer.Normalizer",
+    sizeof(NormalizerObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    Normalizer_slots
+};
+
+PyMethodDef icu4py_normalizer_module_methods[] = {
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_normalizer_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_normalizer_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef normalizermodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.normalizer",
+    "",
+    0,
+    icu4py_normalizer_module_methods,
+    icu4py_normalizer_slots,
+    nullptr,
+    nullptr,
+    nullptr,
+};
+
+int icu4py_normalizer_exec(PyObject* m) {
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &Normalizer_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "Normalizer", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+    return 0;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_normalizer() {
+    return PyModuleDef_Init(&normalizermodule);
+}
@@ -0,0 +1,16 @@
+from collections.abc import Iterable
+from typing import Literal, TypeAlias
+
+from typing_extensions import disjoint_base
+
+_Form: TypeAlias = Literal["NFC", "NFD", "NFKC", "NFKD", "NFKC_Casefold"]
+
+@disjoint_base
+class Normalizer:
+    def __init__(self, form: _Form) -> None: ...
+    @property
+    def form(self) -> _Form: ...
+    def normalize(self, string: str, /) -> str: ...
+    def is_normalized(self, string: str, /) -> bool: ...
+    def quick_check(self, string: str, /) -> Literal["yes", "no", "maybe"]: ...
+    def normalize_many(self, strings: Iterable[str], /) -> list[str]: ...
@@ -0,0 +1,574 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/fmtable.h>
+#include <unicode/format.h>
+#include <unicode/locid.h>
+#include <unicode/numberformatter.h>
+#include <unicode/parseerr.h>
+#include <unicode/unistr.h>
+#include <unicode/utypes.h>
+
+#include <cstring>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "locale_types.h"
+#include "lru_cache.h"
+#include "number_conversion.h"
+
+namespace {
+
+using icu::Format;
+using icu::Formattable;
+using icu::Locale;
+using icu::StringPiece;
+using icu::UnicodeString;
+using icu::number::LocalizedNumberFormatter;
+using icu::number::NumberFormatter;
+using icu4py::LocaleObject;
+using icu4py::resolve_locale;
+using icu4py::buffer_item_to_formattable;
+using icu4py::digits_to_formattable;
+using icu4py::float_to_formattable;
+using icu4py::get_numeric_buffer;
+using icu4py::long_to_formattable;
+
+// A formatter compiled from a skeleton, shared between NumberFormatter
+// objects created with the same skeleton and locale. Formatting is const,
+// so threads can use it concurrently.
+struct CompiledFormatter {
+    LocalizedNumberFormatter formatter;
+    // The formatter as an icu::Format, which formats Formattables with
+    // their full decimal precision.
+    std::unique_ptr<Format> format;
+};
+
+// Recently compiled formatters, keyed by locale name and skeleton, so
+// creating the same NumberFormatter again skips parsing the skeleton.
+using FormatterCache = icu4py::LruCache<const CompiledFormatter>;
+
+constexpr size_t kMaxCachedFormatters = 256;
+
+struct ModuleState {
+    PyObject* decimal_decimal_type;
+    PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+    FormatterCache* formatter_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_number_exec(PyObject* m);
+int icu4py_number_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_number_clear(PyObject* m);
+void icu4py_number_free(void* m);
+
+extern PyModuleDef numbermodule;
+
+struct NumberFormatterObject {
+    PyObject_HEAD
+    std::shared_ptr<const CompiledFormatter>* compiled;
+    PyObject* skeleton;
+    Locale* locale;
+};
+
+void NumberFormatter_dealloc(NumberFormatterObject* self) {
+    delete self->compiled;
+    delete self->locale;
+    Py_XDECREF(self->skeleton);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* NumberFormatter_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<NumberFormatterObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->compiled = nullptr;
+        self->skeleton = nullptr;
+        self->locale = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+int NumberFormatter_init(NumberFormatterObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* skeleton_obj;
+    PyObject* locale_obj;
+
+    static const char* kwlist[] = {"skeleton", "locale", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "UO", const_cast<char**>(kwlist),
+                                     &skeleton_obj, &locale_obj)) {
+        return -1;
+    }
+
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &numbermodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &numbermodule);
+#endif
+    if (module == nullptr) {
+        return -1;
+    }
+    ModuleState* mod_state = get_module_state(module);
+
+    Py_ssize_t skeleton_len;
+    const char* skeleton = PyUnicode_AsUTF8AndSize(skeleton_obj, &skeleton_len);
+    if (skeleton == nullptr) {
+        return -1;
+    }
+    Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return -1;
+    }
+
+    std::string cache_key(locale.getName());
+    cache_key.push_back('\0');
+    cache_key.append(skeleton, skeleton_len);
+
+    std::shared_ptr<const CompiledFormatter> compiled =
+        mod_state->formatter_cache->lookup(cache_key);
+    if (compiled == nullptr) {
+        UErrorCode status = U_ZERO_ERROR;
+        UParseError parse_error;
+        UnicodeString uskeleton = UnicodeString::fromUTF8(StringPiece(skeleton, skeleton_len));
+        auto new_compiled = std::make_shared<CompiledFormatter>(CompiledFormatter{
+            NumberFormatter::forSkeleton(uskeleton, parse_error, status).locale(locale),
+            nullptr});
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError,
+                         "Failed to parse number skeleton %R at offset %d: %s", skeleton_obj,
+                         parse_error.offset, u_errorName(status));
+            return -1;
+        }
+        new_compiled->format.reset(new_compiled->formatter.toFormat(status));
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_RuntimeError, "Failed to create number formatter: %s",
+                         u_errorName(status));
+            return -1;
+        }
+        compiled = std::move(new_compiled);
+        mod_state->formatter_cache->store(std::move(cache_key), compiled);
+    }
+
+    delete self->compiled;
+    self->compiled = new std::shared_ptr<const CompiledFormatter>(std::move(compiled));
+    delete self->locale;
+    self->locale = new Locale(locale);
+    Py_INCREF(skeleton_obj);
+    Py_XSETREF(self->skeleton, skeleton_obj);
+    return 0;
+}
+
+void set_unsupported_value_error(PyObject* obj) {
+    PyErr_Format(PyExc_TypeError, "Values must be int, float, or Decimal, got %R", obj);
+}
+
+bool number_to_formattable(PyObject* obj, Formattable& formattable, ModuleState* mod_state) {
+    // Exact types are matched by pointer first, so common values skip the
+    // subclass checks below.
+    PyTypeObject* type = Py_TYPE(obj);
+    if (type == &PyLong_Type) {
+        return long_to_formattable(obj, formattable);
+    }
+    if (type == &PyFloat_Type) {
+        return float_to_formattable(obj, formattable);
+    }
+    if (type == &PyBool_Type) {
+        formattable = Formattable(static_cast<int64_t>(obj == Py_True));
+        return true;
+    }
+    if (reinterpret_cast<PyObject*>(type) == mod_state->decimal_decimal_type) {
+        return digits_to_formattable(obj, formattable, "Decimal");
+    }
+
+    if (PyLong_Check(obj)) {
+        return long_to_formattable(obj, formattable);
+    }
+    if (PyFloat_Check(obj)) {
+        return float_to_formattable(obj, formattable);
+    }
+    int is_decimal = PyObject_IsInstance(obj, mod_state->decimal_decimal_type);
+    if (is_decimal == -1) {
+        return false;
+    }
+    if (is_decimal == 1) {
+        return digits_to_formattable(obj, formattable, "Decimal");
+    }
+
+    set_unsupported_value_error(obj);
+    return false;
+}
+
+bool format_formattable(const CompiledFormatter& compiled, const Formattable& formattable,
+                        UnicodeString& result, std::string& utf8) {
+    UErrorCode status = U_ZERO_ERROR;
+    result.remove();
+    compiled.format->format(formattable, result, status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to format number: %s", u_errorName(status));
+        return false;
+    }
+    utf8.clear();
+    result.toUTF8String(utf8);
+    return true;
+}
+
+ModuleState* defining_module_state(PyTypeObject* defining_class) {
+    return reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+}
+
+bool check_initialized(NumberFormatterObject* self) {
+    if (self->compiled == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "NumberFormatter is not initialized");
+        return false;
+    }
+    return true;
+}
+
+PyObject* NumberFormatter_format(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "format() takes exactly 1 argument");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<NumberFormatterObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = defining_module_state(defining_class);
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    Formattable formattable;
+    if (!number_to_formattable(args[0], formattable, mod_state)) {
+        return nullptr;
+    }
+    UnicodeString result;
+    std::string utf8;
+    if (!format_formattable(**self_obj->compiled, formattable, result, utf8)) {
+        return nullptr;
+    }
+    return PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+}
+
+// Format each item of a 1-dimensional numeric buffer, releasing the GIL
+// while ICU formats them.
+PyObject* format_buffer(NumberFormatterObject* self, PyObject* obj) {
+    Py_buffer view;
+    char kind;
+    if (!get_numeric_buffer(obj, view, kind)) {
+        return nullptr;
+    }
+
+    Py_ssize_t count = view.shape[0];
+    std::vector<std::string> formatted(count);
+    // A reference, so the formatter outlives a concurrent __init__() while
+    // the GIL is released.
+    std::shared_ptr<const CompiledFormatter> compiled = *self->compiled;
+    UErrorCode status = U_ZERO_ERROR;
+
+    Py_BEGIN_ALLOW_THREADS
+    Formattable formattable;
+    UnicodeString result;
+    for (Py_ssize_t i = 0; i < count && U_SUCCESS(status); ++i) {
+        const char* ptr = static_cast<const char*>(view.buf) + i * view.strides[0];
+        // Unsigned values past int64 are converted here rather than by
+        // buffer_item_to_formattable(), which needs the GIL to raise.
+        if (kind == 'u' && view.itemsize == 8) {
+            uint64_t value = icu4py::read_buffer_uint(ptr, view.itemsize);
+            if (value > static_cast<uint64_t>(INT64_MAX)) {
+                char digits[24];
+                int length = snprintf(digits, sizeof(digits), "%llu",
+                                      static_cast<unsigned long long>(value));
+                formattable = Formattable(StringPiece(digits, length), status);
+            } else {
+                formattable = Formattable(static_cast<int64_t>(value));
+            }
+        } else {
+            buffer_item_to_formattable(ptr, kind, view.itemsize, formattable);
+        }
+        result.remove();
+        compiled->format->format(formattable, result, status);
+        result.toUTF8String(formatted[i]);
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&view);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to format number: %s", u_errorName(status));
+        return nullptr;
+    }
+
+    PyObject* results = PyList_New(count);
+    if (results == nullptr) {
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* str_obj = PyUnicode_FromStringAndSize(formatted[i].data(), formatted[i].size());
+        if (str_obj == nullptr) {
+            Py_DECREF(results);
+            return nullptr;
+        }
+        PyList_SET_ITEM(results, i, str_obj);
+    }
+    return results;
+}
+
+PyObject* NumberFormatter_format_many(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "format_many() takes exactly 1 argument");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<NumberFormatterObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = defining_module_state(defining_class);
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* values = args[0];
+    if (PyUnicode_Check(values) || PyBytes_Check(values) || PyByteArray_Check(values)) {
+        PyErr_Format(PyExc_TypeError, "values must be an iterable or numeric buffer, not %.200s",
+                     Py_TYPE(values)->tp_name);
+        return nullptr;
+    }
+    if (PyObject_CheckBuffer(values)) {
+        return format_buffer(self_obj, values);
+    }
+
+    PyObject* iterator = PyObject_GetIter(values);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+    PyObject* results = PyList_New(0);
+    if (results == nullptr) {
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    // Shared across iterations, so their allocations get reused.
+    Formattable formattable;
+    UnicodeString result;
+    std::string utf8;
+    // The iterator can run Python code that reinitializes the object.
+    std::shared_ptr<const CompiledFormatter> compiled = *self_obj->compiled;
+
+    PyObject* value;
+    while ((value = PyIter_Next(iterator)) != nullptr) {
+        bool ok = number_to_formattable(value, formattable, mod_state) &&
+                  format_formattable(*compiled, formattable, result, utf8);
+        Py_DECREF(value);
+        if (!ok) {
+            break;
+        }
+        PyObject* str_obj = PyUnicode_FromStringAndSize(utf8.data(), utf8.size());
+        if (str_obj == nullptr) {
+            break;
+        }
+        int append_result = PyList_Append(results, str_obj);
+        Py_DECREF(str_obj);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+PyObject* NumberFormatter_get_skeleton(NumberFormatterObject* self, void* closure) {
+    if (self->skeleton == nullptr) {
+        return PyUnicode_FromString("");
+    }
+    return Py_NewRef(self->skeleton);
+}
+
+PyObject* NumberFormatter_get_locale(NumberFormatterObject* self, void* closure) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &numbermodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &numbermodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+
+    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+    icu4py::set_locale(locale_obj, *self->locale);
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* NumberFormatter_repr(NumberFormatterObject* self) {
+    if (self->skeleton == nullptr) {
+        return PyUnicode_FromFormat("<%s uninitialized>", Py_TYPE(self)->tp_name);
+    }
+    return PyUnicode_FromFormat("NumberFormatter(%R, Locale('%s'))", self->skeleton,
+                                self->locale->getName());
+}
+
+PyObject* NumberFormatter_reduce(NumberFormatterObject* self, PyObject* Py_UNUSED(ignored)) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return Py_BuildValue("(O(Os))", Py_TYPE(self), self->skeleton, self->locale->getName());
+}
+
+PyMethodDef NumberFormatter_methods[] = {
+    {"format", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(NumberFormatter_format)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format a number"},
+    {"format_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(NumberFormatter_format_many)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Format each number in an iterable or numeric buffer"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(NumberFormatter_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef NumberFormatter_getsetters[] = {
+    {const_cast<char*>("skeleton"), reinterpret_cast<getter>(NumberFormatter_get_skeleton),
+     nullptr, const_cast<char*>("The number skeleton"), nullptr},
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(NumberFormatter_get_locale), nullptr,
+     const_cast<char*>("The locale numbers are formatted for"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot NumberFormatter_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU LocalizedNumberFormatter")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(NumberFormatter_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(NumberFormatter_init)},
+    {Py_tp_new, reinterpret_cast<void*>(NumberFormatter_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(NumberFormatter_repr)},
+    {Py_tp_methods, NumberFormatter_methods},
+    {Py_tp_getset, NumberFormatter_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec NumberFormatter_spec = {
+    "icu4py.number.NumberFormatter",
+    sizeof(NumberFormatterObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    NumberFormatter_slots
+};
+
+PyMethodDef icu4py_number_module_methods[] = {
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_number_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_number_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef numbermodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.number",
+    "",
+    sizeof(ModuleState),
+    icu4py_number_module_methods,
+    icu4py_number_slots,
+    icu4py_number_traverse,
+    icu4py_number_clear,
+    icu4py_number_free,
+};
+
+int icu4py_number_exec(PyObject* m) {
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &NumberFormatter_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "NumberFormatter", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+
+    ModuleState* state = get_module_state(m);
+    state->formatter_cache = new FormatterCache(kMaxCachedFormatters);
+
+    PyObject* decimal_module = PyImport_ImportModule("decimal");
+    if (decimal_module == nullptr) {
+        return -1;
+    }
+    state->decimal_decimal_type = PyObject_GetAttrString(decimal_module, "Decimal");
+    Py_DECREF(decimal_module);
+    if (state->decimal_decimal_type == nullptr) {
+        return -1;
+    }
+
+    PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
+    if (locale_module == nullptr) {
+        return -1;
+    }
+    state->locale_type = PyObject_GetAttrString(locale_module, "Locale");
+    Py_DECREF(locale_module);
+    if (state->locale_type == nullptr) {
+        return -1;
+    }
+
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_number_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->decimal_decimal_type);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    return 0;
+}
+
+int icu4py_number_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->decimal_decimal_type);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    return 0;
+}
+
+void icu4py_number_free(void* m) {
+    icu4py_number_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->formatter_cache;
+    state->formatter_cache = nullptr;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_number() {
+    return PyModuleDef_Init(&numbermodule);
+}
@@ -0,0 +1,18 @@
+from collections.abc import Iterable
+from decimal import Decimal
+
+from typing_extensions import Buffer, disjoint_base
+
+from icu4py.locale import Locale
+
+@disjoint_base
+class NumberFormatter:
+    def __init__(self, skeleton: str, locale: str | Locale) -> None: ...
+    @property
+    def skeleton(self) -> str: ...
+    @property
+    def locale(self) -> Locale: ...
+    def format(self, value: int | float | Decimal, /) -> str: ...
+    def format_many(
+        self, values: Iterable[int | float | Decimal] | Buffer, /
+    ) -> list[str]: ...
@@ -0,0 +1,232 @@
+#ifndef ICU4PY_NUMBER_CONVERSION_H
+#define ICU4PY_NUMBER_CONVERSION_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/fmtable.h>
+#include <unicode/stringpiece.h>
+#include <unicode/utypes.h>
+
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <string>
+
+// Conversion of Python numbers and numeric buffer items to ICU
+// Formattables, shared by the modules that format numbers.
+
+namespace icu4py {
+
+inline bool digits_to_formattable(PyObject* obj, icu::Formattable& formattable,
+                                  const char* type_name) {
+    PyObject* str_obj = PyObject_Str(obj);
+    if (str_obj == nullptr) {
+        return false;
+    }
+    Py_ssize_t size;
+    const char* str_val = PyUnicode_AsUTF8AndSize(str_obj, &size);
+    if (str_val == nullptr) {
+        Py_DECREF(str_obj);
+        return false;
+    }
+    UErrorCode status = U_ZERO_ERROR;
+    formattable = icu::Formattable(icu::StringPiece(str_val, size), status);
+    Py_DECREF(str_obj);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to create Formattable from %s: %s",
+                      type_name, u_errorName(status));
+        return false;
+    }
+    return true;
+}
+
+inline bool uint64_to_formattable(uint64_t value, icu::Formattable& formattable) {
+    if (value <= static_cast<uint64_t>(INT64_MAX)) {
+        formattable = icu::Formattable(static_cast<int64_t>(value));
+        return true;
+    }
+    // Values past int64 are passed to ICU as decimal digits.
+    char digits[24];
+    int length = snprintf(digits, sizeof(digits), "%llu", static_cast<unsigned long long>(value));
+    UErrorCode status = U_ZERO_ERROR;
+    formattable = icu::Formattable(icu::StringPiece(digits, length), status);
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_ValueError, "Failed to create Formattable from overflowed int: %s",
+                      u_errorName(status));
+        return false;
+    }
+    return true;
+}
+
+inline bool long_to_formattable(PyObject* obj, icu::Formattable& formattable) {
+    int overflow;
+    long long long_val = PyLong_AsLongLongAndOverflow(obj, &overflow);
+    if (overflow == 0) {
+        if (long_val == -1 && PyErr_Occurred()) {
+            return false;
+        }
+        formattable = icu::Formattable(static_cast<int64_t>(long_val));
+        return true;
+    }
+
+    if (overflow > 0) {
+        // Values just past int64 fit in uint64, so their digits can be
+        // written without creating an intermediate str.
+        unsigned long long ulong_val = PyLong_AsUnsignedLongLong(obj);
+        if (ulong_val != static_cast<unsigned long long>(-1) || !PyErr_Occurred()) {
+            return uint64_to_formattable(ulong_val, formattable);
+        }
+        if (!PyErr_ExceptionMatches(PyExc_OverflowError)) {
+            return false;
+        }
+        PyErr_Clear();
+    }
+    return digits_to_formattable(obj, formattable, "overflowed int");
+}
+
+inline bool float_to_formattable(PyObject* obj, icu::Formattable& formattable) {
+    double dbl_val = PyFloat_AsDouble(obj);
+    if (dbl_val == -1.0 && PyErr_Occurred()) {
+        return false;
+    }
+    formattable = icu::Formattable(dbl_val);
+    return true;
+}
+
+inline bool is_native_byte_order(char prefix) {
+    const uint16_t probe = 1;
+    bool little_endian = *reinterpret_cast<const uint8_t*>(&probe) == 1;
+    switch (prefix) {
+        case '@':
+        case '=':
+            return true;
+        case '<':
+            return little_endian;
+        case '>':
+        case '!':
+            return !little_endian;
+        default:
+            return false;
+    }
+}
+
+// Classify a buffer's struct format, with any byte order prefix removed,
+// as 'i' for signed integers, 'u' for unsigned integers, or 'f' for
+// floats. Returns 0 for other formats or unexpected item sizes.
+inline char numeric_buffer_kind(const char* format, Py_ssize_t itemsize) {
+    if (format[0] == '\0' || format[1] != '\0') {
+        return 0;
+    }
+    bool integer_size = itemsize == 1 || itemsize == 2 || itemsize == 4 || itemsize == 8;
+    if (std::strchr("bhilqn", format[0]) != nullptr && integer_size) {
+        return 'i';
+    }
+    if (std::strchr("BHILQN", format[0]) != nullptr && integer_size) {
+        return 'u';
+    }
+    if (std::strchr("fd", format[0]) != nullptr && (itemsize == 4 || itemsize == 8)) {
+        return 'f';
+    }
+    return 0;
+}
+
+inline int64_t read_buffer_int(const char* ptr, Py_ssize_t itemsize) {
+    if (itemsize == 1) {
+        return *reinterpret_cast<const int8_t*>(ptr);
+    }
+    if (itemsize == 2) {
+        int16_t value;
+        std::memcpy(&value, ptr, sizeof(value));
+        return value;
+    }
+    if (itemsize == 4) {
+        int32_t value;
+        std::memcpy(&value, ptr, sizeof(value));
+        return value;
+    }
+    int64_t value;
+    std::memcpy(&value, ptr, sizeof(value));
+    return value;
+}
+
+inline uint64_t read_buffer_uint(const char* ptr, Py_ssize_t itemsize) {
+    if (itemsize == 1) {
+        return *reinterpret_cast<const uint8_t*>(ptr);
+    }
+    if (itemsize == 2) {
+        uint16_t value;
+        std::memcpy(&value, ptr, sizeof(value));
+        return value;
+    }
+    if (itemsize == 4) {
+        uint32_t value;
+        std::memcpy(&value, ptr, sizeof(value));
+        return value;
+    }
+    uint64_t value;
+    std::memcpy(&value, ptr, sizeof(value));
+    return value;
+}
+
+inline double read_buffer_float(const char* ptr, Py_ssize_t itemsize) {
+    if (itemsize == 4) {
+        float value;
+        std::memcpy(&value, ptr, sizeof(value));
+        return value;
+    }
+    double value;
+    std::memcpy(&value, ptr, sizeof(value));
+    return value;
+}
+
+// Get a 1-dimensional numeric buffer in native byte order from obj, with
+// kind set as by numeric_buffer_kind(). The caller must release the view
+// when this succeeds.
+inline bool get_numeric_buffer(PyObject* obj, Py_buffer& view, char& kind) {
+    if (PyObject_GetBuffer(obj, &view, PyBUF_STRIDED_RO | PyBUF_FORMAT) < 0) {
+        return false;
+    }
+    if (view.ndim != 1) {
+        PyErr_Format(PyExc_ValueError, "Buffer must be 1-dimensional, got %d dimensions",
+                     view.ndim);
+        PyBuffer_Release(&view);
+        return false;
+    }
+    const char* format = view.format != nullptr ? view.format : "B";
+    if (*format != '\0' && std::strchr("@=<>!", *format) != nullptr) {
+        if (!is_native_byte_order(*format)) {
+            PyErr_Format(PyExc_ValueError, "Buffer must use native byte order, got format '%s'",
+                         format);
+            PyBuffer_Release(&view);
+            return false;
+        }
+        ++format;
+    }
+    kind = numeric_buffer_kind(format, view.itemsize);
+    if (kind == 0) {
+        PyErr_Format(PyExc_ValueError,
+                     "Unsupported buffer format '%s', expected an integer or float format",
+                     view.format != nullptr ? view.format : "B");
+        PyBuffer_Release(&view);
+        return false;
+    }
+    return true;
+}
+
+// Convert a numeric buffer item, of a kind from numeric_buffer_kind().
+inline bool buffer_item_to_formattable(const char* ptr, char kind, Py_ssize_t itemsize,
+                                       icu::Formattable& formattable) {
+    if (kind == 'f') {
+        formattable = icu::Formattable(read_buffer_float(ptr, itemsize));
+        return true;
+    }
+    if (kind == 'u') {
+        return uint64_to_formattable(read_buffer_uint(ptr, itemsize), formattable);
+    }
+    formattable = icu::Formattable(read_buffer_int(ptr, itemsize));
+    return true;
+}
+
+}  // namespace icu4py
+
+#endif  // ICU4PY_NUMBER_CONVERSION_H
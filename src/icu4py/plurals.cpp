@@ -0,0 +1,777 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/locid.h>
+#include <unicode/numberformatter.h>
+#include <unicode/plurrule.h>
+#include <unicode/stringpiece.h>
+#include <unicode/unistr.h>
+#include <unicode/upluralrules.h>
+#include <unicode/utypes.h>
+
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "locale_types.h"
+#include "lru_cache.h"
+#include "number_conversion.h"
+
+namespace {
+
+using icu::Locale;
+using icu::PluralRules;
+using icu::StringPiece;
+using icu::UnicodeString;
+using icu::number::FormattedNumber;
+using icu::number::LocalizedNumberFormatter;
+using icu::number::NumberFormatter;
+using icu::number::Precision;
+using icu4py::LocaleObject;
+using icu4py::resolve_locale;
+using icu4py::get_numeric_buffer;
+
+// The plural categories defined by CLDR, in its order. A locale's rules
+// use a subset of them, always including "other".
+constexpr const char* kCategoryNames[] = {"zero", "one", "two", "few", "many", "other"};
+// The same names as ICU keywords.
+constexpr const char16_t* kCategoryKeywords[] = {u"zero", u"one", u"two",
+                                                 u"few", u"many", u"other"};
+constexpr int kCategoryCount = 6;
+constexpr int kOtherCategory = 5;
+
+struct TypeName {
+    const char* name;
+    UPluralType type;
+};
+
+constexpr TypeName kTypeNames[] = {
+    {"cardinal", UPLURAL_TYPE_CARDINAL},
+    {"ordinal", UPLURAL_TYPE_ORDINAL},
+};
+
+// Integers up to this magnitude convert to doubles exactly, so select them
+// with PluralRules::select(double). Larger ones are formatted first, which
+// keeps all of their digits.
+constexpr int64_t kMaxExactDouble = int64_t{1} << 53;
+
+// Plural rules for a locale and type, shared between PluralRules objects.
+// Selecting is const, so threads can use them concurrently.
+struct CompiledRules {
+    std::unique_ptr<PluralRules> rules;
+    // Formats numbers whose plural operands a double can't represent, such
+    // as large integers and Decimals, keeping all of their digits.
+    LocalizedNumberFormatter formatter;
+    // Maps each index of kCategoryNames to its index in categories.
+    int codes[kCategoryCount];
+    // The indices of kCategoryNames the rules use, in CLDR order.
+    std::vector<int> categories;
+};
+
+// Recently loaded rules, keyed by locale name and type, so creating the
+// same PluralRules again skips loading them.
+using RulesCache = icu4py::LruCache<const CompiledRules>;
+
+constexpr size_t kMaxCachedRules = 64;
+
+struct ModuleState {
+    PyObject* decimal_decimal_type;
+    PyObject* locale_type;
+    // Locale.get(), to share parsed locales for locale strings.
+    PyObject* locale_get;
+    // Interned category names, by index of kCategoryNames, so selecting
+    // a category doesn't create a str.
+    PyObject* category_names[kCategoryCount];
+    RulesCache* rules_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_plurals_exec(PyObject* m);
+int icu4py_plurals_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_plurals_clear(PyObject* m);
+void icu4py_plurals_free(void* m);
+
+extern PyModuleDef pluralsmodule;
+
+struct PluralRulesObject {
+    PyObject_HEAD
+    std::shared_ptr<const CompiledRules>* compiled;
+    Locale* locale;
+    const TypeName* type;
+};
+
+void PluralRules_dealloc(PluralRulesObject* self) {
+    delete self->compiled;
+    delete self->locale;
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* PluralRules_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<PluralRulesObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->compiled = nullptr;
+        self->locale = nullptr;
+        self->type = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+const TypeName* lookup_type(PyObject* type_obj) {
+    if (PyUnicode_Check(type_obj)) {
+        for (const TypeName& entry : kTypeNames) {
+            if (PyUnicode_CompareWithASCIIString(type_obj, entry.name) == 0) {
+                return &entry;
+            }
+        }
+    }
+    PyErr_Format(PyExc_ValueError, "type must be 'cardinal' or 'ordinal', not %R", type_obj);
+    return nullptr;
+}
+
+bool compile_rules(const Locale& locale, UPluralType type, CompiledRules& compiled) {
+    UErrorCode status = U_ZERO_ERROR;
+    compiled.rules.reset(PluralRules::forLocale(locale, type, status));
+    if (U_FAILURE(status)) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to load plural rules: %s", u_errorName(status));
+        return false;
+    }
+    compiled.formatter = NumberFormatter::withLocale(locale)
+                             .precision(Precision::unlimited())
+                             .grouping(UNUM_GROUPING_OFF);
+    for (int i = 0; i < kCategoryCount; ++i) {
+        compiled.codes[i] = -1;
+        if (compiled.rules->isKeyword(UnicodeString(true, kCategoryKeywords[i], -1))) {
+            compiled.codes[i] = static_cast<int>(compiled.categories.size());
+            compiled.categories.push_back(i);
+        }
+    }
+    return true;
+}
+
+int PluralRules_init(PluralRulesObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* locale_obj;
+    PyObject* type_obj = nullptr;
+
+    static const char* kwlist[] = {"locale", "type", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", const_cast<char**>(kwlist),
+                                     &locale_obj, &type_obj)) {
+        return -1;
+    }
+
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &pluralsmodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &pluralsmodule);
+#endif
+    if (module == nullptr) {
+        return -1;
+    }
+    ModuleState* mod_state = get_module_state(module);
+
+    const TypeName* type = &kTypeNames[0];
+    if (type_obj != nullptr) {
+        type = lookup_type(type_obj);
+        if (type == nullptr) {
+            return -1;
+        }
+    }
+    Locale locale;
+    if (!resolve_locale(mod_state->locale_type, mod_state->locale_get, locale_obj, locale)) {
+        return -1;
+    }
+
+    std::string cache_key(locale.getName());
+    cache_key.push_back('\0');
+    cache_key.append(type->name);
+
+    std::shared_ptr<const CompiledRules> compiled = mod_state->rules_cache->lookup(cache_key);
+    if (compiled == nullptr) {
+        auto new_compiled = std::make_shared<CompiledRules>();
+        if (!compile_rules(locale, type->type, *new_compiled)) {
+            return -1;
+        }
+        compiled = std::move(new_compiled);
+        mod_state->rules_cache->store(std::move(cache_key), compiled);
+    }
+
+    delete self->compiled;
+    self->compiled = new std::shared_ptr<const CompiledRules>(std::move(compiled));
+    delete self->locale;
+    self->locale = new Locale(locale);
+    self->type = type;
+    return 0;
+}
+
+// Return the index in kCategoryNames of a keyword returned by ICU.
+int category_index(const UnicodeString& keyword) {
+    for (int i = 0; i < kCategoryCount; ++i) {
+        if (keyword == UnicodeString(true, kCategoryKeywords[i], -1)) {
+            return i;
+        }
+    }
+    return kOtherCategory;
+}
+
+int select_double(const CompiledRules& compiled, double value) {
+    return category_index(compiled.rules->select(value));
+}
+
+// Select the category of a formatted number, which keeps the plural
+// operands of its digits exactly. Returns -1 with status set on failure.
+int select_formatted(const CompiledRules& compiled, const FormattedNumber& formatted,
+                     UErrorCode& status) {
+    UnicodeString keyword = compiled.rules->select(formatted, status);
+    if (U_FAILURE(status)) {
+        return -1;
+    }
+    return category_index(keyword);
+}
+
+int select_int64(const CompiledRules& compiled, int64_t value, UErrorCode& status) {
+    if (value >= -kMaxExactDouble && value <= kMaxExactDouble) {
+        return select_double(compiled, static_cast<double>(value));
+    }
+    return select_formatted(compiled, compiled.formatter.formatInt(value, status), status);
+}
+
+int select_uint64(const CompiledRules& compiled, uint64_t value, UErrorCode& status) {
+    if (value <= static_cast<uint64_t>(INT64_MAX)) {
+        return select_int64(compiled, static_cast<int64_t>(value), status);
+    }
+    char digits[24];
+    int length = snprintf(digits, sizeof(digits), "%llu", static_cast<unsigned long long>(value));
+    return select_formatted(
+        compiled, compiled.formatter.formatDecimal(StringPiece(digits, length), status), status);
+}
+
+void set_select_error(UErrorCode status) {
+    PyErr_Format(PyExc_ValueError, "Failed to select plural category: %s", u_errorName(status));
+}
+
+// Count the fraction digits of a decimal string like "1.50" or "1.5E-7",
+// including trailing zeros, and return whether the last of them is a zero.
+bool has_trailing_fraction_zero(const char* digits, Py_ssize_t size, int32_t& fraction_digits) {
+    const char* point = static_cast<const char*>(std::memchr(digits, '.', size));
+    const char* end = digits + size;
+    const char* exponent = point != nullptr ? point : digits;
+    while (exponent < end && *exponent != 'E' && *exponent != 'e') {
+        ++exponent;
+    }
+    if (exponent == digits || *(exponent - 1) != '0') {
+        return false;
+    }
+    long long count = point != nullptr ? exponent - point - 1 : 0;
+    if (exponent < end) {
+        count -= std::strtoll(exponent + 1, nullptr, 10);
+    }
+    if (count <= 0 || count > 999) {
+        return false;
+    }
+    fraction_digits = static_cast<int32_t>(count);
+    return true;
+}
+
+// Select the category of a number from its decimal digits, for Decimals
+// and ints past int64.
+int select_digits(const CompiledRules& compiled, PyObject* obj) {
+    PyObject* str_obj = PyObject_Str(obj);
+    if (str_obj == nullptr) {
+        return -1;
+    }
+    Py_ssize_t size;
+    const char* digits = PyUnicode_AsUTF8AndSize(str_obj, &size);
+    if (digits == nullptr) {
+        Py_DECREF(str_obj);
+        return -1;
+    }
+    UErrorCode status = U_ZERO_ERROR;
+    int category;
+    int32_t fraction_digits;
+    if (has_trailing_fraction_zero(digits, size, fraction_digits)) {
+        // Trailing zeros are visible fraction digits, so 1.0 selects
+        // differently from 1, but formatting would drop them.
+        LocalizedNumberFormatter formatter =
+            compiled.formatter.precision(Precision::minFraction(fraction_digits));
+        category = select_formatted(
+            compiled, formatter.formatDecimal(StringPiece(digits, size), status), status);
+    } else {
+        category = select_formatted(
+            compiled, compiled.formatter.formatDecimal(StringPiece(digits, size), status), status);
+    }
+    Py_DECREF(str_obj);
+    if (category == -1) {
+        set_select_error(status);
+    }
+    return category;
+}
+
+int select_long(const CompiledRules& compiled, PyObject* obj) {
+    int overflow;
+    long long value = PyLong_AsLongLongAndOverflow(obj, &overflow);
+    if (overflow != 0) {
+        return select_digits(compiled, obj);
+    }
+    if (value == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    UErrorCode status = U_ZERO_ERROR;
+    int category = select_int64(compiled, value, status);
+    if (category == -1) {
+        set_select_error(status);
+    }
+    return category;
+}
+
+int select_float(const CompiledRules& compiled, PyObject* obj) {
+    double value = PyFloat_AsDouble(obj);
+    if (value == -1.0 && PyErr_Occurred()) {
+        return -1;
+    }
+    return select_double(compiled, value);
+}
+
+// Select the category of a Python number, as an index of kCategoryNames.
+// Returns -1 with an exception set on error.
+int select_number(const CompiledRules& compiled, PyObject* obj, ModuleState* mod_state) {
+    // Exact types are matched by pointer first, so common values skip the
+    // subclass checks below.
+    PyTypeObject* type = Py_TYPE(obj);
+    if (type == &PyLong_Type || type == &PyBool_Type) {
+        return select_long(compiled, obj);
+    }
+    if (type == &PyFloat_Type) {
+        return select_float(compiled, obj);
+    }
+    if (reinterpret_cast<PyObject*>(type) == mod_state->decimal_decimal_type) {
+        return select_digits(compiled, obj);
+    }
+
+    if (PyLong_Check(obj)) {
+        return select_long(compiled, obj);
+    }
+    if (PyFloat_Check(obj)) {
+        return select_float(compiled, obj);
+    }
+    int is_decimal = PyObject_IsInstance(obj, mod_state->decimal_decimal_type);
+    if (is_decimal == -1) {
+        return -1;
+    }
+    if (is_decimal == 1) {
+        return select_digits(compiled, obj);
+    }
+
+    PyErr_Format(PyExc_TypeError, "Values must be int, float, or Decimal, got %R", obj);
+    return -1;
+}
+
+PyObject* category_result(const CompiledRules& compiled, int category, bool codes,
+                          ModuleState* mod_state) {
+    if (codes) {
+        return PyLong_FromLong(compiled.codes[category]);
+    }
+    return Py_NewRef(mod_state->category_names[category]);
+}
+
+ModuleState* defining_module_state(PyTypeObject* defining_class) {
+    return reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+}
+
+bool check_initialized(PluralRulesObject* self) {
+    if (self->compiled == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "PluralRules is not initialized");
+        return false;
+    }
+    return true;
+}
+
+PyObject* PluralRules_select(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    if (nargs != 1 || (kwnames != nullptr && PyTuple_GET_SIZE(kwnames) > 0)) {
+        PyErr_SetString(PyExc_TypeError, "select() takes exactly 1 argument");
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<PluralRulesObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = defining_module_state(defining_class);
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    const CompiledRules& compiled = **self_obj->compiled;
+    int category = select_number(compiled, args[0], mod_state);
+    if (category == -1) {
+        return nullptr;
+    }
+    return category_result(compiled, category, false, mod_state);
+}
+
+// Select the category of each item of a 1-dimensional numeric buffer,
+// releasing the GIL while ICU selects them.
+PyObject* select_buffer(PluralRulesObject* self, PyObject* obj, bool codes,
+                        ModuleState* mod_state) {
+    Py_buffer view;
+    char kind;
+    if (!get_numeric_buffer(obj, view, kind)) {
+        return nullptr;
+    }
+
+    Py_ssize_t count = view.shape[0];
+    std::vector<int> categories(count);
+    // A reference, so the rules outlive a concurrent __init__() while the
+    // GIL is released.
+    std::shared_ptr<const CompiledRules> shared_compiled = *self->compiled;
+    const CompiledRules& compiled = *shared_compiled;
+    UErrorCode status = U_ZERO_ERROR;
+
+    Py_BEGIN_ALLOW_THREADS
+    for (Py_ssize_t i = 0; i < count && U_SUCCESS(status); ++i) {
+        const char* ptr = static_cast<const char*>(view.buf) + i * view.strides[0];
+        if (kind == 'f') {
+            categories[i] = select_double(compiled, icu4py::read_buffer_float(ptr, view.itemsize));
+        } else if (kind == 'u') {
+            categories[i] =
+                select_uint64(compiled, icu4py::read_buffer_uint(ptr, view.itemsize), status);
+        } else {
+            categories[i] =
+                select_int64(compiled, icu4py::read_buffer_int(ptr, view.itemsize), status);
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&view);
+    if (U_FAILURE(status)) {
+        set_select_error(status);
+        return nullptr;
+    }
+
+    PyObject* results = PyList_New(count);
+    if (results == nullptr) {
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* result = category_result(compiled, categories[i], codes, mod_state);
+        if (result == nullptr) {
+            Py_DECREF(results);
+            return nullptr;
+        }
+        PyList_SET_ITEM(results, i, result);
+    }
+    return results;
+}
+
+PyObject* PluralRules_select_many(PyObject* self,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    PyObject* codes_obj = Py_False;
+
+    if (nargs != 1) {
+        PyErr_SetString(PyExc_TypeError, "select_many() takes exactly 1 positional argument");
+        return nullptr;
+    }
+    Py_ssize_t nkwargs = kwnames != nullptr ? PyTuple_GET_SIZE(kwnames) : 0;
+    for (Py_ssize_t i = 0; i < nkwargs; ++i) {
+        PyObject* name = PyTuple_GET_ITEM(kwnames, i);
+        if (PyUnicode_CompareWithASCIIString(name, "codes") == 0) {
+            codes_obj = args[nargs + i];
+        } else {
+            PyErr_Format(PyExc_TypeError, "select_many() got an unexpected keyword argument %R",
+                         name);
+            return nullptr;
+        }
+    }
+    int codes = PyObject_IsTrue(codes_obj);
+    if (codes == -1) {
+        return nullptr;
+    }
+    auto* self_obj = reinterpret_cast<PluralRulesObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    ModuleState* mod_state = defining_module_state(defining_class);
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    PyObject* values = args[0];
+    if (PyUnicode_Check(values) || PyBytes_Check(values) || PyByteArray_Check(values)) {
+        PyErr_Format(PyExc_TypeError, "values must be an iterable or numeric buffer, not %.200s",
+                     Py_TYPE(values)->tp_name);
+        return nullptr;
+    }
+    if (PyObject_CheckBuffer(values)) {
+        return select_buffer(self_obj, values, codes, mod_state);
+    }
+
+    PyObject* iterator = PyObject_GetIter(values);
+    if (iterator == nullptr) {
+        return nullptr;
+    }
+    PyObject* results = PyList_New(0);
+    if (results == nullptr) {
+        Py_DECREF(iterator);
+        return nullptr;
+    }
+
+    // The iterator can run Python code that reinitializes the object.
+    std::shared_ptr<const CompiledRules> shared_compiled = *self_obj->compiled;
+    const CompiledRules& compiled = *shared_compiled;
+    PyObject* value;
+    while ((value = PyIter_Next(iterator)) != nullptr) {
+        int category = select_number(compiled, value, mod_state);
+        Py_DECREF(value);
+        if (category == -1) {
+            break;
+        }
+        PyObject* result = category_result(compiled, category, codes, mod_state);
+        if (result == nullptr) {
+            break;
+        }
+        int append_result = PyList_Append(results, result);
+        Py_DECREF(result);
+        if (append_result < 0) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+
+    if (PyErr_Occurred()) {
+        Py_DECREF(results);
+        return nullptr;
+    }
+    return results;
+}
+
+PyObject* PluralRules_get_locale(PluralRulesObject* self, void* closure) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &pluralsmodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &pluralsmodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+
+    PyTypeObject* locale_type = reinterpret_cast<PyTypeObject*>(mod_state->locale_type);
+    auto* locale_obj = reinterpret_cast<LocaleObject*>(locale_type->tp_alloc(locale_type, 0));
+    if (locale_obj == nullptr) {
+        return nullptr;
+    }
+    icu4py::set_locale(locale_obj, *self->locale);
+    return reinterpret_cast<PyObject*>(locale_obj);
+}
+
+PyObject* PluralRules_get_type(PluralRulesObject* self, void* closure) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return PyUnicode_FromString(self->type->name);
+}
+
+PyObject* PluralRules_get_categories(PluralRulesObject* self, void* closure) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(Py_TYPE(self), &pluralsmodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(Py_TYPE(self), &pluralsmodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    ModuleState* mod_state = get_module_state(module);
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+
+    const std::vector<int>& categories = (*self->compiled)->categories;
+    PyObject* result = PyTuple_New(static_cast<Py_ssize_t>(categories.size()));
+    if (result == nullptr) {
+        return nullptr;
+    }
+    for (size_t i = 0; i < categories.size(); ++i) {
+        PyTuple_SET_ITEM(result, static_cast<Py_ssize_t>(i),
+                         Py_NewRef(mod_state->category_names[categories[i]]));
+    }
+    return result;
+}
+
+PyObject* PluralRules_repr(PluralRulesObject* self) {
+    if (self->compiled == nullptr) {
+        return PyUnicode_FromFormat("<%s uninitialized>", Py_TYPE(self)->tp_name);
+    }
+    return PyUnicode_FromFormat("PluralRules(Locale('%s'), type='%s')", self->locale->getName(),
+                                self->type->name);
+}
+
+PyObject* PluralRules_reduce(PluralRulesObject* self, PyObject* Py_UNUSED(ignored)) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return Py_BuildValue("(O(ss))", Py_TYPE(self), self->locale->getName(), self->type->name);
+}
+
+PyMethodDef PluralRules_methods[] = {
+    {"select", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(PluralRules_select)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Return the plural category of a number"},
+    {"select_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(PluralRules_select_many)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS,
+     "Return the plural category of each number in an iterable or numeric buffer"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(PluralRules_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef PluralRules_getsetters[] = {
+    {const_cast<char*>("locale"), reinterpret_cast<getter>(PluralRules_get_locale), nullptr,
+     const_cast<char*>("The locale whose plural rules are used"), nullptr},
+    {const_cast<char*>("type"), reinterpret_cast<getter>(PluralRules_get_type), nullptr,
+     const_cast<char*>("The type of plural rules, cardinal or ordinal"), nullptr},
+    {const_cast<char*>("categories"), reinterpret_cast<getter>(PluralRules_get_categories),
+     nullptr, const_cast<char*>("The plural categories the rules use"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot PluralRules_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU PluralRules")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(PluralRules_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(PluralRules_init)},
+    {Py_tp_new, reinterpret_cast<void*>(PluralRules_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(PluralRules_repr)},
+    {Py_tp_methods, PluralRules_methods},
+    {Py_tp_getset, PluralRules_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec PluralRules_spec = {
+    "icu4py.plurals.PluralRules",
+    sizeof(PluralRulesObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    PluralRules_slots
+};
+
+PyMethodDef icu4py_plurals_module_methods[] = {
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_plurals_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_plurals_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef pluralsmodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.plurals",
+    "",
+    sizeof(ModuleState),
+    icu4py_plurals_module_methods,
+    icu4py_plurals_slots,
+    icu4py_plurals_traverse,
+    icu4py_plurals_clear,
+    icu4py_plurals_free,
+};
+
+int icu4py_plurals_exec(PyObject* m) {
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &PluralRules_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "PluralRules", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+
+    ModuleState* state = get_module_state(m);
+    state->rules_cache = new RulesCache(kMaxCachedRules);
+
+    for (int i = 0; i < kCategoryCount; ++i) {
+        state->category_names[i] = PyUnicode_InternFromString(kCategoryNames[i]);
+        if (state->category_names[i] == nullptr) {
+            return -1;
+        }
+    }
+
+    PyObject* decimal_module = PyImport_ImportModule("decimal");
+    if (decimal_module == nullptr) {
+        return -1;
+    }
+    state->decimal_decimal_type = PyObject_GetAttrString(decimal_module, "Decimal");
+    Py_DECREF(decimal_module);
+    if (state->decimal_decimal_type == nullptr) {
+        return -1;
+    }
+
+    PyObject* locale_module = PyImport_ImportModule("icu4py.locale");
+    if (locale_module == nullptr) {
+        return -1;
+    }
+    state->locale_type = PyObject_GetAttrString(locale_module, "Locale");
+    Py_DECREF(locale_module);
+    if (state->locale_type == nullptr) {
+        return -1;
+    }
+
+    state->locale_get = PyObject_GetAttrString(state->locale_type, "get");
+    if (state->locale_get == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_plurals_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->decimal_decimal_type);
+    Py_VISIT(state->locale_type);
+    Py_VISIT(state->locale_get);
+    for (PyObject* name : state->category_names) {
+        Py_VISIT(name);
+    }
+    return 0;
+}
+
+int icu4py_plurals_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->decimal_decimal_type);
+    Py_CLEAR(state->locale_type);
+    Py_CLEAR(state->locale_get);
+    for (PyObject*& name : state->category_names) {
+        Py_CLEAR(name);
+    }
+    return 0;
+}
+
+void icu4py_plurals_free(void* m) {
+    icu4py_plurals_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->rules_cache;
+    state->rules_cache = nullptr;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_plurals() {
+    return PyModuleDef_Init(&pluralsmodule);
+}
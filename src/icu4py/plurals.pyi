@@ -0,0 +1,42 @@
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import Literal, TypeAlias, overload
+
+from typing_extensions import Buffer, disjoint_base
+
+from icu4py.locale import Locale
+
+_Category: TypeAlias = Literal["zero", "one", "two", "few", "many", "other"]
+
+@disjoint_base
+class PluralRules:
+    def __init__(
+        self, locale: str | Locale, type: Literal["cardinal", "ordinal"] = "cardinal"
+    ) -> None: ...
+    @property
+    def locale(self) -> Locale: ...
+    @property
+    def type(self) -> Literal["cardinal", "ordinal"]: ...
+    @property
+    def categories(self) -> tuple[_Category, ...]: ...
+    def select(self, value: int | float | Decimal, /) -> _Category: ...
+    @overload
+    def select_many(
+        self,
+        values: Iterable[int | float | Decimal] | Buffer,
+        /,
+        *,
+        codes: Literal[False] = False,
+    ) -> list[_Category]: ...
+    @overload
+    def select_many(
+        self,
+        values: Iterable[int | float | Decimal] | Buffer,
+        /,
+        *,
+        codes: Literal[True],
+    ) -> list[int]: ...
+    @overload
+    def select_many(
+        self, values: Iterable[int | float | Decimal] | Buffer, /, *, codes: bool
+    ) -> list[_Category] | list[int]: ...
@@ -0,0 +1,90 @@
+#ifndef ICU4PY_STRING_CONVERSION_H
+#define ICU4PY_STRING_CONVERSION_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/utf16.h>
+#include <unicode/utypes.h>
+
+#include <cstdint>
+#include <string>
+
+// Conversion between Python strs and ICU's UTF-16 text, shared by the
+// modules that process many strings, which read strs' internal storage
+// directly rather than through a UTF-8 copy.
+
+namespace icu4py {
+
+// A str's code points, read from its internal storage, which stays valid
+// without the GIL while a reference to the str is held.
+struct StrData {
+    const void* data;
+    int kind;
+    int32_t length;
+    bool is_ascii;
+};
+
+inline bool get_str_data(PyObject* obj, StrData& result) {
+    if (!PyUnicode_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "Values must be strings, not %.200s",
+                     Py_TYPE(obj)->tp_name);
+        return false;
+    }
+    if (PyUnicode_READY(obj) < 0) {
+        return false;
+    }
+    // Code points past the BMP take two UTF-16 code units.
+    if (PyUnicode_GET_LENGTH(obj) > INT32_MAX / 2) {
+        PyErr_SetString(PyExc_OverflowError, "String is too long for ICU");
+        return false;
+    }
+    result.data = PyUnicode_DATA(obj);
+    result.kind = PyUnicode_KIND(obj);
+    result.length = static_cast<int32_t>(PyUnicode_GET_LENGTH(obj));
+    result.is_ascii = PyUnicode_IS_ASCII(obj);
+    return true;
+}
+
+// Return str as UTF-16, which two byte strs already are, or else as
+// converted into buffer.
+inline const UChar* to_utf16(const StrData& str, std::u16string& buffer, int32_t& length) {
+    if (str.kind == PyUnicode_2BYTE_KIND) {
+        length = str.length;
+        return reinterpret_cast<const UChar*>(str.data);
+    }
+    buffer.clear();
+    if (str.kind == PyUnicode_1BYTE_KIND) {
+        const auto* chars = static_cast<const Py_UCS1*>(str.data);
+        buffer.assign(chars, chars + str.length);
+    } else {
+        const auto* chars = static_cast<const Py_UCS4*>(str.data);
+        for (int32_t i = 0; i < str.length; ++i) {
+            Py_UCS4 c = chars[i];
+            if (c > 0xFFFF) {
+                buffer.push_back(static_cast<char16_t>(U16_LEAD(c)));
+                buffer.push_back(static_cast<char16_t>(U16_TRAIL(c)));
+            } else {
+                buffer.push_back(static_cast<char16_t>(c));
+            }
+        }
+    }
+    length = static_cast<int32_t>(buffer.size());
+    return reinterpret_cast<const UChar*>(buffer.data());
+}
+
+// Create a str from UTF-16 text. Unpaired surrogates, which ICU passes
+// through unchanged, are kept rather than raising.
+inline PyObject* utf16_to_str(const UChar* text, int32_t length) {
+#if PY_LITTLE_ENDIAN
+    int byteorder = -1;
+#else
+    int byteorder = 1;
+#endif
+    return PyUnicode_DecodeUTF16(reinterpret_cast<const char*>(text),
+                                 static_cast<Py_ssize_t>(length) * 2, "surrogatepass",
+                                 &byteorder);
+}
+
+}  // namespace icu4py
+
+#endif  // ICU4PY_STRING_CONVERSION_H
@@ -0,0 +1,625 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <unicode/parseerr.h>
+#include <unicode/translit.h>
+#include <unicode/unistr.h>
+#include <unicode/utypes.h>
+
+#include <cstring>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "lru_cache.h"
+#include "string_conversion.h"
+
+namespace {
+
+using icu::Transliterator;
+using icu::UnicodeString;
+using icu4py::StrData;
+using icu4py::get_str_data;
+using icu4py::to_utf16;
+using icu4py::utf16_to_str;
+
+// A compiled transliterator, shared between Transliterator objects and
+// calls with the same ID or rules. ICU doesn't support using one
+// transliterator from several threads at once, so each use takes a clone.
+// Clones are kept for reuse, since transliterators like Any-Latin load the
+// transliterators they delegate to on first use, which a new clone would
+// repeat.
+struct CompiledTransliterator {
+    // Only ever cloned.
+    std::unique_ptr<const Transliterator> prototype;
+    std::mutex mutex;
+    // Clones not currently in use.
+    std::vector<std::unique_ptr<Transliterator>> idle;
+};
+
+constexpr size_t kMaxIdleClones = 8;
+
+// A clone of a compiled transliterator for one thread's use, returned to
+// the idle clones when done. Holds a reference to the compiled
+// transliterator, so it outlives a concurrent __init__() and cache eviction
+// while the GIL is released.
+class TransliteratorLease {
+public:
+    explicit TransliteratorLease(std::shared_ptr<CompiledTransliterator> compiled)
+        : compiled_(std::move(compiled)) {
+        {
+            std::lock_guard<std::mutex> lock(compiled_->mutex);
+            if (!compiled_->idle.empty()) {
+                clone_ = std::move(compiled_->idle.back());
+                compiled_->idle.pop_back();
+            }
+        }
+        if (clone_ == nullptr) {
+            clone_.reset(compiled_->prototype->clone());
+        }
+    }
+
+    ~TransliteratorLease() {
+        if (clone_ == nullptr) {
+            return;
+        }
+        std::lock_guard<std::mutex> lock(compiled_->mutex);
+        if (compiled_->idle.size() < kMaxIdleClones) {
+            compiled_->idle.push_back(std::move(clone_));
+        }
+    }
+
+    TransliteratorLease(const TransliteratorLease&) = delete;
+    TransliteratorLease& operator=(const TransliteratorLease&) = delete;
+
+    // nullptr if cloning failed.
+    Transliterator* get() const { return clone_.get(); }
+
+private:
+    std::shared_ptr<CompiledTransliterator> compiled_;
+    std::unique_ptr<Transliterator> clone_;
+};
+
+// Recently compiled transliterators, keyed by ID or rules, so creating the
+// same transliterator again skips compiling it.
+using TransliteratorCache = icu4py::LruCache<CompiledTransliterator>;
+
+constexpr size_t kMaxCachedTransliterators = 64;
+
+struct ModuleState {
+    // The interned string "from_rules", for pickling.
+    PyObject* str_from_rules;
+    TransliteratorCache* transliterator_cache;
+};
+
+static inline ModuleState* get_module_state(PyObject* module) {
+    void* state = PyModule_GetState(module);
+    return static_cast<ModuleState*>(state);
+}
+
+int icu4py_transliterate_exec(PyObject* m);
+int icu4py_transliterate_traverse(PyObject* m, visitproc visit, void* arg);
+int icu4py_transliterate_clear(PyObject* m);
+void icu4py_transliterate_free(void* m);
+
+extern PyModuleDef transliteratemodule;
+
+struct TransliteratorObject {
+    PyObject_HEAD
+    std::shared_ptr<CompiledTransliterator>* transliterator;
+    PyObject* id;
+    // nullptr for transliterators created from an ID.
+    PyObject* rules;
+};
+
+void Transliterator_dealloc(TransliteratorObject* self) {
+    delete self->transliterator;
+    Py_XDECREF(self->id);
+    Py_XDECREF(self->rules);
+    Py_TYPE(self)->tp_free(reinterpret_cast<PyObject*>(self));
+}
+
+PyObject* Transliterator_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+    auto* self = reinterpret_cast<TransliteratorObject*>(type->tp_alloc(type, 0));
+    if (self != nullptr) {
+        self->transliterator = nullptr;
+        self->id = nullptr;
+        self->rules = nullptr;
+    }
+    return reinterpret_cast<PyObject*>(self);
+}
+
+ModuleState* type_module_state(PyTypeObject* type) {
+#if PY_VERSION_HEX < 0x030B0000
+    PyObject* module = _PyType_GetModuleByDef(type, &transliteratemodule);
+#else
+    PyObject* module = PyType_GetModuleByDef(type, &transliteratemodule);
+#endif
+    if (module == nullptr) {
+        return nullptr;
+    }
+    return get_module_state(module);
+}
+
+// Get the compiled transliterator for an ID, or for rules if rules_obj
+// isn't nullptr, from the cache or else by compiling it.
+std::shared_ptr<CompiledTransliterator> get_transliterator(ModuleState* mod_state,
+                                                           PyObject* id_obj,
+                                                           PyObject* rules_obj) {
+    Py_ssize_t id_len;
+    const char* id = PyUnicode_AsUTF8AndSize(id_obj, &id_len);
+    if (id == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t rules_len = 0;
+    const char* rules = nullptr;
+    if (rules_obj != nullptr) {
+        rules = PyUnicode_AsUTF8AndSize(rules_obj, &rules_len);
+        if (rules == nullptr) {
+            return nullptr;
+        }
+    }
+
+    std::string cache_key(rules != nullptr ? "r" : "i");
+    cache_key.append(id, id_len);
+    if (rules != nullptr) {
+        cache_key.push_back('\0');
+        cache_key.append(rules, rules_len);
+    }
+
+    std::shared_ptr<CompiledTransliterator> transliterator =
+        mod_state->transliterator_cache->lookup(cache_key);
+    if (transliterator != nullptr) {
+        return transliterator;
+    }
+
+    UErrorCode status = U_ZERO_ERROR;
+    UParseError parse_error;
+    UnicodeString uid = UnicodeString::fromUTF8(icu::StringPiece(id, id_len));
+    auto new_transliterator = std::make_shared<CompiledTransliterator>();
+    if (rules != nullptr) {
+        new_transliterator->prototype.reset(Transliterator::createFromRules(
+            uid, UnicodeString::fromUTF8(icu::StringPiece(rules, rules_len)), UTRANS_FORWARD,
+            parse_error, status));
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError,
+                         "Failed to parse transliterator rules at offset %d: %s",
+                         parse_error.offset, u_errorName(status));
+            return nullptr;
+        }
+    } else {
+        new_transliterator->prototype.reset(
+            Transliterator::createInstance(uid, UTRANS_FORWARD, parse_error, status));
+        if (U_FAILURE(status)) {
+            PyErr_Format(PyExc_ValueError, "Failed to create transliterator %R: %s", id_obj,
+                         u_errorName(status));
+            return nullptr;
+        }
+    }
+    if (new_transliterator->prototype == nullptr) {
+        PyErr_NoMemory();
+        return nullptr;
+    }
+    transliterator = std::move(new_transliterator);
+    mod_state->transliterator_cache->store(std::move(cache_key), transliterator);
+    return transliterator;
+}
+
+bool init_transliterator(TransliteratorObject* self, ModuleState* mod_state, PyObject* id_obj,
+                         PyObject* rules_obj) {
+    std::shared_ptr<CompiledTransliterator> transliterator =
+        get_transliterator(mod_state, id_obj, rules_obj);
+    if (transliterator == nullptr) {
+        return false;
+    }
+    delete self->transliterator;
+    self->transliterator = new std::shared_ptr<CompiledTransliterator>(std::move(transliterator));
+    Py_INCREF(id_obj);
+    Py_XSETREF(self->id, id_obj);
+    Py_XINCREF(rules_obj);
+    Py_XSETREF(self->rules, rules_obj);
+    return true;
+}
+
+int Transliterator_init(TransliteratorObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* id_obj;
+
+    static const char* kwlist[] = {"id", nullptr};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U", const_cast<char**>(kwlist), &id_obj)) {
+        return -1;
+    }
+
+    ModuleState* mod_state = type_module_state(Py_TYPE(self));
+    if (mod_state == nullptr) {
+        return -1;
+    }
+    return init_transliterator(self, mod_state, id_obj, nullptr) ? 0 : -1;
+}
+
+PyObject* Transliterator_from_rules(PyObject* cls,
+        PyTypeObject* defining_class,
+        PyObject* const* args,
+        Py_ssize_t nargs,
+        PyObject* kwnames) {
+    static const char* const kwlist[] = {"id", "rules"};
+    PyObject* values[2] = {nullptr, nullptr};
+
+    if (nargs > 2) {
+        PyErr_Format(PyExc_TypeError, "from_rules() takes at most 2 arguments (%zd given)",
+                     nargs);
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < nargs; ++i) {
+        values[i] = args[i];
+    }
+    Py_ssize_t nkwargs = kwnames != nullptr ? PyTuple_GET_SIZE(kwnames) : 0;
+    for (Py_ssize_t i = 0; i < nkwargs; ++i) {
+        PyObject* name = PyTuple_GET_ITEM(kwnames, i);
+        Py_ssize_t position = -1;
+        for (Py_ssize_t j = 0; j < 2; ++j) {
+            if (PyUnicode_CompareWithASCIIString(name, kwlist[j]) == 0) {
+                position = j;
+                break;
+            }
+        }
+        if (position == -1) {
+            PyErr_Format(PyExc_TypeError,
+                         "from_rules() got an unexpected keyword argument %R", name);
+            return nullptr;
+        }
+        if (position < nargs) {
+            PyErr_Format(PyExc_TypeError,
+                         "from_rules() got multiple values for argument %R", name);
+            return nullptr;
+        }
+        values[position] = args[nargs + i];
+    }
+    if (values[0] == nullptr || values[1] == nullptr) {
+        PyErr_SetString(PyExc_TypeError,
+                        "from_rules() missing required argument 'id' or 'rules'");
+        return nullptr;
+    }
+    for (Py_ssize_t i = 0; i < 2; ++i) {
+        if (!PyUnicode_Check(values[i])) {
+            PyErr_Format(PyExc_TypeError, "%s must be a string, not %.200s", kwlist[i],
+                         Py_TYPE(values[i])->tp_name);
+            return nullptr;
+        }
+    }
+
+    ModuleState* mod_state = reinterpret_cast<ModuleState*>(PyType_GetModuleState(defining_class));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+
+    // Subclasses are created without calling their __init__(), as it
+    // takes an ID.
+    auto* type = reinterpret_cast<PyTypeObject*>(cls);
+    PyObject* self = type->tp_alloc(type, 0);
+    if (self == nullptr) {
+        return nullptr;
+    }
+    if (!init_transliterator(reinterpret_cast<TransliteratorObject*>(self), mod_state, values[0],
+                             values[1])) {
+        Py_DECREF(self);
+        return nullptr;
+    }
+    return self;
+}
+
+bool check_initialized(TransliteratorObject* self) {
+    if (self->transliterator == nullptr) {
+        PyErr_SetString(PyExc_ValueError, "Transliterator is not initialized");
+        return false;
+    }
+    return true;
+}
+
+// Transliterate str into result. Returns true if the transliteration left
+// str unchanged.
+bool transliterate_text(const Transliterator& transliterator, const StrData& str,
+                        std::u16string& buffer, UnicodeString& result) {
+    int32_t length;
+    const UChar* text = to_utf16(str, buffer, length);
+    result.setTo(text, length);
+    transliterator.transliterate(result);
+    return result.length() == length &&
+           std::memcmp(result.getBuffer(), text, static_cast<size_t>(length) * sizeof(UChar)) == 0;
+}
+
+PyObject* transliterate_one(std::shared_ptr<CompiledTransliterator> compiled,
+                            PyObject* text_obj) {
+    StrData str;
+    if (!get_str_data(text_obj, str)) {
+        return nullptr;
+    }
+    TransliteratorLease transliterator(std::move(compiled));
+    if (transliterator.get() == nullptr) {
+        return PyErr_NoMemory();
+    }
+    std::u16string buffer;
+    UnicodeString result;
+    if (transliterate_text(*transliterator.get(), str, buffer, result)) {
+        return Py_NewRef(text_obj);
+    }
+    return utf16_to_str(result.getBuffer(), result.length());
+}
+
+// Transliterate each string in an iterable, releasing the GIL while ICU
+// transliterates them. compiled is taken by value, as collecting the
+// strings can run Python code that reinitializes the object.
+PyObject* transliterate_iterable(std::shared_ptr<CompiledTransliterator> compiled,
+                                 PyObject* arg) {
+    if (PyUnicode_Check(arg) || PyBytes_Check(arg) || PyByteArray_Check(arg)) {
+        PyErr_Format(PyExc_TypeError, "strings must be an iterable of strings, not %.200s",
+                     Py_TYPE(arg)->tp_name);
+        return nullptr;
+    }
+    PyObject* strings = PySequence_Tuple(arg);
+    if (strings == nullptr) {
+        return nullptr;
+    }
+    Py_ssize_t count = PyTuple_GET_SIZE(strings);
+    std::vector<StrData> str_data(count);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        if (!get_str_data(PyTuple_GET_ITEM(strings, i), str_data[i])) {
+            Py_DECREF(strings);
+            return nullptr;
+        }
+    }
+    // One clone serves the whole batch.
+    TransliteratorLease transliterator(std::move(compiled));
+    if (transliterator.get() == nullptr) {
+        Py_DECREF(strings);
+        return PyErr_NoMemory();
+    }
+
+    // Transliterated copies, by index, of only the strings that changed.
+    std::vector<std::pair<Py_ssize_t, UnicodeString>> changed;
+
+    Py_BEGIN_ALLOW_THREADS
+    std::u16string buffer;
+    UnicodeString result;
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        if (!transliterate_text(*transliterator.get(), str_data[i], buffer, result)) {
+            changed.emplace_back(i, std::move(result));
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyObject* list = PyList_New(count);
+    if (list == nullptr) {
+        Py_DECREF(strings);
+        return nullptr;
+    }
+    auto next_changed = changed.begin();
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject* str_obj;
+        if (next_changed != changed.end() && next_changed->first == i) {
+            const UnicodeString& transliterated = next_changed->second;
+            str_obj = utf16_to_str(transliterated.getBuffer(), transliterated.length());
+            if (str_obj == nullptr) {
+                Py_DECREF(list);
+                Py_DECREF(strings);
+                return nullptr;
+            }
+            ++next_changed;
+        } else {
+            str_obj = Py_NewRef(PyTuple_GET_ITEM(strings, i));
+        }
+        PyList_SET_ITEM(list, i, str_obj);
+    }
+    Py_DECREF(strings);
+    return list;
+}
+
+PyObject* Transliterator_transliterate(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<TransliteratorObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    return transliterate_one(*self_obj->transliterator, arg);
+}
+
+PyObject* Transliterator_transliterate_many(PyObject* self, PyObject* arg) {
+    auto* self_obj = reinterpret_cast<TransliteratorObject*>(self);
+    if (!check_initialized(self_obj)) {
+        return nullptr;
+    }
+    return transliterate_iterable(*self_obj->transliterator, arg);
+}
+
+PyObject* Transliterator_get_id(TransliteratorObject* self, void* closure) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    return Py_NewRef(self->id);
+}
+
+PyObject* Transliterator_get_rules(TransliteratorObject* self, void* closure) {
+    if (self->rules == nullptr) {
+        Py_RETURN_NONE;
+    }
+    return Py_NewRef(self->rules);
+}
+
+PyObject* Transliterator_repr(TransliteratorObject* self) {
+    if (self->transliterator == nullptr) {
+        return PyUnicode_FromFormat("<%s uninitialized>", Py_TYPE(self)->tp_name);
+    }
+    if (self->rules != nullptr) {
+        return PyUnicode_FromFormat("Transliterator.from_rules(%R, %R)", self->id, self->rules);
+    }
+    return PyUnicode_FromFormat("Transliterator(%R)", self->id);
+}
+
+PyObject* Transliterator_reduce(TransliteratorObject* self, PyObject* Py_UNUSED(ignored)) {
+    if (!check_initialized(self)) {
+        return nullptr;
+    }
+    if (self->rules == nullptr) {
+        return Py_BuildValue("(O(O))", Py_TYPE(self), self->id);
+    }
+    ModuleState* mod_state = type_module_state(Py_TYPE(self));
+    if (mod_state == nullptr) {
+        return nullptr;
+    }
+    PyObject* from_rules =
+        PyObject_GetAttr(reinterpret_cast<PyObject*>(Py_TYPE(self)), mod_state->str_from_rules);
+    if (from_rules == nullptr) {
+        return nullptr;
+    }
+    return Py_BuildValue("(N(OO))", from_rules, self->id, self->rules);
+}
+
+PyMethodDef Transliterator_methods[] = {
+    {"from_rules", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(Transliterator_from_rules)),
+     METH_METHOD | METH_FASTCALL | METH_KEYWORDS | METH_CLASS,
+     "Create a Transliterator from transform rules"},
+    {"transliterate", reinterpret_cast<PyCFunction>(Transliterator_transliterate), METH_O,
+     "Transliterate a string"},
+    {"transliterate_many", reinterpret_cast<PyCFunction>(Transliterator_transliterate_many),
+     METH_O, "Transliterate each string in an iterable"},
+    {"__reduce__", reinterpret_cast<PyCFunction>(Transliterator_reduce), METH_NOARGS,
+     "Return state for pickling"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyGetSetDef Transliterator_getsetters[] = {
+    {const_cast<char*>("id"), reinterpret_cast<getter>(Transliterator_get_id), nullptr,
+     const_cast<char*>("The transliterator ID"), nullptr},
+    {const_cast<char*>("rules"), reinterpret_cast<getter>(Transliterator_get_rules), nullptr,
+     const_cast<char*>("The transform rules, or None if created from an ID"), nullptr},
+    {nullptr, nullptr, nullptr, nullptr, nullptr}
+};
+
+PyType_Slot Transliterator_slots[] = {
+    {Py_tp_doc, const_cast<char*>("ICU Transliterator")},
+    {Py_tp_dealloc, reinterpret_cast<void*>(Transliterator_dealloc)},
+    {Py_tp_init, reinterpret_cast<void*>(Transliterator_init)},
+    {Py_tp_new, reinterpret_cast<void*>(Transliterator_new)},
+    {Py_tp_repr, reinterpret_cast<void*>(Transliterator_repr)},
+    {Py_tp_methods, Transliterator_methods},
+    {Py_tp_getset, Transliterator_getsetters},
+    {0, nullptr}
+};
+
+PyType_Spec Transliterator_spec = {
+    "icu4py.transliterate.Transliterator",
+    sizeof(TransliteratorObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    Transliterator_slots
+};
+
+PyObject* transliterate(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "transliterate() takes exactly 2 arguments");
+        return nullptr;
+    }
+    if (!PyUnicode_Check(args[1])) {
+        PyErr_Format(PyExc_TypeError, "id must be a string, not %.200s",
+                     Py_TYPE(args[1])->tp_name);
+        return nullptr;
+    }
+    std::shared_ptr<CompiledTransliterator> transliterator =
+        get_transliterator(get_module_state(module), args[1], nullptr);
+    if (transliterator == nullptr) {
+        return nullptr;
+    }
+    return transliterate_one(std::move(transliterator), args[0]);
+}
+
+PyObject* transliterate_many(PyObject* module, PyObject* const* args, Py_ssize_t nargs) {
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "transliterate_many() takes exactly 2 arguments");
+        return nullptr;
+    }
+    if (!PyUnicode_Check(args[1])) {
+        PyErr_Format(PyExc_TypeError, "id must be a string, not %.200s",
+                     Py_TYPE(args[1])->tp_name);
+        return nullptr;
+    }
+    std::shared_ptr<CompiledTransliterator> transliterator =
+        get_transliterator(get_module_state(module), args[1], nullptr);
+    if (transliterator == nullptr) {
+        return nullptr;
+    }
+    return transliterate_iterable(std::move(transliterator), args[0]);
+}
+
+PyMethodDef icu4py_transliterate_module_methods[] = {
+    {"transliterate", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(transliterate)),
+     METH_FASTCALL, "Transliterate a string with the transliterator for an ID"},
+    {"transliterate_many", reinterpret_cast<PyCFunction>(reinterpret_cast<void(*)(void)>(transliterate_many)),
+     METH_FASTCALL, "Transliterate each string in an iterable with the transliterator for an ID"},
+    {nullptr, nullptr, 0, nullptr}
+};
+
+PyModuleDef_Slot icu4py_transliterate_slots[] = {
+    {Py_mod_exec, reinterpret_cast<void*>(icu4py_transliterate_exec)},
+#ifdef Py_GIL_DISABLED
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, nullptr}
+};
+
+PyModuleDef transliteratemodule = {
+    PyModuleDef_HEAD_INIT,
+    "icu4py.transliterate",
+    "",
+    sizeof(ModuleState),
+    icu4py_transliterate_module_methods,
+    icu4py_transliterate_slots,
+    icu4py_transliterate_traverse,
+    icu4py_transliterate_clear,
+    icu4py_transliterate_free,
+};
+
+int icu4py_transliterate_exec(PyObject* m) {
+    PyObject* type_obj = PyType_FromModuleAndSpec(m, &Transliterator_spec, nullptr);
+    if (type_obj == nullptr) {
+        return -1;
+    }
+    if (PyModule_AddObject(m, "Transliterator", type_obj) < 0) {
+        Py_DECREF(type_obj);
+        return -1;
+    }
+
+    ModuleState* state = get_module_state(m);
+    state->transliterator_cache = new TransliteratorCache(kMaxCachedTransliterators);
+
+    state->str_from_rules = PyUnicode_InternFromString("from_rules");
+    if (state->str_from_rules == nullptr) {
+        return -1;
+    }
+
+    return 0;
+}
+
+int icu4py_transliterate_traverse(PyObject* m, visitproc visit, void* arg) {
+    ModuleState* state = get_module_state(m);
+    Py_VISIT(state->str_from_rules);
+    return 0;
+}
+
+int icu4py_transliterate_clear(PyObject* m) {
+    ModuleState* state = get_module_state(m);
+    Py_CLEAR(state->str_from_rules);
+    return 0;
+}
+
+void icu4py_transliterate_free(void* m) {
+    icu4py_transliterate_clear(static_cast<PyObject*>(m));
+    ModuleState* state = get_module_state(static_cast<PyObject*>(m));
+    delete state->transliterator_cache;
+    state->transliterator_cache = nullptr;
+}
+
+}  // anonymous namespace
+
+PyMODINIT_FUNC PyInit_transliterate() {
+    return PyModuleDef_Init(&transliteratemodule);
+}
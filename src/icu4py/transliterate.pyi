@@ -0,0 +1,18 @@
+from collections.abc import Iterable
+
+from typing_extensions import Self, disjoint_base
+
+@disjoint_base
+class Transliterator:
+    def __init__(self, id: str) -> None: ...
+    @classmethod
+    def from_rules(cls, id: str, rules: str) -> Self: ...
+    @property
+    def id(self) -> str: ...
+    @property
+    def rules(self) -> str | None: ...
+    def transliterate(self, text: str, /) -> str: ...
+    def transliterate_many(self, strings: Iterable[str], /) -> list[str]: ...
+
+def transliterate(text: str, id: str, /) -> str: ...
+def transliterate_many(strings: Iterable[str], id: str, /) -> list[str]: ...
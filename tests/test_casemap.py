@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import pytest
+
+from icu4py.casemap import (
+    fold,
+    fold_many,
+    lower,
+    lower_many,
+    title,
+    title_many,
+    upper,
+    upper_many,
+)
+from icu4py.locale import Locale
+
+LATIN1 = "".join(map(chr, range(1, 256)))
+
+
+class TestLower:
+    def test_lower(self):
+        assert lower("Hello World", "en") == "hello world"
+
+    def test_turkish(self):
+        assert lower("TITLE", "tr") == "tıtle"
+        assert lower("İstanbul", "tr") == "istanbul"
+        assert lower("İstanbul", "en") == "i\u0307stanbul"
+
+    def test_lithuanian(self):
+        assert lower("Í", "lt") == "i\u0307\u0301"
+        assert lower("Í", "en") == "í"
+
+    def test_latin1_matches_str(self):
+        assert lower(LATIN1, "en") == LATIN1.lower()
+
+    def test_unchanged_returns_same_object(self):
+        for text in ["hello", "straße", "日本"]:
+            assert lower(text, "en") is text
+
+    def test_locale_object(self):
+        assert lower("I", Locale("tr")) == "ı"
+
+    def test_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            lower(b"A", "en")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be strings, not bytes"
+
+    def test_invalid_locale_type(self):
+        with pytest.raises(TypeError) as excinfo:
+            lower("A", 1)  # type: ignore[arg-type]
+        assert str(excinfo.value) == "locale must be a string or Locale object"
+
+    def test_argument_count(self):
+        with pytest.raises(TypeError) as excinfo:
+            lower("A")  # type: ignore[call-arg]
+        assert str(excinfo.value) == "lower() takes exactly 2 arguments"
+
+
+class TestUpper:
+    def test_upper(self):
+        assert upper("hello", "en") == "HELLO"
+
+    def test_turkish(self):
+        assert upper("istanbul", "tr") == "İSTANBUL"
+
+    def test_greek_removes_accents(self):
+        assert upper("όδός", "el") == "ΟΔΟΣ"
+
+    def test_latin1_matches_str(self):
+        assert upper(LATIN1, "en") == LATIN1.upper()
+
+    def test_longer_result(self):
+        assert upper("ß" * 40, "de") == "SS" * 40
+
+    def test_non_bmp(self):
+        assert upper("\U0001044f", "en") == "\U00010427"
+
+    def test_unpaired_surrogate(self):
+        assert upper("a\ud800", "en") == "A\ud800"
+
+
+class TestFold:
+    def test_fold(self):
+        assert fold("Straße", "en") == "strasse"
+
+    def test_turkic(self):
+        assert fold("Iİ", "tr") == "ıi"
+        assert fold("Iİ", "en") == "ii\u0307"
+
+    def test_latin1_matches_str(self):
+        assert fold(LATIN1, "en") == LATIN1.casefold()
+
+
+class TestTitle:
+    def test_title(self):
+        assert title("hello wORLD", "en") == "Hello World"
+
+    def test_dutch(self):
+        assert title("ijssel", "nl") == "IJssel"
+        assert title("ijssel", "en") == "Ijssel"
+
+    def test_word_boundaries(self):
+        assert title("l'amour can't", "fr") == "L'amour Can't"
+
+    def test_unchanged_returns_same_object(self):
+        text = "Hello World"
+        assert title(text, "en") is text
+
+
+class TestMany:
+    def test_lower_many(self):
+        strings = ["ABC", "abc", "ÀB", "Α"]
+        result = lower_many(strings, "en")
+        assert result == ["abc", "abc", "àb", "α"]
+        assert result[1] is strings[1]
+
+    def test_upper_many(self):
+        assert upper_many(["i", "ß"], "tr") == ["İ", "SS"]
+
+    def test_fold_many(self):
+        assert fold_many(["Straße", "ABC"], "en") == ["strasse", "abc"]
+
+    def test_title_many(self):
+        assert title_many(["ijssel meer", "a b"], "nl") == ["IJssel Meer", "A B"]
+
+    def test_generator(self):
+        assert lower_many((s for s in ["A", "B"]), "en") == ["a", "b"]
+
+    def test_empty(self):
+        assert title_many([], "en") == []
+
+    def test_rejects_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            lower_many("ABC", "en")
+        assert str(excinfo.value) == "strings must be an iterable of strings, not str"
+
+    def test_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            upper_many(["a", 1], "en")  # type: ignore[list-item]
+        assert str(excinfo.value) == "Values must be strings, not int"
+
+    def test_argument_count(self):
+        with pytest.raises(TypeError) as excinfo:
+            title_many(["a"])  # type: ignore[call-arg]
+        assert str(excinfo.value) == "title_many() takes exactly 2 arguments"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from icu4py.collator import Collator
+from icu4py.locale import Locale
+
+
+class TestCollator:
+    def test_sorted(self):
+        collator = Collator("de_DE")
+        values = ["Zebra", "Äpfel", "apfel", "Bär", "bar"]
+        assert collator.sorted(values) == ["apfel", "Äpfel", "bar", "Bär", "Zebra"]
+
+    def test_sorted_locale_rules(self):
+        values = ["Ö", "Z", "A", "Å"]
+        assert Collator("de_DE").sorted(values) == ["A", "Å", "Ö", "Z"]
+        assert Collator("sv_SE").sorted(values) == ["A", "Z", "Å", "Ö"]
+
+    def test_sorted_locale_object(self):
+        collator = Collator(Locale("sv", "SE"))
+        assert collator.sorted(["Ö", "Z"]) == ["Z", "Ö"]
+
+    def test_sorted_numeric(self):
+        values = ["file10", "file2", "file1"]
+        assert Collator("en").sorted(values) == ["file1", "file10", "file2"]
+        assert Collator("en", numeric=True).sorted(values) == [
+            "file1",
+            "file2",
+            "file10",
+        ]
+
+    def test_sorted_reverse(self):
+        collator = Collator("en")
+        assert collator.sorted(["b", "c", "a"], reverse=True) == ["c", "b", "a"]
+
+    def test_sorted_key(self):
+        collator = Collator("en", strength="primary")
+        values = [("b", 1), ("A", 2), ("a", 3)]
+        assert collator.sorted(values, key=lambda item: item[0]) == [
+            ("A", 2),
+            ("a", 3),
+            ("b", 1),
+        ]
+
+    def test_sorted_stable_reverse(self):
+        collator = Collator("en", strength="primary")
+        values = [("a", 1), ("b", 2), ("A", 3)]
+        assert collator.sorted(values, key=lambda item: item[0], reverse=True) == [
+            ("b", 2),
+            ("a", 1),
+            ("A", 3),
+        ]
+
+    def test_sorted_generator(self):
+        collator = Collator("en")
+        assert collator.sorted(s for s in ["b", "a"]) == ["a", "b"]
+
+    def test_sorted_empty(self):
+        assert Collator("en").sorted([]) == []
+
+    def test_sorted_non_bmp(self):
+        collator = Collator("en")
+        assert collator.sorted(["b", "😀", "a"]) == ["😀", "a", "b"]
+
+    def test_sorted_key_not_str(self):
+        collator = Collator("en")
+        with pytest.raises(TypeError) as excinfo:
+            collator.sorted([1, 2], key=lambda item: item)  # type: ignore[arg-type,return-value]
+        assert str(excinfo.value) == "Values must be strings, not int"
+
+    def test_sorted_unexpected_keyword(self):
+        collator = Collator("en")
+        with pytest.raises(TypeError) as excinfo:
+            collator.sorted([], cmp=None)  # type: ignore[call-overload]
+        assert str(excinfo.value) == "sorted() got an unexpected keyword argument 'cmp'"
+
+    def test_strength(self):
+        values = ["a", "A", "á"]
+        primary = Collator("en", strength="primary")
+        assert primary.compare("a", "A") == 0
+        assert primary.compare("a", "á") == 0
+        secondary = Collator("en", strength="secondary")
+        assert secondary.compare("a", "A") == 0
+        assert secondary.compare("a", "á") == -1
+        tertiary = Collator("en")
+        assert tertiary.sorted(values) == ["a", "A", "á"]
+        assert tertiary.compare("a", "A") == -1
+
+    def test_invalid_strength(self):
+        with pytest.raises(ValueError) as excinfo:
+            Collator("en", strength="weak")  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "strength must be 'primary', 'secondary', 'tertiary', 'quaternary', "
+            "or 'identical', not 'weak'"
+        )
+
+    def test_compare(self):
+        collator = Collator("en")
+        assert collator.compare("a", "b") == -1
+        assert collator.compare("b", "a") == 1
+        assert collator.compare("a", "a") == 0
+
+    def test_sort_key(self):
+        collator = Collator("de_DE")
+        assert isinstance(collator.sort_key("a"), bytes)
+        assert collator.sort_key("apfel") < collator.sort_key("Äpfel")
+        assert collator.sort_key("Äpfel") < collator.sort_key("bar")
+
+    def test_sort_key_as_key_function(self):
+        collator = Collator("de_DE")
+        values = ["Zebra", "Äpfel", "apfel"]
+        assert sorted(values, key=collator.sort_key) == collator.sorted(values)
+
+    def test_sort_key_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Collator("en").sort_key(b"a")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be strings, not bytes"
+
+    def test_sort_keys(self):
+        collator = Collator("de_DE")
+        values = ["b", "ä", "😀"]
+        assert collator.sort_keys(values) == [collator.sort_key(s) for s in values]
+
+    def test_sort_keys_rejects_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Collator("en").sort_keys("abc")
+        assert str(excinfo.value) == "strings must be an iterable of strings, not str"
+
+    def test_attributes(self):
+        collator = Collator("de_DE", strength="secondary", numeric=True)
+        assert collator.locale == Locale("de_DE")
+        assert collator.strength == "secondary"
+        assert collator.numeric is True
+
+    def test_repr(self):
+        collator = Collator("de_DE", strength="primary")
+        assert repr(collator) == (
+            "Collator(Locale('de_DE'), strength='primary', numeric=False)"
+        )
+
+    def test_pickle(self):
+        collator = Collator("sv_SE", strength="primary", numeric=True)
+        unpickled = pickle.loads(pickle.dumps(collator))
+        assert unpickled.locale == Locale("sv_SE")
+        assert unpickled.strength == "primary"
+        assert unpickled.numeric is True
+
+    def test_cached_collators_are_independent(self):
+        primary = Collator("en", strength="primary")
+        tertiary = Collator("en")
+        assert primary.compare("a", "A") == 0
+        assert tertiary.compare("a", "A") == -1
+        assert Collator("en", strength="primary").compare("a", "A") == 0
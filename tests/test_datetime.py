@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import pickle
+from array import array
+from collections.abc import Iterator
+from datetime import date, datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from icu4py.datetime import DateFormatter
+from icu4py.locale import Locale
+from tests.utils import datetime64_array
+
+
+class TestDateFormatter:
+    def test_skeleton(self):
+        formatter = DateFormatter("yMMMd", "en_US", "UTC")
+        assert formatter.pattern == "MMM d, y"
+        assert formatter.format(datetime(2025, 3, 4, 5, 6)) == "Mar 4, 2025"
+
+    def test_skeleton_locale(self):
+        formatter = DateFormatter("yMMMMd", "de_DE", "UTC")
+        assert formatter.pattern == "d. MMMM y"
+        assert formatter.format(date(2025, 3, 4)) == "4. März 2025"
+
+    def test_from_pattern(self):
+        formatter = DateFormatter.from_pattern("yyyy-MM-dd HH:mm", "en_US", "UTC")
+        assert formatter.skeleton is None
+        assert formatter.pattern == "yyyy-MM-dd HH:mm"
+        assert formatter.format(datetime(2025, 3, 4, 5, 6)) == "2025-03-04 05:06"
+
+    def test_from_pattern_keywords(self):
+        formatter = DateFormatter.from_pattern(
+            pattern="HH:mm", locale="en_US", time_zone="UTC"
+        )
+        assert formatter.format(time(7, 8)) == "07:08"
+
+    def test_from_pattern_subclass(self):
+        class MyFormatter(DateFormatter):
+            pass
+
+        formatter = MyFormatter.from_pattern("y", "en_US")
+        assert type(formatter) is MyFormatter
+
+    def test_from_pattern_invalid_arguments(self):
+        with pytest.raises(TypeError) as excinfo:
+            DateFormatter.from_pattern(1, "en_US")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "pattern must be a string, not int"
+
+        with pytest.raises(TypeError) as excinfo:
+            DateFormatter.from_pattern("y", "en_US", zone="UTC")  # type: ignore[call-arg]
+        assert str(excinfo.value) == (
+            "from_pattern() got an unexpected keyword argument 'zone'"
+        )
+
+    def test_time_zone(self):
+        formatter = DateFormatter.from_pattern("HH:mm", "en_US", "Europe/Berlin")
+        assert formatter.time_zone == "Europe/Berlin"
+        value = datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)
+        assert formatter.format(value) == "14:00"
+
+    def test_time_zone_zoneinfo(self):
+        formatter = DateFormatter.from_pattern(
+            "HH:mm", "en_US", ZoneInfo("America/New_York")
+        )
+        assert formatter.time_zone == "America/New_York"
+        value = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        assert formatter.format(value) == "07:00"
+
+    def test_naive_in_time_zone(self):
+        formatter = DateFormatter.from_pattern("HH:mm", "en_US", "Asia/Tokyo")
+        assert formatter.format(datetime(2025, 1, 1, 9, 30)) == "09:30"
+
+    def test_aware_other_zone(self):
+        formatter = DateFormatter.from_pattern("HH:mm", "en_US", "UTC")
+        value = datetime(2025, 1, 1, 9, 30, tzinfo=ZoneInfo("Asia/Tokyo"))
+        assert formatter.format(value) == "00:30"
+
+    def test_default_time_zone(self):
+        formatter = DateFormatter("yMd", "en_US")
+        assert formatter.time_zone is None
+        assert formatter.format(date(2025, 3, 4)) == "3/4/2025"
+
+    def test_unknown_time_zone(self):
+        with pytest.raises(ValueError) as excinfo:
+            DateFormatter("yMd", "en_US", "Nowhere/Zone")
+        assert str(excinfo.value) == "Unknown time zone: 'Nowhere/Zone'"
+
+    def test_invalid_time_zone_type(self):
+        with pytest.raises(TypeError) as excinfo:
+            DateFormatter("yMd", "en_US", 1)  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "time_zone must be a string or ZoneInfo object, not int"
+        )
+
+    def test_locale_object(self):
+        formatter = DateFormatter("yMd", Locale("en", "GB"), "UTC")
+        assert formatter.format(date(2025, 3, 4)) == "04/03/2025"
+
+    def test_unsupported_value(self):
+        formatter = DateFormatter("yMd", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format(1)  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be datetime, date, or time, got 1"
+
+    def test_attributes(self):
+        formatter = DateFormatter("yMMMd", "de_DE", "UTC")
+        assert formatter.skeleton == "yMMMd"
+        assert formatter.locale == Locale("de_DE")
+
+    def test_repr(self):
+        formatter = DateFormatter("yMMMd", "de_DE")
+        assert repr(formatter) == "DateFormatter('yMMMd', Locale('de_DE'))"
+
+    def test_repr_from_pattern(self):
+        formatter = DateFormatter.from_pattern("HH:mm", "de_DE", "UTC")
+        assert repr(formatter) == (
+            "DateFormatter.from_pattern('HH:mm', Locale('de_DE'), time_zone='UTC')"
+        )
+
+    def test_pickle(self):
+        formatter = DateFormatter("yMMMd", "de_DE", "Europe/Berlin")
+        unpickled = pickle.loads(pickle.dumps(formatter))
+        assert unpickled.skeleton == "yMMMd"
+        assert unpickled.locale == Locale("de_DE")
+        assert unpickled.time_zone == "Europe/Berlin"
+
+    def test_pickle_from_pattern(self):
+        formatter = DateFormatter.from_pattern("HH:mm", "de_DE")
+        unpickled = pickle.loads(pickle.dumps(formatter))
+        assert unpickled.skeleton is None
+        assert unpickled.pattern == "HH:mm"
+        assert unpickled.time_zone is None
+
+    def test_cached_formats_are_independent(self):
+        utc = DateFormatter.from_pattern("HH:mm", "en_US", "UTC")
+        berlin = DateFormatter.from_pattern("HH:mm", "en_US", "Europe/Berlin")
+        value = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        assert utc.format(value) == "12:00"
+        assert berlin.format(value) == "13:00"
+        assert DateFormatter.from_pattern("HH:mm", "en_US", "UTC").format(value) == (
+            "12:00"
+        )
+
+
+class TestFormatMany:
+    def test_list(self):
+        formatter = DateFormatter.from_pattern("yyyy-MM-dd HH:mm", "en_US", "UTC")
+        values: list[datetime | date | time] = [
+            datetime(2025, 3, 4, 5, 6),
+            date(2025, 1, 2),
+            time(7, 8),
+        ]
+        assert formatter.format_many(values) == [
+            "2025-03-04 05:06",
+            "2025-01-02 00:00",
+            "1970-01-01 07:08",
+        ]
+
+    def test_generator(self):
+        formatter = DateFormatter.from_pattern("d", "en_US", "UTC")
+        result = formatter.format_many(date(2025, 1, day) for day in range(1, 4))
+        assert result == ["1", "2", "3"]
+
+    def test_reinit_during_iteration(self):
+        formatter = DateFormatter.from_pattern("d", "en_US", "UTC")
+
+        def values() -> Iterator[date]:
+            yield date(2025, 1, 1)
+            formatter.__init__("yMd", "en_US")  # type: ignore[misc]
+            # Evict the original format from the cache.
+            for i in range(300):
+                DateFormatter.from_pattern(f"'{i}' d", "en_US", "UTC")
+            yield date(2025, 1, 2)
+
+        assert formatter.format_many(values()) == ["1", "2"]
+        assert formatter.skeleton == "yMd"
+
+    def test_reinit_time_zone_during_iteration(self):
+        formatter = DateFormatter("H", "en_GB", "Asia/Tokyo")
+
+        def values() -> Iterator[datetime]:
+            yield datetime(2025, 1, 1, 12)
+            formatter.__init__("H", "en_GB", "Europe/Paris")  # type: ignore[misc]
+            yield datetime(2025, 1, 1, 12)
+
+        assert formatter.format_many(values()) == ["12", "12"]
+        assert formatter.time_zone == "Europe/Paris"
+
+    def test_empty(self):
+        formatter = DateFormatter("yMd", "en_US")
+        assert formatter.format_many([]) == []
+        assert formatter.format_many(datetime64_array([], "<M8[s]")) == []
+
+    def test_unsupported_value(self):
+        formatter = DateFormatter("yMd", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format_many([date(2025, 1, 1), "2025-01-01"])  # type: ignore[list-item]
+        assert str(excinfo.value) == (
+            "Values must be datetime, date, or time, got '2025-01-01'"
+        )
+
+    def test_rejects_str(self):
+        formatter = DateFormatter("yMd", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format_many("2025")  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "values must be an iterable or datetime64 array, not str"
+        )
+
+    def test_datetime64(self):
+        formatter = DateFormatter.from_pattern("yyyy-MM-dd HH:mm", "en_US", "UTC")
+        value = int(datetime(2025, 3, 4, 5, 6, tzinfo=timezone.utc).timestamp())
+        result = formatter.format_many(datetime64_array([0, value], "<M8[s]"))
+        assert result == ["1970-01-01 00:00", "2025-03-04 05:06"]
+
+    @pytest.mark.parametrize(
+        "unit,per_day",
+        [
+            ("D", 1),
+            ("h", 24),
+            ("m", 1440),
+            ("s", 86400),
+            ("ms", 86400000),
+            ("us", 86400000000),
+            ("ns", 86400000000000),
+        ],
+    )
+    def test_datetime64_units(self, unit, per_day):
+        formatter = DateFormatter.from_pattern("yyyy-MM-dd", "en_US", "UTC")
+        values = datetime64_array([per_day * 2], f"<M8[{unit}]")
+        assert formatter.format_many(values) == ["1970-01-03"]
+
+    def test_datetime64_time_zone(self):
+        formatter = DateFormatter.from_pattern("HH:mm", "en_US", "Asia/Tokyo")
+        assert formatter.format_many(datetime64_array([0], "<M8[s]")) == ["09:00"]
+
+    def test_datetime64_nat(self):
+        formatter = DateFormatter("yMd", "en_US")
+        with pytest.raises(ValueError) as excinfo:
+            formatter.format_many(datetime64_array([0, -(2**63)], "<M8[s]"))
+        assert str(excinfo.value) == "Cannot format NaT at index 1"
+
+    def test_datetime64_unsupported_unit(self):
+        formatter = DateFormatter("yMd", "en_US")
+        with pytest.raises(ValueError) as excinfo:
+            formatter.format_many(datetime64_array([1], "<M8[Y]"))
+        assert str(excinfo.value) == "Unsupported datetime64 unit in dtype '<M8[Y]'"
+
+    def test_other_buffer(self):
+        formatter = DateFormatter("yMd", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format_many(array("q", [1]))
+        assert str(excinfo.value) == "Values must be datetime, date, or time, got 1"
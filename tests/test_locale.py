@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import copy
+import pickle
+
 import pytest
 
-from icu4py.locale import Locale
+from icu4py.locale import Locale, LocaleMatcher, canonicalize_many
 
 
 class TestLocale:
@@ -138,6 +141,34 @@ class TestLocale:
         with pytest.raises(AssertionError):
             CustomLocale("de_DE")
 
+    def test_pickle(self):
+        locale = Locale("en", "GB", extensions={"collation": "phonebook"})
+
+        result = pickle.loads(pickle.dumps(locale))
+
+        assert type(result) is Locale
+        assert repr(result) == "Locale('en_GB@collation=phonebook')"
+        assert result.extensions == {"collation": "phonebook"}
+
+    def test_pickle_variant(self):
+        locale = Locale("en", "GB", "POSIX")
+
+        result = pickle.loads(pickle.dumps(locale))
+
+        assert (result.language, result.country, result.variant) == (
+            "en",
+            "GB",
+            "POSIX",
+        )
+
+    def test_copy(self):
+        locale = Locale("fr_FR")
+
+        result = copy.copy(locale)
+
+        assert result is not locale
+        assert repr(result) == "Locale('fr_FR')"
+
     def test_repr_simple(self):
         locale = Locale("en")
         assert repr(locale) == "Locale('en')"
@@ -162,3 +193,315 @@ class TestLocale:
         assert repr_str.startswith("Locale('en_GB@")
         assert "collation=phonebook" in repr_str
         assert "currency=USD" in repr_str
+
+    def test_eq(self):
+        assert Locale("en_GB") == Locale("en", "GB")
+        assert Locale("en_GB") != Locale("en", "US")
+        assert (Locale("en_GB") != Locale("en", "GB")) is False
+
+    def test_eq_extensions(self):
+        assert Locale("de_DE@collation=phonebook") == Locale(
+            "de", "DE", extensions={"collation": "phonebook"}
+        )
+        assert Locale("de_DE@collation=phonebook") != Locale("de_DE")
+
+    def test_eq_canonical(self):
+        assert Locale("iw") == Locale("he")
+        assert Locale("EN_us") == Locale("en_US")
+        assert Locale("iw") != Locale("en")
+
+    def test_eq_other_type(self):
+        assert Locale("en_GB") != "en_GB"
+
+    def test_eq_subclass(self):
+        class CustomLocale(Locale):
+            pass
+
+        assert CustomLocale("en_GB") == Locale("en_GB")
+        assert Locale("en_GB") == CustomLocale("en_GB")
+
+    def test_hash(self):
+        assert hash(Locale("en_GB")) == hash(Locale("en", "GB"))
+        assert {Locale("en_GB"): 1}[Locale("en", "GB")] == 1
+        assert len({Locale("en_GB"), Locale("en", "GB"), Locale("fr")}) == 2
+
+    def test_hash_canonical(self):
+        assert hash(Locale("iw")) == hash(Locale("he"))
+        assert {Locale("he"): 1}[Locale("iw")] == 1
+
+    def test_hash_derived(self):
+        assert hash(Locale.from_bcp47("en-GB")) == hash(Locale("en_GB"))
+        assert {Locale("en_GB"): 1}[Locale("en_GB").canonicalize()] == 1
+
+    def test_reinit(self):
+        locale = Locale("en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            locale.__init__("de_DE")  # type: ignore[misc]
+
+        assert str(exc_info.value) == "Locale objects cannot be reinitialized"
+        assert locale == Locale("en_GB")
+
+    def test_get_reinit(self):
+        locale = Locale.get("en_US")
+
+        with pytest.raises(TypeError):
+            locale.__init__("de_DE")  # type: ignore[misc]
+
+        assert Locale.get("en_US").country == "US"
+
+    def test_ordering_unsupported(self):
+        with pytest.raises(TypeError):
+            _ = Locale("en") < Locale("fr")  # type: ignore[operator]
+
+    def test_get(self):
+        locale = Locale.get("en_GB")
+
+        assert type(locale) is Locale
+        assert locale == Locale("en", "GB")
+        assert Locale.get("en_GB") is locale
+
+    def test_get_different_strings(self):
+        assert Locale.get("en-GB") == Locale.get("en_GB")
+        assert Locale.get("fr_FR") is not Locale.get("en_GB")
+
+    def test_get_evicts_oldest(self):
+        locale = Locale.get("en_GB@test=evict")
+
+        for i in range(256):
+            Locale.get(f"en_GB@test=other{i}")
+
+        result = Locale.get("en_GB@test=evict")
+        assert result is not locale
+        assert result == locale
+
+    def test_get_subclass(self):
+        class CustomLocale(Locale):
+            pass
+
+        locale = CustomLocale.get("en_GB")
+
+        assert type(locale) is CustomLocale
+        assert CustomLocale.get("en_GB") is not locale
+
+    def test_get_not_string(self):
+        with pytest.raises(TypeError) as exc_info:
+            Locale.get(1)  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "name must be a string, not int"
+
+    def test_get_wrong_arguments(self):
+        with pytest.raises(TypeError) as exc_info:
+            Locale.get()  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "get() takes exactly 1 argument"
+
+    def test_from_bcp47(self):
+        locale = Locale.from_bcp47("zh-Hant-TW")
+        assert type(locale) is Locale
+        assert repr(locale) == "Locale('zh_Hant_TW')"
+
+    def test_from_bcp47_extensions(self):
+        locale = Locale.from_bcp47("de-DE-u-co-phonebk")
+        assert locale.extensions == {"collation": "phonebook"}
+
+    def test_from_bcp47_invalid(self):
+        with pytest.raises(ValueError) as exc_info:
+            Locale.from_bcp47("en_US")
+
+        assert str(exc_info.value) == (
+            "Failed to parse language tag 'en_US': U_ILLEGAL_ARGUMENT_ERROR"
+        )
+
+    def test_from_bcp47_not_string(self):
+        with pytest.raises(TypeError) as exc_info:
+            Locale.from_bcp47(1)  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "tag must be a string, not int"
+
+    def test_from_bcp47_subclass(self):
+        class CustomLocale(Locale):
+            pass
+
+        assert type(CustomLocale.from_bcp47("en-GB")) is CustomLocale
+
+    def test_to_bcp47(self):
+        assert Locale("en_GB").to_bcp47() == "en-GB"
+        assert Locale("zh_Hant_TW").to_bcp47() == "zh-Hant-TW"
+
+    def test_to_bcp47_extensions(self):
+        locale = Locale("de", "DE", extensions={"collation": "phonebook"})
+        assert locale.to_bcp47() == "de-DE-u-co-phonebk"
+
+    def test_to_bcp47_empty(self):
+        assert Locale("").to_bcp47() == "und"
+
+    def test_to_bcp47_bogus(self):
+        with pytest.raises(ValueError) as exc_info:
+            Locale("x" * 100).to_bcp47()
+
+        assert str(exc_info.value) == (
+            "Failed to convert locale to language tag: U_ILLEGAL_ARGUMENT_ERROR"
+        )
+
+    def test_canonicalize(self):
+        assert Locale("iw").canonicalize() == Locale("he")
+        assert Locale("in_ID").canonicalize() == Locale("id_ID")
+        assert Locale("mo").canonicalize() == Locale("ro")
+
+    def test_canonicalize_returns_copy(self):
+        locale = Locale("en_GB")
+
+        result = locale.canonicalize()
+
+        assert result == locale
+        assert result is not locale
+
+    def test_add_likely_subtags(self):
+        assert Locale("zh_TW").add_likely_subtags() == Locale("zh_Hant_TW")
+        assert Locale("en").add_likely_subtags() == Locale("en_Latn_US")
+
+    def test_minimize_subtags(self):
+        assert Locale("zh_Hant_TW").minimize_subtags() == Locale("zh_TW")
+        assert Locale("en_Latn_US").minimize_subtags() == Locale("en")
+
+    def test_transform_subclass(self):
+        class CustomLocale(Locale):
+            pass
+
+        assert type(CustomLocale("iw").canonicalize()) is CustomLocale
+
+
+class TestLocaleMatcher:
+    @pytest.fixture
+    def matcher(self) -> LocaleMatcher:
+        return LocaleMatcher(["en", "en_GB", "fr", "de_CH", Locale("pt", "BR")])
+
+    def test_best_match_header(self, matcher):
+        result = matcher.best_match("fr-CA,fr;q=0.9,en;q=0.8")
+        assert result == Locale("fr")
+
+    def test_best_match_header_region(self, matcher):
+        assert matcher.best_match("en-AU") == Locale("en_GB")
+        assert matcher.best_match("de") == Locale("de_CH")
+        assert matcher.best_match("pt") == Locale("pt_BR")
+
+    def test_best_match_header_quality(self, matcher):
+        assert matcher.best_match("fr;q=0.5, de;q=0.9") == Locale("de_CH")
+
+    def test_best_match_no_match(self, matcher):
+        assert matcher.best_match("ja") == Locale("en")
+
+    def test_best_match_empty_header(self, matcher):
+        assert matcher.best_match("") == Locale("en")
+
+    def test_best_match_wildcard(self, matcher):
+        assert matcher.best_match("fr-CH, *;q=0.5") == Locale("fr")
+
+    def test_best_match_returns_supported_object(self, matcher):
+        result = matcher.best_match("pt-PT")
+        assert result is matcher.supported_locales[4]
+
+    def test_best_match_cached(self, matcher):
+        first = matcher.best_match("en-AU,en;q=0.9")
+        assert matcher.best_match("en-AU,en;q=0.9") is first
+
+    def test_best_match_invalid_header(self, matcher):
+        with pytest.raises(ValueError) as exc_info:
+            matcher.best_match("en;q=abc")
+
+        assert str(exc_info.value) == (
+            "Failed to parse Accept-Language header 'en;q=abc': "
+            + "U_ILLEGAL_ARGUMENT_ERROR"
+        )
+
+    def test_best_match_list(self, matcher):
+        assert matcher.best_match(["ja", "de_AT"]) == Locale("de_CH")
+        assert matcher.best_match([Locale("en", "IE")]) == Locale("en_GB")
+
+    def test_best_match_empty_list(self, matcher):
+        assert matcher.best_match([]) == Locale("en")
+
+    def test_best_match_invalid_list_item(self, matcher):
+        with pytest.raises(TypeError) as exc_info:
+            matcher.best_match([1])
+
+        assert str(exc_info.value) == (
+            "desired locales must be strings or Locale objects, not int"
+        )
+
+    def test_best_match_wrong_arguments(self, matcher):
+        with pytest.raises(TypeError) as exc_info:
+            matcher.best_match()
+
+        assert str(exc_info.value) == "best_match() takes exactly 1 argument"
+
+    def test_supported_locales(self, matcher):
+        assert matcher.supported_locales == (
+            Locale("en"),
+            Locale("en_GB"),
+            Locale("fr"),
+            Locale("de_CH"),
+            Locale("pt_BR"),
+        )
+
+    def test_supported_locales_shared(self):
+        matcher = LocaleMatcher(["en_GB"])
+        assert matcher.supported_locales[0] is Locale.get("en_GB")
+
+    def test_empty(self):
+        with pytest.raises(ValueError) as exc_info:
+            LocaleMatcher([])
+
+        assert str(exc_info.value) == "supported_locales must not be empty"
+
+    def test_string(self):
+        with pytest.raises(TypeError) as exc_info:
+            LocaleMatcher("en, fr")
+
+        assert str(exc_info.value) == (
+            "supported_locales must be an iterable of locales, not a string"
+        )
+
+    def test_invalid_item(self):
+        with pytest.raises(TypeError) as exc_info:
+            LocaleMatcher(["en", None])  # type: ignore[list-item]
+
+        assert str(exc_info.value) == (
+            "supported_locales must be strings or Locale objects, not NoneType"
+        )
+
+
+class TestCanonicalizeMany:
+    def test_basic(self):
+        result = canonicalize_many(["en-us", "zh_Hant_TW", "iw", "EN_gb", "tl"])
+        assert result == ["en-US", "zh-Hant-TW", "he", "en-GB", "fil"]
+
+    def test_extensions(self):
+        result = canonicalize_many(["de-DE-u-co-phonebk", "th_TH@calendar=buddhist"])
+        assert result == ["de-DE-u-co-phonebk", "th-TH-u-ca-buddhist"]
+
+    def test_deduplicates(self):
+        result = canonicalize_many(["en-us", "fr", "en-us"])
+
+        assert result == ["en-US", "fr", "en-US"]
+        assert result[0] is result[2]
+
+    def test_generator(self):
+        assert canonicalize_many(tag for tag in ["en-us"]) == ["en-US"]
+
+    def test_empty(self):
+        assert canonicalize_many([]) == []
+
+    def test_undetermined(self):
+        assert canonicalize_many(["", "x" * 100]) == ["und", "und"]
+
+    def test_not_string(self):
+        with pytest.raises(TypeError) as exc_info:
+            canonicalize_many(["en", 1])  # type: ignore[list-item]
+
+        assert str(exc_info.value) == "tags must be strings, not int"
+
+    def test_not_iterable(self):
+        with pytest.raises(TypeError):
+            canonicalize_many(1)  # type: ignore[arg-type]
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timezone
+import copy
+import pickle
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
 from decimal import Decimal
+from enum import Enum, IntEnum
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from zoneinfo import ZoneInfo
 
 import pytest
 
 from icu4py.locale import Locale
-from icu4py.messageformat import MessageFormat
+from icu4py.messageformat import Catalog, MessageFormat, compile_catalog
+from tests.utils import Datetime64Array, datetime64_array
+
+
+class PicklableMessageFormat(MessageFormat):
+    pass
 
 
 class TestMessageFormat:
@@ -18,7 +33,8 @@ class TestMessageFormat:
             fmt.format({"name": ["invalid", "list"]})  # type: ignore[dict-item]
 
         assert str(exc_info.value) == (
-            "Parameter values must be int, float, str, Decimal, datetime, or date, "
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
             "got ['invalid', 'list'] for key 'name'"
         )
 
@@ -34,7 +50,8 @@ class TestMessageFormat:
             fmt.format({"obj": Witch()})  # type: ignore[dict-item]
 
         assert str(exc_info.value) == (
-            "Parameter values must be int, float, str, Decimal, datetime, or date, "
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
             "got <Witch instance> for key 'obj'"
         )
 
@@ -133,6 +150,78 @@ class TestMessageFormat:
 
         assert result == "1,000,000,000,000,000,000,000,000,000,000"
 
+    def test_integer_uint64_max(self):
+        fmt = MessageFormat("{num}", "en_GB")
+
+        result = fmt.format({"num": 2**64 - 1})
+
+        assert result == "18,446,744,073,709,551,615"
+
+    def test_integer_below_int64(self):
+        fmt = MessageFormat("{num}", "en_GB")
+
+        result = fmt.format({"num": -(2**63) - 1})
+
+        assert result == "-9,223,372,036,854,775,809"
+
+    def test_integer_subclass(self):
+        class MyInt(int):
+            pass
+
+        fmt = MessageFormat("{num}", "en_GB")
+
+        assert fmt.format({"num": MyInt(1234)}) == "1,234"
+
+    def test_string_and_float_subclasses(self):
+        class MyStr(str):
+            pass
+
+        class MyFloat(float):
+            pass
+
+        fmt = MessageFormat("{name}: {num}", "en_GB")
+
+        assert fmt.format({"name": MyStr("Pi"), "num": MyFloat(3.5)}) == "Pi: 3.5"
+
+    def test_bool(self):
+        fmt = MessageFormat("{flag, plural, one {yes} other {no}}", "en")
+
+        assert fmt.format({"flag": True}) == "yes"
+        assert fmt.format({"flag": False}) == "no"
+
+    def test_enum(self):
+        class Colour(Enum):
+            RED = "red"
+            COUNT = 1234
+
+        fmt = MessageFormat("{value}", "en_GB")
+
+        assert fmt.format({"value": Colour.RED}) == "red"
+        assert fmt.format({"value": Colour.COUNT}) == "1,234"
+
+    def test_enum_int(self):
+        class Size(IntEnum):
+            LARGE = 3
+
+        fmt = MessageFormat("{size, plural, one {# item} other {# items}}", "en")
+
+        assert fmt.format({"size": Size.LARGE}) == "3 items"
+
+    def test_enum_invalid_value(self):
+        class Shape(Enum):
+            SQUARE = (4, 4)
+
+        fmt = MessageFormat("{shape}", "en")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({"shape": Shape.SQUARE})
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got (4, 4) for key 'shape'"
+        )
+
     def test_simple_float_substitution(self):
         pattern = "Price: {price}"
         fmt = MessageFormat(pattern, "en_GB")
@@ -434,6 +523,14 @@ class TestMessageFormat:
         result = fmt.format({"val": Decimal("1.23E+10")})
         assert result == "Scientific: 12,300,000,000"
 
+    def test_decimal_subclass(self):
+        class MyDecimal(Decimal):
+            pass
+
+        fmt = MessageFormat("{val}", "en_GB")
+
+        assert fmt.format({"val": MyDecimal("1234.5")}) == "1,234.5"
+
     def test_date_object(self):
         pattern = "Birthday: {birthday,date,long}"
         fmt = MessageFormat(pattern, "en_GB")
@@ -485,6 +582,94 @@ class TestMessageFormat:
         result = fmt.format({"timestamp": dt})
         assert result == "Time: 10/03/2024"
 
+    def test_datetime_aware(self):
+        pattern = "{when,date,::yyyyMMddHHmmssSSS}"
+        fmt = MessageFormat(pattern, "en_GB")
+
+        dt = datetime(
+            2024, 3, 10, 23, 15, 30, 250000, tzinfo=timezone(timedelta(hours=-5))
+        )
+        utc_dt = dt.astimezone(timezone.utc)
+        assert fmt.format({"when": dt}) == fmt.format({"when": utc_dt})
+
+    def test_datetime_utcoffset_none(self):
+        class Unknown(tzinfo):
+            def utcoffset(self, dt: datetime | None) -> None:
+                return None
+
+        pattern = "{when,date,::yyyyMMddHHmm}"
+        fmt = MessageFormat(pattern, "en_GB")
+
+        dt = datetime(2024, 7, 1, 3, 0)
+        aware_dt = dt.replace(tzinfo=Unknown())  # type: ignore[abstract]
+        assert fmt.format({"when": aware_dt}) == fmt.format({"when": dt})
+
+    def test_datetime_utcoffset_error(self):
+        class Broken(tzinfo):
+            def utcoffset(self, dt: datetime | None) -> timedelta:
+                raise ValueError("no offset")
+
+        fmt = MessageFormat("{when,date}", "en_GB")
+
+        dt = datetime(2024, 7, 1, tzinfo=Broken())  # type: ignore[abstract]
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format({"when": dt})
+
+        assert str(exc_info.value) == "no offset for key 'when'"
+
+    def test_datetime_naive_matches_timestamp(self):
+        pattern = "{when,date,::yyyyMMddHHmmssSSS}"
+        fmt = MessageFormat(pattern, "en_GB")
+
+        dt = datetime(2024, 6, 20, 15, 45, 30, 123000)
+        utc_dt = datetime.fromtimestamp(dt.timestamp(), timezone.utc)
+        assert fmt.format({"when": dt}) == fmt.format({"when": utc_dt})
+
+    def test_datetime_extremes(self):
+        fmt = MessageFormat("{when,date,short}", "en_GB")
+
+        # ICU uses the Julian calendar before 1582.
+        earliest = datetime(1, 1, 1, 12, tzinfo=timezone.utc)
+        assert fmt.format({"when": earliest}) == "03/01/1"
+        latest = datetime(9999, 12, 31, 12, tzinfo=timezone.utc)
+        assert fmt.format({"when": latest}) == "31/12/9999"
+
+    def test_time_naive(self):
+        pattern = "Meeting at {when,time,::HHmm}"
+        fmt = MessageFormat(pattern, "en_GB")
+
+        result = fmt.format({"when": time(14, 30)})
+        assert result == "Meeting at 14:30"
+
+    def test_time_aware(self):
+        pattern = "{when,time,::HHmmss}"
+        fmt = MessageFormat(pattern, "en_GB")
+
+        t = time(14, 30, 15, tzinfo=timezone(timedelta(hours=2)))
+        dt = datetime(1970, 1, 1, 12, 30, 15, tzinfo=timezone.utc)
+        assert fmt.format({"when": t}) == fmt.format({"when": dt})
+
+    def test_time_utc(self):
+        pattern = "{when,time,::HHmmss}"
+        fmt = MessageFormat(pattern, "en_GB")
+
+        t = time(14, 30, 15, tzinfo=timezone.utc)
+        dt = datetime(1970, 1, 1, 14, 30, 15, tzinfo=timezone.utc)
+        assert fmt.format({"when": t}) == fmt.format({"when": dt})
+
+    def test_timedelta_duration(self):
+        fmt = MessageFormat("Took {elapsed, duration}", "en_GB")
+
+        result = fmt.format({"elapsed": timedelta(hours=1, minutes=1, seconds=1)})
+        assert result == "Took 1:01:01"
+
+    def test_timedelta_seconds(self):
+        fmt = MessageFormat("{elapsed, number} seconds", "en_GB")
+
+        assert fmt.format({"elapsed": timedelta(days=1)}) == "86,400 seconds"
+        assert fmt.format({"elapsed": timedelta(seconds=1.5)}) == "1.5 seconds"
+        assert fmt.format({"elapsed": timedelta(seconds=-90)}) == "-90 seconds"
+
     def test_datetime_different_locales(self):
         pattern = "Date: {when,date,medium}"
 
@@ -539,9 +724,7 @@ class TestMessageFormat:
         pattern = "Hello, {name}!"
 
         class CustomMessageFormat(MessageFormat):
-            def format(
-                self, params: dict[str, int | float | str | Decimal | date | datetime]
-            ) -> str:
+            def format(self, params: Any = (), /, **kwargs: Any) -> str:
                 original = super().format(params)
                 return original.upper()
 
@@ -561,6 +744,49 @@ class TestMessageFormat:
         fmt = MessageFormat(pattern, locale)
         assert fmt.format({"amount": 1234}) == "١٬٢٣٤ pears"
 
+    def test_pickle(self):
+        fmt = MessageFormat("{count, plural, one {# item} other {# items}}", "en_GB")
+
+        result = pickle.loads(pickle.dumps(fmt))
+
+        assert type(result) is MessageFormat
+        assert result.pattern == fmt.pattern
+        assert repr(result.locale) == "Locale('en_GB')"
+        assert result.format(count=2) == "2 items"
+
+    def test_pickle_locale_object(self):
+        locale = Locale("de", "DE", extensions={"collation": "phonebook"})
+        fmt = MessageFormat("{n, number}", locale)
+
+        result = pickle.loads(pickle.dumps(fmt))
+
+        assert result.locale.extensions == {"collation": "phonebook"}
+        assert result.format(n=1234) == "1.234"
+
+    def test_pickle_subclass(self):
+        result = pickle.loads(pickle.dumps(PicklableMessageFormat("{a}", "en_GB")))
+
+        assert type(result) is PicklableMessageFormat
+        assert result.format(a="x") == "x"
+
+    def test_copy(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        result = copy.deepcopy(fmt)
+
+        assert result is not fmt
+        assert result.format(name="World") == "Hello, World!"
+
+    def test_same_pattern_independent(self):
+        fmt1 = MessageFormat("{name}: {n, number}", "en_GB")
+        fmt2 = MessageFormat("{name}: {n, number}", "en_GB")
+        fmt3 = MessageFormat("{name}: {n, number}", "de_DE")
+
+        assert fmt1.format(name="a", n=1000) == "a: 1,000"
+        del fmt1
+        assert fmt2.format(name="b", n=1000) == "b: 1,000"
+        assert fmt3.format(name="c", n=1000) == "c: 1.000"
+
     def test_repr_simple(self):
         pattern = "Hello, {name}!"
         fmt = MessageFormat(pattern, "en_GB")
@@ -609,3 +835,1454 @@ class TestMessageFormat:
         assert isinstance(locale, Locale)
         assert locale.language == "fr"
         assert locale.country == ""
+
+    def test_arg_names(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        assert fmt.arg_names == ("greeting", "name")
+
+    def test_arg_names_no_arguments(self):
+        fmt = MessageFormat("Static", "en_GB")
+        assert fmt.arg_names == ()
+        assert fmt.arg_types == ()
+
+    def test_arg_names_nested_and_repeated(self):
+        pattern = (
+            "{host} {count, plural, one {# {host}} other {# {guest}}} "
+            "{host} {when, date, short}"
+        )
+        fmt = MessageFormat(pattern, "en_GB")
+        assert fmt.arg_names == ("host", "count", "guest", "when")
+        assert fmt.arg_types == ("none", "plural", "none", "date")
+
+    def test_arg_names_numbered(self):
+        fmt = MessageFormat("{0} and {1}", "en_GB")
+        assert fmt.arg_names == ("0", "1")
+        assert fmt.format({"0": "a", "1": "b"}) == "a and b"
+
+    def test_arg_types(self):
+        pattern = (
+            "{a} {b, number} {c, DATE, short} {d, time} {e, select, x {X} other {Y}} "
+            "{f, selectordinal, other {#}} {g, choice, 0#none|1#some} {h, spellout}"
+        )
+        fmt = MessageFormat(pattern, "en_GB")
+        assert fmt.arg_types == (
+            "none",
+            "number",
+            "date",
+            "time",
+            "select",
+            "selectordinal",
+            "choice",
+            "spellout",
+        )
+
+    def test_format_no_params(self):
+        fmt = MessageFormat("This is a static message.", "en_GB")
+        assert fmt.format() == "This is a static message."
+
+    def test_format_dict_extra_keys(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+        assert fmt.format({"name": "World", "unused": 1}) == "Hello, World!"
+
+    def test_format_dict_missing_keys(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        assert fmt.format({"name": "World"}) == "{greeting}, World!"
+
+    def test_format_dict_same_size_different_keys(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        assert fmt.format({"name": "World", "other": "x"}) == "{greeting}, World!"
+
+    def test_format_kwargs(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        assert fmt.format(name="World", greeting="Hello") == "Hello, World!"
+
+    def test_format_kwargs_unpacked(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        params = {"".join(["na", "me"]): "World", "greeting": "Hello"}
+        assert fmt.format(**params) == "Hello, World!"
+
+    def test_format_kwargs_extra(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+        assert fmt.format(name="World", unused=1) == "Hello, World!"
+
+    def test_format_kwargs_same_size_different_keys(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        assert fmt.format(name="World", other="x") == "{greeting}, World!"
+
+    def test_format_kwargs_invalid_value(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format(name=["invalid"])  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got ['invalid'] for key 'name'"
+        )
+
+    def test_format_kwargs_extra_invalid_value(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format(name="World", other=["invalid"])  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got ['invalid'] for key 'other'"
+        )
+
+    def test_format_tuple(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        assert fmt.format(("Hello", "World")) == "Hello, World!"
+
+    def test_format_tuple_nested(self):
+        fmt = MessageFormat(
+            "{count, plural, one {# {thing}} other {# {thing}s}}", "en_GB"
+        )
+        assert fmt.format((2, "file")) == "2 files"
+
+    def test_format_tuple_wrong_length(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format(("Hello",))
+
+        assert str(exc_info.value) == (
+            "params tuple must have one item per argument (2), got 1"
+        )
+
+    def test_format_tuple_invalid_value(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format(("Hello", None))  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got None for key 'name'"
+        )
+
+    def test_format_invalid_params_type(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format(["World"])  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "params must be a dict or tuple, not list"
+
+    def test_format_params_and_kwargs(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({"name": "World"}, name="World")
+
+        assert str(exc_info.value) == (
+            "format() takes either a params argument or keyword arguments, not both"
+        )
+
+    def test_format_too_many_positional(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({"name": "World"}, {})  # type: ignore[arg-type, call-arg]
+
+        assert str(exc_info.value) == (
+            "format() takes at most 1 positional argument (2 given)"
+        )
+
+    def test_format_concurrent(self):
+        fmt = MessageFormat("{count, plural, one {# item} other {# items}}", "en_GB")
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda n: fmt.format(count=n), range(2_000)))
+
+        assert results[:3] == ["0 items", "1 item", "2 items"]
+        assert results == [fmt.format(count=n) for n in range(2_000)]
+
+    def test_format_to_parts(self):
+        fmt = MessageFormat(
+            "{name} has {count, plural, one {# file} other {# files}}.", "en_GB"
+        )
+
+        result = fmt.format_to_parts({"name": "Alice", "count": 5})
+
+        assert result == (
+            "Alice has 5 files.",
+            [("name", "none", 0, 5), ("count", "plural", 10, 17)],
+        )
+
+    def test_format_to_parts_matches_format(self):
+        fmt = MessageFormat(
+            "It''s '{'{name}'}' on {when, date, short}: {name} 😊", "en_GB"
+        )
+        params: dict[str, Any] = {"name": "Bob 😊", "when": date(2024, 1, 16)}
+
+        text, parts = fmt.format_to_parts(params)
+
+        assert text == fmt.format(params)
+        assert text == "It's {Bob 😊} on 16/01/2024: Bob 😊 😊"
+        assert parts == [
+            ("name", "none", 6, 11),
+            ("when", "date", 16, 26),
+            ("name", "none", 28, 33),
+        ]
+        assert [text[start:end] for _, _, start, end in parts] == [
+            "Bob 😊",
+            "16/01/2024",
+            "Bob 😊",
+        ]
+
+    def test_format_to_parts_nested(self):
+        fmt = MessageFormat(
+            "{gender, select, female {She} other {They}} sent {thing}", "en_GB"
+        )
+
+        text, parts = fmt.format_to_parts(gender="female", thing="a file")
+
+        assert text == "She sent a file"
+        assert parts == [("gender", "select", 0, 3), ("thing", "none", 9, 15)]
+
+    def test_format_to_parts_tuple(self):
+        fmt = MessageFormat("{count, number} items", "en_GB")
+
+        assert fmt.format_to_parts((1234,)) == (
+            "1,234 items",
+            [("count", "number", 0, 5)],
+        )
+
+    def test_format_to_parts_no_arguments(self):
+        fmt = MessageFormat("Hello '{world}'", "en_GB")
+
+        assert fmt.format_to_parts() == ("Hello {world}", [])
+
+    def test_format_to_parts_missing_argument(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        assert fmt.format_to_parts() == ("Hello, {name}!", [("name", "none", 7, 13)])
+
+    def test_format_to_parts_repeated_calls(self):
+        fmt = MessageFormat("{n, number}", "en_GB")
+
+        assert fmt.format_to_parts(n=1) == ("1", [("n", "number", 0, 1)])
+        assert fmt.format_to_parts(n=1000) == ("1,000", [("n", "number", 0, 5)])
+
+    def test_format_to_parts_format_error(self):
+        fmt = MessageFormat("Amount: {amount, number}", "en_GB")
+
+        with pytest.raises(RuntimeError) as exc_info:
+            fmt.format_to_parts({"amount": "lots"})
+
+        assert str(exc_info.value) == "Failed to format message: U_INVALID_FORMAT_ERROR"
+
+    def test_format_to_parts_invalid_value(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_to_parts({"name": None})  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got None for key 'name'"
+        )
+
+    def test_format_to_parts_params_and_kwargs(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_to_parts({"name": "World"}, name="World")
+
+        assert str(exc_info.value) == (
+            "format_to_parts() takes either a params argument or keyword arguments, "
+            "not both"
+        )
+
+    def test_format_to_parts_too_many_positional(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_to_parts({"name": "World"}, {})  # type: ignore[arg-type, call-arg]
+
+        assert str(exc_info.value) == (
+            "format_to_parts() takes at most 1 positional argument (2 given)"
+        )
+
+    def test_format_many(self):
+        fmt = MessageFormat("{count, plural, one {# item} other {# items}}", "en_GB")
+        result = fmt.format_many([{"count": 1}, {"count": 2}, {"count": 5}])
+        assert result == ["1 item", "2 items", "5 items"]
+
+    def test_format_many_empty(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+        assert fmt.format_many([]) == []
+
+    def test_format_many_generator(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+        result = fmt.format_many({"name": name} for name in ["Alice", "Bob"])
+        assert result == ["Hello, Alice!", "Hello, Bob!"]
+
+    def test_format_many_mixed(self):
+        fmt = MessageFormat("{greeting}, {name}!", "en_GB")
+        result = fmt.format_many(
+            [
+                ("Hello", "Alice"),
+                {"greeting": "Hi", "name": "Bob"},
+                {"name": "Carol"},
+                {"greeting": "Hey", "name": "Dave", "extra": 1},
+            ]
+        )
+        assert result == [
+            "Hello, Alice!",
+            "Hi, Bob!",
+            "{greeting}, Carol!",
+            "Hey, Dave!",
+        ]
+
+    def test_format_many_result_lengths(self):
+        fmt = MessageFormat("{text}", "en_GB")
+        result = fmt.format_many([{"text": "long text 😊"}, {"text": "x"}])
+        assert result == ["long text 😊", "x"]
+
+    def test_format_many_not_iterable(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError, match="not iterable"):
+            fmt.format_many(1)  # type: ignore[arg-type]
+
+    def test_format_many_invalid_item(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many([{"name": "Alice"}, ["Bob"]])  # type: ignore[list-item]
+
+        assert str(exc_info.value) == "params must be a dict or tuple, not list"
+
+    def test_format_many_invalid_value(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many([{"name": "Alice"}, {"name": None}])  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got None for key 'name'"
+        )
+
+    def test_format_many_format_error(self):
+        fmt = MessageFormat("{amount, number}", "en_GB")
+
+        with pytest.raises(RuntimeError) as exc_info:
+            fmt.format_many([{"amount": 1}, {"amount": "x"}])
+
+        assert str(exc_info.value) == "Failed to format message: U_INVALID_FORMAT_ERROR"
+
+    def test_format_many_iterator_error(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        def gen() -> Iterator[dict[str, Any]]:
+            yield {"name": "Alice"}
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            fmt.format_many(gen())
+
+    def test_format_many_wrong_arguments(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many()  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "format_many() takes exactly 1 argument"
+
+    def test_format_many_keyword_argument(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many(params=[])  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "format_many() takes exactly 1 argument"
+
+    def test_format_many_unexpected_keyword_argument(self):
+        fmt = MessageFormat("Hello, {name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many([], name="World")  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == (
+            "format_many() got an unexpected keyword argument 'name'"
+        )
+
+    def test_format_columns_sequences(self):
+        fmt = MessageFormat(
+            "{name} has {count, plural, one {# item} other {# items}}", "en_GB"
+        )
+        result = fmt.format_columns({"name": ["Alice", "Bob"], "count": (1, 5)})
+        assert result == ["Alice has 1 item", "Bob has 5 items"]
+
+    def test_format_columns_generic_sequence(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        assert fmt.format_columns({"n": range(3)}) == ["0", "1", "2"]
+
+    def test_format_columns_empty(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        assert fmt.format_columns({"n": []}) == []
+
+    def test_format_columns_no_columns(self):
+        fmt = MessageFormat("Static", "en_GB")
+        assert fmt.format_columns({}) == []
+
+    def test_format_columns_int_buffers(self):
+        fmt = MessageFormat("{a} {b} {c} {d}", "en_GB")
+        result = fmt.format_columns(
+            {
+                "a": array("b", [-1, 2]),
+                "b": array("h", [-300, 400]),
+                "c": array("i", [-70000, 80000]),
+                "d": array("q", [-(2**63), 2**63 - 1]),
+            }
+        )
+        assert result == [
+            "-1 -300 -70,000 -9,223,372,036,854,775,808",
+            "2 400 80,000 9,223,372,036,854,775,807",
+        ]
+
+    def test_format_columns_unsigned_buffers(self):
+        fmt = MessageFormat("{a} {b} {c} {d}", "en_GB")
+        result = fmt.format_columns(
+            {
+                "a": array("B", [255]),
+                "b": array("H", [65535]),
+                "c": array("I", [4294967295]),
+                "d": array("Q", [2**64 - 1]),
+            }
+        )
+        assert result == ["255 65,535 4,294,967,295 18,446,744,073,709,551,615"]
+
+    def test_format_columns_float_buffers(self):
+        fmt = MessageFormat("{a} {b, number}", "en_GB")
+        result = fmt.format_columns(
+            {"a": array("f", [0.5, 1.25]), "b": array("d", [1234.5, -0.25])}
+        )
+        assert result == ["0.5 1,234.5", "1.25 -0.25"]
+
+    def test_format_columns_memoryview(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        view = memoryview(array("q", [1, 2, 3, 4, 5]))[::2]
+        assert fmt.format_columns({"n": view}) == ["1", "3", "5"]
+
+    def test_format_columns_mixed(self):
+        fmt = MessageFormat("{when, date, short}: {count} {label}", "en_GB")
+        result = fmt.format_columns(
+            {
+                "when": [date(2024, 1, 15), date(2024, 6, 20)],
+                "count": array("q", [3, 4]),
+                "label": ["a", "b"],
+            }
+        )
+        assert result == ["15/01/2024: 3 a", "20/06/2024: 4 b"]
+
+    def test_format_columns_datetime64(self):
+        fmt = MessageFormat("{when, date, short}", "en_GB")
+        days = 19737  # 2024-01-15
+        result = fmt.format_columns(
+            {"when": datetime64_array([days * 86400000], "<M8[ms]")}
+        )
+        assert result == ["15/01/2024"]
+
+    @pytest.mark.parametrize(
+        "unit,per_day",
+        [
+            ("D", 1),
+            ("h", 24),
+            ("m", 24 * 60),
+            ("s", 86400),
+            ("us", 86400 * 10**6),
+            ("ns", 86400 * 10**9),
+            ("2D", 1 / 2),
+        ],
+    )
+    def test_format_columns_datetime64_units(self, unit, per_day):
+        fmt = MessageFormat("{when, date, short}", "en_GB")
+        value = int(19738 * per_day)  # 2024-01-16
+        result = fmt.format_columns({"when": datetime64_array([value], f"<M8[{unit}]")})
+        assert result == ["16/01/2024"]
+
+    def test_format_columns_datetime64_weeks(self):
+        fmt = MessageFormat("{when, date, short}", "en_GB")
+        result = fmt.format_columns({"when": datetime64_array([1], "<M8[W]")})
+        assert result == ["08/01/1970"]
+
+    def test_format_columns_datetime64_nat(self):
+        fmt = MessageFormat("{when, date}", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_columns({"when": datetime64_array([-(2**63)], "<M8[s]")})
+
+        assert str(exc_info.value) == "Cannot format NaT for key 'when'"
+
+    def test_format_columns_datetime64_unsupported_unit(self):
+        fmt = MessageFormat("{when, date}", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_columns({"when": datetime64_array([1], "<M8[Y]")})
+
+        assert str(exc_info.value) == (
+            "Unsupported datetime64 unit in dtype '<M8[Y]' for key 'when'"
+        )
+
+    def test_format_columns_buffer_with_other_dtype(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        values = Datetime64Array("q", [7])
+        values.dtype = SimpleNamespace(kind="i", str="<i8")
+        assert fmt.format_columns({"n": values}) == ["7"]
+
+    def test_format_columns_invalid_value(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns({"n": [1, None]})  # type: ignore[list-item]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, Decimal, datetime, date, time, "
+            "or timedelta, "
+            "got None for key 'n'"
+        )
+
+    def test_format_columns_invalid_key(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns({1: [1]})  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == "Dictionary keys must be strings, got 1"
+
+    def test_format_columns_different_lengths(self):
+        fmt = MessageFormat("{a} {b}", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_columns({"a": [1, 2], "b": array("q", [1])})
+
+        assert str(exc_info.value) == (
+            "All columns must have the same length, got 2 for key 'a' and 1 for key 'b'"
+        )
+
+    def test_format_columns_str_column(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns({"n": "abc"})
+
+        assert str(exc_info.value) == (
+            "Column must be a sequence or numeric buffer, not str for key 'n'"
+        )
+
+    def test_format_columns_bytes_column(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns({"n": b"abc"})
+
+        assert str(exc_info.value) == (
+            "Column must be a sequence or numeric buffer, not bytes for key 'n'"
+        )
+
+    def test_format_columns_not_sequence(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns({"n": 1})  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == (
+            "Column must be a sequence or numeric buffer, not int for key 'n'"
+        )
+
+    def test_format_columns_iteration_error(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        class Broken:
+            def __iter__(self) -> Iterator[int]:
+                raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            fmt.format_columns({"n": Broken()})  # type: ignore[dict-item]
+
+    def test_format_columns_multidimensional_buffer(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        view = memoryview(bytes(16)).cast("q", shape=[1, 2])
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_columns({"n": view})
+
+        assert str(exc_info.value) == (
+            "Buffer column must be 1-dimensional, got 2 dimensions for key 'n'"
+        )
+
+    def test_format_columns_unsupported_buffer_format(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        view = memoryview(b"ab").cast("c")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_columns({"n": view})
+
+        assert str(exc_info.value) == (
+            "Unsupported buffer format 'c' for key 'n', expected an integer or float format"
+        )
+
+    def test_format_columns_format_error(self):
+        fmt = MessageFormat("{n, number}", "en_GB")
+
+        with pytest.raises(RuntimeError) as exc_info:
+            fmt.format_columns({"n": ["x"]})
+
+        assert str(exc_info.value) == "Failed to format message: U_INVALID_FORMAT_ERROR"
+
+    def test_format_columns_not_dict(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns([[1]])  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "columns must be a dict, not list"
+
+    def test_format_columns_wrong_arguments(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_columns()  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "format_columns() takes exactly 1 argument"
+
+    def test_cache_disabled(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        assert fmt.format({"n": 1}) == "1"
+
+        assert fmt.cache_info() == (0, 0, 0, 0)
+
+    def test_cache_hits(self):
+        fmt = MessageFormat(
+            "{count, plural, one {# item} other {# items}}", "en_GB", cache_size=10
+        )
+
+        assert fmt.format({"count": 1}) == "1 item"
+        assert fmt.format({"count": 1}) == "1 item"
+        assert fmt.format((1,)) == "1 item"
+        assert fmt.format(count=1) == "1 item"
+        assert fmt.format({"count": 2}) == "2 items"
+
+        info = fmt.cache_info()
+        assert info == (3, 2, 10, 2)
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 2, 10, 2)
+
+    def test_cache_keyword_order(self):
+        fmt = MessageFormat("{a} {b}", "en_GB", cache_size=10)
+
+        assert fmt.format(a="x", b="y") == "x y"
+        assert fmt.format(b="y", a="x") == "x y"
+        assert fmt.format({"b": "y", "a": "x"}) == "x y"
+
+        assert fmt.cache_info() == (2, 1, 10, 1)
+
+    def test_cache_no_arguments(self):
+        fmt = MessageFormat("Hello", "en_GB", cache_size=10)
+
+        assert fmt.format() == "Hello"
+        assert fmt.format({}) == "Hello"
+
+        assert fmt.cache_info() == (1, 1, 10, 1)
+
+    def test_cache_evicts_least_recently_used(self):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=2)
+        fmt.format((1,))
+        fmt.format((2,))
+        fmt.format((1,))
+        fmt.format((3,))
+
+        assert fmt.cache_info() == (1, 3, 2, 2)
+        fmt.format((1,))
+        assert fmt.cache_info().hits == 2
+        fmt.format((2,))
+        assert fmt.cache_info().misses == 4
+
+    def test_cache_enum_and_bool(self):
+        class Colour(Enum):
+            RED = "red"
+
+        fmt = MessageFormat("{c} {n}", "en_GB", cache_size=10)
+
+        assert fmt.format((Colour.RED, True)) == "red 1"
+        assert fmt.format((Colour.RED, True)) == "red 1"
+
+        assert fmt.cache_info() == (1, 1, 10, 1)
+
+    @pytest.mark.parametrize(
+        "value",
+        [1.0, Decimal("1.0"), datetime(2024, 1, 1, 12, 0), [1], None],
+    )
+    def test_cache_uncacheable_values(self, value):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=10)
+
+        for _ in range(2):
+            try:
+                fmt.format({"n": value})
+            except TypeError:
+                pass
+
+        assert fmt.cache_info() == (0, 2, 10, 0)
+
+    def test_cache_mismatched_names(self):
+        fmt = MessageFormat("{a}", "en_GB", cache_size=10)
+
+        assert fmt.format({"b": 1}) == "{a}"
+        assert fmt.format(b=1) == "{a}"
+        assert fmt.format({"a": 1, "b": 2}) == "1"
+
+        assert fmt.cache_info() == (0, 3, 10, 0)
+
+    def test_cache_errors_not_cached(self):
+        fmt = MessageFormat("{n, number}", "en_GB", cache_size=10)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                fmt.format({"n": "x"})
+
+        assert fmt.cache_info() == (0, 2, 10, 0)
+
+    def test_cache_format_many(self):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=10)
+
+        assert fmt.format_many([(1,), {"n": 1}, (2,)]) == ["1", "1", "2"]
+
+        assert fmt.cache_info() == (1, 2, 10, 2)
+
+    def test_cache_clear(self):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=10)
+        fmt.format((1,))
+        fmt.format((1,))
+
+        fmt.cache_clear()
+
+        assert fmt.cache_info() == (0, 0, 10, 0)
+
+    def test_cache_size_negative(self):
+        with pytest.raises(ValueError) as exc_info:
+            MessageFormat("{n}", "en_GB", cache_size=-1)
+
+        assert str(exc_info.value) == "cache_size must be non-negative"
+
+    def test_cache_info_wrong_arguments(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.cache_info(1)  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "cache_info() takes no arguments"
+
+    def test_cache_pickle(self):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=10)
+        fmt.format((1,))
+
+        unpickled = pickle.loads(pickle.dumps(fmt))
+
+        assert unpickled.cache_info() == (0, 0, 10, 0)
+
+    def test_time_zone_default(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB")
+
+        assert fmt.time_zone is None
+
+    def test_time_zone_construction(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+
+        result = fmt.format({"when": datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)})
+
+        assert result == "21:00"
+        assert fmt.time_zone == "Asia/Tokyo"
+
+    def test_time_zone_construction_zoneinfo(self):
+        fmt = MessageFormat(
+            "{when, time, short}", "en_GB", time_zone=ZoneInfo("America/New_York")
+        )
+
+        result = fmt.format({"when": datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)})
+
+        assert result == "07:00"
+        assert fmt.time_zone == "America/New_York"
+
+    def test_time_zone_format(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format({"when": when}, time_zone="Asia/Tokyo") == "21:00"
+        assert fmt.format(when=when, time_zone=ZoneInfo("America/New_York")) == "07:00"
+        assert fmt.format((when,), time_zone=None) == fmt.format((when,))
+
+    def test_time_zone_format_overrides_construction(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format(when=when, time_zone="Europe/Paris") == "13:00"
+        assert fmt.format(when=when) == "21:00"
+
+    def test_time_zone_names(self):
+        fmt = MessageFormat("{when, time, full}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        result = fmt.format(when=when, time_zone="Asia/Tokyo")
+
+        assert result == "21:00:00 Japan Standard Time"
+
+    def test_time_zone_naive_values(self):
+        fmt = MessageFormat(
+            "{when, time, short} {day, date, short} {at, time, short}", "en_GB"
+        )
+
+        result = fmt.format(
+            {
+                "when": datetime(2024, 7, 1, 12, 0),
+                "day": date(2024, 7, 1),
+                "at": time(9, 30),
+            },
+            time_zone="America/Los_Angeles",
+        )
+
+        assert result == "12:00 01/07/2024 09:30"
+
+    def test_time_zone_nested_argument(self):
+        with pytest.raises(ValueError) as exc_info:
+            MessageFormat(
+                "{n, plural, other {{when, time, short}}}",
+                "en_GB",
+                time_zone="Asia/Tokyo",
+            )
+
+        assert str(exc_info.value) == (
+            "time_zone is not supported for date or time arguments nested in "
+            "plural, select, or choice arguments"
+        )
+
+    def test_time_zone_nested_argument_format(self):
+        fmt = MessageFormat("{s, select, other {{when, date, short}}}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format(s="x", when=when) == "16/01/2024"
+        with pytest.raises(ValueError):
+            fmt.format(s="x", when=when, time_zone="Asia/Tokyo")
+        with pytest.raises(ValueError):
+            fmt.format_into(
+                {"s": "x", "when": when}, bytearray(32), time_zone="Asia/Tokyo"
+            )
+        with pytest.raises(ValueError):
+            fmt.format_to_parts(s="x", when=when, time_zone="Asia/Tokyo")
+        with pytest.raises(ValueError):
+            fmt.format_many([{"s": "x", "when": when}], time_zone="Asia/Tokyo")
+
+    def test_time_zone_nested_number_argument(self):
+        fmt = MessageFormat(
+            "{when, time, short} {n, plural, other {# {m, number}}}",
+            "en_GB",
+            time_zone="Asia/Tokyo",
+        )
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format(when=when, n=2, m=3) == "21:00 2 3"
+
+    def test_time_zone_format_only(self):
+        fmt = MessageFormat("Hello", "en_GB")
+
+        assert fmt.format(time_zone="Asia/Tokyo") == "Hello"
+
+    def test_time_zone_with_other_arguments(self):
+        fmt = MessageFormat("{name}: {when, time, short}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        result = fmt.format(name="Alice", time_zone="Asia/Tokyo", when=when)
+
+        assert result == "Alice: 21:00"
+
+    def test_time_zone_format_many(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format_many([(when,)]) == ["21:00"]
+
+    def test_time_zone_format_many_argument(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        result = fmt.format_many([(when,), {"when": when}], time_zone="Europe/Paris")
+
+        assert result == ["13:00", "13:00"]
+        assert fmt.format_many([(when,)], time_zone=None) == ["21:00"]
+
+    def test_time_zone_format_to_parts(self):
+        fmt = MessageFormat("At {when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format_to_parts(when=when) == ("At 21:00", [("when", "time", 3, 8)])
+
+    def test_time_zone_format_to_parts_argument(self):
+        fmt = MessageFormat("At {when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        result = fmt.format_to_parts(when=when, time_zone="Europe/Paris")
+
+        assert result == ("At 13:00", [("when", "time", 3, 8)])
+        assert fmt.format_to_parts((when,), time_zone=None)[0] == "At 21:00"
+        assert fmt.format_to_parts(when=when)[0] == "At 21:00"
+
+    def test_time_zone_format_columns(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format_columns({"when": [when]}) == ["21:00"]
+
+    def test_time_zone_concurrent(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+        zones = ["Asia/Tokyo", "Europe/Paris", "UTC"] * 100
+        expected = {"Asia/Tokyo": "21:00", "Europe/Paris": "13:00", "UTC": "12:00"}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda zone: fmt.format((when,), time_zone=zone), zones)
+            )
+
+        assert results == [expected[zone] for zone in zones]
+
+    def test_time_zone_cache(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", cache_size=10)
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format((when,), time_zone="Asia/Tokyo") == "21:00"
+        assert fmt.format((when,)) == "12:00"
+
+    def test_time_zone_result_cache(self):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=10)
+
+        fmt.format(n=1, time_zone="Asia/Tokyo")
+        fmt.format(n=1, time_zone="Asia/Tokyo")
+        fmt.format(n=1, time_zone="Europe/Paris")
+        fmt.format(n=1)
+
+        assert fmt.cache_info() == (1, 3, 10, 3)
+
+    def test_time_zone_unknown(self):
+        with pytest.raises(ValueError) as exc_info:
+            MessageFormat("{n}", "en_GB", time_zone="Mars/Olympus_Mons")
+
+        assert str(exc_info.value) == "Unknown time zone: 'Mars/Olympus_Mons'"
+
+    def test_time_zone_format_unknown(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format(n=1, time_zone="Mars/Olympus_Mons")
+
+        assert str(exc_info.value) == "Unknown time zone: 'Mars/Olympus_Mons'"
+
+    def test_time_zone_wrong_type(self):
+        with pytest.raises(TypeError) as exc_info:
+            MessageFormat("{n}", "en_GB", time_zone=timezone.utc)  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == (
+            "time_zone must be a string or ZoneInfo object, not datetime.timezone"
+        )
+
+    def test_time_zone_pickle(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB", time_zone="Asia/Tokyo")
+
+        unpickled = pickle.loads(pickle.dumps(fmt))
+
+        assert unpickled.time_zone == "Asia/Tokyo"
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+        assert unpickled.format(when=when) == "21:00"
+
+    def test_format_bytes(self):
+        fmt = MessageFormat("{n, plural, one {# café} other {# cafés}}", "fr")
+
+        assert fmt.format_bytes({"n": 1}) == "1 café".encode()
+        assert fmt.format_bytes((2,)) == "2 cafés".encode()
+        assert fmt.format_bytes(n=3) == "3 cafés".encode()
+
+    def test_format_bytes_no_arguments(self):
+        fmt = MessageFormat("Hello", "en_GB")
+
+        assert fmt.format_bytes() == b"Hello"
+
+    def test_format_bytes_time_zone(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+
+        assert fmt.format_bytes(when=when, time_zone="Asia/Tokyo") == b"21:00"
+
+    def test_format_bytes_skips_cache(self):
+        fmt = MessageFormat("{n}", "en_GB", cache_size=10)
+
+        assert fmt.format_bytes(n=1) == b"1"
+
+        assert fmt.cache_info() == (0, 0, 10, 0)
+
+    def test_format_bytes_params_and_kwargs(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_bytes({"n": 1}, n=2)
+
+        assert str(exc_info.value) == (
+            "format_bytes() takes either a params argument or keyword arguments, not both"
+        )
+
+    def test_format_bytes_too_many_positional(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_bytes({"n": 1}, {})  # type: ignore[arg-type, call-arg]
+
+        assert str(exc_info.value) == (
+            "format_bytes() takes at most 1 positional argument (2 given)"
+        )
+
+    def test_format_into(self):
+        fmt = MessageFormat("{n, plural, one {# café} other {# cafés}}", "fr")
+        buffer = bytearray(12)
+
+        written = fmt.format_into({"n": 2}, buffer)
+
+        assert written == 8
+        assert buffer == b"2 caf\xc3\xa9s\x00\x00\x00\x00"
+
+    def test_format_into_offset(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        buffer = bytearray(b"n=____")
+
+        written = fmt.format_into((42,), buffer, 2)
+
+        assert written == 2
+        assert buffer == b"n=42__"
+
+    def test_format_into_memoryview(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        buffer = bytearray(4)
+
+        fmt.format_into((7,), memoryview(buffer)[1:])
+
+        assert buffer == b"\x007\x00\x00"
+
+    def test_format_into_exact_fit(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        buffer = bytearray(3)
+
+        assert fmt.format_into((42,), buffer, 1) == 2
+        assert buffer == b"\x0042"
+
+    def test_format_into_time_zone(self):
+        fmt = MessageFormat("{when, time, short}", "en_GB")
+        when = datetime(2024, 1, 16, 12, 0, tzinfo=timezone.utc)
+        buffer = bytearray(5)
+
+        fmt.format_into((when,), buffer, time_zone="Asia/Tokyo")
+
+        assert buffer == b"21:00"
+
+    def test_format_into_too_small(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        buffer = bytearray(b"____")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_into((1234,), buffer, 1)
+
+        assert str(exc_info.value) == (
+            "Buffer too small: the message needs 5 bytes at offset 1, but the buffer has 4 bytes"
+        )
+        assert buffer == b"____"
+
+    def test_format_into_offset_past_end(self):
+        fmt = MessageFormat("", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_into((), bytearray(2), 3)
+
+        assert str(exc_info.value) == (
+            "Buffer too small: the message needs 0 bytes at offset 3, but the buffer has 2 bytes"
+        )
+
+    def test_format_into_negative_offset(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.format_into((1,), bytearray(4), -1)
+
+        assert str(exc_info.value) == "offset must be non-negative"
+
+    def test_format_into_read_only(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(BufferError):
+            fmt.format_into((1,), b"____")
+
+    def test_format_into_wrong_arguments(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_into((1,))  # type: ignore[call-arg]
+
+        assert (
+            str(exc_info.value)
+            == "format_into() takes 2 or 3 positional arguments (1 given)"
+        )
+
+    def test_format_into_unexpected_keyword(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_into((1,), bytearray(4), n=1)  # type: ignore[call-arg]
+
+        assert (
+            str(exc_info.value)
+            == "format_into() got an unexpected keyword argument 'n'"
+        )
+
+    def test_format_into_invalid_params(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_into([1], bytearray(4))  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "params must be a dict or tuple, not list"
+
+    def test_parse(self):
+        fmt = MessageFormat("{user} uploaded {size, number} bytes", "en_GB")
+
+        result = fmt.parse("alice uploaded 1,048,576 bytes")
+
+        assert result == {"user": "alice", "size": 1048576}
+        assert type(result["size"]) is int
+
+    def test_parse_float(self):
+        fmt = MessageFormat("Ratio: {r, number}", "de_DE")
+        assert fmt.parse("Ratio: 1.234,5") == {"r": 1234.5}
+
+    def test_parse_round_trip(self):
+        fmt = MessageFormat("{name} has {count, number} items", "en_GB")
+        text = fmt.format(name="Bob", count=12345)
+        assert fmt.parse(text) == {"name": "Bob", "count": 12345}
+
+    def test_parse_repeated_argument(self):
+        fmt = MessageFormat("{a}-{b}-{a}", "en_GB")
+        assert fmt.parse("x-y-x") == {"a": "x", "b": "y"}
+
+    def test_parse_numbered(self):
+        fmt = MessageFormat("{1} before {0}", "en_GB")
+        assert fmt.parse("b before a") == {"1": "b", "0": "a"}
+
+    def test_parse_date(self):
+        fmt = MessageFormat("Due {d, date, short}", "en_GB", time_zone="UTC")
+        assert fmt.parse("Due 02/01/2024") == {
+            "d": datetime(2024, 1, 2, tzinfo=timezone.utc)
+        }
+
+    def test_parse_time_zone(self):
+        fmt = MessageFormat(
+            "{d, date, short} {t, time, short}", "en_GB", time_zone="Asia/Tokyo"
+        )
+
+        result = fmt.parse("02/01/2024 09:30")
+
+        assert result == {
+            "d": datetime(2024, 1, 1, 15, 0, tzinfo=timezone.utc),
+            "t": datetime(1970, 1, 1, 0, 30, tzinfo=timezone.utc),
+        }
+
+    def test_parse_no_arguments(self):
+        fmt = MessageFormat("Hello!", "en_GB")
+        assert fmt.parse("Hello!") == {}
+
+    def test_parse_no_match(self):
+        fmt = MessageFormat("Disk {disk} is {pct, number}% full", "en_GB")
+
+        with pytest.raises(ValueError) as exc_info:
+            fmt.parse("Disk check skipped")
+
+        assert (
+            str(exc_info.value)
+            == "Text does not match the pattern: 'Disk check skipped'"
+        )
+
+    def test_parse_partial_match(self):
+        fmt = MessageFormat("Disk {disk} is {pct, number}% full", "en_GB")
+
+        with pytest.raises(ValueError):
+            fmt.parse("Disk sda is 93% full!")
+
+    def test_parse_plural_unsupported(self):
+        fmt = MessageFormat("{n, plural, one {# file} other {# files}}", "en_GB")
+
+        with pytest.raises(ValueError):
+            fmt.parse("3 files")
+
+    def test_parse_not_string(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.parse(1)  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "text must be a string, not int"
+
+    def test_parse_wrong_arguments(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.parse()  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "parse() takes exactly 1 argument"
+
+    def test_parse_shares_parser(self):
+        first = MessageFormat("{a} and {b}", "en_GB")
+        second = MessageFormat("{a} and {b}", "en_GB")
+        assert first.parse("x and y") == second.parse("x and y")
+
+    def test_parse_many(self):
+        fmt = MessageFormat("Disk {disk} is {pct, number}% full", "en_GB")
+
+        result = fmt.parse_many(
+            text for text in ["Disk sda is 93% full", "Disk check skipped"]
+        )
+
+        assert result == [{"disk": "sda", "pct": 93}, None]
+
+    def test_parse_many_reinit(self):
+        fmt = MessageFormat("Disk {disk} is {pct, number}% full", "en_GB")
+
+        def texts() -> Iterator[str]:
+            yield "Disk sda is 93% full"
+            fmt.__init__("{a} and {b}", "en_GB")  # type: ignore[misc]
+            # Evict the original pattern from the cache.
+            for i in range(300):
+                MessageFormat(f"{{n}} {i}", "en_GB")
+            yield "Disk sdb is 50% full"
+
+        result = fmt.parse_many(texts())
+
+        assert result == [{"disk": "sda", "pct": 93}, {"disk": "sdb", "pct": 50}]
+        assert fmt.parse("x and y") == {"a": "x", "b": "y"}
+
+    def test_parse_many_empty(self):
+        fmt = MessageFormat("{n}", "en_GB")
+        assert fmt.parse_many([]) == []
+
+    def test_parse_many_not_string(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.parse_many(["a", b"b"])  # type: ignore[list-item]
+
+        assert str(exc_info.value) == "text must be a string, not bytes"
+
+    def test_parse_many_wrong_arguments(self):
+        fmt = MessageFormat("{n}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.parse_many()  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "parse_many() takes exactly 1 argument"
+
+
+MESSAGES = {
+    "greeting": "Hello, {name}!",
+    "files": "{count, plural, one {# file} other {# files}}",
+    "empty": "Nothing here",
+}
+
+
+class TestCatalog:
+    @pytest.fixture
+    def path(self, tmp_path: Path) -> Path:
+        path = tmp_path / "messages.cat"
+        path.write_bytes(compile_catalog(MESSAGES, "en_GB"))
+        return path
+
+    def test_getitem(self, path):
+        catalog = Catalog(path)
+
+        fmt = catalog["greeting"]
+
+        assert isinstance(fmt, MessageFormat)
+        assert fmt.format(name="Ada") == "Hello, Ada!"
+        assert fmt.pattern == "Hello, {name}!"
+        assert fmt.arg_names == ("name",)
+
+    def test_getitem_plural(self, path):
+        catalog = Catalog(path)
+        assert catalog["files"].format(count=1) == "1 file"
+        assert catalog["files"].format(count=1000) == "1,000 files"
+
+    def test_getitem_reuses_format(self, path):
+        catalog = Catalog(path)
+        assert catalog["greeting"] is catalog["greeting"]
+
+    def test_getitem_missing(self, path):
+        catalog = Catalog(path)
+
+        with pytest.raises(KeyError) as exc_info:
+            catalog["missing"]
+
+        assert exc_info.value.args == ("missing",)
+
+    def test_getitem_non_string(self, path):
+        catalog = Catalog(path)
+
+        with pytest.raises(KeyError):
+            catalog[1]  # type: ignore[index]
+
+    def test_get(self, path):
+        catalog = Catalog(path)
+        assert catalog.get("empty") is catalog["empty"]
+        assert catalog.get("missing") is None
+        assert catalog.get("missing", "x") == "x"
+
+    def test_contains(self, path):
+        catalog = Catalog(path)
+        assert "files" in catalog
+        assert "missing" not in catalog
+        assert 1 not in catalog
+
+    def test_len_and_iter(self, path):
+        catalog = Catalog(path)
+        assert len(catalog) == 3
+        assert list(catalog) == ["empty", "files", "greeting"]
+
+    def test_locale(self, path):
+        catalog = Catalog(path)
+        assert catalog.locale == Locale("en", "GB")
+        assert catalog["greeting"].locale == Locale("en", "GB")
+
+    def test_locale_object(self, tmp_path):
+        path = tmp_path / "messages.cat"
+        path.write_bytes(compile_catalog(MESSAGES, Locale("de", "DE")))
+
+        catalog = Catalog(path)
+
+        assert catalog["files"].format(count=1000) == "1.000 files"
+
+    def test_str_path(self, path):
+        catalog = Catalog(str(path))
+        assert catalog["empty"].format() == "Nothing here"
+
+    def test_non_ascii(self, tmp_path):
+        path = tmp_path / "messages.cat"
+        path.write_bytes(
+            compile_catalog({"café": "Ça coûte {n, number} €", "cafe": "x"}, "fr_FR")
+        )
+
+        catalog = Catalog(path)
+
+        assert list(catalog) == ["cafe", "café"]
+        assert catalog["café"].format(n=1234) == "Ça coûte 1\u202f234 €"
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "messages.cat"
+        path.write_bytes(compile_catalog({}, "en_GB"))
+
+        catalog = Catalog(path)
+
+        assert len(catalog) == 0
+        assert "x" not in catalog
+
+    def test_pickle_message(self, path):
+        fmt = pickle.loads(pickle.dumps(Catalog(path)["files"]))
+        assert fmt.format(count=2) == "2 files"
+
+    def test_close(self, path):
+        catalog = Catalog(path)
+
+        catalog.close()
+
+        with pytest.raises(ValueError) as exc_info:
+            catalog["greeting"]
+
+        assert str(exc_info.value) == "Catalog is not open"
+        assert len(catalog) == 0
+
+    def test_context_manager(self, path):
+        with Catalog(path) as catalog:
+            fmt = catalog["greeting"]
+
+        assert fmt.format(name="Ada") == "Hello, Ada!"
+        with pytest.raises(ValueError):
+            catalog["greeting"]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            Catalog(tmp_path / "missing.cat")
+
+    def test_not_a_catalog(self, tmp_path):
+        path = tmp_path / "messages.cat"
+        path.write_bytes(b"Hello, world! This is not a catalog.")
+
+        with pytest.raises(ValueError) as exc_info:
+            Catalog(path)
+
+        assert str(exc_info.value) == "File is not a compiled catalog"
+
+    def test_unsupported_version(self, tmp_path):
+        data = bytearray(compile_catalog(MESSAGES, "en_GB"))
+        data[8] = 99
+        path = tmp_path / "messages.cat"
+        path.write_bytes(data)
+
+        with pytest.raises(ValueError) as exc_info:
+            Catalog(path)
+
+        assert str(exc_info.value) == "Unsupported catalog version 99"
+
+    def test_truncated(self, tmp_path):
+        data = compile_catalog(MESSAGES, "en_GB")
+        path = tmp_path / "messages.cat"
+        path.write_bytes(data[:40])
+
+        with pytest.raises(ValueError) as exc_info:
+            Catalog(path)
+
+        assert str(exc_info.value) == "Catalog file is corrupt"
+
+    def test_corrupt_entry(self, tmp_path):
+        data = bytearray(compile_catalog(MESSAGES, "en_GB"))
+        # Point the first message's pattern past the end of the file.
+        data[40:44] = (len(data) + 1).to_bytes(4, "little")
+        path = tmp_path / "messages.cat"
+        path.write_bytes(data)
+        catalog = Catalog(path)
+
+        with pytest.raises(ValueError) as exc_info:
+            catalog["empty"]
+
+        assert str(exc_info.value) == "Catalog file is corrupt"
+
+    def test_compile_invalid_pattern(self):
+        with pytest.raises(ValueError) as exc_info:
+            compile_catalog({"bad": "{unclosed"}, "en_GB")
+
+        assert str(exc_info.value).startswith("Failed to compile message 'bad': U_")
+
+    def test_compile_non_string(self):
+        with pytest.raises(TypeError) as exc_info:
+            compile_catalog({"n": 1}, "en_GB")  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == (
+            "Message IDs and patterns must be strings, got 'n': 1"
+        )
+
+    def test_compile_invalid_locale_type(self):
+        with pytest.raises(TypeError) as exc_info:
+            compile_catalog(MESSAGES, 1)  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "locale must be a string or Locale object"
+
+    def test_compile_is_deterministic(self):
+        reordered = dict(reversed(MESSAGES.items()))
+        assert compile_catalog(MESSAGES, "en_GB") == compile_catalog(reordered, "en_GB")
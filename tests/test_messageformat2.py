@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from icu4py.locale import Locale
+
+pytest.importorskip("icu4py.messageformat2", exc_type=ImportError)
+
+from icu4py.messageformat2 import DataModel, MessageFormatter  # noqa: E402
+
+FILES = """\
+.input {$count :number}
+.match $count
+one {{You have {$count} file.}}
+* {{You have {$count} files.}}"""
+
+
+class TestDataModel:
+    def test_source(self):
+        model = DataModel("Hello!")
+        assert model.source == "Hello!"
+
+    def test_repr(self):
+        model = DataModel("Hello!")
+        assert repr(model) == "DataModel('Hello!')"
+
+    def test_invalid_source(self):
+        with pytest.raises(ValueError, match=r"^Failed to parse message: "):
+            DataModel("{{unclosed")
+
+
+class TestMessageFormatter:
+    def test_no_placeholders(self):
+        fmt = MessageFormatter("Hello, world!", "en_GB")
+        assert fmt.format() == "Hello, world!"
+
+    def test_number(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+        assert fmt.format({"n": 1234}) == "Total: 1,234"
+
+    def test_number_locale(self):
+        fmt = MessageFormatter("Total: {$n :number}", "de_DE")
+        assert fmt.format({"n": 1234.5}) == "Total: 1.234,5"
+
+    def test_number_locale_object(self):
+        fmt = MessageFormatter("Total: {$n :number}", Locale("de", "DE"))
+        assert fmt.format({"n": 1234}) == "Total: 1.234"
+
+    def test_decimal(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+        assert fmt.format({"n": Decimal("1234.5")}) == "Total: 1,234.5"
+
+    def test_big_integer(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+        assert fmt.format({"n": 10**20}) == "Total: 100,000,000,000,000,000,000"
+
+    def test_plural(self):
+        fmt = MessageFormatter(FILES, "en_GB")
+        assert fmt.format({"count": 1}) == "You have 1 file."
+        assert fmt.format({"count": 5}) == "You have 5 files."
+
+    def test_kwargs(self):
+        fmt = MessageFormatter(FILES, "en_GB")
+        assert fmt.format(count=2) == "You have 2 files."
+
+    def test_from_data_model(self):
+        model = DataModel(FILES)
+
+        fmt_gb = MessageFormatter(model, "en_GB")
+        fmt_de = MessageFormatter(model, "de_DE")
+
+        assert fmt_gb.format(count=1000) == "You have 1,000 files."
+        assert fmt_de.format(count=1000) == "You have 1.000 files."
+        assert fmt_gb.data_model is model
+        assert fmt_gb.source == FILES
+
+    def test_data_model_from_source(self):
+        fmt = MessageFormatter(FILES, "en_GB")
+
+        model = fmt.data_model
+
+        assert model is fmt.data_model
+        assert model.source == FILES
+        assert MessageFormatter(model, "en_GB").format(count=1) == "You have 1 file."
+
+    def test_format_many(self):
+        fmt = MessageFormatter(FILES, "en_GB")
+        result = fmt.format_many([{"count": 1}, {"count": 3}])
+        assert result == ["You have 1 file.", "You have 3 files."]
+
+    def test_format_many_not_dict(self):
+        fmt = MessageFormatter(FILES, "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many([(1,)])  # type: ignore[list-item]
+
+        assert str(exc_info.value) == "params must be a dict, not tuple"
+
+    def test_format_many_wrong_arguments(self):
+        fmt = MessageFormatter(FILES, "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format_many()  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == "format_many() takes exactly 1 argument"
+
+    def test_source(self):
+        fmt = MessageFormatter("Hello!", "en_GB")
+        assert fmt.source == "Hello!"
+
+    def test_locale(self):
+        fmt = MessageFormatter("Hello!", "en_GB")
+        assert repr(fmt.locale) == "Locale('en_GB')"
+
+    def test_repr(self):
+        fmt = MessageFormatter("Hello!", "en_GB")
+        assert repr(fmt) == "MessageFormatter('Hello!', Locale('en_GB'))"
+
+    def test_invalid_source(self):
+        with pytest.raises(ValueError, match=r"^Failed to parse message: "):
+            MessageFormatter("{{unclosed", "en_GB")
+
+    def test_invalid_source_type(self):
+        with pytest.raises(TypeError) as exc_info:
+            MessageFormatter(123, "en_GB")  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "source must be a string or DataModel object"
+
+    def test_invalid_locale_type(self):
+        with pytest.raises(TypeError) as exc_info:
+            MessageFormatter("Hello!", 123)  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "locale must be a string or Locale object"
+
+    def test_invalid_value(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({"n": [1]})  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == (
+            "Parameter values must be int, float, str, or Decimal, got [1] for key 'n'"
+        )
+
+    def test_invalid_key(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({1: 1})  # type: ignore[dict-item]
+
+        assert str(exc_info.value) == "Dictionary keys must be strings, got 1"
+
+    def test_params_not_dict(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format((1,))  # type: ignore[arg-type]
+
+        assert str(exc_info.value) == "params must be a dict, not tuple"
+
+    def test_params_and_kwargs(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({"n": 1}, n=2)
+
+        assert str(exc_info.value) == (
+            "format() takes either a params argument or keyword arguments, not both"
+        )
+
+    def test_too_many_positional(self):
+        fmt = MessageFormatter("Total: {$n :number}", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.format({"n": 1}, {})  # type: ignore[call-arg]
+
+        assert str(exc_info.value) == (
+            "format() takes at most 1 positional argument (2 given)"
+        )
+
+    def test_reinit(self):
+        fmt = MessageFormatter("Hello {$name}!", "en_GB")
+
+        with pytest.raises(TypeError) as exc_info:
+            fmt.__init__("Bye {$name}!", "en_GB")  # type: ignore[misc]
+
+        assert str(exc_info.value) == (
+            "MessageFormatter objects cannot be reinitialized"
+        )
+        assert fmt.format(name="Ada") == "Hello Ada!"
+
+    def test_inheritance(self):
+        class CustomFormatter(MessageFormatter):
+            def format(self, params: Any = {}, /, **kwargs: Any) -> str:  # noqa: B006
+                return super().format(params, **kwargs).upper()
+
+        fmt = CustomFormatter("total: {$n :number}", "en_GB")
+        assert fmt.format({"n": 1}) == "TOTAL: 1"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pickle
+import unicodedata
+
+import pytest
+
+from icu4py.normalizer import Normalizer
+
+COMPOSED = "\u00e9t\u00e9"
+DECOMPOSED = "e\u0301te\u0301"
+
+
+class TestNormalizer:
+    @pytest.mark.parametrize("form", ["NFC", "NFD", "NFKC", "NFKD"])
+    def test_matches_unicodedata(self, form):
+        normalizer = Normalizer(form)
+        for string in [COMPOSED, DECOMPOSED, "ﬁ²", "Å", "한국어", "\U0001f600\u0301"]:
+            assert normalizer.normalize(string) == unicodedata.normalize(form, string)
+
+    def test_nfc(self):
+        assert Normalizer("NFC").normalize(DECOMPOSED) == COMPOSED
+
+    def test_nfd(self):
+        assert Normalizer("NFD").normalize(COMPOSED) == DECOMPOSED
+
+    def test_nfkc_casefold(self):
+        normalizer = Normalizer("NFKC_Casefold")
+        assert normalizer.normalize("Straße ＡＢＣ ﬁ") == "strasse abc fi"
+        assert normalizer.normalize("ABC") == "abc"
+
+    def test_normalized_returns_same_object(self):
+        normalizer = Normalizer("NFC")
+        for string in ["abc", COMPOSED, "中文"]:
+            assert normalizer.normalize(string) is string
+
+    def test_partly_normalized(self):
+        string = "abc" + DECOMPOSED
+        assert Normalizer("NFC").normalize(string) == "abc" + COMPOSED
+
+    def test_unpaired_surrogate(self):
+        assert Normalizer("NFD").normalize("\u00e9\ud800") == "e\u0301\ud800"
+
+    def test_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Normalizer("NFC").normalize(b"abc")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be strings, not bytes"
+
+    def test_invalid_form(self):
+        with pytest.raises(ValueError) as excinfo:
+            Normalizer("nfc")  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "form must be 'NFC', 'NFD', 'NFKC', 'NFKD', or 'NFKC_Casefold', not 'nfc'"
+        )
+
+    def test_is_normalized(self):
+        nfc = Normalizer("NFC")
+        assert nfc.is_normalized(COMPOSED) is True
+        assert nfc.is_normalized(DECOMPOSED) is False
+        nfd = Normalizer("NFD")
+        assert nfd.is_normalized(COMPOSED) is False
+        assert nfd.is_normalized(DECOMPOSED) is True
+        assert nfd.is_normalized("abc") is True
+
+    def test_is_normalized_casefold(self):
+        normalizer = Normalizer("NFKC_Casefold")
+        assert normalizer.is_normalized("abc") is True
+        assert normalizer.is_normalized("aBc") is False
+
+    def test_quick_check(self):
+        nfc = Normalizer("NFC")
+        assert nfc.quick_check(COMPOSED) == "yes"
+        assert nfc.quick_check(DECOMPOSED) == "maybe"
+        assert nfc.quick_check("क़") == "no"
+        assert Normalizer("NFD").quick_check(COMPOSED) == "no"
+
+    def test_quick_check_latin1(self):
+        assert Normalizer("NFC").quick_check("éÿ") == "yes"
+        assert Normalizer("NFKC").quick_check("²") == "no"
+
+    def test_form(self):
+        assert Normalizer("NFKC_Casefold").form == "NFKC_Casefold"
+
+    def test_repr(self):
+        assert repr(Normalizer("NFD")) == "Normalizer('NFD')"
+
+    def test_pickle(self):
+        unpickled = pickle.loads(pickle.dumps(Normalizer("NFKD")))
+        assert unpickled.form == "NFKD"
+
+
+class TestNormalizeMany:
+    def test_normalize_many(self):
+        normalizer = Normalizer("NFC")
+        strings = [DECOMPOSED, "abc", COMPOSED, "\U0001f600e\u0301"]
+        result = normalizer.normalize_many(strings)
+        assert result == [COMPOSED, "abc", COMPOSED, "\U0001f600\u00e9"]
+        assert result[1] is strings[1]
+        assert result[2] is strings[2]
+
+    def test_generator(self):
+        normalizer = Normalizer("NFD")
+        assert normalizer.normalize_many(s for s in [COMPOSED]) == [DECOMPOSED]
+
+    def test_empty(self):
+        assert Normalizer("NFC").normalize_many([]) == []
+
+    def test_rejects_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Normalizer("NFC").normalize_many("abc")
+        assert str(excinfo.value) == "strings must be an iterable of strings, not str"
+
+    def test_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Normalizer("NFC").normalize_many(["a", 1])  # type: ignore[list-item]
+        assert str(excinfo.value) == "Values must be strings, not int"
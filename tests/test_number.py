@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import pickle
+from array import array
+from collections.abc import Iterator
+from decimal import Decimal
+
+import pytest
+
+from icu4py.locale import Locale
+from icu4py.number import NumberFormatter
+
+
+class TestNumberFormatter:
+    def test_default(self):
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format(1234567.891) == "1,234,567.891"
+
+    def test_currency(self):
+        formatter = NumberFormatter("currency/EUR", "de_DE")
+        assert formatter.format(1234.5) == "1.234,50\xa0€"
+
+    def test_measure_unit(self):
+        formatter = NumberFormatter(
+            "measure-unit/length-meter unit-width-full-name", "en_GB"
+        )
+        assert formatter.format(1) == "1 metre"
+        assert formatter.format(3) == "3 metres"
+
+    def test_compact(self):
+        formatter = NumberFormatter("compact-short", "en_US")
+        assert formatter.format(1234567) == "1.2M"
+
+    def test_percent(self):
+        formatter = NumberFormatter("percent scale/100", "fr_FR")
+        assert formatter.format(0.25) == "25\xa0%"
+
+    def test_locale_object(self):
+        formatter = NumberFormatter("", Locale("de", "DE"))
+        assert formatter.format(1234.5) == "1.234,5"
+
+    def test_bool(self):
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format(True) == "1"
+
+    def test_decimal_precision(self):
+        formatter = NumberFormatter("", "en_US")
+        result = formatter.format(Decimal("12345678901234567890.123"))
+        assert result == "12,345,678,901,234,567,890.123"
+
+    def test_large_int(self):
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format(10**20) == "100,000,000,000,000,000,000"
+        assert formatter.format(-(2**64)) == "-18,446,744,073,709,551,616"
+
+    def test_int_subclass(self):
+        class MyInt(int):
+            pass
+
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format(MyInt(1000)) == "1,000"
+
+    def test_unsupported_value(self):
+        formatter = NumberFormatter("", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format("1")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be int, float, or Decimal, got '1'"
+
+    def test_invalid_skeleton(self):
+        with pytest.raises(ValueError) as excinfo:
+            NumberFormatter("currency/", "en_US")
+        assert str(excinfo.value).startswith("Failed to parse number skeleton")
+
+    def test_invalid_locale_type(self):
+        with pytest.raises(TypeError) as excinfo:
+            NumberFormatter("", 1)  # type: ignore[arg-type]
+        assert str(excinfo.value) == "locale must be a string or Locale object"
+
+    def test_attributes(self):
+        formatter = NumberFormatter("currency/EUR", "de_DE")
+        assert formatter.skeleton == "currency/EUR"
+        assert formatter.locale == Locale("de_DE")
+        assert hash(formatter.locale) == hash(Locale("de_DE"))
+
+    def test_repr(self):
+        formatter = NumberFormatter("currency/EUR", "de_DE")
+        assert repr(formatter) == "NumberFormatter('currency/EUR', Locale('de_DE'))"
+
+    def test_pickle(self):
+        formatter = NumberFormatter("currency/EUR", "de_DE")
+        unpickled = pickle.loads(pickle.dumps(formatter))
+        assert unpickled.skeleton == "currency/EUR"
+        assert unpickled.locale == Locale("de_DE")
+        assert unpickled.format(5) == "5,00\xa0€"
+
+    def test_cached_formatters_are_independent(self):
+        first = NumberFormatter("currency/EUR", "de_DE")
+        second = NumberFormatter("currency/EUR", "de_DE")
+        other = NumberFormatter("currency/EUR", "en_US")
+        assert first.format(1) == second.format(1) == "1,00\xa0€"
+        assert other.format(1) == "€1.00"
+
+    def test_subclass(self):
+        class MyFormatter(NumberFormatter):
+            pass
+
+        formatter = MyFormatter("", "en_US")
+        assert formatter.format(1000) == "1,000"
+
+
+class TestFormatMany:
+    def test_list(self):
+        formatter = NumberFormatter("", "en_US")
+        values: list[int | float | Decimal] = [1000, 2.5, Decimal("3.25"), 10**20]
+        assert formatter.format_many(values) == [
+            "1,000",
+            "2.5",
+            "3.25",
+            "100,000,000,000,000,000,000",
+        ]
+
+    def test_generator(self):
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format_many(x * 1000 for x in range(3)) == [
+            "0",
+            "1,000",
+            "2,000",
+        ]
+
+    def test_reinit_during_iteration(self):
+        formatter = NumberFormatter("", "en_US")
+
+        def values() -> Iterator[int]:
+            yield 1000
+            formatter.__init__("percent", "de_DE")  # type: ignore[misc]
+            # Evict the original formatter from the cache.
+            for i in range(300):
+                NumberFormatter(f"precision-integer scale/{i + 2}", "en_US")
+            yield 2000
+
+        assert formatter.format_many(values()) == ["1,000", "2,000"]
+        assert formatter.format(50) == "50\xa0%"
+
+    def test_empty(self):
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format_many([]) == []
+        assert formatter.format_many(array("q")) == []
+
+    def test_unsupported_value(self):
+        formatter = NumberFormatter("", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format_many([1, None])  # type: ignore[list-item]
+        assert str(excinfo.value) == "Values must be int, float, or Decimal, got None"
+
+    def test_rejects_str(self):
+        formatter = NumberFormatter("", "en_US")
+        with pytest.raises(TypeError) as excinfo:
+            formatter.format_many("123")  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "values must be an iterable or numeric buffer, not str"
+        )
+
+    @pytest.mark.parametrize("typecode", ["b", "h", "i", "l", "q"])
+    def test_signed_buffer(self, typecode):
+        formatter = NumberFormatter("", "en_US")
+        values = array(typecode, [-1, 0, 100])
+        assert formatter.format_many(values) == ["-1", "0", "100"]
+
+    @pytest.mark.parametrize("typecode", ["B", "H", "I", "L", "Q"])
+    def test_unsigned_buffer(self, typecode):
+        formatter = NumberFormatter("", "en_US")
+        values = array(typecode, [0, 100])
+        assert formatter.format_many(values) == ["0", "100"]
+
+    def test_uint64_buffer_past_int64(self):
+        formatter = NumberFormatter("", "en_US")
+        values = array("Q", [2**64 - 1])
+        assert formatter.format_many(values) == ["18,446,744,073,709,551,615"]
+
+    def test_float_buffer(self):
+        formatter = NumberFormatter("currency/EUR", "de_DE")
+        values = array("d", [1234.5, -0.5])
+        assert formatter.format_many(values) == ["1.234,50\xa0€", "-0,50\xa0€"]
+
+    def test_float32_buffer(self):
+        formatter = NumberFormatter("", "en_US")
+        assert formatter.format_many(array("f", [0.5, 2.0])) == ["0.5", "2"]
+
+    def test_strided_buffer(self):
+        formatter = NumberFormatter("", "en_US")
+        values = memoryview(array("q", [1, 2, 3, 4, 5]))[::2]
+        assert formatter.format_many(values) == ["1", "3", "5"]
+
+    def test_unsupported_buffer_format(self):
+        formatter = NumberFormatter("", "en_US")
+        with pytest.raises(ValueError) as excinfo:
+            formatter.format_many(memoryview(b"ab").cast("c"))
+        assert str(excinfo.value) == (
+            "Unsupported buffer format 'c', expected an integer or float format"
+        )
+
+    def test_multidimensional_buffer(self):
+        formatter = NumberFormatter("", "en_US")
+        values = memoryview(array("q", [1, 2, 3, 4])).cast("B").cast("q", (2, 2))
+        with pytest.raises(ValueError) as excinfo:
+            formatter.format_many(values)
+        assert str(excinfo.value) == "Buffer must be 1-dimensional, got 2 dimensions"
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import pickle
+from array import array
+from collections.abc import Iterator
+from decimal import Decimal
+
+import pytest
+
+from icu4py.locale import Locale
+from icu4py.plurals import PluralRules
+
+
+class TestPluralRules:
+    def test_select(self):
+        rules = PluralRules("en")
+        assert rules.select(0) == "other"
+        assert rules.select(1) == "one"
+        assert rules.select(2) == "other"
+
+    def test_several_categories(self):
+        rules = PluralRules("ru")
+        assert rules.select(1) == "one"
+        assert rules.select(3) == "few"
+        assert rules.select(5) == "many"
+        assert rules.select(21) == "one"
+        assert rules.select(1.5) == "other"
+
+    def test_float(self):
+        rules = PluralRules("en")
+        assert rules.select(1.0) == "one"
+        assert rules.select(1.5) == "other"
+
+    def test_decimal_visible_fraction_digits(self):
+        rules = PluralRules("en")
+        assert rules.select(Decimal("1")) == "one"
+        assert rules.select(Decimal("1.0")) == "other"
+        assert rules.select(Decimal("1.50")) == "other"
+        assert rules.select(Decimal("1.0E+1")) == "other"
+
+    def test_decimal_exponent(self):
+        rules = PluralRules("fr")
+        assert rules.select(Decimal("1E+6")) == "many"
+        assert rules.select(Decimal("1.0E-1")) == "one"
+
+    def test_large_int(self):
+        rules = PluralRules("fr")
+        assert rules.select(2**53 + 1) == "other"
+        assert rules.select(10**17 + 10**6) == "many"
+        assert rules.select(2**64 + 1) == "other"
+
+    def test_bool(self):
+        assert PluralRules("en").select(True) == "one"
+
+    def test_int_subclass(self):
+        class MyInt(int):
+            pass
+
+        assert PluralRules("en").select(MyInt(1)) == "one"
+
+    def test_unsupported_value(self):
+        with pytest.raises(TypeError) as excinfo:
+            PluralRules("en").select("1")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be int, float, or Decimal, got '1'"
+
+    def test_ordinal(self):
+        rules = PluralRules("en", type="ordinal")
+        assert [rules.select(n) for n in [1, 2, 3, 4, 11, 21]] == [
+            "one",
+            "two",
+            "few",
+            "other",
+            "other",
+            "one",
+        ]
+
+    def test_invalid_type(self):
+        with pytest.raises(ValueError) as excinfo:
+            PluralRules("en", type="cardinals")  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "type must be 'cardinal' or 'ordinal', not 'cardinals'"
+        )
+
+    def test_invalid_locale_type(self):
+        with pytest.raises(TypeError) as excinfo:
+            PluralRules(1)  # type: ignore[arg-type]
+        assert str(excinfo.value) == "locale must be a string or Locale object"
+
+    def test_categories(self):
+        assert PluralRules("en").categories == ("one", "other")
+        assert PluralRules("ar").categories == (
+            "zero",
+            "one",
+            "two",
+            "few",
+            "many",
+            "other",
+        )
+        assert PluralRules("ja").categories == ("other",)
+
+    def test_attributes(self):
+        rules = PluralRules(Locale("pl"), "ordinal")
+        assert rules.locale == Locale("pl")
+        assert rules.type == "ordinal"
+
+    def test_repr(self):
+        assert repr(PluralRules("cy")) == "PluralRules(Locale('cy'), type='cardinal')"
+
+    def test_pickle(self):
+        unpickled = pickle.loads(pickle.dumps(PluralRules("en", "ordinal")))
+        assert unpickled.locale == Locale("en")
+        assert unpickled.type == "ordinal"
+        assert unpickled.select(2) == "two"
+
+    def test_cached_rules_are_independent(self):
+        cardinal = PluralRules("en")
+        ordinal = PluralRules("en", "ordinal")
+        assert cardinal.select(2) == "other"
+        assert ordinal.select(2) == "two"
+
+
+class TestSelectMany:
+    def test_list(self):
+        rules = PluralRules("ru")
+        values: list[int | float | Decimal] = [1, 2, 5, 1.5, Decimal("1.0")]
+        assert rules.select_many(values) == ["one", "few", "many", "other", "other"]
+
+    def test_generator(self):
+        rules = PluralRules("en")
+        assert rules.select_many(n for n in range(3)) == ["other", "one", "other"]
+
+    def test_reinit_during_iteration(self):
+        rules = PluralRules("ru")
+
+        def values() -> Iterator[int]:
+            yield 2
+            rules.__init__("en")  # type: ignore[misc]
+            # Evict the original rules from the cache.
+            for i in range(100):
+                PluralRules(f"ru@test=evict{i}")
+            yield 5
+
+        assert rules.select_many(values()) == ["few", "many"]
+        assert rules.select(5) == "other"
+
+    def test_codes(self):
+        rules = PluralRules("ru")
+        assert rules.categories == ("one", "few", "many", "other")
+        assert rules.select_many([1, 2, 5, 1.5], codes=True) == [0, 1, 2, 3]
+
+    def test_empty(self):
+        rules = PluralRules("en")
+        assert rules.select_many([]) == []
+        assert rules.select_many(array("q")) == []
+
+    def test_int_buffer(self):
+        rules = PluralRules("pl")
+        values = array("q", [1, 2, 5, 22, 112])
+        assert rules.select_many(values) == ["one", "few", "many", "few", "many"]
+        assert rules.select_many(values, codes=True) == [0, 1, 2, 1, 2]
+
+    def test_large_int_buffer(self):
+        rules = PluralRules("fr")
+        values = array("q", [10**6, 2**60, 10**17])
+        assert rules.select_many(values) == ["many", "other", "many"]
+
+    def test_uint64_buffer_past_int64(self):
+        rules = PluralRules("fr")
+        assert rules.select_many(array("Q", [1, 2**64 - 1])) == ["one", "other"]
+
+    def test_float_buffer(self):
+        rules = PluralRules("en")
+        assert rules.select_many(array("d", [1.0, 1.5, 2.0])) == [
+            "one",
+            "other",
+            "other",
+        ]
+
+    def test_strided_buffer(self):
+        rules = PluralRules("en")
+        values = memoryview(array("q", [1, 2, 1, 2]))[::2]
+        assert rules.select_many(values) == ["one", "one"]
+
+    def test_unsupported_buffer_format(self):
+        with pytest.raises(ValueError) as excinfo:
+            PluralRules("en").select_many(memoryview(b"ab").cast("c"))
+        assert str(excinfo.value) == (
+            "Unsupported buffer format 'c', expected an integer or float format"
+        )
+
+    def test_unsupported_value(self):
+        with pytest.raises(TypeError) as excinfo:
+            PluralRules("en").select_many([1, None])  # type: ignore[list-item]
+        assert str(excinfo.value) == "Values must be int, float, or Decimal, got None"
+
+    def test_rejects_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            PluralRules("en").select_many("123")  # type: ignore[arg-type]
+        assert str(excinfo.value) == (
+            "values must be an iterable or numeric buffer, not str"
+        )
+
+    def test_unexpected_keyword(self):
+        with pytest.raises(TypeError) as excinfo:
+            PluralRules("en").select_many([1], code=True)  # type: ignore[call-overload]
+        assert str(excinfo.value) == (
+            "select_many() got an unexpected keyword argument 'code'"
+        )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import pickle
+from collections.abc import Iterator
+
+import pytest
+
+from icu4py.transliterate import Transliterator, transliterate, transliterate_many
+
+
+class TestTransliterator:
+    def test_any_latin(self):
+        transliterator = Transliterator("Any-Latin")
+        assert transliterator.transliterate("Привет") == "Privet"
+        assert transliterator.transliterate("日本語") == "rì běn yǔ"
+
+    def test_compound_id(self):
+        transliterator = Transliterator("Greek-Latin; Latin-ASCII")
+        assert transliterator.transliterate("Ελλάδα") == "Ellada"
+
+    def test_latin_ascii(self):
+        assert (
+            Transliterator("Latin-ASCII").transliterate("Ærøskøbing") == "AEroskobing"
+        )
+
+    def test_unchanged_returns_same_object(self):
+        text = "already lower"
+        assert Transliterator("Lower").transliterate(text) is text
+
+    def test_unpaired_surrogate(self):
+        assert Transliterator("Lower").transliterate("A\ud800") == "a\ud800"
+
+    def test_repeated_calls(self):
+        transliterator = Transliterator("Any-Latin")
+        for _ in range(20):
+            assert transliterator.transliterate("Москва") == "Moskva"
+
+    def test_invalid_id(self):
+        with pytest.raises(ValueError) as excinfo:
+            Transliterator("Nope-Nope")
+        assert str(excinfo.value) == (
+            "Failed to create transliterator 'Nope-Nope': U_INVALID_ID"
+        )
+
+    def test_id_not_str(self):
+        with pytest.raises(TypeError):
+            Transliterator(1)  # type: ignore[arg-type]
+
+    def test_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Transliterator("Lower").transliterate(b"A")  # type: ignore[arg-type]
+        assert str(excinfo.value) == "Values must be strings, not bytes"
+
+    def test_attributes(self):
+        transliterator = Transliterator("Any-Latin")
+        assert transliterator.id == "Any-Latin"
+        assert transliterator.rules is None
+
+    def test_repr(self):
+        assert repr(Transliterator("Any-Latin")) == "Transliterator('Any-Latin')"
+
+    def test_pickle(self):
+        transliterator = Transliterator("Latin-ASCII")
+        unpickled = pickle.loads(pickle.dumps(transliterator))
+        assert unpickled.id == "Latin-ASCII"
+        assert unpickled.transliterate("é") == "e"
+
+    def test_subclass(self):
+        class MyTransliterator(Transliterator):
+            pass
+
+        transliterator = MyTransliterator("Lower")
+        assert transliterator.transliterate("A") == "a"
+
+
+class TestFromRules:
+    def test_from_rules(self):
+        transliterator = Transliterator.from_rules("ab", "a > b;")
+        assert transliterator.transliterate("banana") == "bbnbnb"
+        assert transliterator.id == "ab"
+        assert transliterator.rules == "a > b;"
+
+    def test_keywords(self):
+        transliterator = Transliterator.from_rules(id="ab", rules="a > b;")
+        assert transliterator.transliterate("a") == "b"
+
+    def test_same_id_different_rules(self):
+        first = Transliterator.from_rules("custom", "a > b;")
+        second = Transliterator.from_rules("custom", "a > c;")
+        assert first.transliterate("a") == "b"
+        assert second.transliterate("a") == "c"
+
+    def test_parse_error(self):
+        with pytest.raises(ValueError) as excinfo:
+            Transliterator.from_rules("x", "a > ;;; >")
+        assert str(excinfo.value) == (
+            "Failed to parse transliterator rules at offset 8: U_MISSING_OPERATOR"
+        )
+
+    def test_repr(self):
+        transliterator = Transliterator.from_rules("ab", "a > b;")
+        assert repr(transliterator) == "Transliterator.from_rules('ab', 'a > b;')"
+
+    def test_pickle(self):
+        transliterator = Transliterator.from_rules("ab", "a > b;")
+        unpickled = pickle.loads(pickle.dumps(transliterator))
+        assert unpickled.rules == "a > b;"
+        assert unpickled.transliterate("a") == "b"
+
+    def test_subclass(self):
+        class MyTransliterator(Transliterator):
+            pass
+
+        transliterator = MyTransliterator.from_rules("ab", "a > b;")
+        assert type(transliterator) is MyTransliterator
+
+
+class TestTransliterateMany:
+    def test_list(self):
+        strings = ["Привет", "hello", "Ελλάδα"]
+        result = Transliterator("Any-Latin").transliterate_many(strings)
+        assert result == ["Privet", "hello", "Elláda"]
+        assert result[1] is strings[1]
+
+    def test_generator(self):
+        transliterator = Transliterator("Upper")
+        assert transliterator.transliterate_many(s for s in ["a", "b"]) == ["A", "B"]
+
+    def test_reinit_during_iteration(self):
+        transliterator = Transliterator("Upper")
+
+        def strings() -> Iterator[str]:
+            yield "a"
+            transliterator.__init__("Lower")  # type: ignore[misc]
+            # Evict the original transliterator from the cache.
+            for i in range(100):
+                Transliterator.from_rules(f"evict{i}", f"a > {i % 10};")
+            yield "b"
+
+        assert transliterator.transliterate_many(strings()) == ["A", "B"]
+        assert transliterator.transliterate("C") == "c"
+
+    def test_empty(self):
+        assert Transliterator("Upper").transliterate_many([]) == []
+
+    def test_rejects_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Transliterator("Upper").transliterate_many("abc")
+        assert str(excinfo.value) == "strings must be an iterable of strings, not str"
+
+    def test_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            Transliterator("Upper").transliterate_many(["a", 1])  # type: ignore[list-item]
+        assert str(excinfo.value) == "Values must be strings, not int"
+
+
+class TestFunctions:
+    def test_transliterate(self):
+        assert transliterate("Москва", "Any-Latin") == "Moskva"
+
+    def test_transliterate_many(self):
+        assert transliterate_many(["Σ", "A"], "Any-Lower") == ["σ", "a"]
+
+    def test_id_not_str(self):
+        with pytest.raises(TypeError) as excinfo:
+            transliterate("a", 1)  # type: ignore[arg-type]
+        assert str(excinfo.value) == "id must be a string, not int"
+
+    def test_invalid_id(self):
+        with pytest.raises(ValueError) as excinfo:
+            transliterate_many(["a"], "Nope-Nope")
+        assert str(excinfo.value) == (
+            "Failed to create transliterator 'Nope-Nope': U_INVALID_ID"
+        )
+
+    def test_argument_count(self):
+        with pytest.raises(TypeError) as excinfo:
+            transliterate("a")  # type: ignore[call-arg]
+        assert str(excinfo.value) == "transliterate() takes exactly 2 arguments"
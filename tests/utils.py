@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from array import array
+from types import SimpleNamespace
+
+
+class Datetime64Array(array):  # type: ignore[type-arg]
+    """
+    Mimic the parts of a NumPy datetime64 array read by format_columns() and
+    format_many().
+    """
+
+    dtype: SimpleNamespace
+
+    def view(self, dtype: str) -> array[int]:
+        assert dtype == "i8"
+        return array("q", self)
+
+
+def datetime64_array(values: list[int], dtype_str: str) -> Datetime64Array:
+    result = Datetime64Array("q", values)
+    result.dtype = SimpleNamespace(kind="M", str=dtype_str)
+    return result